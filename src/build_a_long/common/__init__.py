@@ -0,0 +1,5 @@
+"""Utilities shared by the downloader and the PDF extractor."""
+
+from .files import atomic_open, atomic_write
+
+__all__ = ["atomic_open", "atomic_write"]
@@ -0,0 +1,55 @@
+"""File helpers."""
+
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "w") -> Iterator[IO[Any]]:
+    """Open a file for writing atomically, via a temporary file renamed over it.
+
+    For content that is streamed rather than built in memory. The file
+    object writes to a temporary file next to ``path``, which replaces
+    ``path`` when the block exits normally. If the block raises, the
+    temporary file is removed and ``path`` is left untouched.
+
+    Readers, including other processes, see either the old or the new
+    content, never a partial file. The temporary file is named after the
+    writing process, so processes writing the same file concurrently do not
+    clobber each other's temporaries; the last rename wins.
+
+    Args:
+        path: The file to write. Its directory must exist.
+        mode: ``"w"`` for UTF-8 text, or ``"wb"`` for bytes.
+
+    Yields:
+        The open temporary file.
+    """
+    if mode not in ("w", "wb"):
+        raise ValueError(f"Unsupported mode: {mode!r}")
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, mode, encoding=None if "b" in mode else "utf-8") as f:
+            yield f
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write(path: Path, data: bytes | str) -> None:
+    """Write a file atomically, via a temporary file renamed over it.
+
+    See `atomic_open`, which this wraps for content already in memory.
+
+    Args:
+        path: The file to write. Its directory must exist.
+        data: The content. Strings are encoded as UTF-8.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    with atomic_open(path, "wb") as f:
+        f.write(data)
@@ -0,0 +1,80 @@
+"""Tests for the file helpers."""
+
+from pathlib import Path
+
+import pytest
+
+from build_a_long.common.files import atomic_open, atomic_write
+
+
+def test_atomic_write_bytes(tmp_path: Path) -> None:
+    path = tmp_path / "out.bin"
+    atomic_write(path, b"\x00\x01")
+    assert path.read_bytes() == b"\x00\x01"
+
+
+def test_atomic_write_text_is_utf8(tmp_path: Path) -> None:
+    path = tmp_path / "out.json"
+    atomic_write(path, '{"name": "Café"}')
+    assert path.read_bytes() == '{"name": "Café"}'.encode()
+
+
+def test_atomic_write_replaces_and_leaves_no_temporary(tmp_path: Path) -> None:
+    path = tmp_path / "out.json"
+    path.write_text("old")
+
+    atomic_write(path, "new")
+
+    assert path.read_text() == "new"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_failed_write_keeps_old_content(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "out.json"
+    path.write_text("old")
+
+    def fail(self: Path, target: Path) -> Path:
+        raise OSError("rename failed")
+
+    monkeypatch.setattr(Path, "replace", fail)
+    with pytest.raises(OSError, match="rename failed"):
+        atomic_write(path, "new")
+
+    assert path.read_text() == "old"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_open_streams_text(tmp_path: Path) -> None:
+    path = tmp_path / "out.json"
+    path.write_text("old")
+
+    with atomic_open(path) as f:
+        f.write("[")
+        # Not visible until the block exits
+        assert path.read_text() == "old"
+        f.write("Café]")
+
+    assert path.read_bytes() == "[Café]".encode()
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_open_error_keeps_old_content(tmp_path: Path) -> None:
+    path = tmp_path / "out.json"
+    path.write_text("old")
+
+    with pytest.raises(RuntimeError, match="boom"), atomic_open(path) as f:
+        f.write("partial")
+        raise RuntimeError("boom")
+
+    assert path.read_text() == "old"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_open_rejects_read_modes(tmp_path: Path) -> None:
+    with (
+        pytest.raises(ValueError, match="Unsupported mode"),
+        atomic_open(tmp_path / "out.json", "r"),
+    ):
+        pass
@@ -37,7 +37,9 @@ def test_main_routes_to_summarize_command(mock_summarize, monkeypatch):
     exit_code = main()
 
     assert exit_code == 0
-    mock_summarize.assert_called_once_with(Path("/tmp/data"), Path("data/indices"))
+    mock_summarize.assert_called_once_with(
+        Path("/tmp/data"), Path("data/indices"), full=False
+    )
 
 
 @patch("build_a_long.downloader.verify.command._verify_data_integrity")
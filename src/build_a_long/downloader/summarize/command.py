@@ -28,6 +28,11 @@ def add_summarize_parser(subparsers: argparse._SubParsersAction) -> None:
         default="data/indices",
         help="Directory to store the generated index files.",
     )
+    summarize_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the saved state and rebuild every yearly index.",
+    )
 
 
 def run_summarize(args: argparse.Namespace) -> int:
@@ -39,4 +44,6 @@ def run_summarize(args: argparse.Namespace) -> int:
     Returns:
         Exit code from summarize_metadata.
     """
-    return _summarize_metadata(Path(args.data_dir), Path(args.output_dir))
+    return _summarize_metadata(
+        Path(args.data_dir), Path(args.output_dir), full=args.full
+    )
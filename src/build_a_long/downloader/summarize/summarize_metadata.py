@@ -1,16 +1,64 @@
-"""Summarizes all metadata files into a yearly index."""
+"""Summarizes all metadata files into a yearly index.
+
+The summary is maintained incrementally. A small state file in the output
+directory records, for every set directory, the hash of its metadata.json and
+the year it was filed under. On each run only metadata files whose size, mtime
+or content hash changed are re-parsed, and only the yearly shards whose
+membership or content changed are rewritten.
+"""
 
 import argparse
-import collections
+import hashlib
 import json
+import textwrap
+from collections.abc import Iterable
 from pathlib import Path
 
+from pydantic import BaseModel, Field, ValidationError
 from tqdm.auto import tqdm
 from tqdm.contrib.concurrent import process_map
 
+from build_a_long.common import atomic_open, atomic_write
 from build_a_long.downloader.metadata import read_metadata
 from build_a_long.schemas import InstructionMetadata
 
+STATE_FILENAME = ".summarize-state.json"
+"""Name of the incremental state file stored alongside the indices."""
+
+_STATE_VERSION = 2
+
+_PARALLEL_THRESHOLD = 64
+"""Only spin up a process pool when at least this many files need parsing."""
+
+
+class SetState(BaseModel):
+    """Cached summary of a single set's metadata.json."""
+
+    hash: str = Field(..., description="SHA256 of the metadata.json bytes.")
+    size: int = Field(..., description="File size in bytes when last hashed.")
+    mtime_ns: int = Field(..., description="File mtime when last hashed.")
+    set: str | None = Field(
+        default=None, description="The set identifier, used for sorting."
+    )
+    year: int | None = Field(
+        default=None, description="The year, or None if unreadable or unset."
+    )
+
+
+class SummarizeState(BaseModel):
+    """Incremental state for summarize_metadata, keyed by set directory name."""
+
+    version: int = _STATE_VERSION
+    sets: dict[str, SetState] = Field(default_factory=dict)
+    counts: dict[int, int] = Field(
+        default_factory=dict,
+        description="Entries actually written to each yearly index.",
+    )
+
+
+def _hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
 
 def _load_single_metadata(metadata_file: Path) -> InstructionMetadata | None:
     """Load and parse a single metadata file.
@@ -28,73 +76,199 @@ def _load_single_metadata(metadata_file: Path) -> InstructionMetadata | None:
         return None
 
 
-def summarize_metadata(data_dir: Path, output_dir: Path) -> int:
+def _scan_single_metadata(metadata_file: Path) -> SetState | None:
+    """Hash and parse a single metadata file into its SetState.
+
+    Args:
+        metadata_file: Path to the metadata.json file.
+
+    Returns:
+        The SetState, or None if the file could not be read at all. Files
+        that can be read but not parsed are recorded with a None year so they
+        are not re-parsed until they change.
+    """
+    try:
+        stat = metadata_file.stat()
+        data = metadata_file.read_bytes()
+    except OSError as e:
+        tqdm.write(f"Warning: Could not read {metadata_file}: {e}; ignoring")
+        return None
+
+    state = SetState(
+        hash=_hash_bytes(data), size=stat.st_size, mtime_ns=stat.st_mtime_ns
+    )
+    try:
+        metadata = InstructionMetadata.model_validate_json(data)
+    except ValidationError as e:
+        tqdm.write(f"Warning: Could not read {metadata_file}: {e}; ignoring")
+        return state
+
+    state.set = metadata.set
+    state.year = metadata.year or None
+    return state
+
+
+def _read_state(state_file: Path) -> SummarizeState:
+    """Read the state file, returning an empty state if missing or stale."""
+    try:
+        state = SummarizeState.model_validate_json(state_file.read_bytes())
+    except OSError, ValueError:
+        return SummarizeState()
+    if state.version != _STATE_VERSION:
+        return SummarizeState()
+    return state
+
+
+def _write_yearly_index(output_file: Path, metadata_files: Iterable[Path]) -> int:
+    """Stream a yearly index to disk atomically.
+
+    Each metadata file is read, serialized and written before the next is
+    read, so memory stays bounded by a single set. The output is byte for byte
+    what ``json.dump(list, f, indent=2)`` would produce for the whole list.
+
+    Args:
+        output_file: Destination index-{year}.json path.
+        metadata_files: The metadata.json files for the year, in output order.
+
+    Returns:
+        The number of entries written.
+    """
+    count = 0
+    with atomic_open(output_file) as f:
+        f.write("[")
+        for metadata_file in metadata_files:
+            metadata = _load_single_metadata(metadata_file)
+            if metadata is None:
+                continue
+            entry = json.dumps(
+                metadata.model_dump(mode="json", exclude_unset=True), indent=2
+            )
+            f.write(",\n" if count else "\n")
+            f.write(textwrap.indent(entry, "  "))
+            count += 1
+        f.write("\n]" if count else "]")
+    return count
+
+
+def summarize_metadata(data_dir: Path, output_dir: Path, full: bool = False) -> int:
     """Summarize all metadata.json files into a yearly index.
 
     Args:
         data_dir: The directory containing the data folders.
         output_dir: The directory to write the indices to.
+        full: Ignore any saved state and rebuild every yearly index.
 
     Returns:
         0 on success, 1 on error.
     """
-    yearly_metadata = collections.defaultdict(list)
-    metadata_files = list(data_dir.glob("*/metadata.json"))
+    metadata_files = {p.parent.name: p for p in data_dir.glob("*/metadata.json")}
 
     if not metadata_files:
         print(f"No metadata.json files found in {data_dir}")
         return 1
 
-    # Use process_map for parallel loading of metadata files
-    metadata_list = process_map(
-        _load_single_metadata,
-        metadata_files,
-        desc="Loading metadata",
-        unit="file",
-        max_workers=4,
-        chunksize=10,
-    )
+    output_dir.mkdir(exist_ok=True)
+    state_file = output_dir / STATE_FILENAME
+    old_state = SummarizeState() if full else _read_state(state_file)
+    new_state = SummarizeState()
 
-    # Group metadata by year
-    for metadata in metadata_list:
-        if metadata is None:
+    # Cheap stat check first; only files whose size or mtime changed are read.
+    to_scan: list[str] = []
+    for key, metadata_file in metadata_files.items():
+        previous = old_state.sets.get(key)
+        try:
+            stat = metadata_file.stat()
+        except OSError:
+            to_scan.append(key)
             continue
-        year = metadata.year
-        if year:
-            yearly_metadata[year].append(metadata)
+        if (
+            previous is not None
+            and previous.size == stat.st_size
+            and previous.mtime_ns == stat.st_mtime_ns
+        ):
+            new_state.sets[key] = previous
+        else:
+            to_scan.append(key)
 
-    output_dir.mkdir(exist_ok=True)
+    scan_paths = [metadata_files[key] for key in to_scan]
+    if len(scan_paths) >= _PARALLEL_THRESHOLD:
+        scanned = process_map(
+            _scan_single_metadata,
+            scan_paths,
+            desc="Loading metadata",
+            unit="file",
+            max_workers=4,
+            chunksize=10,
+        )
+    else:
+        scanned = [_scan_single_metadata(p) for p in scan_paths]
 
-    all_years_summary = []
-    sorted_years = sorted(yearly_metadata.keys())
+    # A year is dirty if any set enters, leaves or changes within it.
+    dirty_years: set[int] = set()
+    for key, entry in zip(to_scan, scanned, strict=True):
+        if entry is None:
+            continue
+        new_state.sets[key] = entry
+        previous = old_state.sets.get(key)
+        if previous is not None and previous.hash == entry.hash:
+            continue
+        if previous is not None and previous.year is not None:
+            dirty_years.add(previous.year)
+        if entry.year is not None:
+            dirty_years.add(entry.year)
 
-    for year in sorted_years:
-        metadata_list = yearly_metadata[year]
-        metadata_list.sort(key=lambda x: x.set)
-        filename = f"index-{year}.json"
-        output_file = output_dir / filename
-        with open(output_file, "w") as f:
-            # Convert to dict for JSON serialization with mode='json' to serialize URLs
-            json.dump(
-                [m.model_dump(mode="json", exclude_unset=True) for m in metadata_list],
-                f,
-                indent=2,
-            )
+    for key, previous in old_state.sets.items():
+        if key not in new_state.sets and previous.year is not None:
+            dirty_years.add(previous.year)
+
+    years: dict[int, list[str]] = {}
+    for key, entry in new_state.sets.items():
+        if entry.year is not None:
+            years.setdefault(entry.year, []).append(key)
 
+    # Shards that went missing on disk, or whose count is unknown, must be
+    # regenerated too.
+    for year in years:
+        if (
+            not (output_dir / f"index-{year}.json").exists()
+            or year not in old_state.counts
+        ):
+            dirty_years.add(year)
+
+    # Sets that fail to load when the shard is written are left out of it, so
+    # the count comes from the write, not from the state.
+    for year in years:
+        if year not in dirty_years:
+            new_state.counts[year] = old_state.counts[year]
+    for year in sorted(dirty_years):
+        output_file = output_dir / f"index-{year}.json"
+        if year not in years:
+            output_file.unlink(missing_ok=True)
+            continue
+        keys = sorted(years[year], key=lambda k: (new_state.sets[k].set or "", k))
+        new_state.counts[year] = _write_yearly_index(
+            output_file, (metadata_files[k] for k in keys)
+        )
+
+    all_years_summary = []
+    for year in sorted(years):
+        filename = f"index-{year}.json"
         all_years_summary.append(
             {
                 "year": year,
-                "count": len(metadata_list),
-                "filesize": output_file.stat().st_size,
+                "count": new_state.counts[year],
+                "filesize": (output_dir / filename).stat().st_size,
                 "filename": filename,
             }
         )
 
-    index_file = output_dir / "index.json"
-    with open(index_file, "w") as f:
-        json.dump(all_years_summary, f, indent=2)
+    atomic_write(output_dir / "index.json", json.dumps(all_years_summary, indent=2))
+    atomic_write(state_file, new_state.model_dump_json())
 
-    print(f"Indexed {len(metadata_files)} files into {len(sorted_years)} year(s).")
+    print(
+        f"Indexed {len(metadata_files)} files into {len(years)} year(s) "
+        f"({len(to_scan)} scanned, {len(dirty_years)} year(s) rewritten)."
+    )
     return 0
 
 
@@ -113,13 +287,18 @@ def _parse_args() -> argparse.Namespace:
         default="data/indices",
         help="Directory to store the generated index files.",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the saved state and rebuild every yearly index.",
+    )
     return parser.parse_args()
 
 
 def main() -> int:
     """Main entry point for the metadata summarizer."""
     args = _parse_args()
-    return summarize_metadata(Path(args.data_dir), Path(args.output_dir))
+    return summarize_metadata(Path(args.data_dir), Path(args.output_dir), args.full)
 
 
 if __name__ == "__main__":
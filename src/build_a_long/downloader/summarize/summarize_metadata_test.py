@@ -1,12 +1,16 @@
 """Tests for summarize_metadata."""
 
+import importlib
 import json
 import tempfile
 from pathlib import Path
 
 import pytest
 
-from .summarize_metadata import summarize_metadata
+from .summarize_metadata import STATE_FILENAME, summarize_metadata
+
+# The package re-exports the function under the module's name
+summarize_metadata_module = importlib.import_module(".summarize_metadata", __package__)
 
 
 @pytest.fixture
@@ -164,3 +168,119 @@ def test_summarize_metadata_with_urls(tmp_path):
             == "https://www.lego.com/cdn/product-assets/instructions.pdf"
         )
         assert isinstance(data[0]["pdfs"][0]["url"], str)
+
+
+def _write_set(data_dir: Path, set_id: str, year: int | None, **extra) -> None:
+    (data_dir / set_id).mkdir(exist_ok=True)
+    payload = {"set": set_id, "locale": "en-us", **extra}
+    if year is not None:
+        payload["year"] = year
+    with open(data_dir / set_id / "metadata.json", "w") as f:
+        json.dump(payload, f)
+
+
+def test_summarize_metadata_matches_json_dump(temp_data_dir):
+    """Test that streamed shards are byte-identical to a single json.dump."""
+    output_dir = temp_data_dir / "indices"
+    assert summarize_metadata(temp_data_dir, output_dir) == 0
+
+    data_2023 = json.loads((output_dir / "index-2023.json").read_text())
+    expected = json.dumps(data_2023, indent=2)
+    assert (output_dir / "index-2023.json").read_text() == expected
+
+
+def test_summarize_metadata_incremental_skips_unchanged_years(temp_data_dir):
+    """Test that only shards affected by a change are rewritten."""
+    output_dir = temp_data_dir / "indices"
+    assert summarize_metadata(temp_data_dir, output_dir) == 0
+    assert (output_dir / STATE_FILENAME).exists()
+
+    mtime_2023 = (output_dir / "index-2023.json").stat().st_mtime_ns
+    mtime_2024 = (output_dir / "index-2024.json").stat().st_mtime_ns
+
+    _write_set(temp_data_dir, "set3", 2024, name="Renamed")
+    assert summarize_metadata(temp_data_dir, output_dir) == 0
+
+    assert (output_dir / "index-2023.json").stat().st_mtime_ns == mtime_2023
+    assert (output_dir / "index-2024.json").stat().st_mtime_ns != mtime_2024
+    data_2024 = json.loads((output_dir / "index-2024.json").read_text())
+    assert data_2024[0]["name"] == "Renamed"
+
+
+def test_summarize_metadata_incremental_moves_and_removes(temp_data_dir):
+    """Test that year changes and deleted sets update both affected shards."""
+    output_dir = temp_data_dir / "indices"
+    assert summarize_metadata(temp_data_dir, output_dir) == 0
+
+    # Move set2 from 2023 to 2024, and remove set3 (2024)
+    _write_set(temp_data_dir, "set2", 2024)
+    (temp_data_dir / "set3" / "metadata.json").unlink()
+    _write_set(temp_data_dir, "set5", 2025)
+    assert summarize_metadata(temp_data_dir, output_dir) == 0
+
+    data_2023 = json.loads((output_dir / "index-2023.json").read_text())
+    data_2024 = json.loads((output_dir / "index-2024.json").read_text())
+    data_2025 = json.loads((output_dir / "index-2025.json").read_text())
+    assert [d["set"] for d in data_2023] == ["set1"]
+    assert [d["set"] for d in data_2024] == ["set2"]
+    assert [d["set"] for d in data_2025] == ["set5"]
+
+    # Removing the last set of a year drops its shard
+    (temp_data_dir / "set5" / "metadata.json").unlink()
+    assert summarize_metadata(temp_data_dir, output_dir) == 0
+    assert not (output_dir / "index-2025.json").exists()
+
+    index_data = json.loads((output_dir / "index.json").read_text())
+    assert [(d["year"], d["count"]) for d in index_data] == [(2023, 1), (2024, 1)]
+
+
+def test_summarize_metadata_incremental_matches_full(temp_data_dir):
+    """Test that an incremental update produces the same files as a rebuild."""
+    incremental_dir = temp_data_dir / "incremental"
+    full_dir = temp_data_dir / "full"
+    assert summarize_metadata(temp_data_dir, incremental_dir) == 0
+
+    _write_set(temp_data_dir, "set0", 2023, pieces=10)
+    _write_set(temp_data_dir, "set1", 2024)
+    assert summarize_metadata(temp_data_dir, incremental_dir) == 0
+    assert summarize_metadata(temp_data_dir, full_dir, full=True) == 0
+
+    for name in ["index.json", "index-2023.json", "index-2024.json"]:
+        assert (incremental_dir / name).read_text() == (full_dir / name).read_text()
+
+
+def test_summarize_metadata_regenerates_missing_shard(temp_data_dir):
+    """Test that a shard deleted from disk is rebuilt even without changes."""
+    output_dir = temp_data_dir / "indices"
+    assert summarize_metadata(temp_data_dir, output_dir) == 0
+    (output_dir / "index-2024.json").unlink()
+
+    assert summarize_metadata(temp_data_dir, output_dir) == 0
+    data_2024 = json.loads((output_dir / "index-2024.json").read_text())
+    assert [d["set"] for d in data_2024] == ["set3"]
+
+
+def test_summarize_metadata_counts_written_entries(temp_data_dir, monkeypatch):
+    """Test that index.json counts the entries written, across runs."""
+    output_dir = temp_data_dir / "indices"
+    set2 = temp_data_dir / "set2" / "metadata.json"
+    load = summarize_metadata_module._load_single_metadata
+    # set2 scans fine, but fails to load when its shard is written
+    monkeypatch.setattr(
+        summarize_metadata_module,
+        "_load_single_metadata",
+        lambda path: None if path == set2 else load(path),
+    )
+    assert summarize_metadata(temp_data_dir, output_dir) == 0
+    monkeypatch.undo()
+
+    def counts() -> list[tuple[int, int]]:
+        index_data = json.loads((output_dir / "index.json").read_text())
+        return [(d["year"], d["count"]) for d in index_data]
+
+    assert counts() == [(2023, 1), (2024, 1)]
+
+    # 2023 is not rewritten, so its count comes from the state
+    _write_set(temp_data_dir, "set3", 2024, name="Renamed")
+    assert summarize_metadata(temp_data_dir, output_dir) == 0
+    assert counts() == [(2023, 1), (2024, 1)]
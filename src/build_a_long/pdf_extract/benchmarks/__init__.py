@@ -0,0 +1,6 @@
+"""Micro-benchmarks for performance-sensitive parts of pdf_extract.
+
+Each ``*_benchmark.py`` module is a standalone script comparing an optimized
+implementation against the reference one it replaced, on fixture pages and
+synthetic dense pages.
+"""
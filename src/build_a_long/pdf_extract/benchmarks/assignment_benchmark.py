@@ -0,0 +1,291 @@
+"""Benchmark the Hungarian assignment phases of `StepClassifier.build_all`.
+
+Builds synthetic pages with a grid of steps separated by dividers, each step
+with a diagram nearby plus extra diagrams, subassemblies and rotation symbols,
+and times assigning diagrams, subassemblies and rotation symbols to the steps
+(`assign_diagrams_to_steps` and friends) two ways:
+
+- the original cost matrices, filled one pair at a time with
+  `calculate_pairing_cost`, `has_divider_between` and per-pair distances, and
+- the vectorized matrices from `classifier.steps.assignment`, computed
+  with NumPy over arrays of bbox coordinates.
+
+A second table times assigning the same page again with a shared
+`ClassificationResult.memoize`-style cache, as rebuilding a page during a
+config sweep does.
+
+Both produce identical assignments; the benchmark checks that before timing.
+
+Usage:
+    pants run src/build_a_long/pdf_extract/benchmarks/assignment_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from collections.abc import Callable, Hashable
+from typing import Any, NamedTuple
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from build_a_long.pdf_extract.benchmarks.timing import best_of, print_comparison
+from build_a_long.pdf_extract.classifier.steps.assignment import Memoize
+from build_a_long.pdf_extract.classifier.steps.pairing import (
+    PairingConfig,
+    calculate_pairing_cost,
+    has_divider_between,
+)
+from build_a_long.pdf_extract.classifier.steps.step_classifier import (
+    assign_diagrams_to_steps,
+    assign_rotation_symbols_to_steps,
+    assign_subassemblies_to_steps,
+)
+from build_a_long.pdf_extract.extractor.bbox import BBox
+from build_a_long.pdf_extract.extractor.lego_page_elements import (
+    Diagram,
+    RotationSymbol,
+    Step,
+    StepNumber,
+    SubAssembly,
+)
+
+
+class _Page(NamedTuple):
+    step_numbers: list[StepNumber]
+    diagrams: list[Diagram]
+    subassemblies: list[SubAssembly]
+    rotation_symbols: list[RotationSymbol]
+    dividers: list[BBox]
+
+
+def _synthetic_page(steps: int, seed: int = 0) -> _Page:
+    """Return a page with `steps` steps in a grid, with dividers between cells."""
+    rng = random.Random(seed)
+    cols = max(1, round(steps**0.5))
+    rows = -(-steps // cols)
+    cell_w, cell_h = 300.0, 250.0
+    page = _Page([], [], [], [], [])
+
+    for i in range(steps):
+        x = (i % cols) * cell_w + rng.uniform(0, 10)
+        y = (i // cols) * cell_h + rng.uniform(0, 10)
+        page.step_numbers.append(
+            StepNumber(value=i + 1, bbox=BBox(x + 5, y + 5, x + 20, y + 25))
+        )
+        page.diagrams.append(
+            Diagram(bbox=BBox(x + 25, y + 30, x + cell_w - 20, y + cell_h - 20))
+        )
+        # Extra callout-sized diagrams, subassemblies and rotation symbols
+        if i % 2 == 0:
+            dx, dy = rng.uniform(150, 220), rng.uniform(20, 120)
+            page.diagrams.append(
+                Diagram(bbox=BBox(x + dx, y + dy, x + dx + 60, y + dy + 50))
+            )
+        if i % 3 == 0:
+            dx, dy = rng.uniform(30, 150), rng.uniform(120, 160)
+            page.subassemblies.append(
+                SubAssembly(bbox=BBox(x + dx, y + dy, x + dx + 90, y + dy + 70))
+            )
+        if i % 2 == 1:
+            dx, dy = rng.uniform(200, 250), rng.uniform(20, 60)
+            page.rotation_symbols.append(
+                RotationSymbol(bbox=BBox(x + dx, y + dy, x + dx + 30, y + dy + 30))
+            )
+
+    width, height = cols * cell_w, rows * cell_h
+    for c in range(1, cols):
+        page.dividers.append(BBox(c * cell_w - 1, 0, c * cell_w + 1, height))
+    for r in range(1, rows):
+        page.dividers.append(BBox(0, r * cell_h - 1, width, r * cell_h + 1))
+    return page
+
+
+def _steps(page: _Page) -> list[Step]:
+    return [Step(step_number=sn, bbox=sn.bbox) for sn in page.step_numbers]
+
+
+def _loop_pairings(
+    step_bboxes: list[BBox],
+    diagram_bboxes: list[BBox],
+    config: PairingConfig,
+    divider_bboxes: list[BBox],
+) -> list[tuple[int, int]]:
+    cost_matrix = np.full((len(step_bboxes), len(diagram_bboxes)), np.inf)
+    for i, step_bbox in enumerate(step_bboxes):
+        for j, diagram_bbox in enumerate(diagram_bboxes):
+            cost_matrix[i, j] = calculate_pairing_cost(
+                step_bbox, diagram_bbox, config, divider_bboxes
+            )
+    if np.all(np.isinf(cost_matrix)):
+        return []
+    try:
+        rows, cols = linear_sum_assignment(cost_matrix)
+    except ValueError:
+        return []
+    return [
+        (i, j)
+        for i, j in zip(rows, cols, strict=True)
+        if not np.isinf(cost_matrix[i, j])
+    ]
+
+
+def _loop_thresholded(
+    cost_matrix: np.ndarray, max_distance: float
+) -> tuple[np.ndarray, np.ndarray]:
+    high_cost = max_distance * 10
+    return linear_sum_assignment(
+        np.where(cost_matrix > max_distance, high_cost, cost_matrix)
+    )
+
+
+def _loop_assign(page: _Page, memoize: Memoize | None = None) -> list[Step]:
+    """The original per-pair cost matrices (`memoize` is ignored)."""
+    steps = _steps(page)
+
+    config = PairingConfig(max_distance=500.0)
+    for i, j in _loop_pairings(
+        [s.step_number.bbox for s in steps],
+        [d.bbox for d in page.diagrams],
+        config,
+        page.dividers,
+    ):
+        object.__setattr__(steps[i], "diagram", page.diagrams[j])
+
+    max_distance = 400.0
+    high_cost = max_distance * 10
+    sa_costs = np.zeros((len(page.subassemblies), len(steps)))
+    for i, sa in enumerate(page.subassemblies):
+        sa_center = sa.bbox.center
+        for j, step in enumerate(steps):
+            if step.diagram:
+                target_bbox = step.diagram.bbox
+                target_center = target_bbox.center
+            else:
+                target_bbox = step.bbox
+                target_center = step.step_number.bbox.center
+            distance = (
+                (target_center[0] - sa_center[0]) ** 2
+                + (target_center[1] - sa_center[1]) ** 2
+            ) ** 0.5
+            if has_divider_between(sa.bbox, target_bbox, page.dividers):
+                distance = high_cost
+            sa_costs[i, j] = distance
+    assigned: set[int] = set()
+    for i, j in zip(*_loop_thresholded(sa_costs, max_distance), strict=True):
+        if sa_costs[i, j] <= max_distance:
+            step = steps[j]
+            subassemblies = [*step.subassemblies, page.subassemblies[i]]
+            object.__setattr__(step, "subassemblies", subassemblies)
+            assigned.add(i)
+    for i, sa in enumerate(page.subassemblies):
+        if i in assigned:
+            continue
+        best_j, best_cost = None, high_cost
+        for j in range(len(steps)):
+            if sa_costs[i, j] < best_cost:
+                best_j, best_cost = j, sa_costs[i, j]
+        if best_j is not None and best_cost <= max_distance:
+            step = steps[best_j]
+            object.__setattr__(step, "subassemblies", [*step.subassemblies, sa])
+
+    max_distance = 300.0
+    rs_costs = np.zeros((len(page.rotation_symbols), len(steps)))
+    for i, rs in enumerate(page.rotation_symbols):
+        rs_center = rs.bbox.center
+        for j, step in enumerate(steps):
+            target_center = (
+                step.diagram.bbox.center if step.diagram else step.bbox.center
+            )
+            rs_costs[i, j] = (
+                (rs_center[0] - target_center[0]) ** 2
+                + (rs_center[1] - target_center[1]) ** 2
+            ) ** 0.5
+    for i, j in zip(*_loop_thresholded(rs_costs, max_distance), strict=True):
+        if rs_costs[i, j] <= max_distance:
+            steps[j].rotation_symbol = page.rotation_symbols[i]
+            steps[j].bbox = steps[j].bbox.union(page.rotation_symbols[i].bbox)
+    return steps
+
+
+def _vectorized_assign(page: _Page, memoize: Memoize | None = None) -> list[Step]:
+    steps = _steps(page)
+    assign_diagrams_to_steps(steps, page.diagrams, page.dividers, memoize=memoize)
+    assign_subassemblies_to_steps(
+        steps, page.subassemblies, page.dividers, memoize=memoize
+    )
+    assign_rotation_symbols_to_steps(steps, page.rotation_symbols, memoize=memoize)
+    return steps
+
+
+def _assignments(steps: list[Step]) -> list[tuple]:
+    return [
+        (
+            s.step_number.value,
+            s.diagram.bbox if s.diagram else None,
+            [sa.bbox for sa in s.subassemblies],
+            s.rotation_symbol.bbox if s.rotation_symbol else None,
+        )
+        for s in steps
+    ]
+
+
+def _cache() -> Memoize:
+    values: dict[Hashable, Any] = {}
+
+    def memoize[T](key: Hashable, factory: Callable[[], T]) -> T:
+        if key not in values:
+            values[key] = factory()
+        return values[key]
+
+    return memoize
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--steps",
+        type=int,
+        nargs="+",
+        default=[4, 9, 16, 36, 64],
+        help="Steps per synthetic page.",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds.")
+    args = parser.parse_args()
+
+    rows = []
+    rebuild_rows = []
+    for n in args.steps:
+        page = _synthetic_page(n)
+        expected = _assignments(_loop_assign(page))
+        assert _assignments(_vectorized_assign(page)) == expected, f"mismatch at {n}"
+        memoize = _cache()
+        _vectorized_assign(page, memoize)
+        assert _assignments(_vectorized_assign(page, memoize)) == expected
+
+        case = f"{n} steps, {len(page.diagrams)} diagrams, {len(page.dividers)} div"
+        loop = best_of(lambda p=page: _loop_assign(p), args.repeat)
+        vectorized = best_of(lambda p=page: _vectorized_assign(p), args.repeat)
+        rebuild = best_of(
+            lambda p=page, m=memoize: _vectorized_assign(p, m), args.repeat
+        )
+        rows.append((case, n, loop, vectorized))
+        rebuild_rows.append((case, n, vectorized, rebuild))
+
+    print_comparison(
+        "Diagram, subassembly and rotation symbol assignment",
+        rows,
+        baseline="per pair",
+        optimized="vectorized",
+    )
+    print_comparison(
+        "Assigning the same page again (e.g. in a config sweep)",
+        rebuild_rows,
+        baseline="uncached",
+        optimized="memoized",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark dict/set membership of blocks, as used to track removed blocks.
+
+Builds a set and a dict of the Drawing blocks on the fixture pages with the
+most drawings (so the longest paths), then looks up copies of the blocks
+(equal but not identical, so equality is checked) and the blocks of another
+page (absent) two ways:
+
+- pydantic's default frozen-model hash and equality, which cover every
+  field (bbox, colors, path items, ...), and
+- the `Block.__hash__`/`Block.__eq__` fast path: hash of id and bbox, and
+  blocks with different ids unequal without comparing other fields.
+
+Usage:
+    pants run src/build_a_long/pdf_extract/benchmarks/block_hash_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import operator
+from contextlib import ExitStack
+from unittest import mock
+
+from pydantic import BaseModel
+
+from build_a_long.pdf_extract.benchmarks.timing import (
+    best_of,
+    iter_fixture_pages,
+    print_comparison,
+)
+from build_a_long.pdf_extract.extractor.page_blocks import Block, Drawing
+
+
+def _field_hash(self: Block) -> int:
+    getter = operator.itemgetter(*type(self).model_fields)
+    return hash(getter(self.__dict__))
+
+
+def _by_value() -> ExitStack:
+    """Patch blocks back to hashing and comparing every field."""
+    stack = ExitStack()
+    stack.enter_context(mock.patch.object(Block, "__hash__", _field_hash))
+    stack.enter_context(mock.patch.object(Block, "__eq__", BaseModel.__eq__))
+    return stack
+
+
+def _membership(
+    keys: list[Drawing], lookups: list[Drawing], absent: list[Drawing]
+) -> None:
+    removed = set(keys)
+    mapping = dict.fromkeys(keys)
+    for block in lookups:
+        assert block in removed
+        assert block in mapping
+    for block in absent:
+        assert block not in removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5, help="Pages to time.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds.")
+    args = parser.parse_args()
+
+    pages = [
+        (name, [b for b in page.blocks if isinstance(b, Drawing)])
+        for name, page in iter_fixture_pages()
+    ]
+    pages.sort(key=lambda item: sum(len(d.items or ()) for d in item[1]))
+    rows: list[tuple[str, int, float, float]] = []
+    for (name, drawings), (_, other) in zip(
+        pages[-args.pages :], pages[-args.pages - 1 : -1], strict=True
+    ):
+        copies = [d.model_copy() for d in drawings]
+
+        def run(
+            drawings: list[Drawing] = drawings,
+            copies: list[Drawing] = copies,
+            other: list[Drawing] = other,
+        ) -> None:
+            _membership(drawings, copies, other)
+
+        with _by_value():
+            by_value = best_of(run, repeat=args.repeat)
+        fast = best_of(run, repeat=args.repeat)
+        rows.append((name, len(drawings), by_value, fast))
+
+    print_comparison(
+        "Drawing set/dict membership (densest paths)", rows, "by value", "id/bbox"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Per-fixture performance budgets for the classifier golden fixtures.
+
+The golden tests check what the classifier produces for each fixture page,
+not how long it takes, so a change that makes one page 50x slower still
+passes. The budget file ``fixtures/performance_budget.json`` records, for
+every ``*_raw.json`` fixture:
+
+- the time `classify_elements` takes, in *calibration units*: multiples of
+  the time a fixed pure-Python workload (`calibrate`) takes on the same
+  machine, so budgets recorded on a laptop hold on a CI runner, and
+- the number of candidates per label. A candidate explosion is usually
+  what precedes a slowdown in `ClassificationResult.build`, and unlike
+  timings the counts are deterministic.
+
+`tests/performance_budget_test.py` checks the fixtures against the budget.
+To record a new budget after an intended change:
+
+    pants run src/build_a_long/pdf_extract/benchmarks/budget_benchmark.py -- \\
+        --update
+"""
+
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from build_a_long.pdf_extract.benchmarks.timing import best_of
+from build_a_long.pdf_extract.classifier import ClassificationResult
+from build_a_long.pdf_extract.classifier.classifier import classify_elements
+from build_a_long.pdf_extract.extractor import PageData
+from build_a_long.pdf_extract.extractor.bbox import BBox
+from build_a_long.pdf_extract.fixtures import (
+    FIXTURES_DIR,
+    extract_element_id,
+    load_classifier_config,
+    load_raw_fixture,
+)
+
+BUDGET_PATH = FIXTURES_DIR / "performance_budget.json"
+
+DEFAULT_TIME_FACTOR = 3.0
+"""How many times its budget a page may take before it fails."""
+
+DEFAULT_CANDIDATE_FACTOR = 1.5
+"""How many times its budgeted candidates a label may produce."""
+
+CANDIDATE_SLACK = 5
+"""Extra candidates always allowed, so small counts can move a little."""
+
+MIN_UNITS = 0.25
+"""Budgets below this are raised to it; tiny timings are mostly noise."""
+
+
+class FixtureBudget(BaseModel):
+    """The budget for one fixture page.
+
+    Attributes:
+        units: Classification time in calibration units
+        candidates: Number of candidates per label
+    """
+
+    units: float
+    candidates: dict[str, int] = Field(default_factory=dict)
+
+
+class PerformanceBudget(BaseModel):
+    """The checked-in budget for every fixture.
+
+    Attributes:
+        calibration_seconds: `calibrate()` on the machine that recorded the
+            budget, for reference only
+        fixtures: Budget per fixture file name
+    """
+
+    calibration_seconds: float
+    fixtures: dict[str, FixtureBudget] = Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path = BUDGET_PATH) -> PerformanceBudget:
+        """Load the budget file."""
+        return cls.model_validate_json(path.read_text())
+
+    def save(self, path: Path = BUDGET_PATH) -> None:
+        """Write the budget file."""
+        path.write_text(self.model_dump_json(indent=2) + "\n")
+
+
+def _calibration_workload() -> float:
+    # Bbox geometry and small-object churn, like most of classification
+    boxes = [BBox(i % 37, i % 23, i % 37 + 10, i % 23 + 7) for i in range(120)]
+    total = 0.0
+    for a in boxes:
+        for b in boxes:
+            total += a.iou(b)
+    return total
+
+
+def calibrate(repeat: int = 7) -> float:
+    """Return the best time, in seconds, of a fixed pure-Python workload."""
+    return best_of(_calibration_workload, repeat=repeat)
+
+
+def load_fixture(fixture_file: str) -> tuple[PageData, ClassificationResult]:
+    """Load a fixture's page and classify it as the golden tests do."""
+    extraction = load_raw_fixture(fixture_file)
+    page = extraction.pages[0]
+    config = load_classifier_config(extract_element_id(fixture_file))
+    return page, classify_elements(page, config)
+
+
+def candidate_counts(result: ClassificationResult) -> dict[str, int]:
+    """Return the number of candidates per label, for labels that have any."""
+    return {
+        label: len(candidates)
+        for label, candidates in sorted(result.get_all_candidates().items())
+        if candidates
+    }
+
+
+def measure_fixture(
+    fixture_file: str, calibration_seconds: float, repeat: int = 3
+) -> FixtureBudget:
+    """Measure a fixture's classification time and candidate counts."""
+    page, result = load_fixture(fixture_file)
+    config = load_classifier_config(extract_element_id(fixture_file))
+    seconds = best_of(lambda: classify_elements(page, config), repeat=repeat)
+    return FixtureBudget(
+        units=round(seconds / calibration_seconds, 3),
+        candidates=candidate_counts(result),
+    )
+
+
+def time_violation(
+    measured_units: float, budget: FixtureBudget, factor: float
+) -> str | None:
+    """Describe how a measured time exceeds its budget, or return None."""
+    allowed = max(budget.units, MIN_UNITS) * factor
+    if measured_units <= allowed:
+        return None
+    return (
+        f"took {measured_units:.2f} calibration units, budget is "
+        f"{budget.units:.2f} (limit {allowed:.2f} at {factor}x)"
+    )
+
+
+def candidate_violations(
+    counts: dict[str, int], budget: FixtureBudget, factor: float
+) -> list[str]:
+    """Describe every label whose candidate count exceeds its budget."""
+    violations = []
+    for label, count in counts.items():
+        budgeted = budget.candidates.get(label, 0)
+        allowed = math.ceil(budgeted * factor) + CANDIDATE_SLACK
+        if count > allowed:
+            violations.append(
+                f"{label}: {count} candidates, budget is {budgeted} (limit {allowed})"
+            )
+    return violations
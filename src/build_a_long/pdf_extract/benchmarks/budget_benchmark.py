@@ -0,0 +1,81 @@
+"""Compare the golden fixtures against their performance budget, or update it.
+
+Measures every ``*_raw.json`` fixture as `budget` describes and prints its
+time (in calibration units) and candidate count next to the checked-in
+budget. With ``--update`` the measurements become the new budget.
+
+Usage:
+    pants run src/build_a_long/pdf_extract/benchmarks/budget_benchmark.py
+    pants run src/build_a_long/pdf_extract/benchmarks/budget_benchmark.py -- \\
+        --update
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+
+from build_a_long.pdf_extract.benchmarks.budget import (
+    BUDGET_PATH,
+    DEFAULT_CANDIDATE_FACTOR,
+    DEFAULT_TIME_FACTOR,
+    PerformanceBudget,
+    calibrate,
+    candidate_violations,
+    measure_fixture,
+    time_violation,
+)
+from build_a_long.pdf_extract.fixtures import RAW_FIXTURE_FILES
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--update", action="store_true", help=f"Rewrite {BUDGET_PATH.name}."
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timing rounds.")
+    parser.add_argument("--factor", type=float, default=DEFAULT_TIME_FACTOR)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    calibration = calibrate()
+    budget = PerformanceBudget.load() if BUDGET_PATH.exists() else None
+    measured = {
+        name: measure_fixture(name, calibration, repeat=args.repeat)
+        for name in RAW_FIXTURE_FILES
+    }
+
+    print(f"Calibration: {calibration * 1000:.2f}ms")
+    header = (
+        f"{'fixture':<32} {'budget':>8} {'units':>8} {'ratio':>6} "
+        f"{'cands':>6} {'budget':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    failures = 0
+    for name, m in measured.items():
+        b = budget.fixtures.get(name) if budget else None
+        total = sum(m.candidates.values())
+        if b is None:
+            print(f"{name:<32} {'-':>8} {m.units:>8.2f} {'-':>6} {total:>6} {'-':>6}")
+            continue
+        problems = candidate_violations(m.candidates, b, DEFAULT_CANDIDATE_FACTOR)
+        if (problem := time_violation(m.units, b, args.factor)) is not None:
+            problems.insert(0, problem)
+        print(
+            f"{name:<32} {b.units:>8.2f} {m.units:>8.2f} "
+            f"{m.units / b.units:>5.1f}x {total:>6} {sum(b.candidates.values()):>6}"
+        )
+        for problem in problems:
+            print(f"  ! {problem}")
+        failures += bool(problems)
+
+    if args.update:
+        PerformanceBudget(calibration_seconds=calibration, fixtures=measured).save()
+        print(f"\nWrote {BUDGET_PATH}")
+        return 0
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+"""Benchmark computing the visible (clipped) bbox of every drawing on a page.
+
+LEGO manuals nest clip groups deeply. This benchmark builds synthetic
+``get_drawings(extended=True)`` output with a given clip nesting depth and
+times computing the visible bbox of every drawing two ways:
+
+- the original `ClipStackTracker`, which intersected each drawing with every
+  clip on the stack (a new `BBox` per clip), plus the extra
+  `BBox.from_rect` `extract_drawing_blocks` built for its debug log, and
+- `visible_rects`, which keeps the running intersection of the stack and
+  clips all drawings in one NumPy pass.
+
+Both produce identical bboxes; the benchmark checks that before timing.
+
+Usage:
+    pants run src/build_a_long/pdf_extract/benchmarks/clip_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+
+import pymupdf
+
+from build_a_long.pdf_extract.benchmarks.timing import best_of, print_comparison
+from build_a_long.pdf_extract.extractor.bbox import BBox
+from build_a_long.pdf_extract.extractor.clip import visible_rects
+
+
+def _synthetic_drawings(count: int, depth: int, seed: int = 0) -> list[dict]:
+    """Return drawings in groups nested `depth` clips deep."""
+    rng = random.Random(seed)
+    drawings: list[dict] = []
+    while len(drawings) < count:
+        # A group of nested clips, each slightly inside the previous one,
+        # followed by a few paths inside the innermost clip
+        x, y = rng.uniform(0, 500), rng.uniform(0, 700)
+        for level in range(depth):
+            inset = level * 1.5
+            drawings.append(
+                {
+                    "type": "clip",
+                    "level": level,
+                    "scissor": pymupdf.Rect(
+                        x + inset, y + inset, x + 100 - inset, y + 100 - inset
+                    ),
+                }
+            )
+        for _ in range(rng.randint(1, 8)):
+            px, py = x + rng.uniform(-20, 90), y + rng.uniform(-20, 90)
+            drawings.append(
+                {
+                    "type": "f",
+                    "level": depth,
+                    "rect": pymupdf.Rect(px, py, px + 30, py + 30),
+                }
+            )
+    return drawings[:count]
+
+
+def _per_clip_visible_bboxes(drawings: list[dict]) -> list[BBox | None]:
+    """The original per-drawing, per-clip intersection."""
+    stack: list[tuple[int, BBox]] = []
+    result: list[BBox | None] = []
+    for d in drawings:
+        level = d.get("level", 0)
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        if d.get("type") == "clip":
+            scissor = d["scissor"]
+            stack.append((level, BBox.from_tuple(tuple(scissor))))
+            continue
+        if not d["rect"]:
+            continue
+        bbox = BBox.from_rect(d["rect"])
+        visible = bbox
+        for _, clip in stack:
+            visible = visible.intersect(clip)
+        BBox.from_rect(d["rect"])  # Rebuilt for the debug log
+        result.append(visible)
+    return result
+
+
+def _cumulative_visible_bboxes(drawings: list[dict]) -> list[BBox | None]:
+    return [
+        BBox.from_tuple(rects[1])
+        for rects in visible_rects(drawings)  # type: ignore[arg-type]
+        if rects is not None
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drawings", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds.")
+    args = parser.parse_args()
+
+    rows: list[tuple[str, int, float, float]] = []
+    for depth in (1, 4, 8, 16, 32):
+        drawings = _synthetic_drawings(args.drawings, depth)
+        expected = _per_clip_visible_bboxes(drawings)
+        assert _cumulative_visible_bboxes(drawings) == expected
+        per_clip = best_of(
+            lambda d=drawings: _per_clip_visible_bboxes(d), repeat=args.repeat
+        )
+        cumulative = best_of(
+            lambda d=drawings: _cumulative_visible_bboxes(d), repeat=args.repeat
+        )
+        rows.append((f"clip depth {depth}", len(expected), per_clip, cumulative))
+
+    print_comparison(
+        "Visible drawing bboxes (synthetic pages)", rows, "per clip", "cumulative"
+    )
+
+
+if __name__ == "__main__":
+    main()
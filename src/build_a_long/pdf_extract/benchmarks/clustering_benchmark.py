@@ -0,0 +1,127 @@
+"""Benchmark connected-component clustering of overlapping images.
+
+Replays the diagram build loop (take each unconsumed image as a seed, flood
+fill through overlapping unconsumed images, consume the cluster) two ways:
+
+- the original approach, which rebuilds the unconsumed image list and runs a
+  quadratic flood fill for every build, and
+- a per-page `OverlapGraph` built once and walked with a live "unconsumed"
+  predicate, as `DiagramClassifier` now does.
+
+Runs on the fixture pages with the most images and on synthetic pages made of
+many overlapping image fragments.
+
+Usage:
+    pants run src/build_a_long/pdf_extract/benchmarks/clustering_benchmark.py
+"""
+
+import argparse
+import random
+
+from build_a_long.pdf_extract.benchmarks.timing import (
+    best_of,
+    iter_fixture_pages,
+    print_comparison,
+)
+from build_a_long.pdf_extract.extractor.bbox import BBox
+from build_a_long.pdf_extract.extractor.page_blocks import Image
+from build_a_long.pdf_extract.extractor.spatial_index import OverlapGraph
+
+
+def _reference_cluster(seed: Image, candidates: list[Image]) -> list[Image]:
+    """The original quadratic flood fill from `build_connected_cluster`."""
+    remaining = set(range(len(candidates)))
+    start = next(i for i, c in enumerate(candidates) if c is seed)
+    remaining.discard(start)
+    cluster = {start}
+    to_process = [start]
+    while to_process:
+        current = candidates[to_process.pop()].bbox.expand(1e-6)
+        for idx in list(remaining):
+            if candidates[idx].bbox.overlaps(current):
+                cluster.add(idx)
+                to_process.append(idx)
+                remaining.discard(idx)
+    return [candidates[i] for i in sorted(cluster)]
+
+
+def _build_all_reference(images: list[Image]) -> list[list[Image]]:
+    consumed: set[int] = set()
+    clusters = []
+    for seed in images:
+        if seed.id in consumed:
+            continue
+        unclaimed = [b for b in images if b.id not in consumed]
+        cluster = _reference_cluster(seed, unclaimed)
+        consumed.update(b.id for b in cluster)
+        clusters.append(cluster)
+    return clusters
+
+
+def _build_all_indexed(images: list[Image]) -> list[list[Image]]:
+    consumed: set[int] = set()
+    graph = OverlapGraph(images)
+    clusters = []
+    for seed in images:
+        if seed.id in consumed:
+            continue
+        cluster = graph.cluster(seed, available=lambda b: b.id not in consumed)
+        consumed.update(b.id for b in cluster)
+        clusters.append(cluster)
+    return clusters
+
+
+def _synthetic_images(n: int, seed: int = 0) -> list[Image]:
+    """Generate a page of small image fragments grouped into diagrams."""
+    rng = random.Random(seed)
+    images: list[Image] = []
+    while len(images) < n:
+        # Each diagram is a blob of overlapping fragments around a centre
+        cx, cy = rng.uniform(0, 550), rng.uniform(0, 490)
+        for _ in range(rng.randint(5, 40)):
+            x0, y0 = cx + rng.uniform(-40, 40), cy + rng.uniform(-40, 40)
+            w, h = rng.uniform(2, 20), rng.uniform(2, 20)
+            images.append(Image(id=len(images), bbox=BBox(x0, y0, x0 + w, y0 + h)))
+    rng.shuffle(images)
+    return images[:n]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5, help="Fixture pages to use.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing rounds.")
+    args = parser.parse_args()
+
+    fixture_cases = [
+        (name, [b for b in page.blocks if isinstance(b, Image)])
+        for name, page in iter_fixture_pages()
+    ]
+    fixture_cases.sort(key=lambda case: len(case[1]), reverse=True)
+    cases = fixture_cases[: args.pages]
+    for n in (500, 2000, 5000):
+        cases.append((f"synthetic fragments ({n})", _synthetic_images(n)))
+
+    rows = []
+    for name, images in cases:
+        assert _build_all_indexed(images) == _build_all_reference(images), (
+            f"mismatch on {name}"
+        )
+        rows.append(
+            (
+                name,
+                len(images),
+                best_of(lambda i=images: _build_all_reference(i), args.repeat),
+                best_of(lambda i=images: _build_all_indexed(i), args.repeat),
+            )
+        )
+
+    print_comparison(
+        "Diagram image clustering (all builds on a page)",
+        rows,
+        baseline="rebuild + BFS",
+        optimized="overlap graph",
+    )
+
+
+if __name__ == "__main__":
+    main()
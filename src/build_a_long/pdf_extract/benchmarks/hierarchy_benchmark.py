@@ -0,0 +1,78 @@
+"""Benchmark the containment hierarchy builder.
+
+Compares the reference O(n²) parent search with the grid-indexed one used by
+`build_hierarchy_from_blocks`, on the densest fixture pages and on synthetic
+pages with thousands of nested boxes.
+
+Usage:
+    pants run src/build_a_long/pdf_extract/benchmarks/hierarchy_benchmark.py
+"""
+
+import argparse
+import random
+
+from build_a_long.pdf_extract.benchmarks.timing import (
+    best_of,
+    densest_fixture_pages,
+    print_comparison,
+)
+from build_a_long.pdf_extract.extractor.hierarchy import (
+    _find_parents_brute_force,
+    _find_parents_indexed,
+)
+
+type _Rect = tuple[float, float, float, float]
+
+
+def _synthetic_page(n: int, seed: int = 0) -> list[_Rect]:
+    """Generate a dense page of nested boxes, similar to a busy step page."""
+    rng = random.Random(seed)
+    rects: list[_Rect] = [(0.0, 0.0, 552.8, 496.1)]
+    while len(rects) < n:
+        # Pick an existing box and put a smaller one somewhere inside it
+        x0, y0, x1, y1 = rng.choice(rects)
+        w = (x1 - x0) * rng.uniform(0.05, 0.6)
+        h = (y1 - y0) * rng.uniform(0.05, 0.6)
+        nx0 = rng.uniform(x0, x1 - w)
+        ny0 = rng.uniform(y0, y1 - h)
+        rects.append((nx0, ny0, nx0 + w, ny0 + h))
+    rng.shuffle(rects)
+    return rects
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5, help="Fixture pages to use.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing rounds.")
+    args = parser.parse_args()
+
+    cases: list[tuple[str, list[_Rect]]] = []
+    for name, page in densest_fixture_pages(args.pages):
+        rects = [(b.bbox.x0, b.bbox.y0, b.bbox.x1, b.bbox.y1) for b in page.blocks]
+        cases.append((name, rects))
+    for n in (500, 2000, 5000):
+        cases.append((f"synthetic nested ({n})", _synthetic_page(n)))
+
+    rows = []
+    for name, rects in cases:
+        expected = _find_parents_brute_force(rects)
+        assert _find_parents_indexed(rects) == expected, f"mismatch on {name}"
+        rows.append(
+            (
+                name,
+                len(rects),
+                best_of(lambda r=rects: _find_parents_brute_force(r), args.repeat),
+                best_of(lambda r=rects: _find_parents_indexed(r), args.repeat),
+            )
+        )
+
+    print_comparison(
+        "Containment hierarchy parent search",
+        rows,
+        baseline="brute force",
+        optimized="indexed",
+    )
+
+
+if __name__ == "__main__":
+    main()
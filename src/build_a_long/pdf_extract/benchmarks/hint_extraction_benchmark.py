@@ -0,0 +1,112 @@
+"""Benchmark the hint pass over every page of a PDF.
+
+`main.py` reads the text of every page of a manual to build font size and
+page hints, even when only a few pages are classified. This benchmark times
+that pass two ways:
+
+- the original text-only `Extractor.extract_page_data`, which builds a
+  `Text` block per span, then the block filters over those blocks, and
+- `Extractor.extract_page_text`, which keeps each span's text, font and bbox
+  as columns, then `filter_page_text` over the columns.
+
+Both are timed end to end (including PyMuPDF's `get_text`) and with each
+page's `get_text` output cached, to show the cost this side of PyMuPDF. Both
+produce identical hints; the benchmark checks that before timing.
+
+Usage:
+    pants run src/build_a_long/pdf_extract/benchmarks/hint_extraction_benchmark.py \
+        -- path/to/manual.pdf
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+from pathlib import Path
+
+import pymupdf
+
+from build_a_long.pdf_extract.benchmarks.timing import best_of, print_comparison
+from build_a_long.pdf_extract.classifier.block_filter import (
+    filter_duplicate_blocks,
+    filter_overlapping_text_blocks,
+    filter_page_text,
+)
+from build_a_long.pdf_extract.classifier.pages.page_hint_collection import (
+    PageHintCollection,
+)
+from build_a_long.pdf_extract.classifier.text import FontSizeHints
+from build_a_long.pdf_extract.extractor import PageData
+from build_a_long.pdf_extract.extractor.extractor import Extractor
+
+
+def _block_hints(
+    pages: list[pymupdf.Page],
+) -> tuple[FontSizeHints, PageHintCollection]:
+    hint_pages: list[PageData] = []
+    for page_num, page in enumerate(pages, start=1):
+        page_data = Extractor(page, page_num).extract_page_data(include_types={"text"})
+        kept, _ = filter_overlapping_text_blocks(page_data.blocks)
+        kept, _ = filter_duplicate_blocks(kept)
+        hint_pages.append(
+            PageData(page_number=page_num, bbox=page_data.bbox, blocks=kept)
+        )
+    return FontSizeHints.from_pages(hint_pages), PageHintCollection.from_pages(
+        hint_pages
+    )
+
+
+def _columnar_hints(
+    pages: list[pymupdf.Page],
+) -> tuple[FontSizeHints, PageHintCollection]:
+    hint_pages = [
+        filter_page_text(Extractor(page, page_num).extract_page_text())
+        for page_num, page in enumerate(pages, start=1)
+    ]
+    return FontSizeHints.from_pages(hint_pages), PageHintCollection.from_pages(
+        hint_pages
+    )
+
+
+def _cache_get_text(pages: list[pymupdf.Page]) -> None:
+    """Make each page's `get_text` return the same (cached) result."""
+    for page in pages:
+        page.get_text = functools.cache(page.get_text)  # type: ignore[method-assign]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", type=Path, nargs="+", help="PDFs to time.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing rounds.")
+    args = parser.parse_args()
+
+    end_to_end: list[tuple[str, int, float, float]] = []
+    cached: list[tuple[str, int, float, float]] = []
+    for path in args.pdfs:
+        with pymupdf.open(path) as doc:
+            pages = list(doc)
+            assert _block_hints(pages) == _columnar_hints(pages)
+            end_to_end.append(
+                (
+                    path.name,
+                    len(pages),
+                    best_of(lambda p=pages: _block_hints(p), repeat=args.repeat),
+                    best_of(lambda p=pages: _columnar_hints(p), repeat=args.repeat),
+                )
+            )
+            _cache_get_text(pages)
+            cached.append(
+                (
+                    path.name,
+                    len(pages),
+                    best_of(lambda p=pages: _block_hints(p), repeat=args.repeat),
+                    best_of(lambda p=pages: _columnar_hints(p), repeat=args.repeat),
+                )
+            )
+
+    print_comparison("Hint pass (end to end)", end_to_end, "blocks", "columns")
+    print_comparison("Hint pass (get_text cached)", cached, "blocks", "columns")
+
+
+if __name__ == "__main__":
+    main()
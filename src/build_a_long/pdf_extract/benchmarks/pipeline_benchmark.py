@@ -0,0 +1,358 @@
+"""End-to-end pipeline benchmark over the raw fixture corpus.
+
+Runs every ``fixtures/*_raw.json(.bz2)`` document through `classify_pages`,
+as the CLI does, timing each stage separately:
+
+- ``load``: decompress and parse the raw JSON
+- ``filter``: filtering duplicate blocks (`filter_overlapping_text_blocks`,
+  `filter_duplicate_blocks`), on the pages to classify and the hint pages
+- ``hints``: building the font size and page hints
+- ``prepare``: the rest of `classify_pages` outside classifying single
+  pages, e.g. the text histogram
+- ``score``: every classifier's ``score()`` (also broken down per label)
+- ``build``: building the page and checking the classification invariants
+- ``validation``: `validate_results` over the document
+- ``serialize``: building the `Manual` and serializing it to JSON
+
+Filtering, hints, scoring and building times come from the classifier's
+own instrumentation (`classify_pages(..., instrument=True)`), and per-page
+latency from its ``page_context`` hook. The report gives per-page latency
+as p50/p95/max, the slowest pages and the peak RSS of the process. Pages
+that fail to build or fail the classification invariants abort
+`classify_pages`; they are listed and the rest of the document is
+classified again without them, rather than aborting the run. With
+``--compact`` each page's result is compacted once classified, as the CLI
+does in production runs, so the RSS of both modes can be compared.
+
+The report is JSON so it can be stored and compared. ``--compare`` flags
+every metric that got slower than the stored baseline by more than
+``--threshold`` and exits non-zero if there are any.
+
+Usage:
+    pants run src/build_a_long/pdf_extract/benchmarks/pipeline_benchmark.py -- \\
+        --output baseline.json
+    pants run src/build_a_long/pdf_extract/benchmarks/pipeline_benchmark.py -- \\
+        --compare baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import resource
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from build_a_long.pdf_extract.classifier import (
+    classify_pages,
+)
+from build_a_long.pdf_extract.cli.io import open_compressed
+from build_a_long.pdf_extract.extractor import ExtractionResult
+from build_a_long.pdf_extract.fixtures import FIXTURES_DIR
+from build_a_long.pdf_extract.validation.runner import validate_results
+
+REPORT_VERSION = 3
+
+STAGES = (
+    "load",
+    "filter",
+    "hints",
+    "prepare",
+    "score",
+    "build",
+    "validation",
+    "serialize",
+)
+
+_SLOWEST_PAGES = 10
+
+
+@dataclass
+class _Recorder:
+    """Accumulates timings for one pass over the corpus."""
+
+    stages: dict[str, float] = field(default_factory=lambda: dict.fromkeys(STAGES, 0))
+    labels: dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    pages: dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    failures: dict[str, str] = field(default_factory=dict)
+
+    @contextmanager
+    def stage(self, name: str, page: str | None = None) -> Iterator[None]:
+        """Time a block of code, charging it to a stage and optionally a page."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] += elapsed
+            if page is not None:
+                self.pages[page] += elapsed
+
+
+def fixture_paths(fixtures_dir: Path = FIXTURES_DIR) -> list[Path]:
+    """Return every raw fixture document, per-page and whole-document."""
+    return sorted(fixtures_dir.glob("*_raw.json")) + sorted(
+        fixtures_dir.glob("*_raw.json.bz2")
+    )
+
+
+class _PageTimer:
+    """A `classify_pages` ``page_context`` that times each page.
+
+    Also records the page that aborted the batch, if any.
+    """
+
+    def __init__(self) -> None:
+        self.seconds: dict[int, float] = {}
+        self.failed: tuple[int, str] | None = None
+
+    @contextmanager
+    def __call__(self, page_number: int) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        except (AssertionError, ValueError) as e:
+            self.failed = (page_number, f"{type(e).__name__}: {e}".splitlines()[0])
+            raise
+        finally:
+            self.seconds[page_number] = time.perf_counter() - start
+
+
+def _run_document(path: Path, rec: _Recorder, *, compact: bool = False) -> int:
+    """Run one fixture document through the pipeline. Returns pages classified."""
+    with rec.stage("load"), open_compressed(path, "rb") as f:
+        pages = ExtractionResult.model_validate_json(f.read()).pages
+    multi = len(pages) > 1
+
+    def page_name(page_number: int) -> str:
+        return f"{path.name}#p{page_number}" if multi else path.name
+
+    failed: set[int] = set()
+    while True:
+        timer = _PageTimer()
+        start = time.perf_counter()
+        try:
+            batch = classify_pages(
+                [p for p in pages if p.page_number not in failed],
+                pages_for_hints=pages,
+                instrument=True,
+                compact=compact,
+                page_context=timer,
+            )
+        except AssertionError, ValueError:
+            # Some fixture pages hit known classifier bugs; record them and
+            # time the rest of the document without them.
+            if timer.failed is None:
+                raise
+            page_number, error = timer.failed
+            rec.failures[page_name(page_number)] = error
+            failed.add(page_number)
+            continue
+        elapsed = time.perf_counter() - start
+        break
+
+    assert batch.stats is not None
+    filter_seconds = batch.stats.stages.get("filter", 0.0)
+    hints_seconds = batch.stats.stages.get("hints", 0.0)
+    rec.stages["filter"] += filter_seconds
+    rec.stages["hints"] += hints_seconds
+    rec.stages["prepare"] += (
+        elapsed - sum(timer.seconds.values()) - filter_seconds - hints_seconds
+    )
+    for page_number, seconds in timer.seconds.items():
+        rec.pages[page_name(page_number)] += seconds
+    for page in batch.stats.pages:
+        score = 0.0
+        for label, stats in page.labels.items():
+            rec.labels[label] += stats.score_seconds
+            score += stats.score_seconds
+        rec.stages["score"] += score
+        rec.stages["build"] += page.seconds - score
+
+    with rec.stage("validation"):
+        validate_results(batch)
+    with rec.stage("serialize"):
+        batch.manual.to_json(indent=2)
+    return len(batch.stats.pages)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of ``values`` (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil without floats
+    return ordered[int(rank) - 1]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_benchmark(
+    paths: list[Path], repeat: int = 1, *, compact: bool = False
+) -> dict[str, Any]:
+    """Run the corpus ``repeat`` times and return the JSON report.
+
+    Every timing is the best across the repetitions, which filters out most
+    scheduling noise.
+
+    Args:
+        paths: Fixture documents to run.
+        repeat: Number of passes over the corpus.
+        compact: Compact each page's result once it is classified.
+    """
+    best: _Recorder | None = None
+    page_count = 0
+    for _ in range(repeat):
+        rec = _Recorder()
+        page_count = sum(_run_document(path, rec, compact=compact) for path in paths)
+        if best is None:
+            best = rec
+            continue
+        for name, t in rec.stages.items():
+            best.stages[name] = min(best.stages[name], t)
+        for name, t in rec.labels.items():
+            best.labels[name] = min(best.labels[name], t)
+        for name, t in rec.pages.items():
+            best.pages[name] = min(best.pages[name], t)
+    assert best is not None
+
+    page_times = list(best.pages.values())
+    slowest = sorted(best.pages.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "version": REPORT_VERSION,
+        "python": platform.python_version(),
+        "documents": len(paths),
+        "pages": page_count,
+        "compact": compact,
+        "stages": dict(best.stages),
+        "labels": dict(sorted(best.labels.items())),
+        "page_latency": {
+            "p50": percentile(page_times, 50),
+            "p95": percentile(page_times, 95),
+            "max": max(page_times, default=0.0),
+        },
+        "slowest_pages": dict(slowest[:_SLOWEST_PAGES]),
+        "peak_rss_mb": _peak_rss_mb(),
+        "failures": best.failures,
+    }
+
+
+def _metrics(report: dict[str, Any]) -> dict[str, float]:
+    """Flatten the comparable metrics of a report."""
+    metrics: dict[str, float] = {}
+    for name, t in report["stages"].items():
+        metrics[f"stage.{name}"] = t
+    for name, t in report["labels"].items():
+        metrics[f"label.{name}"] = t
+    for name, t in report["page_latency"].items():
+        metrics[f"page.{name}"] = t
+    metrics["peak_rss_mb"] = report["peak_rss_mb"]
+    return metrics
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    *,
+    threshold: float = 1.25,
+    min_delta: float = 0.005,
+) -> list[tuple[str, float, float]]:
+    """Return the metrics that regressed against the baseline.
+
+    A metric regresses when it is more than ``threshold`` times its baseline
+    value and the absolute difference exceeds ``min_delta`` (seconds, or MB
+    for memory), so tiny stages don't flag on noise.
+
+    Returns:
+        (metric, baseline value, current value) for each regression.
+    """
+    base = _metrics(baseline)
+    regressions = []
+    for name, value in _metrics(current).items():
+        if name not in base:
+            continue
+        before = base[name]
+        if value > before * threshold and value - before > min_delta:
+            regressions.append((name, before, value))
+    return regressions
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(f"{report['documents']} documents, {report['pages']} pages")
+    for name, t in report["stages"].items():
+        print(f"  {name:<12} {t * 1000:>10.1f}ms")
+    latency = report["page_latency"]
+    print(
+        f"  per page: p50 {latency['p50'] * 1000:.1f}ms, "
+        f"p95 {latency['p95'] * 1000:.1f}ms, max {latency['max'] * 1000:.1f}ms"
+    )
+    print(f"  peak RSS: {report['peak_rss_mb']:.0f} MB")
+    if report["failures"]:
+        print(f"  {len(report['failures'])} page(s) failed to classify")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--match", default="", help="Only run fixtures whose name contains this."
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Timing rounds.")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Compact each page's result once classified, as production runs do.",
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    parser.add_argument(
+        "--compare", type=Path, help="Baseline report to check for regressions."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Slowdown ratio that counts as a regression (default: 1.25).",
+    )
+    args = parser.parse_args()
+    # Validation warnings about known edge cases would drown the report.
+    logging.basicConfig(level=logging.ERROR)
+
+    paths = [p for p in fixture_paths() if args.match in p.name]
+    report = run_benchmark(paths, repeat=args.repeat, compact=args.compact)
+    _print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.compare is None:
+        return 0
+    baseline = json.loads(args.compare.read_text())
+    if baseline.get("version") != REPORT_VERSION:
+        print(
+            f"{args.compare} is a version {baseline.get('version')} report, "
+            f"expected version {REPORT_VERSION}; regenerate it with --output"
+        )
+        return 2
+    regressions = compare_reports(baseline, report, threshold=args.threshold)
+    if not regressions:
+        print(f"No regressions against {args.compare}")
+        return 0
+    print(f"{len(regressions)} regression(s) against {args.compare}:")
+    for name, before, after in regressions:
+        ratio = f"{after / before:.2f}x" if before > 0 else "new"
+        print(f"  {name:<40} {before:>10.4f} -> {after:>10.4f} ({ratio})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Tests for the pipeline benchmark's report helpers."""
+
+from typing import Any
+
+from build_a_long.pdf_extract.benchmarks.pipeline_benchmark import (
+    REPORT_VERSION,
+    STAGES,
+    compare_reports,
+    percentile,
+)
+
+
+def _report(
+    stage_seconds: float = 1.0,
+    *,
+    score: float | None = None,
+    labels: dict[str, float] | None = None,
+    p95: float = 0.05,
+    peak_rss_mb: float = 500.0,
+) -> dict[str, Any]:
+    stages = dict.fromkeys(STAGES, stage_seconds)
+    if score is not None:
+        stages["score"] = score
+    return {
+        "version": REPORT_VERSION,
+        "stages": stages,
+        "labels": labels or {"step": 0.2},
+        "page_latency": {"p50": 0.01, "p95": p95, "max": 0.5},
+        "peak_rss_mb": peak_rss_mb,
+    }
+
+
+class TestPercentile:
+    def test_empty(self) -> None:
+        assert percentile([], 50) == 0.0
+
+    def test_single_value(self) -> None:
+        assert percentile([3.0], 50) == 3.0
+        assert percentile([3.0], 95) == 3.0
+
+    def test_nearest_rank(self) -> None:
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 100) == 100.0
+
+    def test_rounds_rank_up(self) -> None:
+        # 95% of 10 values is rank 9.5, so the 10th value
+        values = [float(v) for v in range(10)]
+        assert percentile(values, 95) == 9.0
+        assert percentile(values, 50) == 4.0
+
+    def test_unsorted_input(self) -> None:
+        assert percentile([5.0, 1.0, 3.0, 2.0, 4.0], 50) == 3.0
+
+
+class TestCompareReports:
+    def test_identical_reports(self) -> None:
+        assert compare_reports(_report(), _report()) == []
+
+    def test_flags_slowdown(self) -> None:
+        regressions = compare_reports(_report(score=1.0), _report(score=2.0))
+        assert regressions == [("stage.score", 1.0, 2.0)]
+
+    def test_flags_label_and_latency_slowdowns(self) -> None:
+        regressions = compare_reports(
+            _report(labels={"step": 0.2, "page": 0.1}),
+            _report(labels={"step": 0.5, "page": 0.1}, p95=0.1),
+        )
+        assert regressions == [("label.step", 0.2, 0.5), ("page.p95", 0.05, 0.1)]
+
+    def test_flags_memory_growth(self) -> None:
+        regressions = compare_reports(
+            _report(peak_rss_mb=500.0), _report(peak_rss_mb=700.0)
+        )
+        assert regressions == [("peak_rss_mb", 500.0, 700.0)]
+
+    def test_ignores_noise_below_threshold(self) -> None:
+        assert compare_reports(_report(score=1.0), _report(score=1.2)) == []
+
+    def test_ignores_tiny_absolute_changes(self) -> None:
+        # 3x slower, but only by 2ms
+        assert compare_reports(_report(score=0.001), _report(score=0.003)) == []
+
+    def test_ignores_speedups(self) -> None:
+        assert compare_reports(_report(score=2.0), _report(score=1.0)) == []
+
+    def test_ignores_new_metrics(self) -> None:
+        regressions = compare_reports(
+            _report(labels={"step": 0.2}),
+            _report(labels={"step": 0.2, "new_label": 5.0}),
+        )
+        assert regressions == []
+
+    def test_custom_threshold(self) -> None:
+        assert compare_reports(_report(score=1.0), _report(score=1.2), threshold=1.1)
@@ -0,0 +1,171 @@
+"""Benchmark proximity grouping in TriviaTextClassifier and OpenBagClassifier.
+
+Scores both classifiers on the fixture pages with the most blocks (info and
+inventory pages, including those `classify_pages` skips) two ways:
+
+- the original pairwise implementations: every pair of text blocks for trivia
+  grouping, every visual for each text group, and every visual against every
+  bag circle, and
+- the spatial-grid versions (`proximity_groups`, `SpatialGrid.neighbours`
+  and the shared per-page `small_visuals_grid`) the classifiers now use.
+
+Both produce identical candidates; the benchmark checks that before timing.
+
+Usage:
+    pants run src/build_a_long/pdf_extract/benchmarks/proximity_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+from contextlib import ExitStack
+from unittest import mock
+
+from build_a_long.pdf_extract.benchmarks.timing import (
+    best_of,
+    densest_fixture_pages,
+    print_comparison,
+)
+from build_a_long.pdf_extract.classifier import ClassificationResult, ClassifierConfig
+from build_a_long.pdf_extract.classifier.bags import OpenBagClassifier
+from build_a_long.pdf_extract.classifier.pages.trivia_text_classifier import (
+    TriviaTextClassifier,
+)
+from build_a_long.pdf_extract.extractor import PageData
+from build_a_long.pdf_extract.extractor.bbox import BBox, filter_by_max_area
+from build_a_long.pdf_extract.extractor.page_blocks import Blocks, Drawing, Image, Text
+
+
+def _small_visuals(result: ClassificationResult) -> list[Drawing | Image]:
+    visuals: list[Drawing | Image] = [
+        b for b in result.page_data.blocks if isinstance(b, Drawing | Image)
+    ]
+    return filter_by_max_area(
+        visuals, max_ratio=0.5, reference_bbox=result.page_data.bbox
+    )
+
+
+def _pairwise_cluster_text_blocks(
+    self: TriviaTextClassifier, blocks: list[Text], margin: float
+) -> list[list[Text]]:
+    parent = list(range(len(blocks)))
+
+    def find(x: int) -> int:
+        if parent[x] != x:
+            parent[x] = find(parent[x])
+        return parent[x]
+
+    for i in range(len(blocks)):
+        for j in range(i + 1, len(blocks)):
+            bbox_i = blocks[i].bbox.expand(margin)
+            bbox_j = blocks[j].bbox.expand(margin)
+            if bbox_i.overlaps(bbox_j):
+                pi, pj = find(i), find(j)
+                if pi != pj:
+                    parent[pi] = pj
+    groups: dict[int, list[Text]] = {}
+    for i, block in enumerate(blocks):
+        groups.setdefault(find(i), []).append(block)
+    return list(groups.values())
+
+
+def _linear_find_related_visuals(
+    self: TriviaTextClassifier, text_bbox: BBox, result: ClassificationResult
+) -> list[Drawing | Image]:
+    expanded_bbox = text_bbox.expand(20.0)
+    return [
+        block
+        for block in _small_visuals(result)
+        if expanded_bbox.contains(block.bbox) or text_bbox.iou(block.bbox) > 0.1
+    ]
+
+
+def _pairwise_assign_blocks_to_circles(
+    self: OpenBagClassifier, circles: list[Drawing], result: ClassificationResult
+) -> dict[int, list[Blocks]]:
+    circle_info = [(id(c), c.bbox.expand(2.0), c.draw_order) for c in circles]
+    assignments: dict[int, list[Blocks]] = {id(c): [] for c in circles}
+    for block in _small_visuals(result):
+        containing = [
+            (circle_id, order)
+            for circle_id, expanded, order in circle_info
+            if expanded.contains(block.bbox)
+            and not (
+                block.draw_order is not None
+                and order is not None
+                and block.draw_order > order
+            )
+        ]
+        if containing:
+            containing.sort(key=lambda x: (x[1] is None, x[1] or 0))
+            assignments[containing[0][0]].append(block)
+    return assignments
+
+
+def _pairwise() -> ExitStack:
+    """Patch both classifiers back to their pairwise implementations."""
+    stack = ExitStack()
+    for target, name, replacement in (
+        (TriviaTextClassifier, "_cluster_text_blocks", _pairwise_cluster_text_blocks),
+        (TriviaTextClassifier, "_find_related_visuals", _linear_find_related_visuals),
+        (
+            OpenBagClassifier,
+            "_assign_blocks_to_circles",
+            _pairwise_assign_blocks_to_circles,
+        ),
+    ):
+        stack.enter_context(mock.patch.object(target, name, replacement))
+    return stack
+
+
+def _score(page: PageData, config: ClassifierConfig) -> list[tuple]:
+    """Score both classifiers on a fresh result; return comparable candidates."""
+    result = ClassificationResult(page_data=page)
+    for classifier in (
+        TriviaTextClassifier(config=config),
+        OpenBagClassifier(config=config),
+    ):
+        classifier.score(result)
+    return [
+        (c.label, c.bbox, [b.id for b in c.source_blocks])
+        for label in ("trivia_text", "open_bag")
+        for c in result.get_candidates(label)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=8, help="Fixture pages to use.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing rounds.")
+    args = parser.parse_args()
+
+    config = ClassifierConfig()
+    rows = []
+    for name, page in densest_fixture_pages(args.pages):
+        with _pairwise():
+            expected = _score(page, config)
+        assert _score(page, config) == expected, f"mismatch on {name}"
+
+        with _pairwise():
+            baseline = best_of(lambda p=page: _score(p, config), args.repeat)
+        optimized = best_of(lambda p=page: _score(p, config), args.repeat)
+        rows.append((name, len(page.blocks), baseline, optimized))
+
+    rows.append(
+        (
+            "total",
+            sum(r[1] for r in rows),
+            sum(r[2] for r in rows),
+            sum(r[3] for r in rows),
+        )
+    )
+    print_comparison(
+        "Trivia text + open bag scoring on the densest pages",
+        rows,
+        baseline="pairwise",
+        optimized="spatial grid",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark per-classifier scoring time, with and without compiled rule plans.
+
+Runs the scoring phase of every classifier over the densest fixture pages and
+reports the total time spent in each classifier's ``score()``. The baseline
+disables type-filter hoisting, so every rule-based classifier evaluates its
+rules against every block on the page as it used to. Both runs share the
+per-page values cached in `RuleContext`.
+
+Usage:
+    pants run src/build_a_long/pdf_extract/benchmarks/rule_scoring_benchmark.py
+"""
+
+import argparse
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from unittest import mock
+
+from build_a_long.pdf_extract.benchmarks.timing import (
+    densest_fixture_pages,
+    print_comparison,
+)
+from build_a_long.pdf_extract.classifier import ClassificationResult, ClassifierConfig
+from build_a_long.pdf_extract.classifier.classifier import Classifier
+from build_a_long.pdf_extract.classifier.rule_based_classifier import (
+    RuleBasedClassifier,
+)
+from build_a_long.pdf_extract.classifier.rules import Rule, RulePlan
+from build_a_long.pdf_extract.extractor import PageData
+
+
+def _unhoisted_plan(rules: Sequence[Rule]) -> RulePlan:
+    return RulePlan(rules=tuple(rules), block_type=None, hoisted=None)
+
+
+def _score_times(classifier: Classifier, pages: list[PageData]) -> dict[str, float]:
+    """Return the total scoring time per classifier over all pages."""
+    totals: dict[str, float] = defaultdict(float)
+    for page in pages:
+        result = ClassificationResult(page_data=page)
+        for label_classifier in classifier.classifiers:
+            start = time.perf_counter()
+            label_classifier.score(result)
+            totals[type(label_classifier).__name__] += time.perf_counter() - start
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20, help="Fixture pages to use.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing rounds.")
+    args = parser.parse_args()
+
+    pages = [page for _, page in densest_fixture_pages(args.pages)]
+    classifier = Classifier(ClassifierConfig())
+    rule_based = {
+        type(c).__name__
+        for c in classifier.classifiers
+        if isinstance(c, RuleBasedClassifier)
+    }
+
+    baseline: dict[str, float] = {}
+    planned: dict[str, float] = {}
+    for _ in range(args.repeat):
+        with mock.patch.object(RulePlan, "compile", _unhoisted_plan):
+            for name, t in _score_times(classifier, pages).items():
+                baseline[name] = min(baseline.get(name, t), t)
+        for name, t in _score_times(classifier, pages).items():
+            planned[name] = min(planned.get(name, t), t)
+
+    rows = [
+        (name + (" *" if name in rule_based else ""), len(pages), baseline[name], t)
+        for name, t in planned.items()
+    ]
+    rows.sort(key=lambda row: row[2], reverse=True)
+    rows.append(
+        (
+            "total",
+            len(pages),
+            sum(baseline.values()),
+            sum(planned.values()),
+        )
+    )
+    print_comparison(
+        f"Scoring time per classifier over {len(pages)} pages (* rule-based)",
+        rows,
+        baseline="all blocks",
+        optimized="rule plan",
+    )
+
+
+if __name__ == "__main__":
+    main()
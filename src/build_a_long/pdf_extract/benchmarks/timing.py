@@ -0,0 +1,78 @@
+"""Shared helpers for the benchmark scripts."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from build_a_long.pdf_extract.cli.io import load_extraction
+from build_a_long.pdf_extract.extractor import PageData
+from build_a_long.pdf_extract.fixtures import FIXTURES_DIR
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5, number: int = 1) -> float:
+    """Return the best average wall time per call, in seconds.
+
+    Args:
+        fn: Zero-argument callable to time.
+        repeat: Number of timing rounds; the fastest round is reported.
+        number: Calls per round.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def iter_fixture_pages(
+    fixtures_dir: Path = FIXTURES_DIR,
+) -> Iterator[tuple[str, PageData]]:
+    """Yield (name, page) for every page in the raw fixtures.
+
+    Names look like ``6509377_page_013_raw.json`` for per-page fixtures and
+    ``6509377_raw.json.bz2#p13`` for pages of whole-document fixtures.
+    """
+    paths = sorted(fixtures_dir.glob("*_raw.json")) + sorted(
+        fixtures_dir.glob("*_raw.json.bz2")
+    )
+    for path in paths:
+        extraction = load_extraction(path)
+        multi = len(extraction.pages) > 1
+        for page in extraction.pages:
+            name = f"{path.name}#p{page.page_number}" if multi else path.name
+            yield name, page
+
+
+def densest_fixture_pages(count: int) -> list[tuple[str, PageData]]:
+    """Return the `count` fixture pages with the most blocks."""
+    pages = list(iter_fixture_pages())
+    pages.sort(key=lambda item: len(item[1].blocks), reverse=True)
+    return pages[:count]
+
+
+def print_comparison(
+    title: str, rows: list[tuple[str, int, float, float]], baseline: str, optimized: str
+) -> None:
+    """Print a table of (case, size, baseline seconds, optimized seconds).
+
+    Args:
+        title: Heading printed above the table.
+        rows: One row per benchmark case.
+        baseline: Column name for the reference implementation.
+        optimized: Column name for the new implementation.
+    """
+    print(title)
+    header = f"{'case':<40} {'n':>6} {baseline:>12} {optimized:>12} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for case, size, base_s, opt_s in rows:
+        speedup = base_s / opt_s if opt_s > 0 else float("inf")
+        print(
+            f"{case:<40} {size:>6} {base_s * 1000:>10.2f}ms "
+            f"{opt_s * 1000:>10.2f}ms {speedup:>7.1f}x"
+        )
+    print()
@@ -65,10 +65,12 @@ from .candidate import Candidate
 from .classification_result import ClassificationResult
 from .classifier import Classifier, classify_elements, classify_pages
 from .classifier_config import ClassifierConfig
+from .instrumentation import ClassificationStats, LabelStats, PageStats
 from .label_classifier import LabelClassifier
 from .removal_reason import RemovalReason
 from .score import Score, Weight
 from .text import FontSizeHints, TextHistogram
+from .tracing import PageTrace, TraceRecord
 
 PageType = Page.PageType
 
@@ -80,14 +82,18 @@ __all__ = [
     "Candidate",
     "Classifier",
     "ClassificationResult",
+    "ClassificationStats",
     "ClassifierConfig",
     "DiagramClassifier",
     "FontSizeHints",
     "LabelClassifier",
+    "LabelStats",
     "LoosePartSymbolClassifier",
     "OpenBagClassifier",
     "PageHint",
     "PageHintCollection",
+    "PageStats",
+    "PageTrace",
     "PageType",
     "RemovalReason",
     "Score",
@@ -105,6 +111,7 @@ __all__ = [
     "ProgressBarClassifier",
     "ProgressBarIndicatorClassifier",
     "TextHistogram",
+    "TraceRecord",
     "Weight",
 ]
 
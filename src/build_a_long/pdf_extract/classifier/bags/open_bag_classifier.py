@@ -40,7 +40,6 @@ from build_a_long.pdf_extract.classifier.label_classifier import (
 from build_a_long.pdf_extract.classifier.score import Score, Weight, find_best_scoring
 from build_a_long.pdf_extract.extractor.bbox import (
     BBox,
-    filter_by_max_area,
     filter_contained,
 )
 from build_a_long.pdf_extract.extractor.lego_page_elements import (
@@ -84,8 +83,7 @@ def _is_circular_drawing(drawing: Drawing, min_size: float = 100.0) -> bool:
         return False
 
     # Count bezier curves ('c' type items) - circles have 4+ curves
-    curve_count = sum(1 for item in drawing.items if item[0] == "c")
-    return curve_count >= 4
+    return drawing.items.count_command("c") >= 4
 
 
 class _OpenBagScore(Score):
@@ -174,9 +172,7 @@ class OpenBagClassifier(LabelClassifier):
 
         # Pre-compute block assignments for all circles
         # This ensures blocks are assigned to the correct circle when circles overlap
-        block_assignments = self._assign_blocks_to_circles(
-            circle_drawings, page_data.blocks, page_bbox
-        )
+        block_assignments = self._assign_blocks_to_circles(circle_drawings, result)
 
         # Process each circle as a potential bag icon
         for circle in circle_drawings:
@@ -222,8 +218,7 @@ class OpenBagClassifier(LabelClassifier):
     def _assign_blocks_to_circles(
         self,
         circles: list[Drawing],
-        blocks: list[Blocks],
-        page_bbox: BBox,
+        result: ClassificationResult,
     ) -> dict[int, list[Blocks]]:
         """Assign blocks to circles based on spatial containment and draw order.
 
@@ -231,57 +226,50 @@ class OpenBagClassifier(LabelClassifier):
         the closest higher draw_order (i.e., the circle drawn immediately after
         the block). This ensures blocks are consumed by the correct circle.
 
+        Only drawings and images are considered, excluding large blocks
+        (likely backgrounds) covering more than 50% of the page.
+
         Args:
             circles: List of circular drawings (potential bag icons).
-            blocks: All blocks on the page.
-            page_bbox: The page bounding box for size comparison.
+            result: The classification result for the page.
 
         Returns:
             Dictionary mapping circle id() to list of blocks assigned to it.
         """
-        # Only consider drawings and images
-        drawing_image_blocks: list[Blocks] = [
-            b for b in blocks if isinstance(b, Drawing | Image)
-        ]
-
-        # Filter out large blocks (likely backgrounds) - >50% of page size
-        small_blocks = filter_by_max_area(
-            drawing_image_blocks, max_ratio=0.5, reference_bbox=page_bbox
-        )
+        if not circles:
+            return {}
+        grid = result.index.grid((Drawing, Image), max_ratio=0.5)
 
-        # Build a mapping of circle id to its expanded bbox and draw_order
-        circle_info: list[tuple[int, BBox, int | None]] = []
+        # For each block, the circles that contain it and are drawn after it,
+        # in circle order
+        containing: dict[int, list[tuple[int, int | None]]] = {}
         for circle in circles:
             # Expand circle bbox slightly to catch blocks on the edge
             expanded_bbox = circle.bbox.expand(2.0)
-            circle_info.append((id(circle), expanded_bbox, circle.draw_order))
-
-        # Initialize result dictionary
-        result: dict[int, list[Blocks]] = {id(c): [] for c in circles}
-
-        # Assign each block to the appropriate circle
-        for block in small_blocks:
-            block_draw_order = block.draw_order
-
-            # Find all circles that contain this block and have higher draw_order
-            containing_circles: list[tuple[int, int | None]] = []
-            for circle_id, expanded_bbox, circle_draw_order in circle_info:
+            circle_draw_order = circle.draw_order
+            for idx in grid.overlapping(expanded_bbox):
+                block = grid.items[idx]
                 # Check if block is spatially contained in circle
                 if not expanded_bbox.contains(block.bbox):
                     continue
 
                 # Block must be drawn before the circle (lower draw_order)
                 if (
-                    block_draw_order is not None
+                    block.draw_order is not None
                     and circle_draw_order is not None
-                    and block_draw_order > circle_draw_order
+                    and block.draw_order > circle_draw_order
                 ):
                     continue
 
-                containing_circles.append((circle_id, circle_draw_order))
+                containing.setdefault(idx, []).append((id(circle), circle_draw_order))
 
-            if not containing_circles:
-                continue
+        # Initialize result dictionary
+        assignments: dict[int, list[Blocks]] = {id(c): [] for c in circles}
+
+        # Assign each block to the appropriate circle, in page order
+        for idx in sorted(containing):
+            block = grid.items[idx]
+            containing_circles = containing[idx]
 
             # If block is contained by multiple circles, assign to the one
             # with the closest (smallest) draw_order that's still >= block's
@@ -295,19 +283,19 @@ class OpenBagClassifier(LabelClassifier):
                 )
                 best_circle_id = containing_circles[0][0]
 
-            result[best_circle_id].append(block)
+            assignments[best_circle_id].append(block)
 
             if len(containing_circles) > 1:
                 log.debug(
                     "[open_bag] Block %s (draw_order=%s) contained by %d circles, "
                     "assigned to circle with draw_order=%s",
                     block.bbox,
-                    block_draw_order,
+                    block.draw_order,
                     len(containing_circles),
                     containing_circles[0][1],
                 )
 
-        return result
+        return assignments
 
     def _score_circle(
         self,
@@ -7,6 +7,7 @@ from pydantic import BaseModel
 from build_a_long.pdf_extract.classifier.classification_result import (
     ClassificationResult,
 )
+from build_a_long.pdf_extract.classifier.instrumentation import ClassificationStats
 from build_a_long.pdf_extract.classifier.text import TextHistogram
 from build_a_long.pdf_extract.extractor.lego_page_elements import Manual
 
@@ -25,6 +26,9 @@ class BatchClassificationResult(BaseModel):
     histogram: TextHistogram
     """Global text histogram computed across all pages"""
 
+    stats: ClassificationStats | None = None
+    """Per-label timings and counters, if classification was instrumented"""
+
     @property
     def manual(self) -> Manual:
         """Construct a Manual from the classification results.
@@ -15,6 +15,7 @@ from build_a_long.pdf_extract.classifier.classification_result import (
     ClassificationResult,
 )
 from build_a_long.pdf_extract.classifier.removal_reason import RemovalReason
+from build_a_long.pdf_extract.extractor import PageText
 from build_a_long.pdf_extract.extractor.bbox import BBox, filter_contained
 from build_a_long.pdf_extract.extractor.page_blocks import (
     Block,
@@ -23,6 +24,7 @@ from build_a_long.pdf_extract.extractor.page_blocks import (
     Image,
     Text,
 )
+from build_a_long.pdf_extract.extractor.pymupdf_types import RectLikeTuple
 
 logger = logging.getLogger(__name__)
 
@@ -284,6 +286,95 @@ def remove_similar_bboxes(
                 )
 
 
+def _overlapped_texts(
+    texts: Sequence[str], bboxes: Sequence[RectLikeTuple]
+) -> dict[int, int]:
+    """Find texts sharing an origin with a longer text.
+
+    Texts are grouped by origin (x0, y0, y1), rounded to 0.5 points. In each
+    group the longest text (or widest bbox as tiebreaker, then the first)
+    is kept.
+
+    Returns:
+        Maps the index of each overlapped text to the index of the kept one,
+        in index order within each group.
+    """
+    tolerance = 0.5
+    groups: dict[tuple[float, float, float], list[int]] = defaultdict(list)
+    for i, (x0, y0, _, y1) in enumerate(bboxes):
+        key = (
+            round(x0 / tolerance) * tolerance,
+            round(y0 / tolerance) * tolerance,
+            round(y1 / tolerance) * tolerance,
+        )
+        groups[key].append(i)
+
+    overlapped: dict[int, int] = {}
+    for group in groups.values():
+        if len(group) > 1:
+            best = max(
+                group, key=lambda i: (len(texts[i]), bboxes[i][2] - bboxes[i][0])
+            )
+            for i in group:
+                if i != best:
+                    overlapped[i] = best
+    return overlapped
+
+
+def filter_page_text(page: PageText) -> PageText:
+    """Filter a page's text spans as `classify_pages` filters its blocks.
+
+    The columnar equivalent of `filter_overlapping_text_blocks` followed by
+    `filter_duplicate_blocks`, keeping exactly the spans those keep for the
+    page's Text blocks. Used to build hints from `PageText` pages.
+
+    Args:
+        page: The text spans of a page.
+
+    Returns:
+        A PageText with overlapping and duplicate spans removed, preserving
+        order.
+    """
+    overlapped = _overlapped_texts(page.texts, page.bboxes)
+    kept = [i for i in range(len(page)) if i not in overlapped]
+
+    # Duplicates must have the same text, so only spans whose text repeats
+    # need comparing, and only with each other
+    by_text: dict[str, list[int]] = defaultdict(list)
+    for i in kept:
+        by_text[page.texts[i]].append(i)
+
+    IOU_THRESHOLD = 0.9  # As in filter_duplicate_blocks
+    removed: set[int] = set()
+    for same_text in by_text.values():
+        if len(same_text) < 2:
+            continue
+        bboxes = [BBox.from_tuple(page.bboxes[i]) for i in same_text]
+        parent = list(range(len(same_text)))
+
+        def find(i: int, parent: list[int] = parent) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for a in range(len(same_text)):
+            for b in range(a + 1, len(same_text)):
+                if bboxes[a].iou(bboxes[b]) >= IOU_THRESHOLD:
+                    root_a, root_b = find(a), find(b)
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+
+        groups: dict[int, list[int]] = defaultdict(list)
+        for a in range(len(same_text)):
+            groups[find(a)].append(a)
+        for group in groups.values():
+            best = max(group, key=lambda a: bboxes[a].area)
+            removed.update(same_text[a] for a in group if a != best)
+
+    return page.take([i for i in kept if i not in removed])
+
+
 def filter_overlapping_text_blocks(
     blocks: Sequence[Blocks],
 ) -> tuple[list[Blocks], dict[Blocks, RemovalReason]]:
@@ -330,48 +421,30 @@ def filter_overlapping_text_blocks(
     if len(text_blocks) <= 1:
         return list(blocks), {}
 
-    # Group text blocks by origin (x0, y0, y1) with tolerance
-    tolerance = 0.5
-
-    def origin_key(block: Text) -> tuple[float, float, float]:
-        return (
-            round(block.bbox.x0 / tolerance) * tolerance,
-            round(block.bbox.y0 / tolerance) * tolerance,
-            round(block.bbox.y1 / tolerance) * tolerance,
-        )
-
-    groups: dict[tuple[float, float, float], list[tuple[int, Text]]] = defaultdict(list)
-    for idx, block in zip(text_indices, text_blocks, strict=True):
-        key = origin_key(block)
-        groups[key].append((idx, block))
-
-    # For each group, keep the block with the longest text
+    # Map removed blocks to the kept block
     removed_mapping: dict[Blocks, RemovalReason] = {}
     removed_text_indices: set[int] = set()
 
-    for blocks_in_group in groups.values():
-        if len(blocks_in_group) > 1:
-            # Find the block with the longest text (or widest bbox as tiebreaker)
-            best_idx, best_block = max(
-                blocks_in_group,
-                key=lambda ib: (len(ib[1].text), ib[1].bbox.width),
-            )
-
-            # Map removed blocks to the kept block
-            for idx, block in blocks_in_group:
-                if idx != best_idx:
-                    removed_text_indices.add(idx)
-                    removed_mapping[block] = RemovalReason(
-                        reason_type="overlapping_text", target_block=best_block
-                    )
-                    logger.debug(
-                        "Filtered overlapping text at origin (%.1f, %.1f): "
-                        "kept %r, removed %r",
-                        best_block.bbox.x0,
-                        best_block.bbox.y0,
-                        best_block.text,
-                        block.text,
-                    )
+    overlapped = _overlapped_texts(
+        [block.text for block in text_blocks],
+        [
+            (block.bbox.x0, block.bbox.y0, block.bbox.x1, block.bbox.y1)
+            for block in text_blocks
+        ],
+    )
+    for i, best_i in overlapped.items():
+        block, best_block = text_blocks[i], text_blocks[best_i]
+        removed_text_indices.add(text_indices[i])
+        removed_mapping[block] = RemovalReason(
+            reason_type="overlapping_text", target_block=best_block
+        )
+        logger.debug(
+            "Filtered overlapping text at origin (%.1f, %.1f): kept %r, removed %r",
+            best_block.bbox.x0,
+            best_block.bbox.y0,
+            best_block.text,
+            block.text,
+        )
 
     # Rebuild the block list preserving original order
     result = [b for i, b in enumerate(blocks) if i not in removed_text_indices]
@@ -4,8 +4,10 @@ from build_a_long.pdf_extract.classifier.block_filter import (
     filter_background_blocks,
     filter_duplicate_blocks,
     filter_overlapping_text_blocks,
+    filter_page_text,
 )
 from build_a_long.pdf_extract.classifier.removal_reason import RemovalReason
+from build_a_long.pdf_extract.extractor import PageData, PageText
 from build_a_long.pdf_extract.extractor.bbox import BBox
 from build_a_long.pdf_extract.extractor.page_blocks import Drawing, Image, Text
 
@@ -390,3 +392,50 @@ class TestFilterOverlappingTextBlocks:
         # Should keep the one with the widest bbox (id=2, width=25)
         assert kept[0].id == 2
         assert isinstance(kept[0], Text) and kept[0].text == "CD"
+
+
+class TestFilterPageText:
+    """Tests for the filter_page_text function."""
+
+    def test_matches_block_filters(self) -> None:
+        """Test it keeps the same spans as the block filters keep Text blocks."""
+        blocks = [
+            # Overlapping text at the same origin: keeps "43"
+            Text(id=1, bbox=BBox(100.0, 200.0, 110.0, 220.0), text="4"),
+            Text(id=2, bbox=BBox(100.2, 200.1, 125.0, 220.2), text="43"),
+            # Drop shadow chain: keeps the largest of the three
+            Text(id=3, bbox=BBox(10, 10, 50, 30), text="2x"),
+            Text(id=4, bbox=BBox(10.2, 10.2, 50.4, 30.4), text="2x"),
+            Text(id=5, bbox=BBox(10.4, 10.4, 50.8, 30.8), text="2x"),
+            # Similar bbox, different text: both kept
+            Text(id=6, bbox=BBox(300, 300, 340, 320), text="A"),
+            Drawing(id=7, bbox=BBox(300, 300, 340, 320)),
+            Text(id=8, bbox=BBox(301, 300, 341, 320), text="B"),
+            # Same text far apart: both kept
+            Text(id=9, bbox=BBox(400, 10, 420, 30), text="2x"),
+        ]
+        page = PageData(page_number=1, bbox=BBox(0, 0, 612, 792), blocks=blocks)
+
+        kept, _ = filter_overlapping_text_blocks(blocks)
+        kept, _ = filter_duplicate_blocks(kept)
+        expected = PageText.from_page_data(
+            PageData(page_number=1, bbox=page.bbox, blocks=kept)
+        )
+
+        result = filter_page_text(PageText.from_page_data(page))
+
+        assert result == expected
+        assert result.texts == ["43", "2x", "A", "B", "2x"]
+        assert result.bboxes[1] == (10.4, 10.4, 50.8, 30.8)
+
+    def test_empty_page(self) -> None:
+        """Test with no spans returns no spans."""
+        page = PageText(
+            page_number=1,
+            bbox=BBox(0, 0, 100, 100),
+            texts=[],
+            font_names=[],
+            font_sizes=[],
+            bboxes=[],
+        )
+        assert len(filter_page_text(page)) == 0
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
-import logging
-from collections.abc import Sequence
+from collections.abc import Callable, Hashable, Iterable, Sequence
 from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
 from build_a_long.pdf_extract.classifier.candidate import Candidate
+from build_a_long.pdf_extract.classifier.instrumentation import PageStats
+from build_a_long.pdf_extract.classifier.page_index import PageIndex
 from build_a_long.pdf_extract.classifier.removal_reason import RemovalReason
+from build_a_long.pdf_extract.classifier.tracing import PageTrace
+from build_a_long.pdf_extract.extractor.bbox import BBox
 from build_a_long.pdf_extract.extractor.extractor import PageData
 from build_a_long.pdf_extract.extractor.lego_page_elements import (
     LegoPageElements,
@@ -20,8 +23,6 @@ from build_a_long.pdf_extract.extractor.page_blocks import Blocks
 if TYPE_CHECKING:
     from build_a_long.pdf_extract.classifier.label_classifier import LabelClassifier
 
-log = logging.getLogger(__name__)
-
 # Score key can be either a single Block or a tuple of Blocks (for pairings)
 ScoreKey = Blocks | tuple[Blocks, ...]
 
@@ -54,6 +55,35 @@ class _BuildSnapshot(BaseModel):
     consumed_blocks: set[int]
 
 
+class ScoreCheckpoint(BaseModel):
+    """The scored candidates of a page, before anything was built.
+
+    Taken by `ClassificationResult.checkpoint_scores` and restored by
+    `ClassificationResult.restore_scores`, so a page can be built again
+    (e.g. with a different config) without scoring it again.
+    """
+
+    model_config = {"frozen": True}
+
+    candidates: dict[str, list[Candidate]]
+    # Each candidate with the bbox and source blocks it was scored with,
+    # which building may change
+    scored_states: list[tuple[Candidate, BBox, tuple[Blocks, ...]]]
+
+
+class CompactedResult(BaseModel):
+    """What remains of a page's result after `ClassificationResult.compact`."""
+
+    page: Page | None
+    """The constructed Page, if classification produced one."""
+
+    unconsumed_count: int
+    """Blocks neither removed nor consumed (see count_unconsumed_blocks)."""
+
+    block_labels: dict[int, str]
+    """Block id to the label of its best constructed candidate (see get_label)."""
+
+
 class ClassificationResult(BaseModel):
     """Result of classifying a single page.
 
@@ -115,8 +145,29 @@ class ClassificationResult(BaseModel):
     Public for serialization. Prefer using get_* accessor methods.
     """
 
+    stats: PageStats | None = Field(default=None, exclude=True)
+    """Timings and counters for this page, if instrumentation is enabled.
+
+    Not serialized with the rest of the result.
+    """
+
+    trace: PageTrace | None = Field(default=None, exclude=True)
+    """Decision trace for this page, if tracing is enabled.
+
+    Hot paths must check this before computing any trace payload. See
+    `build_a_long.pdf_extract.classifier.tracing`.
+    """
+
+    compacted: CompactedResult | None = Field(default=None, exclude=True)
+    """Set by `compact()`, which discards the candidates.
+
+    Not serialized with the rest of the result.
+    """
+
     _classifiers: dict[str, LabelClassifier] = PrivateAttr(default_factory=dict)
     _consumed_blocks: set[int] = PrivateAttr(default_factory=set)
+    _memo: dict[Hashable, Any] = PrivateAttr(default_factory=dict)
+    _index: PageIndex | None = PrivateAttr(default=None)
 
     @model_validator(mode="after")
     def validate_unique_block_ids(self) -> ClassificationResult:
@@ -162,16 +213,42 @@ class ClassificationResult(BaseModel):
         Returns:
             List of unconsumed blocks, optionally filtered by type
         """
-        # TODO I wonder if in future we should track unconsumed blocks
-        # separately for performance if this becomes a bottleneck.
-        unconsumed = [
-            block
-            for block in self.page_data.blocks
-            if block.id not in self._consumed_blocks
-        ]
-        if block_filter is not None:
-            unconsumed = [b for b in unconsumed if isinstance(b, block_filter)]
-        return unconsumed
+        return self.index.unconsumed(block_filter, self._consumed_blocks)
+
+    @property
+    def index(self) -> PageIndex:
+        """Block partitions and geometry caches for this page.
+
+        Built on first use and shared by every classifier on the page, and
+        rebuilt if `page_data` is replaced. See
+        `build_a_long.pdf_extract.classifier.page_index`.
+        """
+        if self._index is None or self._index.page_data is not self.page_data:
+            self._index = PageIndex(self.page_data)
+        return self._index
+
+    def memoize[T](self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Return a per-page derived value, computing it on first use.
+
+        Classifiers are stateless, so expensive structures derived from the
+        page (e.g. spatial indexes over a block type) are cached here and
+        shared by every classifier working on this page.
+
+        The value must depend only on `page_data`, which never changes, and
+        on `key` itself (e.g. the bboxes a matrix was computed from). State
+        that changes during build (such as consumed blocks) must be checked
+        at query time instead of being baked into the cached value.
+
+        Args:
+            key: Unique key for the derived value, e.g. a name or a tuple.
+            factory: Called with no arguments to compute the value.
+
+        Returns:
+            The cached value for `key`.
+        """
+        if key not in self._memo:
+            self._memo[key] = factory()
+        return self._memo[key]
 
     def _register_classifier(self, label: str, classifier: LabelClassifier) -> None:
         """Register a classifier for a specific label.
@@ -201,18 +278,11 @@ class ClassificationResult(BaseModel):
         if not classifier:
             raise ValueError(f"No classifier registered for label '{label}'")
 
-        log.debug(
-            "[build_all] Starting build_all for '%s' on page %s",
-            label,
-            self.page_data.page_number,
-        )
+        if self.trace is not None:
+            self.trace.record("build_all.start", label=label)
         result = classifier.build_all(self)
-        log.debug(
-            "[build_all] Completed build_all for '%s' on page %s: built %d elements",
-            label,
-            self.page_data.page_number,
-            len(result),
-        )
+        if self.trace is not None:
+            self.trace.record("build_all.done", label=label, built=len(result))
         return result
 
     def build(self, candidate: Candidate, **kwargs: Any) -> LegoPageElements:
@@ -243,6 +313,13 @@ class ClassificationResult(BaseModel):
         if candidate.constructed:
             return candidate.constructed
 
+        if self.stats is not None:
+            with self.stats.build(candidate.label):
+                return self._build(candidate, **kwargs)
+        return self._build(candidate, **kwargs)
+
+    def _build(self, candidate: Candidate, **kwargs: Any) -> LegoPageElements:
+        """Construct a candidate that has not been constructed yet."""
         if candidate.failure_reason:
             raise CandidateFailedError(
                 candidate, f"Candidate failed: {candidate.failure_reason}"
@@ -255,12 +332,8 @@ class ClassificationResult(BaseModel):
         if not classifier:
             raise ValueError(f"No classifier registered for label '{candidate.label}'")
 
-        log.debug(
-            "[build] Starting build for '%s' at %s on page %s",
-            candidate.label,
-            candidate.bbox,
-            self.page_data.page_number,
-        )
+        if self.trace is not None:
+            self.trace.record("build.start", label=candidate.label, bbox=candidate.bbox)
 
         # Take snapshot before building for automatic rollback on failure
         snapshot = self._take_snapshot()
@@ -276,40 +349,42 @@ class ClassificationResult(BaseModel):
                 b for b in candidate.source_blocks if b not in original_source_blocks
             ]
             if new_blocks:
-                log.debug(
-                    "[build] Classifier added %d blocks during build for '%s': %s",
-                    len(new_blocks),
-                    candidate.label,
-                    [b.id for b in new_blocks],
-                )
+                if self.trace is not None:
+                    self.trace.record(
+                        "build.added_blocks",
+                        label=candidate.label,
+                        blocks=[b.id for b in new_blocks],
+                    )
                 self._check_blocks_not_consumed(candidate, new_blocks)
 
             # Sync candidate bbox with constructed element's bbox.
             # The constructed element may have a different bbox (e.g., Step's
             # bbox includes diagram which is only determined at build time).
-            if candidate.bbox != element.bbox:
-                log.debug(
-                    "[build] Updating candidate bbox from %s to %s - "
-                    "This indicate the bbox changed between score and build, "
-                    "and may indicate a classification bug",
-                    candidate.bbox,
-                    element.bbox,
+            # A changed bbox may indicate a classification bug.
+            if self.trace is not None and candidate.bbox != element.bbox:
+                self.trace.record(
+                    "build.bbox_changed",
+                    label=candidate.label,
+                    scored=candidate.bbox,
+                    built=element.bbox,
                 )
             candidate.bbox = element.bbox
 
             # Mark blocks as consumed
-            log.debug(
-                "[build] Marking %d blocks as consumed for '%s' at %s: %s",
-                len(candidate.source_blocks),
-                candidate.label,
-                candidate.bbox,
-                [b.id for b in candidate.source_blocks],
-            )
+            if self.trace is not None:
+                self.trace.record(
+                    "build.consume",
+                    label=candidate.label,
+                    bbox=candidate.bbox,
+                    blocks=[b.id for b in candidate.source_blocks],
+                )
 
             self._assert_no_duplicate_source_blocks(candidate)
 
             for block in candidate.source_blocks:
                 self._consumed_blocks.add(block.id)
+                if self._index is not None:
+                    self._index.mark_consumed(block.id)
 
             # Fail other candidates that use these blocks
             self._fail_conflicting_candidates(candidate)
@@ -317,27 +392,22 @@ class ClassificationResult(BaseModel):
             return element
         except CandidateFailedError as e:
             # A nested candidate failed - rollback and check if we can retry
-            self._restore_snapshot(snapshot)
-
-            # If the failed candidate has a "Replaced by reduced candidate" reason,
-            # we may be able to find the replacement and the caller can retry
-            failed_candidate = e.candidate
-            if (
-                failed_candidate.failure_reason
-                and "Replaced by reduced candidate" in failed_candidate.failure_reason
-            ):
-                # The failed candidate was replaced - caller should retry with
-                # new candidates available
-                log.debug(
-                    "[build] Nested candidate %s (%s) was replaced, "
-                    "propagating for retry",
-                    failed_candidate.label,
-                    failed_candidate.bbox,
+            self._restore_snapshot(snapshot, candidate.label)
+
+            # If the failed candidate was replaced by a reduced candidate, the
+            # caller may find the replacement and retry
+            if self.trace is not None:
+                self.trace.record(
+                    "build.rollback",
+                    label=candidate.label,
+                    failed_label=e.candidate.label,
+                    failed_bbox=e.candidate.bbox,
+                    reason=e.candidate.failure_reason,
                 )
             raise
         except Exception:
             # Rollback all changes made during this build
-            self._restore_snapshot(snapshot)
+            self._restore_snapshot(snapshot, candidate.label)
             raise
 
     def _take_snapshot(self) -> _BuildSnapshot:
@@ -352,8 +422,15 @@ class ClassificationResult(BaseModel):
             consumed_blocks=self._consumed_blocks.copy(),
         )
 
-    def _restore_snapshot(self, snapshot: _BuildSnapshot) -> None:
-        """Restore candidate states and consumed blocks from a snapshot."""
+    def _restore_snapshot(self, snapshot: _BuildSnapshot, label: str) -> None:
+        """Restore candidate states and consumed blocks from a snapshot.
+
+        Args:
+            snapshot: The state to restore.
+            label: Label of the candidate whose build is being rolled back.
+        """
+        if self.stats is not None:
+            self.stats.label(label).rollbacks += 1
         # Restore candidate states
         for candidates in self.candidates.values():
             for c in candidates:
@@ -363,6 +440,8 @@ class ClassificationResult(BaseModel):
 
         # Restore consumed blocks
         self._consumed_blocks = snapshot.consumed_blocks.copy()
+        if self._index is not None:
+            self._index.reset_unconsumed()
 
     def _check_blocks_not_consumed(
         self, candidate: Candidate, blocks: list[Blocks]
@@ -445,12 +524,14 @@ class ClassificationResult(BaseModel):
                     f"conflicting={sorted(conflicting_block_ids)})"
                 )
                 candidate.failure_reason = failure_reason
-                log.debug(
-                    "[conflict] '%s' at %s failed: %s",
-                    label,
-                    candidate.bbox,
-                    failure_reason,
-                )
+                if self.trace is not None:
+                    self.trace.record(
+                        "conflict.lost",
+                        label=label,
+                        bbox=candidate.bbox,
+                        winner=winner.label,
+                        conflicting=sorted(conflicting_block_ids),
+                    )
 
     def _validate_block_in_page_data(
         self, block: Blocks | None, param_name: str = "block"
@@ -464,7 +545,14 @@ class ClassificationResult(BaseModel):
         Raises:
             ValueError: If block is not None and not in PageData.blocks
         """
-        if block is not None and block not in self.page_data.blocks:
+        if block is None:
+            return
+        # Identity check first: comparing pydantic models field by field
+        # against every block on the page dominates scoring on dense pages.
+        if (
+            id(block) not in self.index.identities
+            and block not in self.page_data.blocks
+        ):
             raise ValueError(f"{param_name} must be in PageData.blocks. Block: {block}")
 
     @property
@@ -479,6 +567,8 @@ class ClassificationResult(BaseModel):
     @property
     def page(self) -> Page | None:
         """Returns the Page object built from this classification result."""
+        if self.compacted is not None:
+            return self.compacted.page
         page_candidates = self.get_built_candidates("page")
         if page_candidates:
             page = page_candidates[0].constructed
@@ -714,6 +804,8 @@ class ClassificationResult(BaseModel):
             The label string of the highest-scoring constructed candidate,
             None otherwise
         """
+        if self.compacted is not None:
+            return self.compacted.block_labels.get(block.id)
         best_candidate = self.get_best_candidate(block)
         return best_candidate.label if best_candidate else None
 
@@ -736,6 +828,52 @@ class ClassificationResult(BaseModel):
             self.candidates[label] = []
         self.candidates[label].append(candidate)
 
+    def checkpoint_scores(self) -> ScoreCheckpoint:
+        """Checkpoint the scored candidates, to build the page again later.
+
+        Must be called after scoring and before building.
+        """
+        assert not self._consumed_blocks, "checkpoint_scores called after building"
+        return ScoreCheckpoint(
+            candidates={label: list(cands) for label, cands in self.candidates.items()},
+            scored_states=[
+                (c, c.bbox, tuple(c.source_blocks))
+                for cands in self.candidates.values()
+                for c in cands
+            ],
+        )
+
+    def restore_scores(
+        self, checkpoint: ScoreCheckpoint, keep: Iterable[LabelClassifier]
+    ) -> None:
+        """Reset this result to a checkpoint, as if nothing had been built.
+
+        Only the candidates of the `keep` classifiers' labels are restored,
+        and those classifiers are registered to build them (they may have a
+        different config than the ones that scored them). All other labels
+        are left empty to be scored again.
+
+        Args:
+            checkpoint: Taken from this result by `checkpoint_scores`.
+            keep: Classifiers whose scored candidates are still valid.
+        """
+        self._classifiers = {}
+        self.candidates = {}
+        for classifier in keep:
+            self._register_classifier(classifier.output, classifier)
+            if classifier.output in checkpoint.candidates:
+                self.candidates[classifier.output] = list(
+                    checkpoint.candidates[classifier.output]
+                )
+        for candidate, bbox, source_blocks in checkpoint.scored_states:
+            candidate.constructed = None
+            candidate.failure_reason = None
+            candidate.bbox = bbox
+            candidate.source_blocks = list(source_blocks)
+        self._consumed_blocks = set()
+        if self._index is not None:
+            self._index.reset_unconsumed()
+
     # TODO Reconsider the removal API below - do we need it? We have been
     # capturing all blocks by a element.
     def mark_removed(self, block: Blocks, reason: RemovalReason) -> None:
@@ -775,10 +913,81 @@ class ClassificationResult(BaseModel):
         Returns:
             Number of blocks that remain unconsumed
         """
+        if self.compacted is not None:
+            return self.compacted.unconsumed_count
         all_block_ids = {b.id for b in self.page_data.blocks}
         removed_ids = set(self.removal_reasons.keys())
         return len(all_block_ids - removed_ids - self._consumed_blocks)
 
+    def get_block_labels(self) -> dict[int, str]:
+        """Map each claimed block's id to the label of its best candidate.
+
+        Equivalent to calling `get_label` for every block, but in a single
+        pass over the candidates. Unclaimed blocks are absent.
+
+        Returns:
+            Dictionary of block id to label.
+        """
+        if self.compacted is not None:
+            return self.compacted.block_labels
+        best: dict[int, Candidate] = {}
+        for candidates in self.candidates.values():
+            for candidate in candidates:
+                if candidate.constructed is None:
+                    continue
+                for block in candidate.source_blocks:
+                    current = best.get(block.id)
+                    # Like max() in get_best_candidate, the first of equal
+                    # scores wins.
+                    if current is None or candidate.score > current.score:
+                        best[block.id] = candidate
+        return {block_id: c.label for block_id, c in best.items()}
+
+    def get_unclaimed_blocks(self) -> list[Blocks]:
+        """Get blocks that no constructed candidate uses and were not removed.
+
+        Equivalent to collecting the blocks for which `get_best_candidate`
+        returns None and `is_removed` is False, without rescanning every
+        candidate per block.
+
+        Returns:
+            Unclaimed blocks in page order.
+        """
+        labels = self.get_block_labels()
+        return [
+            block
+            for block in self.page_data.blocks
+            if block.id not in labels and block.id not in self.removal_reasons
+        ]
+
+    def compact(self) -> None:
+        """Discard the candidates, keeping the built Page and per-block labels.
+
+        Classification keeps every candidate for every label, with their
+        score details and any elements built for candidates that later lost,
+        which is most of a result's memory. Once a page has been built and
+        checked, production runs only need its Page, so this drops the
+        candidate graph and the per-page caches. The page data and removal
+        reasons are kept.
+
+        Afterwards `page`, `get_label`, `count_unconsumed_blocks` and
+        `get_unclaimed_blocks` keep working from `compacted`; candidate
+        accessors return nothing.
+        """
+        if self.compacted is not None:
+            return
+        self.compacted = CompactedResult(
+            page=self.page,
+            unconsumed_count=self.count_unconsumed_blocks(),
+            block_labels=self.get_block_labels(),
+        )
+        self.candidates = {}
+        self.trace = None
+        self._classifiers = {}
+        self._consumed_blocks = set()
+        self._memo = {}
+        self._index = None
+
     def get_removal_reason(self, block: Blocks) -> RemovalReason | None:
         """Get the reason why a block was removed.
 
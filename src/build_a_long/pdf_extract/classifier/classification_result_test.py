@@ -104,6 +104,23 @@ class TestClassificationResult:
         assert retrieved_reason.reason_type == "child_bbox"
         assert retrieved_reason.target_block is block2
 
+    def test_memoize_computes_once(self) -> None:
+        """Test that memoized values are computed once per result."""
+        page = PageBuilder(page_number=1, width=100, height=100).build()
+        calls: list[int] = []
+
+        def factory() -> int:
+            calls.append(1)
+            return len(calls)
+
+        result = ClassificationResult(page_data=page)
+        assert result.memoize("key", factory) == 1
+        assert result.memoize("key", factory) == 1
+        assert result.memoize("other", factory) == 2
+
+        # A new result for the same page starts with an empty memo
+        assert ClassificationResult(page_data=page).memoize("key", factory) == 3
+
 
 class TestClassificationResultValidation:
     """Tests for ClassificationResult validation logic."""
@@ -19,6 +19,9 @@ The classification pipeline operates in two main phases:
 from __future__ import annotations
 
 import logging
+import time
+from collections.abc import Callable, Sequence, Set
+from contextlib import AbstractContextManager, nullcontext
 
 from build_a_long.pdf_extract.classifier.bags import (
     BagNumberClassifier,
@@ -31,11 +34,17 @@ from build_a_long.pdf_extract.classifier.batch_classification_result import (
 from build_a_long.pdf_extract.classifier.block_filter import (
     filter_duplicate_blocks,
     filter_overlapping_text_blocks,
+    filter_page_text,
 )
 from build_a_long.pdf_extract.classifier.classification_result import (
     ClassificationResult,
+    ScoreCheckpoint,
 )
 from build_a_long.pdf_extract.classifier.classifier_config import ClassifierConfig
+from build_a_long.pdf_extract.classifier.instrumentation import (
+    ClassificationStats,
+    PageStats,
+)
 from build_a_long.pdf_extract.classifier.pages import (
     PageHintCollection,
 )
@@ -98,7 +107,8 @@ from build_a_long.pdf_extract.classifier.steps import (
 )
 from build_a_long.pdf_extract.classifier.text import FontSizeHints, TextHistogram
 from build_a_long.pdf_extract.classifier.topological_sort import topological_sort
-from build_a_long.pdf_extract.extractor import PageData
+from build_a_long.pdf_extract.classifier.tracing import PageTrace
+from build_a_long.pdf_extract.extractor import PageData, PageText
 from build_a_long.pdf_extract.extractor.page_blocks import Blocks
 
 logger = logging.getLogger(__name__)
@@ -134,8 +144,22 @@ def classify_elements(
     return classifier.classify(page)
 
 
+def _stage(
+    stats: ClassificationStats | None, name: str
+) -> AbstractContextManager[object]:
+    """Time a stage of `classify_pages`, if instrumented."""
+    return stats.stage(name) if stats is not None else nullcontext()
+
+
 def classify_pages(
-    pages: list[PageData], pages_for_hints: list[PageData] | None = None
+    pages: list[PageData],
+    pages_for_hints: Sequence[PageData | PageText] | None = None,
+    *,
+    instrument: bool = False,
+    trace: bool = False,
+    compact: bool = False,
+    on_result: Callable[[ClassificationResult], None] | None = None,
+    page_context: Callable[[int], AbstractContextManager[object]] | None = None,
 ) -> BatchClassificationResult:
     """Classify and label elements across multiple pages using rule-based heuristics.
 
@@ -150,6 +174,24 @@ def classify_pages(
         pages_for_hints: Optional list of pages to use for generating font/page hints.
             If None, uses `pages`. This allows generating hints from all pages
             while only classifying a subset (e.g., when using --pages filter).
+            Only their text is used, so these may be `PageText` columns (see
+            `Extractor.extract_page_text`) rather than full PageData.
+        instrument: If True, record per-label timings and counters for every
+            classified page, and the time spent filtering duplicate blocks
+            and building hints, in `BatchClassificationResult.stats`.
+        trace: If True, keep a decision trace for every classified page in
+            `ClassificationResult.trace`.
+        compact: If True, compact each page's result as soon as it is
+            classified (see `ClassificationResult.compact`), keeping memory
+            bounded by the built pages rather than every candidate.
+        on_result: Called with each page's result as soon as it is
+            classified (including skipped pages), in page order and before
+            it is compacted. Lets callers stream pages to writers and
+            validators instead of waiting for the whole batch.
+        page_context: Called with each classified page's number; the
+            returned context manager wraps that page's classification (e.g.
+            to profile a single page). Hint generation and `on_result` run
+            outside it.
 
     Returns:
         BatchClassificationResult containing per-page results and global histogram
@@ -157,6 +199,8 @@ def classify_pages(
 
     # TODO There is a bunch of duplication in here between hints and non-hints. Refactor
 
+    stats = ClassificationStats() if instrument else None
+
     # Use all pages for hint generation if provided, otherwise use selected pages
     hint_pages = pages_for_hints if pages_for_hints is not None else pages
 
@@ -165,83 +209,86 @@ def classify_pages(
     removed_blocks_per_page: list[dict[Blocks, RemovalReason]] = []
     skipped_pages: set[int] = set()  # Track page numbers that are skipped
 
-    for page_data in pages:
-        # Skip pages with too many blocks - these are likely info/inventory pages
-        # with vectorized text that cause O(n²) algorithms to be very slow
-        if len(page_data.blocks) > MAX_BLOCKS_PER_PAGE:
-            logger.debug(
-                f"Page {page_data.page_number}: skipping classification "
-                f"({len(page_data.blocks)} blocks exceeds threshold of "
-                f"{MAX_BLOCKS_PER_PAGE})"
-            )
-            skipped_pages.add(page_data.page_number)
-            removed_blocks_per_page.append({})
-            continue
+    with _stage(stats, "filter"):
+        for page_data in pages:
+            # Skip pages with too many blocks - these are likely info/inventory pages
+            # with vectorized text that cause O(n²) algorithms to be very slow
+            if len(page_data.blocks) > MAX_BLOCKS_PER_PAGE:
+                logger.debug(
+                    "Page %s: skipping classification "
+                    "(%d blocks exceeds threshold of %d)",
+                    page_data.page_number,
+                    len(page_data.blocks),
+                    MAX_BLOCKS_PER_PAGE,
+                )
+                skipped_pages.add(page_data.page_number)
+                removed_blocks_per_page.append({})
+                continue
 
-        kept_blocks = page_data.blocks
+            kept_blocks = page_data.blocks
 
-        # Filter overlapping text blocks (e.g., "4" and "43" at same origin)
-        kept_blocks, text_removed = filter_overlapping_text_blocks(kept_blocks)
+            # Filter overlapping text blocks (e.g., "4" and "43" at same origin)
+            kept_blocks, text_removed = filter_overlapping_text_blocks(kept_blocks)
 
-        # Filter duplicate image/drawing blocks based on IOU
-        kept_blocks, bbox_removed = filter_duplicate_blocks(kept_blocks)
+            # Filter duplicate image/drawing blocks based on IOU
+            kept_blocks, bbox_removed = filter_duplicate_blocks(kept_blocks)
 
-        # Combine all removal mappings into a single dict for this page
-        combined_removed_mapping = {
-            **text_removed,
-            **bbox_removed,
-        }
+            # Combine all removal mappings into a single dict for this page
+            combined_removed_mapping = {
+                **text_removed,
+                **bbox_removed,
+            }
 
-        logger.debug(
-            f"Page {page_data.page_number}: "
-            f"filtered {len(text_removed)} overlapping text, "
-            f"{len(bbox_removed)} duplicate bbox blocks"
-        )
+            logger.debug(
+                "Page %s: filtered %d overlapping text, %d duplicate bbox blocks",
+                page_data.page_number,
+                len(text_removed),
+                len(bbox_removed),
+            )
 
-        removed_blocks_per_page.append(combined_removed_mapping)
+            removed_blocks_per_page.append(combined_removed_mapping)
 
     # Phase 2: Extract font size hints from hint pages (excluding removed blocks)
     # Build pages with non-removed blocks for hint extraction and histogram
 
-    # Filter duplicates from hint pages (may be different from pages to classify)
-    hint_pages_without_duplicates = []
-    for page_data in hint_pages:
-        # Skip high-block pages for hints too (same threshold)
-        if len(page_data.blocks) > MAX_BLOCKS_PER_PAGE:
-            continue
-
-        # TODO We are re-filtering duplicates here; optimize by changing the API
-        # to accept one list of PageData, and seperate by page_numbers.
-        kept_blocks = page_data.blocks
-        kept_blocks, _ = filter_overlapping_text_blocks(kept_blocks)
-        kept_blocks, _ = filter_duplicate_blocks(kept_blocks)
-
-        hint_pages_without_duplicates.append(
-            PageData(
-                page_number=page_data.page_number,
-                bbox=page_data.bbox,
-                blocks=kept_blocks,
-            )
-        )
-
-    # Build pages without duplicates for classification
-    pages_without_duplicates = []
-    for page_data, removed_mapping in zip(pages, removed_blocks_per_page, strict=True):
-        # We need to filter blocks that were removed by ANY filter
-        non_removed_blocks = [
-            block for block in page_data.blocks if block not in removed_mapping
-        ]
-        pages_without_duplicates.append(
-            PageData(
-                page_number=page_data.page_number,
-                bbox=page_data.bbox,
-                blocks=non_removed_blocks,
+    # Filter duplicates from hint pages (may be different from pages to classify).
+    # Hints only read text, so filter the spans as columns.
+    with _stage(stats, "filter"):
+        hint_pages_without_duplicates: list[PageText] = []
+        for page_data in hint_pages:
+            # Skip high-block pages for hints too (same threshold)
+            if isinstance(page_data, PageData):
+                if len(page_data.blocks) > MAX_BLOCKS_PER_PAGE:
+                    continue
+                page_data = PageText.from_page_data(page_data)
+            elif len(page_data) > MAX_BLOCKS_PER_PAGE:
+                continue
+
+            # TODO We are re-filtering duplicates here; optimize by changing the API
+            # to accept one list of PageData, and seperate by page_numbers.
+            hint_pages_without_duplicates.append(filter_page_text(page_data))
+
+        # Build pages without duplicates for classification
+        pages_without_duplicates = []
+        for page_data, removed_mapping in zip(
+            pages, removed_blocks_per_page, strict=True
+        ):
+            # We need to filter blocks that were removed by ANY filter
+            non_removed_blocks = [
+                block for block in page_data.blocks if block not in removed_mapping
+            ]
+            pages_without_duplicates.append(
+                PageData(
+                    page_number=page_data.page_number,
+                    bbox=page_data.bbox,
+                    blocks=non_removed_blocks,
+                )
             )
-        )
 
     # Generate hints from hint pages, histogram from pages to classify
-    font_size_hints = FontSizeHints.from_pages(hint_pages_without_duplicates)
-    page_hints = PageHintCollection.from_pages(hint_pages_without_duplicates)
+    with _stage(stats, "hints"):
+        font_size_hints = FontSizeHints.from_pages(hint_pages_without_duplicates)
+        page_hints = PageHintCollection.from_pages(hint_pages_without_duplicates)
     histogram = TextHistogram.from_pages(pages_without_duplicates)
 
     # Phase 3: Classify using the hints (on pages without duplicates)
@@ -262,11 +309,20 @@ def classify_pages(
                     f"info/inventory page with vectorized text."
                 ),
             )
+            if on_result is not None:
+                on_result(result)
             results.append(result)
             continue
 
         # Classify using only non-removed blocks
-        result = classifier.classify(page_without_duplicates)
+        with (
+            page_context(page_data.page_number)
+            if page_context is not None
+            else nullcontext()
+        ):
+            result = classifier.classify(
+                page_without_duplicates, instrument=instrument, trace=trace
+            )
 
         # Update result to use original page_data (with all blocks)
         result.page_data = page_data
@@ -275,9 +331,15 @@ def classify_pages(
         for removed_block, removal_reason in removed_mapping.items():
             result.mark_removed(removed_block, removal_reason)
 
+        if on_result is not None:
+            on_result(result)
+        if compact:
+            result.compact()
         results.append(result)
 
-    return BatchClassificationResult(results=results, histogram=histogram)
+    if stats is not None:
+        stats.pages = [r.stats for r in results if r.stats]
+    return BatchClassificationResult(results=results, histogram=histogram, stats=stats)
 
 
 type Classifiers = (
@@ -597,7 +659,9 @@ class Classifier:
             ]
         )
 
-    def classify(self, page_data: PageData) -> ClassificationResult:
+    def classify(
+        self, page_data: PageData, *, instrument: bool = False, trace: bool = False
+    ) -> ClassificationResult:
         """
         Runs the classification logic and returns a result.
         It does NOT modify page_data directly.
@@ -605,28 +669,97 @@ class Classifier:
         The classification process runs in three phases:
         1. Score all classifiers (bottom-up) - auto-registers classifiers
         2. Construct final elements (top-down starting from Page)
+
+        If `instrument` is True, the result's `stats` records timings and
+        counters for each label. If `trace` is True, the result's `trace`
+        keeps a record of build decisions. Tracing is also enabled, without
+        keeping records, when DEBUG logging is on for the classifier.
         """
-        result = ClassificationResult(page_data=page_data)
+        start = time.perf_counter()
+        stats = PageStats(page_number=page_data.page_number) if instrument else None
+        result = ClassificationResult(
+            page_data=page_data,
+            stats=stats,
+            trace=PageTrace.for_page(page_data.page_number, keep=trace),
+        )
 
-        logger.debug(f"Starting classification for page {page_data.page_number}")
+        logger.debug("Starting classification for page %s", page_data.page_number)
 
         # 1. Score all classifiers (Bottom-Up)
         # Note: score() automatically registers each classifier for its output labels
         for classifier in self.classifiers:
-            classifier.score(result)
+            if stats is None:
+                classifier.score(result)
+                continue
+            with stats.score(classifier.output):
+                classifier.score(result)
+            stats.label(classifier.output).candidates = len(
+                result.candidates.get(classifier.output, ())
+            )
+
+        # 2. Construct (Top-Down), and validate
+        self._build(result)
+
+        if stats is not None:
+            stats.seconds = time.perf_counter() - start
+        return result
+
+    def reclassify(
+        self,
+        result: ClassificationResult,
+        checkpoint: ScoreCheckpoint,
+        rescore: Set[str],
+    ) -> ClassificationResult:
+        """Classify a page again, re-scoring only some labels.
+
+        The result is reset to its `checkpoint` (see
+        `ClassificationResult.checkpoint_scores`), keeping the scored
+        candidates of every label not in `rescore`. The `rescore` labels are
+        scored again with this classifier, and the page is built and
+        validated as in `classify`.
+
+        This is much cheaper than `classify` when a config change only
+        affects a few classifiers. It is only correct if the kept labels
+        would score the same with this classifier's config, and `rescore`
+        includes every label that depends on a re-scored label.
 
-        # 2. Construct (Top-Down)
+        Args:
+            result: A result previously scored (or classified) for the page.
+            checkpoint: Taken from `result` after scoring.
+            rescore: Labels to score again.
+
+        Returns:
+            `result`, classified again.
+        """
+        result.restore_scores(
+            checkpoint, keep=[c for c in self.classifiers if c.output not in rescore]
+        )
+        for classifier in self.classifiers:
+            if classifier.output in rescore:
+                classifier.score(result)
+        # Keep the labels in scoring order, as `classify` would
+        order = {c.output: i for i, c in enumerate(self.classifiers)}
+        result.candidates = dict(
+            sorted(
+                result.candidates.items(),
+                key=lambda item: order.get(item[0], len(order)),
+            )
+        )
+
+        self._build(result)
+        return result
+
+    def _build(self, result: ClassificationResult) -> None:
+        """Construct the page from the scored candidates, and validate it."""
         # Find the PageClassifier to start the construction process
         page_classifier = next(
             c for c in self.classifiers if isinstance(c, PageClassifier)
         )
         page_classifier.build_all(result)
 
-        # 3. Validate classification invariants
+        # Validate classification invariants
         self._validate_classification_result(result)
 
-        return result
-
     def _validate_classification_result(self, result: ClassificationResult) -> None:
         """Validate classification invariants and catch programming errors.
 
@@ -15,17 +15,17 @@ import pytest
 
 from build_a_long.pdf_extract.classifier import Candidate, classify_elements
 from build_a_long.pdf_extract.classifier.classifier_config import ClassifierConfig
-from build_a_long.pdf_extract.extractor import ExtractionResult, PageData
+from build_a_long.pdf_extract.extractor import PageData
 from build_a_long.pdf_extract.extractor.lego_page_elements import (
     Diagram,
     LegoPageElement,
     PartsList,
 )
 from build_a_long.pdf_extract.fixtures import (
-    FIXTURES_DIR,
     RAW_FIXTURE_FILES,
     extract_element_id,
     load_classifier_config,
+    load_raw_fixture,
 )
 
 log = logging.getLogger(__name__)
@@ -43,10 +43,7 @@ def _load_pages_from_fixture(fixture_file: str) -> list[PageData]:
     Raises:
         ValueError: If the fixture contains no pages
     """
-    fixture_path = FIXTURES_DIR / fixture_file
-    extraction: ExtractionResult = ExtractionResult.model_validate_json(
-        fixture_path.read_text()
-    )  # type: ignore[assignment]
+    extraction = load_raw_fixture(fixture_file)
 
     if not extraction.pages:
         raise ValueError(f"No pages found in {fixture_file}")
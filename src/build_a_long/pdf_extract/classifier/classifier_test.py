@@ -4,6 +4,9 @@ from build_a_long.pdf_extract.classifier import (
     ClassifierConfig,
     classify_pages,
 )
+from build_a_long.pdf_extract.classifier.classification_result import (
+    ClassificationResult,
+)
 from build_a_long.pdf_extract.classifier.classifier import (
     MAX_BLOCKS_PER_PAGE,
     Classifier,
@@ -11,6 +14,7 @@ from build_a_long.pdf_extract.classifier.classifier import (
 from build_a_long.pdf_extract.classifier.test_utils import PageBuilder
 from build_a_long.pdf_extract.extractor.bbox import BBox
 from build_a_long.pdf_extract.extractor.page_blocks import Drawing
+from build_a_long.pdf_extract.fixtures import load_classifier_config, load_raw_fixture
 
 
 class TestClassifier:
@@ -68,6 +72,36 @@ class TestClassifier:
                     f"but no classifier produces it"
                 )
 
+    def test_reclassify_matches_classify(self) -> None:
+        """Re-scoring some labels from a checkpoint builds the same page."""
+        page_data = load_raw_fixture("6509377_page_010_raw.json").pages[0]
+        config = load_classifier_config("6509377")
+        changed = config.model_copy(
+            update={
+                "page_number": config.page_number.model_copy(update={"min_score": 0.99})
+            }
+        )
+
+        base = Classifier(config)
+        result = ClassificationResult(page_data=page_data)
+        for label_classifier in base.classifiers:
+            label_classifier.score(result)
+        checkpoint = result.checkpoint_scores()
+
+        # Build with the base config, then again with page numbers re-scored
+        # (and the page, which depends on them)
+        assert base.reclassify(result, checkpoint, set()).page == (
+            base.classify(page_data).page
+        )
+        reclassified = Classifier(changed).reclassify(
+            result, checkpoint, {"page_number", "page"}
+        )
+        expected = Classifier(changed).classify(page_data)
+
+        assert reclassified.page == expected.page
+        assert reclassified.page != base.classify(page_data).page
+        assert list(reclassified.candidates) == list(expected.candidates)
+
 
 class TestClassifyElements:
     """Tests for the main classify_elements function."""
@@ -101,6 +135,75 @@ class TestClassifyElements:
             assert page.page_number is not None
             assert page.page_number.value == i
 
+    def test_classify_pages_instrumented(self) -> None:
+        """Instrumentation records per-page, per-label stats when enabled."""
+        pages = [
+            PageBuilder(page_number=i, width=100, height=200)
+            .add_text(str(i), 5, 190, 10, 8, id=0)
+            .build()
+            for i in range(1, 3)
+        ]
+
+        assert classify_pages(pages).stats is None
+
+        batch_result = classify_pages(pages, instrument=True)
+        stats = batch_result.stats
+        assert stats is not None
+        assert [page.page_number for page in stats.pages] == [1, 2]
+
+        page_number = stats.totals()["page_number"]
+        assert page_number.candidates == 2
+        assert page_number.builds_attempted == 2
+        assert page_number.builds_failed == 0
+        assert stats.totals()["page"].builds_attempted == 2
+        assert all(page.seconds > 0 for page in stats.pages)
+        assert set(stats.stages) == {"filter", "hints"}
+        assert all(seconds > 0 for seconds in stats.stages.values())
+
+        # Stats are not part of the serialized result
+        assert "stats" not in batch_result.results[0].model_dump()
+
+    def test_classify_pages_traced(self) -> None:
+        """Decision traces are only kept when requested."""
+        pages = [
+            PageBuilder(page_number=1, width=100, height=200)
+            .add_text("1", 5, 190, 10, 8, id=0)
+            .build()
+        ]
+
+        assert classify_pages(pages).results[0].trace is None
+
+        result = classify_pages(pages, trace=True).results[0]
+        assert result.trace is not None
+        events = [(r.event, r.data.get("label")) for r in result.trace.records]
+        assert ("build.start", "page") in events
+        assert ("build.consume", "page_number") in events
+        assert "trace" not in result.model_dump()
+
+    def test_classify_pages_compact(self) -> None:
+        """Compacted results keep the page, labels and unconsumed blocks."""
+        pages = [
+            PageBuilder(page_number=1, width=100, height=200)
+            .add_text("1", 5, 190, 10, 8, id=0)
+            .add_text("stray", 50, 50, 10, 8, id=1)
+            .build()
+        ]
+        full = classify_pages(pages).results[0]
+        compact = classify_pages(pages, compact=True).results[0]
+
+        assert full.compacted is None
+        assert compact.compacted is not None
+        assert compact.candidates == {}
+        assert compact.page == full.page
+        assert compact.get_block_labels() == full.get_block_labels()
+        for block in pages[0].blocks:
+            assert compact.get_label(block) == full.get_label(block)
+        assert [b.id for b in compact.get_unclaimed_blocks()] == [
+            b.id for b in full.get_unclaimed_blocks()
+        ]
+        assert compact.count_unconsumed_blocks() == full.count_unconsumed_blocks()
+        assert compact.get_label(pages[0].blocks[0]) == "page_number"
+
     def test_empty_pages_list(self) -> None:
         """Test with an empty list of pages."""
         batch_result = classify_pages([])
@@ -0,0 +1,183 @@
+"""Opt-in timing and counters for the classification pipeline.
+
+Instrumentation is off by default. When enabled, `Classifier.classify` gives
+each `ClassificationResult` a `PageStats`, which records per label:
+
+- time spent in the classifier's ``score()``
+- number of candidates it produced
+- builds attempted and failed, and time spent building (including nested
+  builds of child elements)
+- rollbacks of candidate and consumed block state after failed builds
+
+`classify_pages` collects the per-page stats into a `ClassificationStats`,
+along with the time spent in batch stages such as filtering duplicate
+blocks and building hints. It can be summarized, dumped as JSON, or
+exported in Chrome trace-event format (load it in chrome://tracing or
+https://ui.perfetto.dev).
+
+When disabled, the only cost is an ``is None`` check per score and build.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+
+class LabelStats(BaseModel):
+    """Counters and timings for one label."""
+
+    score_seconds: float = 0.0
+    """Time spent in the classifier's score()."""
+
+    build_seconds: float = 0.0
+    """Time spent in build(), including nested builds of other labels."""
+
+    candidates: int = 0
+    """Candidates created during scoring."""
+
+    builds_attempted: int = 0
+    """Calls to build() that were not already constructed."""
+
+    builds_failed: int = 0
+    """Attempted builds that raised."""
+
+    rollbacks: int = 0
+    """Failed builds whose state changes were rolled back."""
+
+    def add(self, other: LabelStats) -> None:
+        """Accumulate another set of stats into this one."""
+        self.score_seconds += other.score_seconds
+        self.build_seconds += other.build_seconds
+        self.candidates += other.candidates
+        self.builds_attempted += other.builds_attempted
+        self.builds_failed += other.builds_failed
+        self.rollbacks += other.rollbacks
+
+
+class TraceEvent(BaseModel):
+    """A timed span of scoring or building one label."""
+
+    label: str
+    phase: Literal["score", "build"]
+    start: float
+    """perf_counter() timestamp, in seconds."""
+    duration: float
+    """Duration in seconds."""
+
+
+class PageStats(BaseModel):
+    """Instrumentation collected while classifying one page."""
+
+    page_number: int
+    seconds: float = 0.0
+    """Wall time for scoring, building and validating the page."""
+
+    labels: dict[str, LabelStats] = Field(default_factory=dict)
+    events: list[TraceEvent] = Field(default_factory=list)
+
+    def label(self, label: str) -> LabelStats:
+        """Return the stats for a label, creating them on first use."""
+        stats = self.labels.get(label)
+        if stats is None:
+            stats = self.labels[label] = LabelStats()
+        return stats
+
+    @contextmanager
+    def score(self, label: str) -> Iterator[None]:
+        """Time scoring a label."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.label(label).score_seconds += duration
+            self.events.append(
+                TraceEvent(label=label, phase="score", start=start, duration=duration)
+            )
+
+    @contextmanager
+    def build(self, label: str) -> Iterator[None]:
+        """Time building a candidate, counting it as failed if it raises."""
+        stats = self.label(label)
+        stats.builds_attempted += 1
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            stats.builds_failed += 1
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            stats.build_seconds += duration
+            self.events.append(
+                TraceEvent(label=label, phase="build", start=start, duration=duration)
+            )
+
+
+class ClassificationStats(BaseModel):
+    """Instrumentation for every page classified in a batch."""
+
+    pages: list[PageStats] = Field(default_factory=list)
+    stages: dict[str, float] = Field(default_factory=dict)
+    """Seconds spent in batch stages outside the pages, e.g. "filter" for
+    filtering duplicate blocks and "hints" for building hints."""
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a batch stage, adding to any earlier time in it."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def seconds(self) -> float:
+        """Total classification wall time across pages."""
+        return sum(page.seconds for page in self.pages)
+
+    def totals(self) -> dict[str, LabelStats]:
+        """Return the stats for each label summed across pages."""
+        totals: dict[str, LabelStats] = {}
+        for page in self.pages:
+            for label, stats in page.labels.items():
+                totals.setdefault(label, LabelStats()).add(stats)
+        return totals
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Export the recorded spans in Chrome trace-event format.
+
+        Each page is shown as its own thread, so nested builds stack under
+        the build that requested them.
+        """
+        starts = [event.start for page in self.pages for event in page.events]
+        origin = min(starts, default=0.0)
+        events: list[dict[str, Any]] = []
+        for page in self.pages:
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 0,
+                    "tid": page.page_number,
+                    "args": {"name": f"page {page.page_number}"},
+                }
+            )
+            for event in page.events:
+                events.append(
+                    {
+                        "name": event.label,
+                        "cat": event.phase,
+                        "ph": "X",
+                        "pid": 0,
+                        "tid": page.page_number,
+                        "ts": (event.start - origin) * 1e6,
+                        "dur": event.duration * 1e6,
+                    }
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
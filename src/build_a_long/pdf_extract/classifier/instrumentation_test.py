@@ -0,0 +1,72 @@
+"""Tests for classification instrumentation."""
+
+import pytest
+
+from build_a_long.pdf_extract.classifier.candidate import Candidate
+from build_a_long.pdf_extract.classifier.classification_result import (
+    CandidateFailedError,
+    ClassificationResult,
+)
+from build_a_long.pdf_extract.classifier.instrumentation import (
+    ClassificationStats,
+    LabelStats,
+    PageStats,
+)
+from build_a_long.pdf_extract.classifier.test_utils import PageBuilder, TestScore
+
+
+def test_build_counts_failures_and_rollbacks() -> None:
+    page_data = PageBuilder().add_text("1", 0, 0, id=0).build()
+    stats = PageStats(page_number=1)
+    result = ClassificationResult(page_data=page_data, stats=stats)
+    candidate = Candidate(
+        bbox=page_data.blocks[0].bbox,
+        label="page_number",
+        score=1.0,
+        score_details=TestScore(),
+        source_blocks=[page_data.blocks[0]],
+        failure_reason="Lost conflict",
+    )
+
+    with pytest.raises(CandidateFailedError):
+        result.build(candidate)
+
+    label = stats.labels["page_number"]
+    assert label.builds_attempted == 1
+    assert label.builds_failed == 1
+    # Rejected before anything was built, so nothing to roll back
+    assert label.rollbacks == 0
+    assert [event.phase for event in stats.events] == ["build"]
+
+
+def test_totals_and_chrome_trace() -> None:
+    page1 = PageStats(page_number=1, seconds=0.5)
+    with page1.score("step"):
+        pass
+    page1.label("step").candidates = 3
+    page2 = PageStats(page_number=2, seconds=0.25)
+    with page2.build("step"):
+        pass
+    with pytest.raises(ValueError), page2.build("arrow"):
+        raise ValueError("boom")
+    stats = ClassificationStats(pages=[page1, page2])
+
+    totals = stats.totals()
+    assert totals["step"].candidates == 3
+    assert totals["step"].builds_attempted == 1
+    assert totals["arrow"] == LabelStats(
+        build_seconds=totals["arrow"].build_seconds,
+        builds_attempted=1,
+        builds_failed=1,
+    )
+    assert stats.seconds == 0.75
+
+    trace = stats.to_chrome_trace()
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert [(e["name"], e["cat"], e["tid"]) for e in spans] == [
+        ("step", "score", 1),
+        ("step", "build", 2),
+        ("arrow", "build", 2),
+    ]
+    assert min(e["ts"] for e in spans) == 0
+    assert all(e["dur"] >= 0 for e in spans)
@@ -0,0 +1,176 @@
+"""Per-page block partitions and geometry caches shared by classifiers.
+
+Many classifiers start by deriving the same lists from
+``result.page_data.blocks``: all drawings, all visuals except full-page
+backgrounds, the unconsumed images and drawings, and so on. `PageIndex`
+computes each of these once per page, on first use, and hands the same
+object to every classifier through `ClassificationResult.index`.
+
+Everything here except the unconsumed views depends only on the page data,
+which never changes during classification. The unconsumed views are kept up
+to date by `ClassificationResult` as blocks are consumed and rolled back.
+
+Returned lists are shared between callers and must not be modified.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from functools import cached_property
+
+from build_a_long.pdf_extract.extractor.extractor import PageData
+from build_a_long.pdf_extract.extractor.page_blocks import (
+    Block,
+    Blocks,
+    Drawing,
+    Image,
+    Text,
+)
+from build_a_long.pdf_extract.extractor.spatial_index import SpatialGrid
+
+type BlockTypes = type[Block] | tuple[type[Block], ...]
+
+
+def _key(block_types: BlockTypes | None) -> tuple[type[Block], ...] | None:
+    if block_types is None or isinstance(block_types, tuple):
+        return block_types
+    return (block_types,)
+
+
+class PageIndex:
+    """Lazily built views of one page's blocks.
+
+    Blocks in every view keep their page order unless stated otherwise.
+    """
+
+    def __init__(self, page_data: PageData) -> None:
+        self.page_data = page_data
+        self._of_type: dict[tuple[type[Block], ...], list[Blocks]] = {}
+        self._small: dict[tuple[tuple[type[Block], ...], float], list[Blocks]] = {}
+        self._grids: dict[tuple[tuple[type[Block], ...], float], SpatialGrid] = {}
+        self._large: dict[float, frozenset[int]] = {}
+        self._unconsumed: dict[tuple[type[Block], ...] | None, dict[int, Blocks]] = {}
+
+    @cached_property
+    def identities(self) -> frozenset[int]:
+        """``id()`` of every block object on the page, for membership checks."""
+        return frozenset(id(block) for block in self.page_data.blocks)
+
+    def of_type(self, block_types: BlockTypes) -> Sequence[Blocks]:
+        """Return the blocks that are instances of ``block_types``."""
+        key = _key(block_types)
+        assert key is not None
+        blocks = self._of_type.get(key)
+        if blocks is None:
+            blocks = self._of_type[key] = [
+                block for block in self.page_data.blocks if isinstance(block, key)
+            ]
+        return blocks
+
+    @property
+    def texts(self) -> Sequence[Text]:
+        """The page's text blocks."""
+        return self.of_type(Text)  # type: ignore[return-value]
+
+    @property
+    def drawings(self) -> Sequence[Drawing]:
+        """The page's drawing blocks."""
+        return self.of_type(Drawing)  # type: ignore[return-value]
+
+    @property
+    def visuals(self) -> Sequence[Drawing | Image]:
+        """The page's drawing and image blocks."""
+        return self.of_type((Drawing, Image))  # type: ignore[return-value]
+
+    @cached_property
+    def by_area(self) -> Sequence[Blocks]:
+        """All blocks, smallest bbox area first (ties keep page order)."""
+        return sorted(self.page_data.blocks, key=lambda block: block.bbox.area)
+
+    @cached_property
+    def by_draw_order(self) -> Sequence[Blocks]:
+        """All blocks in draw order; blocks without one come last."""
+        return sorted(
+            self.page_data.blocks,
+            key=lambda block: (
+                block.draw_order is None,
+                block.draw_order if block.draw_order is not None else 0,
+            ),
+        )
+
+    def large(self, max_ratio: float = 0.5) -> frozenset[int]:
+        """Return ids of blocks covering more than ``max_ratio`` of the page.
+
+        These are usually backgrounds and page-sized decorations.
+        """
+        ids = self._large.get(max_ratio)
+        if ids is None:
+            threshold = self.page_data.bbox.area * max_ratio
+            ids = self._large[max_ratio] = frozenset(
+                block.id
+                for block in self.page_data.blocks
+                if block.bbox.area > threshold
+            )
+        return ids
+
+    def small(self, block_types: BlockTypes, max_ratio: float) -> Sequence[Blocks]:
+        """Return blocks of ``block_types`` no larger than ``max_ratio`` of the page.
+
+        Equivalent to `filter_by_max_area` with the page bbox as reference.
+        """
+        types = _key(block_types)
+        assert types is not None
+        key = (types, max_ratio)
+        blocks = self._small.get(key)
+        if blocks is None:
+            threshold = self.page_data.bbox.area * max_ratio
+            blocks = self._small[key] = [
+                block for block in self.of_type(types) if block.bbox.area <= threshold
+            ]
+        return blocks
+
+    def grid(self, block_types: BlockTypes, max_ratio: float = math.inf) -> SpatialGrid:
+        """Return a spatial grid over `small` (block_types, max_ratio).
+
+        With the default ``max_ratio`` every block of the types is indexed.
+        """
+        types = _key(block_types)
+        assert types is not None
+        key = (types, max_ratio)
+        grid = self._grids.get(key)
+        if grid is None:
+            blocks = (
+                self.of_type(types)
+                if math.isinf(max_ratio)
+                else self.small(types, max_ratio)
+            )
+            grid = self._grids[key] = SpatialGrid(blocks)
+        return grid
+
+    def unconsumed(
+        self, block_types: BlockTypes | None, consumed: set[int]
+    ) -> Sequence[Blocks]:
+        """Return blocks of ``block_types`` (or all blocks) not in ``consumed``.
+
+        The view for each type filter is built from ``consumed`` on first use
+        and afterwards kept current by `mark_consumed` and `reset_unconsumed`,
+        so repeated calls cost only a copy of the remaining blocks.
+        """
+        key = _key(block_types)
+        view = self._unconsumed.get(key)
+        if view is None:
+            blocks = self.page_data.blocks if key is None else self.of_type(key)
+            view = self._unconsumed[key] = {
+                block.id: block for block in blocks if block.id not in consumed
+            }
+        return list(view.values())
+
+    def mark_consumed(self, block_id: int) -> None:
+        """Drop a newly consumed block from every unconsumed view."""
+        for view in self._unconsumed.values():
+            view.pop(block_id, None)
+
+    def reset_unconsumed(self) -> None:
+        """Forget the unconsumed views, e.g. after consumed blocks are restored."""
+        self._unconsumed.clear()
@@ -0,0 +1,88 @@
+"""Tests for the per-page block index."""
+
+from build_a_long.pdf_extract.classifier import ClassificationResult
+from build_a_long.pdf_extract.classifier.page_index import PageIndex
+from build_a_long.pdf_extract.classifier.test_utils import PageBuilder
+from build_a_long.pdf_extract.extractor.extractor import PageData
+from build_a_long.pdf_extract.extractor.page_blocks import Drawing, Image, Text
+
+
+def _page() -> PageData:
+    return (
+        PageBuilder(width=100, height=100)
+        .add_drawing(0, 0, 100, 100, id=0, draw_order=0)  # background
+        .add_text("a", 10, 10, id=1, draw_order=5)
+        .add_image(20, 20, 30, 30, id=2, draw_order=2)
+        .add_drawing(60, 60, 5, 5, id=3)
+        .add_text("b", 70, 70, 20, 20, id=4, draw_order=1)
+        .build()
+    )
+
+
+def _ids(blocks) -> list[int]:
+    return [b.id for b in blocks]
+
+
+def test_partitions_keep_page_order() -> None:
+    index = PageIndex(_page())
+
+    assert _ids(index.texts) == [1, 4]
+    assert _ids(index.drawings) == [0, 3]
+    assert _ids(index.visuals) == [0, 2, 3]
+    assert _ids(index.of_type((Text, Image))) == [1, 2, 4]
+    # Partitions are computed once and shared
+    assert index.of_type(Drawing) is index.drawings
+
+
+def test_sorted_views() -> None:
+    index = PageIndex(_page())
+
+    assert _ids(index.by_area) == [3, 1, 4, 2, 0]
+    assert _ids(index.by_draw_order) == [0, 4, 2, 1, 3]
+
+
+def test_small_and_large_blocks() -> None:
+    index = PageIndex(_page())
+
+    assert index.large(0.5) == {0}
+    assert _ids(index.small((Drawing, Image), max_ratio=0.5)) == [2, 3]
+    assert _ids(index.small(Drawing, max_ratio=1.0)) == [0, 3]
+
+
+def test_grid_indexes_small_blocks() -> None:
+    page = _page()
+    index = PageIndex(page)
+
+    grid = index.grid((Drawing, Image), max_ratio=0.5)
+    assert _ids(grid.items) == [2, 3]
+    assert grid is index.grid((Drawing, Image), max_ratio=0.5)
+    assert _ids(index.grid(Drawing).items) == [0, 3]
+
+
+def test_unconsumed_view_tracks_consumption() -> None:
+    index = PageIndex(_page())
+    consumed: set[int] = {1}
+
+    assert _ids(index.unconsumed(None, consumed)) == [0, 2, 3, 4]
+    assert _ids(index.unconsumed((Image, Drawing), consumed)) == [0, 2, 3]
+
+    consumed.add(2)
+    index.mark_consumed(2)
+    assert _ids(index.unconsumed(None, consumed)) == [0, 3, 4]
+    assert _ids(index.unconsumed((Image, Drawing), consumed)) == [0, 3]
+
+    # Rolling back consumption rebuilds the views from the restored set
+    consumed = {1}
+    index.reset_unconsumed()
+    assert _ids(index.unconsumed((Image, Drawing), consumed)) == [0, 2, 3]
+
+
+def test_result_index_follows_page_data() -> None:
+    result = ClassificationResult(page_data=_page())
+    index = result.index
+    assert result.index is index
+    assert _ids(result.get_unconsumed_blocks(Text)) == [1, 4]
+
+    result.page_data = PageBuilder().add_text("c", 0, 0, id=7).build()
+    assert result.index is not index
+    assert _ids(result.get_unconsumed_blocks()) == [7]
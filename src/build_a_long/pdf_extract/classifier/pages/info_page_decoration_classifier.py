@@ -89,11 +89,7 @@ class InfoPageDecorationClassifier(LabelClassifier):
             return
 
         # Collect all blocks (drawings, images, text)
-        source_blocks: list[Blocks] = [
-            block
-            for block in page_data.blocks
-            if isinstance(block, Drawing | Image | Text)
-        ]
+        source_blocks: list[Blocks] = list(result.index.of_type((Drawing, Image, Text)))
 
         if not source_blocks:
             log.debug(
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 
 from pydantic import BaseModel
 
@@ -11,7 +12,7 @@ from build_a_long.pdf_extract.classifier.constants import (
 )
 from build_a_long.pdf_extract.classifier.pages.page_hint import PageHint, PageType
 from build_a_long.pdf_extract.classifier.text import TextHistogram
-from build_a_long.pdf_extract.extractor import PageData
+from build_a_long.pdf_extract.extractor import PageData, PageText
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +46,7 @@ class PageHintCollection(BaseModel):
         return PageHintCollection(hints={})
 
     @classmethod
-    def from_pages(cls, pages: list[PageData]) -> PageHintCollection:
+    def from_pages(cls, pages: Sequence[PageData | PageText]) -> PageHintCollection:
         """Extract page type hints from multiple pages.
 
         This method performs a lightweight analysis to classify pages:
@@ -61,7 +62,8 @@ class PageHintCollection(BaseModel):
         - INFO: Everything else
 
         Args:
-            pages: List of PageData objects to analyze
+            pages: PageData objects, or the PageText columns of pages, to
+                analyze
 
         Returns:
             PageHintCollection with type hints for each page
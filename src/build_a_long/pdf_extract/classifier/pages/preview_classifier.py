@@ -141,10 +141,7 @@ class PreviewClassifier(LabelClassifier):
         max_height = page_data.bbox.height * preview_config.max_page_height_ratio
 
         valid_drawings: Sequence[Drawing] = []
-        for block in page_data.blocks:
-            if not isinstance(block, Drawing):
-                continue
-
+        for block in result.index.drawings:
             bbox = block.bbox
 
             # Skip boxes smaller than minimum preview size
@@ -217,7 +214,7 @@ class PreviewClassifier(LabelClassifier):
                 continue
 
             # Check for images inside the box
-            images_inside = self._find_images_inside(bbox, page_data.blocks)
+            images_inside = self._find_images_inside(bbox, result.index.of_type(Image))
             diagrams_inside = self._find_diagrams_inside(bbox, diagram_candidates)
             has_images = bool(images_inside or diagrams_inside)
 
@@ -241,9 +238,11 @@ class PreviewClassifier(LabelClassifier):
             # Find all drawings contained within the preview bbox
             # This captures the white fill boxes (from group) plus any border/decoration
             # drawings that are inside the preview area
+            drawing_grid = result.index.grid(Drawing)
             all_drawings_inside: Sequence[Blocks] = []
-            for block in page_data.blocks:
-                if isinstance(block, Drawing) and bbox.contains(block.bbox):
+            for idx in drawing_grid.overlapping(bbox):
+                block = drawing_grid.items[idx]
+                if bbox.contains(block.bbox):
                     all_drawings_inside.append(block)
 
             result.add_candidate(
@@ -22,7 +22,6 @@ Enable with `LOG_LEVEL=DEBUG` for structured logs.
 from __future__ import annotations
 
 import logging
-from collections.abc import Sequence
 
 from build_a_long.pdf_extract.classifier.candidate import Candidate
 from build_a_long.pdf_extract.classifier.classification_result import (
@@ -32,11 +31,12 @@ from build_a_long.pdf_extract.classifier.label_classifier import (
     LabelClassifier,
 )
 from build_a_long.pdf_extract.classifier.score import Score, Weight
-from build_a_long.pdf_extract.extractor.bbox import BBox, filter_by_max_area
+from build_a_long.pdf_extract.extractor.bbox import BBox
 from build_a_long.pdf_extract.extractor.lego_page_elements import (
     TriviaText,
 )
 from build_a_long.pdf_extract.extractor.page_blocks import Blocks, Drawing, Image, Text
+from build_a_long.pdf_extract.extractor.spatial_index import proximity_groups
 
 log = logging.getLogger(__name__)
 
@@ -96,9 +96,7 @@ class TriviaTextClassifier(LabelClassifier):
 
         # Collect text blocks that look like trivia content (actual words)
         content_blocks: list[Text] = [
-            block
-            for block in page_data.blocks
-            if isinstance(block, Text) and self._is_trivia_content(block.text)
+            block for block in result.index.texts if self._is_trivia_content(block.text)
         ]
 
         if not content_blocks:
@@ -127,9 +125,7 @@ class TriviaTextClassifier(LabelClassifier):
             combined_bbox = BBox.union_all([b.bbox for b in cluster])
 
             # Find any images/drawings that overlap with the text area
-            related_visuals = self._find_related_visuals(
-                combined_bbox, page_data.blocks, page_data.bbox
-            )
+            related_visuals = self._find_related_visuals(combined_bbox, result)
 
             # Collect text lines
             text_lines = [b.text for b in cluster]
@@ -187,46 +183,13 @@ class TriviaTextClassifier(LabelClassifier):
     ) -> list[list[Text]]:
         """Cluster text blocks by spatial proximity.
 
-        Groups blocks whose bounding boxes are within `margin` of each other.
-        Uses a simple union-find approach.
+        Groups blocks whose bounding boxes are within `margin` of each other
+        (both boxes expanded by `margin`), transitively.
         """
-        if not blocks:
-            return []
-
-        n = len(blocks)
-        # Parent array for union-find
-        parent = list(range(n))
-
-        def find(x: int) -> int:
-            if parent[x] != x:
-                parent[x] = find(parent[x])
-            return parent[x]
-
-        def union(x: int, y: int) -> None:
-            px, py = find(x), find(y)
-            if px != py:
-                parent[px] = py
-
-        # Check all pairs for proximity
-        for i in range(n):
-            for j in range(i + 1, n):
-                bbox_i = blocks[i].bbox.expand(margin)
-                bbox_j = blocks[j].bbox.expand(margin)
-                if bbox_i.overlaps(bbox_j):
-                    union(i, j)
-
-        # Group by root
-        groups: dict[int, list[Text]] = {}
-        for i, block in enumerate(blocks):
-            root = find(i)
-            if root not in groups:
-                groups[root] = []
-            groups[root].append(block)
-
-        return list(groups.values())
+        return proximity_groups(blocks, margin)
 
     def _find_related_visuals(
-        self, text_bbox: BBox, all_blocks: Sequence[Blocks], page_bbox: BBox
+        self, text_bbox: BBox, result: ClassificationResult
     ) -> list[Image | Drawing]:
         """Find images and drawings that are related to the trivia text area.
 
@@ -235,22 +198,16 @@ class TriviaTextClassifier(LabelClassifier):
         - Is contained within an expanded version of the text area
         - Is NOT a large background element covering most of the page
         """
-        related: list[Image | Drawing] = []
         expanded_bbox = text_bbox.expand(20.0)  # 20pt margin
 
-        # Calculate page area to identify background elements
-        # page_area = page_bbox.area
-
-        candidate_blocks: list[Image | Drawing] = [
-            block for block in all_blocks if isinstance(block, Image | Drawing)
-        ]
-
         # Skip large background elements (covering >50% of page)
-        filtered_blocks = filter_by_max_area(
-            candidate_blocks, max_ratio=0.5, reference_bbox=page_bbox
-        )
+        grid = result.index.grid((Drawing, Image), max_ratio=0.5)
 
-        for block in filtered_blocks:
+        # Both tests imply overlapping the expanded area, so only those
+        # blocks need checking.
+        related: list[Image | Drawing] = []
+        for idx in grid.overlapping(expanded_bbox):
+            block = grid.items[idx]
             # Check if visual overlaps with or is contained in text area
             if expanded_bbox.contains(block.bbox) or text_bbox.iou(block.bbox) > 0.1:
                 related.append(block)
@@ -40,7 +40,6 @@ from build_a_long.pdf_extract.extractor.lego_page_elements import (
     Part,
     PartsList,
 )
-from build_a_long.pdf_extract.extractor.page_blocks import Drawing
 
 log = logging.getLogger(__name__)
 
@@ -86,9 +85,7 @@ class PartsListClassifier(LabelClassifier):
             return
 
         page_data = result.page_data
-        drawings: list[Drawing] = [
-            e for e in page_data.blocks if isinstance(e, Drawing)
-        ]
+        drawings = result.index.drawings
         if not drawings:
             return
 
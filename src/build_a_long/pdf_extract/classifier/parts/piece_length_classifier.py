@@ -101,7 +101,7 @@ class PieceLengthClassifier(RuleBasedClassifier):
         if not isinstance(block, Text):
             return additional
 
-        drawings = [b for b in result.page_data.blocks if isinstance(b, Drawing)]
+        drawings = result.index.drawings
         containing_drawing = self._find_smallest_containing_drawing(block, drawings)
 
         if not containing_drawing:
@@ -92,21 +92,13 @@ class ScaleClassifier(LabelClassifier):
 
     def _score(self, result: ClassificationResult) -> None:
         """Score potential Scale indicators."""
-        page_data = result.page_data
-
         # Get candidates
         piece_length_candidates = result.get_scored_candidates("piece_length")
         scale_text_candidates = result.get_scored_candidates("scale_text")
 
         # Get all Drawing blocks for finding containers
         # Filter out large drawings (backgrounds, etc.) that are > 20% of page area
-        page_area = page_data.bbox.area
-        max_drawing_area = page_area * 0.2
-        drawings = [
-            b
-            for b in page_data.blocks
-            if isinstance(b, Drawing) and b.bbox.area <= max_drawing_area
-        ]
+        drawings = result.index.small(Drawing, max_ratio=0.2)
 
         # Iterate over 1:1 text candidates
         for scale_text_cand in scale_text_candidates:
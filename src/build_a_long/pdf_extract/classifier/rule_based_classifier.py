@@ -18,7 +18,7 @@ from build_a_long.pdf_extract.classifier.classification_result import (
 from build_a_long.pdf_extract.classifier.label_classifier import (
     LabelClassifier,
 )
-from build_a_long.pdf_extract.classifier.rules import Rule, RuleContext
+from build_a_long.pdf_extract.classifier.rules import Rule, RuleContext, RulePlan
 from build_a_long.pdf_extract.classifier.score import Score, Weight
 from build_a_long.pdf_extract.extractor.bbox import BBox
 from build_a_long.pdf_extract.extractor.page_blocks import Blocks
@@ -62,7 +62,8 @@ class RuleBasedClassifier(LabelClassifier):
     ------------
 
     1. Define your rules in the `rules` property
-    2. Rules are evaluated sequentially for each block
+    2. Rules are evaluated sequentially for each block (blocks rejected by
+       the first required `IsInstanceFilter` are skipped without evaluation)
     3. Each rule returns a score (0.0 to 1.0) or None (skipped)
     4. Required rules with score 0.0 cause immediate rejection
     5. Final score is weighted average of all applicable rules
@@ -240,45 +241,20 @@ class RuleBasedClassifier(LabelClassifier):
         return RuleScore(components=components, total_score=total_score)
 
     def _score(self, result: ClassificationResult) -> None:
-        """Score blocks using rules."""
+        """Score blocks using rules.
+
+        The rules are compiled into a `RulePlan` so that blocks rejected by
+        the leading type filter are never visited.
+        """
         context = RuleContext(result.page_data, self.config, result)
-        rules = self.rules
-
-        for block in result.page_data.blocks:
-            components = {}
-            weighted_sum = 0.0
-            total_weight = 0.0
-            failed = False
-
-            for rule in rules:
-                score = rule.calculate(block, context)
-
-                # If rule returns None, it's skipped (not applicable)
-                if score is None:
-                    continue
-
-                # If required rule fails (score 0), fail the block immediately
-                if rule.required and score == 0.0:
-                    failed = True
-                    # log.debug(
-                    #    "[%s] block_id=%s failed required rule '%s'",
-                    #    self.output,
-                    #    block.id,
-                    #    rule.name,
-                    # )
-                    break
-
-                rule_weight = rule.weight  # Using direct weight from Rule instance
-
-                weighted_sum += score * rule_weight
-                total_weight += rule_weight
-                components[rule.name] = score
-
-            if failed:
-                continue
+        plan = RulePlan.compile(self.rules)
 
-            # Calculate final score from rules
-            final_score = weighted_sum / total_weight if total_weight > 0 else 0.0
+        for block in plan.candidate_blocks(context):
+            evaluation = plan.evaluate(block, context)
+            if evaluation is None:
+                continue
+            components = evaluation.components
+            final_score = evaluation.score
 
             # Build source blocks list, deduplicating as we go
             seen_ids: set[int] = {block.id}
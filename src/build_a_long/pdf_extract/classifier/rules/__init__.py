@@ -26,6 +26,7 @@ from build_a_long.pdf_extract.classifier.rules.geometry import (
     TopLeftPositionScore,
     WidthCoverageScore,
 )
+from build_a_long.pdf_extract.classifier.rules.plan import RuleEvaluation, RulePlan
 from build_a_long.pdf_extract.classifier.rules.text import (
     BagNumberFontSizeRule,
     BagNumberTextRule,
@@ -75,6 +76,8 @@ __all__ = [
     "RegexMatch",
     "Rule",
     "RuleContext",
+    "RuleEvaluation",
+    "RulePlan",
     "SizePreferenceScore",
     "SizeRangeRule",
     "SizeRatioRule",
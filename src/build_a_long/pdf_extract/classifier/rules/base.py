@@ -3,24 +3,72 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from dataclasses import dataclass
+from functools import cached_property
 
 from build_a_long.pdf_extract.classifier.classification_result import (
     ClassificationResult,
 )
 from build_a_long.pdf_extract.classifier.classifier_config import ClassifierConfig
 from build_a_long.pdf_extract.extractor import PageData
+from build_a_long.pdf_extract.extractor.bbox import BBox
 from build_a_long.pdf_extract.extractor.page_blocks import Block
 
 
 @dataclass
 class RuleContext:
-    """Context passed to rules during evaluation."""
+    """Context passed to rules during evaluation.
+
+    A context lives for one classifier's scoring pass over a page, so values
+    derived from the page (dimensions, blocks by type, the best page number)
+    are computed once here instead of once per block.
+    """
 
     page_data: PageData
     config: ClassifierConfig
     classification_result: ClassificationResult | None = None
 
+    @cached_property
+    def page_bbox(self) -> BBox:
+        """The page bounding box."""
+        page_bbox = self.page_data.bbox
+        assert page_bbox is not None
+        return page_bbox
+
+    @cached_property
+    def page_width(self) -> float:
+        return self.page_bbox.width
+
+    @cached_property
+    def page_height(self) -> float:
+        return self.page_bbox.height
+
+    @cached_property
+    def page_area(self) -> float:
+        return self.page_bbox.area
+
+    @cached_property
+    def page_number_bbox(self) -> BBox | None:
+        """The bbox of the best scored page number candidate, if any."""
+        if self.classification_result is None:
+            return None
+        candidates = self.classification_result.get_scored_candidates("page_number")
+        return candidates[0].bbox if candidates else None
+
+    def blocks_of_type(
+        self, block_type: type[Block] | tuple[type[Block], ...]
+    ) -> Sequence[Block]:
+        """Return the page's blocks that are instances of ``block_type``.
+
+        Blocks keep their page order. The partition is shared by every
+        classifier on the page when a classification result is available.
+        """
+
+        if self.classification_result is None:
+            return [b for b in self.page_data.blocks if isinstance(b, block_type)]
+        return self.classification_result.index.of_type(block_type)
+
 
 class Rule(ABC):
     """Abstract base class for scoring rules.
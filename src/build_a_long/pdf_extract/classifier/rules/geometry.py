@@ -27,10 +27,9 @@ class InBottomBandFilter(Rule):
         self.required = True
 
     def calculate(self, block: Block, context: RuleContext) -> float | None:
-        page_bbox = context.page_data.bbox
-        assert page_bbox is not None
+        page_bbox = context.page_bbox
 
-        bottom_threshold = page_bbox.y1 - (page_bbox.height * self.threshold_ratio)
+        bottom_threshold = page_bbox.y1 - (context.page_height * self.threshold_ratio)
         element_center_y = (block.bbox.y0 + block.bbox.y1) / 2
 
         is_in_band = element_center_y >= bottom_threshold
@@ -56,8 +55,7 @@ class CornerDistanceScore(Rule):
         self.required = required
 
     def calculate(self, block: Block, context: RuleContext) -> float | None:
-        page_bbox = context.page_data.bbox
-        assert page_bbox is not None
+        page_bbox = context.page_bbox
 
         element_center_x = (block.bbox.x0 + block.bbox.x1) / 2
         element_center_y = (block.bbox.y0 + block.bbox.y1) / 2
@@ -97,12 +95,11 @@ class TopLeftPositionScore(Rule):
         self.horizontal_scale = horizontal_scale
 
     def calculate(self, block: Block, context: RuleContext) -> float | None:
-        page_bbox = context.page_data.bbox
-        assert page_bbox is not None
+        page_bbox = context.page_bbox
 
         # Check vertical position (should be in top 40% of page)
         center_y = (block.bbox.y0 + block.bbox.y1) / 2
-        vertical_ratio = (center_y - page_bbox.y0) / page_bbox.height
+        vertical_ratio = (center_y - page_bbox.y0) / context.page_height
 
         if vertical_ratio > 0.4:
             # Too far down the page
@@ -113,7 +110,7 @@ class TopLeftPositionScore(Rule):
 
         # Check horizontal position (prefer left half)
         center_x = (block.bbox.x0 + block.bbox.x1) / 2
-        horizontal_ratio = (center_x - page_bbox.x0) / page_bbox.width
+        horizontal_ratio = (center_x - page_bbox.x0) / context.page_width
 
         horizontal_score = self.horizontal_scale(horizontal_ratio)
 
@@ -231,9 +228,7 @@ class CoverageRule(Rule):
         self.scale = scale
 
     def calculate(self, block: Block, context: RuleContext) -> float | None:
-        page_bbox = context.page_data.bbox
-        assert page_bbox is not None
-        page_area = page_bbox.area
+        page_area = context.page_area
         if page_area <= 0:
             return 0.0
 
@@ -259,8 +254,7 @@ class EdgeProximityRule(Rule):
         self.scale = scale
 
     def calculate(self, block: Block, context: RuleContext) -> float | None:
-        page_bbox = context.page_data.bbox
-        assert page_bbox is not None
+        page_bbox = context.page_bbox
 
         # Calculate distance from each edge
         left_dist = abs(block.bbox.x0 - page_bbox.x0)
@@ -291,8 +285,7 @@ class PageEdgeFilter(Filter):
         self.margin = margin
 
     def calculate(self, block: Block, context: RuleContext) -> float | None:
-        page_bbox = context.page_data.bbox
-        assert page_bbox is not None
+        page_bbox = context.page_bbox
         bbox = block.bbox
 
         # Check if entirely at left edge (x1 <= margin from left)
@@ -338,13 +331,12 @@ class IsVerticalDividerRule(Rule):
             return 0.0
         drawing_block = block  # type: Drawing
 
-        page_bbox = context.page_data.bbox
-        assert page_bbox is not None
+        page_bbox = context.page_bbox
 
         bbox = drawing_block.bbox
         width = bbox.width
         height = bbox.height
-        page_height = page_bbox.height
+        page_height = context.page_height
 
         # Check for vertical divider (thin width, tall height)
         if (
@@ -384,13 +376,12 @@ class IsHorizontalDividerRule(Rule):
             return 0.0
         drawing_block = block  # type: Drawing
 
-        page_bbox = context.page_data.bbox
-        assert page_bbox is not None
+        page_bbox = context.page_bbox
 
         bbox = drawing_block.bbox
         width = bbox.width
         height = bbox.height
-        page_width = page_bbox.width
+        page_width = context.page_width
 
         # Check for horizontal divider (thin height, wide width)
         if height <= self.max_thickness and width >= page_width * self.min_length_ratio:
@@ -430,7 +421,7 @@ class TextContainerFitRule(Rule):
             return 0.0
 
         # Find all drawings
-        drawings = [b for b in context.page_data.blocks if isinstance(b, Drawing)]
+        drawings = context.blocks_of_type(Drawing)
 
         best_score = 0.0
         # Maximum ratio of drawing area to text area to consider
@@ -486,13 +477,13 @@ class SizeRatioRule(Rule):
         self.scale = scale
 
     def calculate(self, block: Block, context: RuleContext) -> float | None:
-        page_bbox = context.page_data.bbox
-        assert page_bbox is not None
-        if page_bbox.width <= 0 or page_bbox.height <= 0:
+        page_width = context.page_width
+        page_height = context.page_height
+        if page_width <= 0 or page_height <= 0:
             return 0.0
 
-        width_ratio = block.bbox.width / page_bbox.width
-        height_ratio = block.bbox.height / page_bbox.height
+        width_ratio = block.bbox.width / page_width
+        height_ratio = block.bbox.height / page_height
 
         w_score = self.scale(width_ratio)
         h_score = self.scale(height_ratio)
@@ -519,13 +510,9 @@ class BottomPositionScore(Rule):
         self.scale = scale
 
     def calculate(self, block: Block, context: RuleContext) -> float | None:
-        page_bbox = context.page_data.bbox
-        assert page_bbox is not None
-        page_height = page_bbox.height
-
         element_bottom = block.bbox.y1
-        bottom_distance = page_bbox.y1 - element_bottom
-        bottom_margin_ratio = bottom_distance / page_height
+        bottom_distance = context.page_bbox.y1 - element_bottom
+        bottom_margin_ratio = bottom_distance / context.page_height
 
         return self.scale(bottom_margin_ratio)
 
@@ -549,26 +536,17 @@ class PageNumberProximityScore(Rule):
         self.proximity_ratio = proximity_ratio
 
     def calculate(self, block: Block, context: RuleContext) -> float | None:
-        if not context.classification_result:
-            return None
-
-        page_bbox = context.page_data.bbox
-        assert page_bbox is not None
-
-        page_number_candidates = context.classification_result.get_scored_candidates(
-            "page_number"
-        )
-        if not page_number_candidates:
+        # Assume best candidate is page number
+        pn_bbox = context.page_number_bbox
+        if pn_bbox is None:
             return None
 
-        # Assume best candidate is page number
-        pn_bbox = page_number_candidates[0].bbox
         horizontal_distance = min(
             abs(block.bbox.x0 - pn_bbox.x1),
             abs(block.bbox.x1 - pn_bbox.x0),
         )
 
-        if horizontal_distance < page_bbox.width * self.proximity_ratio:
+        if horizontal_distance < context.page_width * self.proximity_ratio:
             return 1.0
 
         return 0.0
@@ -590,12 +568,11 @@ class WidthCoverageScore(Rule):
         self.scale = scale
 
     def calculate(self, block: Block, context: RuleContext) -> float | None:
-        page_bbox = context.page_data.bbox
-        assert page_bbox is not None
-        if page_bbox.width <= 0:
+        page_width = context.page_width
+        if page_width <= 0:
             return 0.0
 
-        width_ratio = block.bbox.width / page_bbox.width
+        width_ratio = block.bbox.width / page_width
 
         return self.scale(width_ratio)
 
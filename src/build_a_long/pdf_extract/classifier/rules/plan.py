@@ -0,0 +1,100 @@
+"""Compiled evaluation plan for a list of rules."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from build_a_long.pdf_extract.classifier.rules.base import (
+    IsInstanceFilter,
+    Rule,
+    RuleContext,
+)
+from build_a_long.pdf_extract.extractor.page_blocks import Block
+
+
+@dataclass(frozen=True)
+class RuleEvaluation:
+    """The outcome of evaluating a rule list against a block that passed."""
+
+    components: dict[str, float]
+    """Rule name to score, in rule order, for every rule that applied."""
+
+    score: float
+    """Weighted average of the component scores."""
+
+
+@dataclass(frozen=True)
+class RulePlan:
+    """A rule list prepared for evaluation over a whole page.
+
+    Most classifiers start their rules with a required `IsInstanceFilter`,
+    which rejects the vast majority of blocks on a page. The plan hoists that
+    filter out of the per-block loop: `candidate_blocks()` uses the page's
+    shared partition of blocks by type, and only those blocks are evaluated
+    against the remaining rules.
+
+    Evaluation is otherwise identical to running every rule in order on every
+    block: the remaining rules keep their order (later rules may rely on
+    earlier ones having passed), and the hoisted filter still appears in the
+    score components at its original position.
+    """
+
+    rules: tuple[Rule, ...]
+    block_type: type[Block] | tuple[type[Block], ...] | None
+    """The type partition that candidate blocks are drawn from, if any."""
+
+    hoisted: Rule | None
+    """The required type filter satisfied by every candidate block."""
+
+    @classmethod
+    def compile(cls, rules: Sequence[Rule]) -> RulePlan:
+        """Build a plan for the given rules.
+
+        Only the first required `IsInstanceFilter` is hoisted. Any other
+        type filters are cheap and are evaluated in place.
+        """
+        hoisted = next(
+            (r for r in rules if isinstance(r, IsInstanceFilter) and r.required),
+            None,
+        )
+        return cls(
+            rules=tuple(rules),
+            block_type=hoisted.block_type if hoisted is not None else None,
+            hoisted=hoisted,
+        )
+
+    def candidate_blocks(self, context: RuleContext) -> Sequence[Block]:
+        """Return the blocks that can pass the hoisted filter, in page order."""
+        if self.block_type is None:
+            return context.page_data.blocks
+        return context.blocks_of_type(self.block_type)
+
+    def evaluate(self, block: Block, context: RuleContext) -> RuleEvaluation | None:
+        """Evaluate the rules against a block from `candidate_blocks()`.
+
+        Returns:
+            The components and weighted score, or None if a required rule
+            scored 0.0.
+        """
+        components: dict[str, float] = {}
+        weighted_sum = 0.0
+        total_weight = 0.0
+
+        for rule in self.rules:
+            score = 1.0 if rule is self.hoisted else rule.calculate(block, context)
+
+            # If rule returns None, it's skipped (not applicable)
+            if score is None:
+                continue
+
+            # If required rule fails (score 0), fail the block immediately
+            if rule.required and score == 0.0:
+                return None
+
+            weighted_sum += score * rule.weight
+            total_weight += rule.weight
+            components[rule.name] = score
+
+        final_score = weighted_sum / total_weight if total_weight > 0 else 0.0
+        return RuleEvaluation(components=components, score=final_score)
@@ -0,0 +1,129 @@
+"""Tests for compiled rule plans."""
+
+from __future__ import annotations
+
+from build_a_long.pdf_extract.classifier.classification_result import (
+    ClassificationResult,
+)
+from build_a_long.pdf_extract.classifier.classifier_config import ClassifierConfig
+from build_a_long.pdf_extract.classifier.rules.base import (
+    IsInstanceFilter,
+    Rule,
+    RuleContext,
+)
+from build_a_long.pdf_extract.classifier.rules.plan import RulePlan
+from build_a_long.pdf_extract.extractor import PageData
+from build_a_long.pdf_extract.extractor.bbox import BBox
+from build_a_long.pdf_extract.extractor.page_blocks import Block, Drawing, Image, Text
+
+
+class RecordingRule(Rule):
+    """Rule that scores blocks by id and records which blocks it saw."""
+
+    def __init__(self, name: str = "Recording", required: bool = False):
+        self.name = name
+        self.required = required
+        self.seen: list[int] = []
+
+    def calculate(self, block: Block, context: RuleContext) -> float | None:
+        self.seen.append(block.id)
+        return 0.0 if block.id % 2 else 0.5
+
+
+def _context() -> RuleContext:
+    page_data = PageData(
+        page_number=1,
+        bbox=BBox(0, 0, 100, 100),
+        blocks=[
+            Text(id=0, bbox=BBox(0, 0, 10, 10), text="a"),
+            Drawing(id=1, bbox=BBox(0, 0, 10, 10)),
+            Text(id=2, bbox=BBox(0, 0, 10, 10), text="b"),
+            Image(id=3, bbox=BBox(0, 0, 10, 10)),
+            Text(id=4, bbox=BBox(0, 0, 10, 10), text="c"),
+            Text(id=5, bbox=BBox(0, 0, 10, 10), text="d"),
+        ],
+    )
+    return RuleContext(
+        page_data, ClassifierConfig(), ClassificationResult(page_data=page_data)
+    )
+
+
+def _evaluate_all(rules: list[Rule], context: RuleContext) -> dict[int, object]:
+    """Evaluate every rule on every block, the way scoring used to."""
+    results: dict[int, object] = {}
+    for block in context.page_data.blocks:
+        components = {}
+        weighted_sum = total_weight = 0.0
+        for rule in rules:
+            score = rule.calculate(block, context)
+            if score is None:
+                continue
+            if rule.required and score == 0.0:
+                break
+            weighted_sum += score * rule.weight
+            total_weight += rule.weight
+            components[rule.name] = score
+        else:
+            final = weighted_sum / total_weight if total_weight > 0 else 0.0
+            results[block.id] = (list(components.items()), final)
+    return results
+
+
+def test_plan_only_visits_blocks_of_hoisted_type() -> None:
+    context = _context()
+    recording = RecordingRule()
+    plan = RulePlan.compile([IsInstanceFilter(Text), recording])
+
+    blocks = plan.candidate_blocks(context)
+    assert [b.id for b in blocks] == [0, 2, 4, 5]
+    for block in blocks:
+        plan.evaluate(block, context)
+    assert recording.seen == [0, 2, 4, 5]
+
+
+def test_plan_matches_evaluating_every_block() -> None:
+    context = _context()
+    rules: list[Rule] = [
+        RecordingRule("Before"),
+        IsInstanceFilter((Text, Image)),
+        RecordingRule("Required", required=True),
+        RecordingRule("After"),
+    ]
+    plan = RulePlan.compile(rules)
+
+    results = {}
+    for block in plan.candidate_blocks(context):
+        evaluation = plan.evaluate(block, context)
+        if evaluation is not None:
+            results[block.id] = (list(evaluation.components.items()), evaluation.score)
+
+    assert results == _evaluate_all(rules, context)
+    # The hoisted filter keeps its place in the components
+    assert [name for name, _ in results[0][0]] == [
+        "Before",
+        "IsInstance(Text|Image)",
+        "Required",
+        "After",
+    ]
+
+
+def test_plan_without_type_filter_visits_every_block() -> None:
+    context = _context()
+    plan = RulePlan.compile([RecordingRule()])
+    assert plan.block_type is None
+    assert list(plan.candidate_blocks(context)) == list(context.page_data.blocks)
+
+
+def test_context_caches_page_values() -> None:
+    context = _context()
+    assert context.page_width == 100
+    assert context.page_area == 100 * 100
+    assert context.page_number_bbox is None
+
+    drawings = context.blocks_of_type(Drawing)
+    assert [b.id for b in drawings] == [1]
+    # Shared with other contexts for the same page
+    other = RuleContext(
+        context.page_data, context.config, context.classification_result
+    )
+    assert other.blocks_of_type(Drawing) is drawings
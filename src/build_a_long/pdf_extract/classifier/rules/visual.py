@@ -74,6 +74,6 @@ class CurveCountRule(Rule):
             return 0.0
 
         # 'c' indicates a curve operation in the drawing path
-        curve_count = sum(1 for item in block.items if item[0] == "c")
+        curve_count = block.items.count_command("c")
 
         return 1.0 if curve_count >= self.min_count else 0.0
@@ -30,6 +30,7 @@ from __future__ import annotations
 
 import logging
 import math
+from collections.abc import Sequence
 from typing import ClassVar
 
 from pydantic import BaseModel
@@ -327,13 +328,14 @@ class ArrowClassifier(LabelClassifier):
             return None
 
         # Must have 3-5 line items forming the shape
-        line_items = [item for item in items if item[0] == "l"]
-        if len(line_items) < 3 or len(line_items) > 5:
+        line_count = items.count_command("l")
+        if line_count < 3 or line_count > 5:
             return None
 
         # All items should be lines (no curves, rectangles, etc.)
-        if len(line_items) != len(items):
+        if line_count != len(items):
             return None
+        line_items = list(items)
 
         # Extract unique points from line items
         points = extract_unique_points(line_items)
@@ -457,11 +459,11 @@ class ArrowClassifier(LabelClassifier):
                 continue
 
             # Reject if there are curve items - those are typically not shafts
-            if any(item[0] == "c" for item in items):
+            if items.count_command("c"):
                 continue
 
             # For thin rectangles, check thickness constraint
-            if len(items) == 1 and items[0][0] == "re":
+            if len(items) == 1 and items.command(0) == "re":
                 bbox = drawing.bbox
                 thickness = min(bbox.width, bbox.height)
                 if thickness > max_shaft_thickness:
@@ -515,9 +517,7 @@ class ArrowClassifier(LabelClassifier):
             return (best_shaft, best_tail)
         return None
 
-    def _extract_path_points(
-        self, items: tuple[tuple, ...] | list[tuple]
-    ) -> list[tuple[float, float]]:
+    def _extract_path_points(self, items: Sequence[tuple]) -> list[tuple[float, float]]:
         """Extract all unique points from path items.
 
         Args:
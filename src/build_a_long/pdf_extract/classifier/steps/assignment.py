@@ -0,0 +1,202 @@
+"""Vectorized cost matrices for the step assignment phases.
+
+`StepClassifier.build_all` matches its steps with diagrams, subassemblies
+and rotation symbols, and `SubStepClassifier` pairs substep numbers with
+diagrams. Each phase is a Hungarian matching over a cost matrix. The helpers
+here build those matrices with NumPy over arrays of bbox coordinates, rather
+than scoring each pair in Python, and give exactly the values the per-pair
+functions in `pairing` do.
+
+Matrices depend only on the geometry they were computed from, so phases can
+cache them per page with `ClassificationResult.memoize`, keyed by that
+geometry (see `memoized`). Rebuilding a page whose steps did not move, as a
+config sweep does once per setting, then reuses them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Sequence
+from typing import NamedTuple, Protocol
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from build_a_long.pdf_extract.extractor.bbox import BBox
+
+
+class Memoize(Protocol):
+    """`ClassificationResult.memoize`, or anything with the same signature."""
+
+    def __call__[T](self, key: Hashable, factory: Callable[[], T]) -> T: ...
+
+
+def memoized[T](memoize: Memoize | None, key: Hashable, factory: Callable[[], T]) -> T:
+    """Compute a value through ``memoize``, or directly if it is None.
+
+    Args:
+        memoize: Per-page cache, e.g. `ClassificationResult.memoize`.
+        key: Must identify everything ``factory`` depends on, e.g. the
+            bboxes and settings a matrix is computed from.
+        factory: Computes the value. It must not be modified afterwards.
+    """
+    if memoize is None:
+        return factory()
+    return memoize(key, factory)
+
+
+def bbox_array(bboxes: Sequence[BBox]) -> np.ndarray:
+    """Stack bboxes into an (n, 4) array of (x0, y0, x1, y1) rows."""
+    if not bboxes:
+        return np.empty((0, 4))
+    return np.array([(b.x0, b.y0, b.x1, b.y1) for b in bboxes], dtype=np.float64)
+
+
+def centers(boxes: np.ndarray) -> np.ndarray:
+    """Centers of an (n, 4) bbox array, as an (n, 2) array (see `BBox.center`)."""
+    return (boxes[:, :2] + boxes[:, 2:]) / 2.0
+
+
+def distance_matrix(points1: np.ndarray, points2: np.ndarray) -> np.ndarray:
+    """Euclidean distances between two sets of points.
+
+    Args:
+        points1: (n, 2) array of points.
+        points2: (m, 2) array of points.
+
+    Returns:
+        (n, m) array of distances.
+    """
+    dx = points1[:, 0, None] - points2[None, :, 0]
+    dy = points1[:, 1, None] - points2[None, :, 1]
+    return np.sqrt(dx**2 + dy**2)
+
+
+def _contains(outer: np.ndarray, inner: np.ndarray) -> np.ndarray:
+    """`BBox.contains` for every (outer, inner) pair, as an (n, k) array."""
+    return (
+        (inner[None, :, 0] >= outer[:, 0, None])
+        & (inner[None, :, 1] >= outer[:, 1, None])
+        & (inner[None, :, 2] <= outer[:, 2, None])
+        & (inner[None, :, 3] <= outer[:, 3, None])
+    )
+
+
+def _edge_hits(
+    start: np.ndarray,
+    delta: np.ndarray,
+    edge: np.ndarray,
+    other_start: np.ndarray,
+    other_delta: np.ndarray,
+    other_lo: np.ndarray,
+    other_hi: np.ndarray,
+) -> np.ndarray:
+    """Whether segments meet an axis-aligned box edge (see `BBox.line_intersects`).
+
+    The edge is at ``edge`` on one axis and spans ``[other_lo, other_hi]`` on
+    the other; the segments start at ``start`` and move ``delta`` along the
+    first axis.
+    """
+    t = (edge - start) / delta
+    at_t = other_start + t * other_delta
+    moving = delta != 0
+    return moving & (t >= 0) & (t <= 1) & (other_lo <= at_t) & (at_t <= other_hi)
+
+
+def segments_cross_boxes(
+    starts: np.ndarray, ends: np.ndarray, boxes: np.ndarray
+) -> np.ndarray:
+    """`BBox.line_intersects` for every segment against every box.
+
+    Follows `BBox.line_intersects` step for step with the same float
+    operations, so the results are identical: a segment crosses a box if
+    either endpoint is inside it, or, unless both endpoints are beyond the
+    same side of it, if the segment meets one of its edges.
+
+    Args:
+        starts: (..., 2) array of segment start points.
+        ends: (..., 2) array of segment end points, broadcastable with
+            ``starts``.
+        boxes: (k, 4) array of boxes (see `bbox_array`).
+
+    Returns:
+        (..., k) boolean array.
+    """
+    x1, y1 = starts[..., 0, None], starts[..., 1, None]
+    x2, y2 = ends[..., 0, None], ends[..., 1, None]
+    bx0, by0, bx1, by1 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+
+    start_inside = (bx0 <= x1) & (x1 <= bx1) & (by0 <= y1) & (y1 <= by1)
+    end_inside = (bx0 <= x2) & (x2 <= bx1) & (by0 <= y2) & (y2 <= by1)
+    beyond_one_side = (
+        ((x1 < bx0) & (x2 < bx0))
+        | ((x1 > bx1) & (x2 > bx1))
+        | ((y1 < by0) & (y2 < by0))
+        | ((y1 > by1) & (y2 > by1))
+    )
+
+    # Like Python floats, overflow to inf (and divide by zero, for segments
+    # parallel to an edge, which are then excluded) without raising
+    with np.errstate(all="ignore"):
+        dx = x2 - x1
+        dy = y2 - y1
+        edges = (
+            _edge_hits(x1, dx, bx0, y1, dy, by0, by1)
+            | _edge_hits(x1, dx, bx1, y1, dy, by0, by1)
+            | _edge_hits(y1, dy, by0, x1, dx, bx0, bx1)
+            | _edge_hits(y1, dy, by1, x1, dx, bx0, bx1)
+        )
+    return start_inside | end_inside | (~beyond_one_side & edges)
+
+
+def divider_crossings(
+    bboxes1: Sequence[BBox],
+    bboxes2: Sequence[BBox],
+    divider_bboxes: Sequence[BBox],
+) -> np.ndarray:
+    """`pairing.has_divider_between` for every pair of bboxes.
+
+    Tests the segment joining each pair's centers against every divider in
+    one pass (see `segments_cross_boxes`), ignoring dividers contained in
+    either bbox of the pair.
+
+    Returns:
+        (n, m) boolean array, True where a divider lies between
+        ``bboxes1[i]`` and ``bboxes2[j]``.
+    """
+    if not divider_bboxes or not bboxes1 or not bboxes2:
+        return np.zeros((len(bboxes1), len(bboxes2)), dtype=bool)
+
+    boxes1 = bbox_array(bboxes1)
+    boxes2 = bbox_array(bboxes2)
+    dividers = bbox_array(divider_bboxes)
+
+    # (n, m, k): dividers inside either bbox of the pair do not separate it
+    separating = ~(
+        _contains(boxes1, dividers)[:, None, :] | _contains(boxes2, dividers)[None]
+    )
+    crosses = segments_cross_boxes(
+        centers(boxes1)[:, None, :], centers(boxes2)[None, :, :], dividers
+    )
+    return (separating & crosses).any(axis=2)
+
+
+class Assignment(NamedTuple):
+    """A Hungarian matching of rows to columns of a cost matrix."""
+
+    cost: np.ndarray
+    """The (unthresholded) cost matrix."""
+    rows: np.ndarray
+    cols: np.ndarray
+    """``rows[i]`` is matched with ``cols[i]``."""
+
+
+def assign_within(cost: np.ndarray, max_cost: float) -> Assignment:
+    """Match rows to columns, avoiding pairs that cost more than ``max_cost``.
+
+    Costs above ``max_cost`` are raised to ``10 * max_cost`` for the matching,
+    so such pairs are only matched when nothing else is left. Callers should
+    still skip matched pairs whose cost is above ``max_cost``.
+    """
+    high_cost = max_cost * 10
+    rows, cols = linear_sum_assignment(np.where(cost > max_cost, high_cost, cost))
+    return Assignment(cost, rows, cols)
@@ -0,0 +1,166 @@
+"""Tests for the vectorized assignment cost helpers."""
+
+import numpy as np
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from build_a_long.pdf_extract.classifier.steps.assignment import (
+    assign_within,
+    bbox_array,
+    centers,
+    distance_matrix,
+    divider_crossings,
+    memoized,
+    segments_cross_boxes,
+)
+from build_a_long.pdf_extract.classifier.steps.pairing import has_divider_between
+from build_a_long.pdf_extract.extractor.bbox import BBox
+
+# Coordinates on a coarse grid so that dividers touching or containing the
+# bboxes, and segments along divider edges, are all common.
+_coords = st.integers(min_value=0, max_value=20).map(float)
+
+
+# Any finite coordinates, including huge, tiny and negative zero ones
+_any_coords = st.floats(allow_nan=False, allow_infinity=False)
+
+
+@st.composite
+def _bboxes(draw, coords=_coords) -> BBox:
+    x0, x1 = sorted((draw(coords), draw(coords)))
+    y0, y1 = sorted((draw(coords), draw(coords)))
+    return BBox(x0, y0, x1, y1)
+
+
+def _points(coords=_coords):
+    return st.tuples(coords, coords)
+
+
+def test_bbox_array_and_centers() -> None:
+    boxes = bbox_array([BBox(0, 0, 10, 20), BBox(5, 5, 6, 8)])
+
+    assert boxes.shape == (2, 4)
+    assert centers(boxes).tolist() == [[5.0, 10.0], [5.5, 6.5]]
+    assert bbox_array([]).shape == (0, 4)
+
+
+def test_distance_matrix() -> None:
+    points = np.array([[0.0, 0.0], [3.0, 0.0]])
+
+    distances = distance_matrix(points, np.array([[3.0, 4.0]]))
+
+    assert distances.tolist() == [[5.0], [4.0]]
+
+
+def test_segments_cross_boxes() -> None:
+    boxes = bbox_array([BBox(10, 10, 20, 20), BBox(40, 0, 50, 5)])
+    starts = np.array([[0.0, 15.0], [0.0, 0.0], [15.0, 15.0]])
+    ends = np.array([[30.0, 15.0], [30.0, 5.0], [15.0, 15.0]])
+
+    crosses = segments_cross_boxes(starts, ends, boxes)
+
+    assert crosses.tolist() == [[True, False], [False, False], [True, False]]
+    # Starts and ends broadcast against each other
+    assert segments_cross_boxes(starts[:, None], ends[None], boxes).shape == (3, 3, 2)
+
+
+def _check_segments_cross_boxes(
+    segments: list[tuple[tuple[float, float], tuple[float, float]]],
+    bboxes: list[BBox],
+) -> None:
+    starts = np.array([start for start, _ in segments], dtype=np.float64)
+    ends = np.array([end for _, end in segments], dtype=np.float64)
+
+    crosses = segments_cross_boxes(starts, ends, bbox_array(bboxes))
+
+    assert crosses.tolist() == [
+        [bbox.line_intersects(start, end) for bbox in bboxes] for start, end in segments
+    ]
+
+
+@settings(max_examples=500)
+@given(
+    st.lists(st.tuples(_points(), _points()), min_size=1, max_size=8),
+    st.lists(_bboxes(), min_size=1, max_size=4),
+)
+def test_segments_cross_boxes_matches_line_intersects_on_grid(
+    segments: list[tuple[tuple[float, float], tuple[float, float]]],
+    bboxes: list[BBox],
+) -> None:
+    _check_segments_cross_boxes(segments, bboxes)
+
+
+@settings(max_examples=500)
+@given(
+    st.lists(
+        st.tuples(_points(_any_coords), _points(_any_coords)), min_size=1, max_size=8
+    ),
+    st.lists(_bboxes(_any_coords), min_size=1, max_size=4),
+)
+def test_segments_cross_boxes_matches_line_intersects(
+    segments: list[tuple[tuple[float, float], tuple[float, float]]],
+    bboxes: list[BBox],
+) -> None:
+    _check_segments_cross_boxes(segments, bboxes)
+
+
+def test_divider_crossings() -> None:
+    left = BBox(0, 0, 10, 10)
+    right = BBox(30, 0, 40, 10)
+    below = BBox(0, 30, 10, 40)
+    divider = BBox(19, -100, 21, 100)
+
+    crossings = divider_crossings([left], [right, below], [divider])
+
+    assert crossings.tolist() == [[True, False]]
+    # A divider inside one of the bboxes does not separate them
+    assert not divider_crossings([left], [BBox(15, -200, 40, 200)], [divider]).any()
+    assert divider_crossings([left], [right], []).shape == (1, 1)
+
+
+@settings(max_examples=300)
+@given(
+    st.lists(_bboxes(), max_size=6),
+    st.lists(_bboxes(), max_size=6),
+    st.lists(_bboxes(), max_size=4),
+)
+def test_divider_crossings_match_has_divider_between(
+    bboxes1: list[BBox], bboxes2: list[BBox], dividers: list[BBox]
+) -> None:
+    crossings = divider_crossings(bboxes1, bboxes2, dividers)
+
+    assert crossings.tolist() == [
+        [has_divider_between(b1, b2, dividers) for b2 in bboxes2] for b1 in bboxes1
+    ]
+
+
+def test_assign_within_prefers_pairs_under_max_cost() -> None:
+    cost = np.array([[1.0, 50.0], [2.0, 200.0]])
+
+    assignment = assign_within(cost, max_cost=100.0)
+
+    # Matching row 0 with column 1 costs more in total, but keeps every
+    # matched pair under max_cost
+    assert sorted(zip(assignment.rows, assignment.cols, strict=True)) == [
+        (0, 1),
+        (1, 0),
+    ]
+    assert assignment.cost is cost
+
+
+def test_memoized() -> None:
+    cache: dict[object, object] = {}
+    calls: list[int] = []
+
+    def memoize(key, factory):
+        if key not in cache:
+            cache[key] = factory()
+        return cache[key]
+
+    def factory() -> int:
+        calls.append(1)
+        return len(calls)
+
+    assert memoized(memoize, "key", factory) == 1
+    assert memoized(memoize, "key", factory) == 1
+    assert memoized(None, "key", factory) == 2
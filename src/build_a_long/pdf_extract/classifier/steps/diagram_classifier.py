@@ -49,16 +49,14 @@ from build_a_long.pdf_extract.classifier.label_classifier import (
     LabelClassifier,
 )
 from build_a_long.pdf_extract.classifier.score import Score, Weight
-from build_a_long.pdf_extract.extractor.bbox import (
-    BBox,
-    build_connected_cluster,
-)
+from build_a_long.pdf_extract.extractor.bbox import BBox
 from build_a_long.pdf_extract.extractor.lego_page_elements import (
     Diagram,
 )
 from build_a_long.pdf_extract.extractor.page_blocks import (
     Image,
 )
+from build_a_long.pdf_extract.extractor.spatial_index import OverlapGraph
 
 log = logging.getLogger(__name__)
 
@@ -200,12 +198,13 @@ class DiagramClassifier(LabelClassifier):
         # This ensures bbox matches source_blocks as required by the assertion
         diagram_bbox = BBox.union_all([b.bbox for b in candidate.source_blocks])
 
-        log.debug(
-            "[diagram] Building diagram at %s (clustered %d images%s)",
-            diagram_bbox,
-            len(clustered_blocks),
-            f", constrained to {constraint_bbox}" if constraint_bbox else "",
-        )
+        if result.trace is not None:
+            result.trace.record(
+                "diagram.build",
+                bbox=diagram_bbox,
+                images=len(clustered_blocks),
+                constraint=constraint_bbox,
+            )
 
         return Diagram(bbox=diagram_bbox)
 
@@ -218,7 +217,10 @@ class DiagramClassifier(LabelClassifier):
         """Expand from a seed image to include all adjacent unclaimed images.
 
         Uses flood-fill to find all images that are adjacent/overlapping
-        and not yet consumed by another classifier.
+        and not yet consumed by another classifier. The overlap graph of the
+        page's images is built once per page and shared by every build; the
+        consumed and constraint checks are applied while walking it, so the
+        result reflects the current state (including rollbacks).
 
         Args:
             seed_block: The starting image block
@@ -230,40 +232,30 @@ class DiagramClassifier(LabelClassifier):
         Returns:
             List of all images in the cluster (including seed)
         """
-        # Get all unclaimed image blocks on the page
-        log.debug(
-            "[diagram] _expand_cluster: seed=%d at %s, consumed_blocks=%s%s",
-            seed_block.id,
-            seed_block.bbox,
-            sorted(result._consumed_blocks),
-            f", constraint={constraint_bbox}" if constraint_bbox else "",
+        if result.trace is not None:
+            result.trace.record(
+                "diagram.expand",
+                seed=seed_block.id,
+                bbox=seed_block.bbox,
+                consumed=sorted(result._consumed_blocks),
+                constraint=constraint_bbox,
+            )
+        graph = result.memoize(
+            "diagram.image_overlap_graph",
+            lambda: OverlapGraph(
+                [b for b in result.page_data.blocks if isinstance(b, Image)]
+            ),
         )
-        unclaimed_images: list[Image] = []
-        for block in result.page_data.blocks:
-            if not isinstance(block, Image):
-                continue
-            # Skip if already consumed
-            if block.id in result._consumed_blocks:
-                # log.debug(
-                #    "[diagram] Skipping consumed image id=%d at %s",
-                #    block.id,
-                #    block.bbox,
-                # )
-                continue
-            # Skip if outside constraint bbox
-            if constraint_bbox and not constraint_bbox.contains(block.bbox):
-                log.debug(
-                    "[diagram] Skipping image id=%d at %s (outside constraint %s)",
-                    block.id,
-                    block.bbox,
-                    constraint_bbox,
-                )
-                continue
-            unclaimed_images.append(block)
+        if graph.index_of(seed_block) is None:
+            # Seed is not one of this page's images (shouldn't happen)
+            return [seed_block]
 
-        if seed_block not in unclaimed_images:
+        cluster = graph.cluster(
+            seed_block,
+            available=lambda block: block.id not in result._consumed_blocks,
+            within=constraint_bbox,
+        )
+        if not cluster:
             # Seed was already consumed (shouldn't happen, but be safe)
             return [seed_block]
-
-        # Build cluster from unclaimed images starting at seed
-        return build_connected_cluster(seed_block, unclaimed_images)
+        return cluster
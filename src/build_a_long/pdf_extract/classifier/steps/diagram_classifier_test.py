@@ -188,6 +188,37 @@ class TestDiagramBuilding:
         # Should only contain img1 (img2 is consumed, so img3 is not reachable)
         assert diagram.bbox == img1.bbox
 
+    def test_build_respects_constraint_and_released_blocks(
+        self, classifier: DiagramClassifier
+    ) -> None:
+        """Test that the shared cluster index follows the current state."""
+        page_bbox = BBox(0, 0, 300, 300)
+        img1 = Image(id=1, bbox=BBox(10, 10, 60, 60))
+        img2 = Image(id=2, bbox=BBox(50, 10, 100, 60))  # Overlaps img1
+        img3 = Image(id=3, bbox=BBox(90, 10, 200, 60))  # Overlaps img2
+
+        page_data = PageData(
+            page_number=1,
+            blocks=[img1, img2, img3],
+            bbox=page_bbox,
+        )
+        result = ClassificationResult(page_data=page_data)
+        classifier.score(result)
+
+        # img3 is outside the constraint, so it is neither included nor used
+        # as a bridge.
+        assert classifier._expand_cluster(img1, result, BBox(0, 0, 150, 100)) == [
+            img1,
+            img2,
+        ]
+
+        result._consumed_blocks.add(img2.id)
+        assert classifier._expand_cluster(img1, result) == [img1]
+
+        # Releasing the block (e.g. after a rollback) reconnects the cluster
+        result._consumed_blocks.discard(img2.id)
+        assert classifier._expand_cluster(img1, result) == [img1, img2, img3]
+
     def test_separate_images_build_separately(
         self, classifier: DiagramClassifier
     ) -> None:
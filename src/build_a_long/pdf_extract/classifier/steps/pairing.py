@@ -15,12 +15,21 @@ The pairing follows LEGO instruction conventions:
 from __future__ import annotations
 
 import logging
+import math
 from collections.abc import Sequence
+from typing import NamedTuple
 
 import numpy as np
 from pydantic import BaseModel
 from scipy.optimize import linear_sum_assignment
 
+from build_a_long.pdf_extract.classifier.steps.assignment import (
+    Memoize,
+    bbox_array,
+    centers,
+    divider_crossings,
+    memoized,
+)
 from build_a_long.pdf_extract.extractor.bbox import BBox
 
 log = logging.getLogger(__name__)
@@ -119,9 +128,11 @@ def calculate_position_score(
         y_score = max(0.0, 0.5 - (excess / tolerance) * 0.5)  # Decay to 0.0
 
     # Bonus for being near the top-left corner of the diagram
-    dist_to_top_left = (
-        (step_center_x - diag_x0) ** 2 + (step_center_y - diag_y0) ** 2
-    ) ** 0.5
+    # Squares are written as products (and roots with math.sqrt) so that
+    # position_score_matrix, in NumPy, gives exactly the same scores
+    corner_dx = step_center_x - diag_x0
+    corner_dy = step_center_y - diag_y0
+    dist_to_top_left = math.sqrt(corner_dx * corner_dx + corner_dy * corner_dy)
 
     if dist_to_top_left <= tolerance:
         # Near top-left corner - bonus that decays with distance
@@ -131,7 +142,7 @@ def calculate_position_score(
 
     # Combined score: geometric mean of x and y scores, plus corner bonus
     # Geometric mean ensures both axes need to be reasonable
-    base_score = (x_score * y_score) ** 0.5
+    base_score = math.sqrt(x_score * y_score)
     final_score = min(1.0, base_score + corner_bonus)
 
     return final_score
@@ -165,9 +176,10 @@ def calculate_distance_score(
     nearest_y = max(diagram_bbox.y0, min(step_center_y, diagram_bbox.y1))
 
     # Distance from step center to nearest point on diagram
-    distance = (
-        (step_center_x - nearest_x) ** 2 + (step_center_y - nearest_y) ** 2
-    ) ** 0.5
+    # (as products, to match distance_score_matrix exactly)
+    dx = step_center_x - nearest_x
+    dy = step_center_y - nearest_y
+    distance = math.sqrt(dx * dx + dy * dy)
 
     if distance > max_distance:
         return 0.0
@@ -265,6 +277,128 @@ def calculate_pairing_cost(
     return -total_score
 
 
+def _axis_scores(offset: np.ndarray, tolerance: float) -> np.ndarray:
+    """The per-axis score of `calculate_position_score`, for an offset array."""
+    return np.where(
+        offset <= 0,
+        1.0,
+        np.where(
+            offset <= tolerance,
+            1.0 - (offset / tolerance) * 0.5,
+            np.maximum(0.0, 0.5 - ((offset - tolerance) / tolerance) * 0.5),
+        ),
+    )
+
+
+def position_score_matrix(
+    step_boxes: np.ndarray,
+    diagram_boxes: np.ndarray,
+    tolerance: float = 100.0,
+) -> np.ndarray:
+    """`calculate_position_score` for every (step, diagram) pair.
+
+    Args:
+        step_boxes: (n, 4) array of step number bboxes (see `bbox_array`)
+        diagram_boxes: (m, 4) array of diagram bboxes
+        tolerance: As for `calculate_position_score`
+
+    Returns:
+        (n, m) array of scores
+    """
+    step_centers = centers(step_boxes)
+    diagram_centers = centers(diagram_boxes)
+    step_x = step_centers[:, 0, None]
+    step_y = step_centers[:, 1, None]
+
+    x_score = _axis_scores(step_x - diagram_centers[None, :, 0], tolerance)
+    y_score = _axis_scores(step_y - diagram_centers[None, :, 1], tolerance)
+
+    dist_to_top_left = np.sqrt(
+        (step_x - diagram_boxes[None, :, 0]) ** 2
+        + (step_y - diagram_boxes[None, :, 1]) ** 2
+    )
+    corner_bonus = np.where(
+        dist_to_top_left <= tolerance,
+        0.2 * (1.0 - dist_to_top_left / tolerance),
+        0.0,
+    )
+    return np.minimum(1.0, np.sqrt(x_score * y_score) + corner_bonus)
+
+
+def distance_score_matrix(
+    step_boxes: np.ndarray,
+    diagram_boxes: np.ndarray,
+    max_distance: float = DEFAULT_MAX_PAIRING_DISTANCE,
+) -> np.ndarray:
+    """`calculate_distance_score` for every (step, diagram) pair.
+
+    Args:
+        step_boxes: (n, 4) array of step number bboxes (see `bbox_array`)
+        diagram_boxes: (m, 4) array of diagram bboxes
+        max_distance: As for `calculate_distance_score`
+
+    Returns:
+        (n, m) array of scores
+    """
+    step_centers = centers(step_boxes)
+    step_x = step_centers[:, 0, None]
+    step_y = step_centers[:, 1, None]
+    nearest_x = np.maximum(
+        diagram_boxes[None, :, 0], np.minimum(step_x, diagram_boxes[None, :, 2])
+    )
+    nearest_y = np.maximum(
+        diagram_boxes[None, :, 1], np.minimum(step_y, diagram_boxes[None, :, 3])
+    )
+    distance = np.sqrt((step_x - nearest_x) ** 2 + (step_y - nearest_y) ** 2)
+    return np.where(distance > max_distance, 0.0, 1.0 - distance / max_distance)
+
+
+class PairingCosts(NamedTuple):
+    """Cost and score matrices for pairing step numbers with diagrams.
+
+    Each is an (n_steps, n_diagrams) array.
+    """
+
+    cost: np.ndarray
+    """`calculate_pairing_cost` of each pair; infinite for invalid pairs."""
+    position: np.ndarray
+    """`calculate_position_score` of each pair."""
+    distance: np.ndarray
+    """`calculate_distance_score` of each pair."""
+
+
+def pairing_costs(
+    step_bboxes: Sequence[BBox],
+    diagram_bboxes: Sequence[BBox],
+    config: PairingConfig,
+    divider_bboxes: Sequence[BBox] = (),
+) -> PairingCosts:
+    """Calculate the cost of pairing every step number with every diagram.
+
+    Gives the same values as calling `calculate_pairing_cost` for each pair.
+
+    Args:
+        step_bboxes: Bounding boxes of the step numbers
+        diagram_bboxes: Bounding boxes of the diagrams
+        config: Pairing configuration
+        divider_bboxes: Sequence of divider bboxes to check for crossing
+            (if config.check_dividers)
+    """
+    step_boxes = bbox_array(step_bboxes)
+    diagram_boxes = bbox_array(diagram_bboxes)
+    position = position_score_matrix(
+        step_boxes, diagram_boxes, config.top_left_tolerance
+    )
+    distance = distance_score_matrix(step_boxes, diagram_boxes, config.max_distance)
+
+    invalid = (position <= 0) | (distance <= 0)
+    if config.check_dividers and divider_bboxes:
+        invalid |= divider_crossings(step_bboxes, diagram_bboxes, divider_bboxes)
+
+    total = config.position_weight * position + config.distance_weight * distance
+    return PairingCosts(np.where(invalid, np.inf, -total), position, distance)
+
+
 class PairingResult(BaseModel, frozen=True):
     """Result of a step-diagram pairing.
 
@@ -288,6 +422,8 @@ def find_optimal_pairings(
     diagram_bboxes: list[BBox],
     config: PairingConfig | None = None,
     divider_bboxes: Sequence[BBox] = (),
+    *,
+    memoize: Memoize | None = None,
 ) -> list[PairingResult]:
     """Find optimal pairings between step numbers and diagrams.
 
@@ -299,6 +435,8 @@ def find_optimal_pairings(
         diagram_bboxes: List of diagram bounding boxes
         config: Pairing configuration (uses defaults if None)
         divider_bboxes: Sequence of divider bboxes to check for crossing
+        memoize: Per-page cache (e.g. `ClassificationResult.memoize`) to
+            reuse the pairings found for the same bboxes and config
 
     Returns:
         List of PairingResult objects for valid pairings
@@ -306,32 +444,47 @@ def find_optimal_pairings(
     if config is None:
         config = PairingConfig()
 
-    n_steps = len(step_bboxes)
-    n_diagrams = len(diagram_bboxes)
-
-    if n_steps == 0 or n_diagrams == 0:
+    if not step_bboxes or not diagram_bboxes:
         return []
 
-    # Build cost matrix
-    cost_matrix = np.full((n_steps, n_diagrams), np.inf)
+    key = (
+        "pairing.find_optimal_pairings",
+        tuple(step_bboxes),
+        tuple(diagram_bboxes),
+        config,
+        tuple(divider_bboxes),
+    )
+    return list(
+        memoized(
+            memoize,
+            key,
+            lambda: _find_optimal_pairings(
+                step_bboxes, diagram_bboxes, config, divider_bboxes
+            ),
+        )
+    )
 
-    for i, step_bbox in enumerate(step_bboxes):
-        for j, diagram_bbox in enumerate(diagram_bboxes):
-            cost_matrix[i, j] = calculate_pairing_cost(
-                step_bbox, diagram_bbox, config, divider_bboxes
-            )
+
+def _find_optimal_pairings(
+    step_bboxes: Sequence[BBox],
+    diagram_bboxes: Sequence[BBox],
+    config: PairingConfig,
+    divider_bboxes: Sequence[BBox],
+) -> tuple[PairingResult, ...]:
+    costs = pairing_costs(step_bboxes, diagram_bboxes, config, divider_bboxes)
+    cost_matrix = costs.cost
 
     # Check if we have any valid pairings
     valid_count = np.sum(~np.isinf(cost_matrix))
     if valid_count == 0:
         log.debug("[pairing] No valid step-diagram pairs found")
-        return []
+        return ()
 
     log.debug(
         "[pairing] Found %d valid pairs for %dx%d matrix",
         valid_count,
-        n_steps,
-        n_diagrams,
+        len(step_bboxes),
+        len(diagram_bboxes),
     )
 
     # Run Hungarian algorithm
@@ -340,7 +493,7 @@ def find_optimal_pairings(
         row_indices, col_indices = linear_sum_assignment(cost_matrix)
     except ValueError as e:
         log.debug("[pairing] Hungarian algorithm failed: %s", e)
-        return []
+        return ()
 
     # Collect valid pairings
     results: list[PairingResult] = []
@@ -349,22 +502,15 @@ def find_optimal_pairings(
         if np.isinf(cost):
             continue
 
-        step_bbox = step_bboxes[row_idx]
-        diagram_bbox = diagram_bboxes[col_idx]
-
         results.append(
             PairingResult(
                 step_index=row_idx,
                 diagram_index=col_idx,
                 cost=float(cost),
-                position_score=calculate_position_score(
-                    step_bbox, diagram_bbox, config.top_left_tolerance
-                ),
-                distance_score=calculate_distance_score(
-                    step_bbox, diagram_bbox, config.max_distance
-                ),
+                position_score=float(costs.position[row_idx, col_idx]),
+                distance_score=float(costs.distance[row_idx, col_idx]),
             )
         )
 
     log.debug("[pairing] Hungarian matching produced %d valid pairings", len(results))
-    return results
+    return tuple(results)
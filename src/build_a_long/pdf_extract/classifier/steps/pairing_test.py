@@ -0,0 +1,108 @@
+"""Tests for step number to diagram pairing."""
+
+from hypothesis import example, given, settings
+from hypothesis import strategies as st
+
+from build_a_long.pdf_extract.classifier.steps.pairing import (
+    PairingConfig,
+    calculate_distance_score,
+    calculate_pairing_cost,
+    calculate_position_score,
+    find_optimal_pairings,
+    pairing_costs,
+)
+from build_a_long.pdf_extract.extractor.bbox import BBox
+
+_coords = st.floats(min_value=0, max_value=800, allow_nan=False)
+
+
+@st.composite
+def _bboxes(draw) -> BBox:
+    x0, x1 = sorted((draw(_coords), draw(_coords)))
+    y0, y1 = sorted((draw(_coords), draw(_coords)))
+    return BBox(x0, y0, x1, y1)
+
+
+_configs = st.builds(
+    PairingConfig,
+    max_distance=st.sampled_from([100.0, 500.0]),
+    position_weight=st.sampled_from([0.5, 0.8]),
+    distance_weight=st.sampled_from([0.5, 0.2]),
+    check_dividers=st.booleans(),
+    top_left_tolerance=st.sampled_from([50.0, 100.0]),
+)
+
+
+@settings(max_examples=200)
+@given(
+    st.lists(_bboxes(), max_size=6),
+    st.lists(_bboxes(), max_size=6),
+    _configs,
+    st.lists(_bboxes(), max_size=3),
+)
+# x ** 2 on a Python float can differ from x * x in the last bit
+@example(
+    steps=[BBox(0.0, 1.077531035313939, 1.0, 518.897079351266)],
+    diagrams=[BBox(0.0, 0.0, 0.0, 0.0)],
+    config=PairingConfig(),
+    dividers=[],
+)
+def test_pairing_costs_match_per_pair_functions(
+    steps: list[BBox],
+    diagrams: list[BBox],
+    config: PairingConfig,
+    dividers: list[BBox],
+) -> None:
+    costs = pairing_costs(steps, diagrams, config, dividers)
+
+    assert costs.cost.shape == (len(steps), len(diagrams))
+    for i, step in enumerate(steps):
+        for j, diagram in enumerate(diagrams):
+            assert costs.cost[i, j] == calculate_pairing_cost(
+                step, diagram, config, dividers
+            )
+            assert costs.position[i, j] == calculate_position_score(
+                step, diagram, config.top_left_tolerance
+            )
+            assert costs.distance[i, j] == calculate_distance_score(
+                step, diagram, config.max_distance
+            )
+
+
+def test_find_optimal_pairings() -> None:
+    steps = [BBox(10, 10, 20, 20), BBox(310, 10, 320, 20)]
+    diagrams = [BBox(320, 20, 500, 200), BBox(20, 20, 200, 200)]
+
+    pairings = find_optimal_pairings(steps, diagrams)
+
+    assert [(p.step_index, p.diagram_index) for p in pairings] == [(0, 1), (1, 0)]
+
+
+def test_find_optimal_pairings_avoids_dividers() -> None:
+    steps = [BBox(10, 10, 20, 20)]
+    diagrams = [BBox(20, 20, 200, 200), BBox(0, 300, 40, 400)]
+
+    assert [p.diagram_index for p in find_optimal_pairings(steps, diagrams)] == [0]
+    divided = find_optimal_pairings(
+        steps, diagrams, divider_bboxes=[BBox(50, 0, 52, 200)]
+    )
+    assert [p.diagram_index for p in divided] == [1]
+
+
+def test_find_optimal_pairings_memoize() -> None:
+    steps = [BBox(10, 10, 20, 20)]
+    diagrams = [BBox(20, 20, 200, 200)]
+    cache: dict[object, object] = {}
+
+    def memoize(key, factory):
+        if key not in cache:
+            cache[key] = factory()
+        return cache[key]
+
+    first = find_optimal_pairings(steps, diagrams, memoize=memoize)
+    second = find_optimal_pairings(list(steps), list(diagrams), memoize=memoize)
+    config = PairingConfig(max_distance=50)
+    find_optimal_pairings(steps, diagrams, config, memoize=memoize)
+
+    assert second == first == find_optimal_pairings(steps, diagrams)
+    assert len(cache) == 2
@@ -216,14 +216,13 @@ class RotationSymbolClassifier(LabelClassifier):
             # Add claimed images to source_blocks so they're marked as consumed
             candidate.source_blocks.extend(claimed_images)
 
-            log.debug(
-                "[rotation_symbol] Claimed %d additional images for rotation symbol "
-                "at %s, expanded bbox to %s, source_blocks=%s",
-                len(claimed_images),
-                candidate.bbox,
-                expanded_bbox,
-                [b.id for b in candidate.source_blocks],
-            )
+            if result.trace is not None:
+                result.trace.record(
+                    "rotation_symbol.claim",
+                    bbox=candidate.bbox,
+                    expanded=expanded_bbox,
+                    blocks=[b.id for b in candidate.source_blocks],
+                )
 
             candidate.bbox = expanded_bbox
 
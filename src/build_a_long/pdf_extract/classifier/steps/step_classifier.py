@@ -24,7 +24,6 @@ import logging
 from collections.abc import Callable, Sequence
 
 import numpy as np
-from scipy.optimize import linear_sum_assignment
 
 from build_a_long.pdf_extract.classifier.candidate import Candidate
 from build_a_long.pdf_extract.classifier.classification_result import (
@@ -42,10 +41,19 @@ from build_a_long.pdf_extract.classifier.score import (
     Weight,
     find_best_scoring,
 )
+from build_a_long.pdf_extract.classifier.steps.assignment import (
+    Assignment,
+    Memoize,
+    assign_within,
+    bbox_array,
+    centers,
+    distance_matrix,
+    divider_crossings,
+    memoized,
+)
 from build_a_long.pdf_extract.classifier.steps.pairing import (
     PairingConfig,
     find_optimal_pairings,
-    has_divider_between,
 )
 from build_a_long.pdf_extract.classifier.steps.substep_classifier import _SubStepScore
 from build_a_long.pdf_extract.extractor.bbox import BBox, filter_overlapping
@@ -413,7 +421,9 @@ class StepClassifier(LabelClassifier):
 
         # Assign diagrams to steps using Hungarian matching
         # Dividers prevent pairing across page divisions
-        assign_diagrams_to_steps(steps, available_diagrams, divider_bboxes)
+        assign_diagrams_to_steps(
+            steps, available_diagrams, divider_bboxes, memoize=result.memoize
+        )
 
         # Phase 8: Assign subassemblies to steps using Hungarian matching
         # Collect built subassemblies
@@ -432,7 +442,9 @@ class StepClassifier(LabelClassifier):
         )
 
         # Assign subassemblies to steps using Hungarian matching
-        assign_subassemblies_to_steps(steps, subassemblies, divider_bboxes)
+        assign_subassemblies_to_steps(
+            steps, subassemblies, divider_bboxes, memoize=result.memoize
+        )
 
         # Phase 8b: Get unclaimed SubSteps as naked substeps
         # SubStepClassifier found small step number + diagram pairs.
@@ -482,7 +494,9 @@ class StepClassifier(LabelClassifier):
             assert isinstance(rs_candidate.constructed, RotationSymbol)
             rotation_symbols.append(rs_candidate.constructed)
 
-        assign_rotation_symbols_to_steps(steps, rotation_symbols)
+        assign_rotation_symbols_to_steps(
+            steps, rotation_symbols, memoize=result.memoize
+        )
 
         log.debug(
             "[step] build_all complete: %d steps, %d rotation symbols assigned",
@@ -1122,6 +1136,8 @@ def assign_diagrams_to_steps(
     diagrams: list[Diagram],
     divider_bboxes: Sequence[BBox] = (),
     max_distance: float = 500.0,
+    *,
+    memoize: Memoize | None = None,
 ) -> None:
     """Assign diagrams to steps using Hungarian algorithm.
 
@@ -1139,6 +1155,8 @@ def assign_diagrams_to_steps(
         diagrams: List of Diagram objects to assign
         divider_bboxes: Sequence of divider bounding boxes to check for crossing
         max_distance: Maximum distance for a valid assignment.
+        memoize: Per-page cache (e.g. `ClassificationResult.memoize`) to reuse
+            the matching when the same steps and diagrams are assigned again
     """
     if not steps or not diagrams:
         log.debug(
@@ -1169,7 +1187,7 @@ def assign_diagrams_to_steps(
 
     # Find optimal pairings using shared logic
     pairings = find_optimal_pairings(
-        step_bboxes, diagram_bboxes, config, divider_bboxes
+        step_bboxes, diagram_bboxes, config, divider_bboxes, memoize=memoize
     )
 
     # Assign diagrams to steps based on the matching
@@ -1191,6 +1209,8 @@ def assign_subassemblies_to_steps(
     subassemblies: Sequence[SubAssembly],
     divider_bboxes: Sequence[BBox] = (),
     max_distance: float = 400.0,
+    *,
+    memoize: Memoize | None = None,
 ) -> None:
     """Assign subassemblies to steps using Hungarian algorithm.
 
@@ -1206,6 +1226,9 @@ def assign_subassemblies_to_steps(
         subassemblies: List of SubAssembly objects to assign
         divider_bboxes: Sequence of divider bounding boxes for obstruction checking
         max_distance: Maximum distance for a valid assignment
+        memoize: Per-page cache (e.g. `ClassificationResult.memoize`) to reuse
+            the matching when the same steps and subassemblies are assigned
+            again
     """
     if not steps or not subassemblies:
         log.debug(
@@ -1215,64 +1238,48 @@ def assign_subassemblies_to_steps(
         )
         return
 
-    n_steps = len(steps)
-    n_subassemblies = len(subassemblies)
-
     log.debug(
         "[step] Running Hungarian matching for subassemblies: "
         "%d steps, %d subassemblies",
-        n_steps,
-        n_subassemblies,
+        len(steps),
+        len(subassemblies),
     )
 
-    # Build cost matrix: rows = subassemblies, cols = steps
-    cost_matrix = np.zeros((n_subassemblies, n_steps))
+    # Measure from the step's diagram if it has one, otherwise from the
+    # step number (but check dividers against the step bbox)
+    sa_bboxes = tuple(sa.bbox for sa in subassemblies)
+    target_bboxes = tuple(
+        step.diagram.bbox if step.diagram else step.bbox for step in steps
+    )
+    target_centers = tuple(
+        step.diagram.bbox.center if step.diagram else step.step_number.bbox.center
+        for step in steps
+    )
     high_cost = max_distance * 10
 
-    for i, sa in enumerate(subassemblies):
-        sa_center = sa.bbox.center
-        for j, step in enumerate(steps):
-            # Use diagram center if available, otherwise step bbox center
-            if step.diagram:
-                target_bbox = step.diagram.bbox
-                target_center = target_bbox.center
-            else:
-                target_bbox = step.bbox
-                target_center = step.step_number.bbox.center
-
-            # Base cost is distance from diagram/step to subassembly center
-            distance = (
-                (target_center[0] - sa_center[0]) ** 2
-                + (target_center[1] - sa_center[1]) ** 2
-            ) ** 0.5
-
-            # Check for divider between subassembly and step's diagram
-            if has_divider_between(sa.bbox, target_bbox, divider_bboxes):
-                # High cost if there's a divider between
-                distance = high_cost
-                log.debug(
-                    "[step]   Divider between subassembly[%d] at %s and step[%d]",
-                    i,
-                    sa.bbox,
-                    step.step_number.value,
-                )
-
-            cost_matrix[i, j] = distance
-            log.debug(
-                "[step]   Cost subassembly[%d] at %s to step[%d]: %.1f",
-                i,
-                sa.bbox,
-                step.step_number.value,
-                distance,
-            )
-
-    # Apply max_distance threshold
-    cost_matrix_thresholded = np.where(
-        cost_matrix > max_distance, high_cost, cost_matrix
+    def compute() -> Assignment:
+        # Rows = subassemblies, cols = steps
+        cost_matrix = distance_matrix(
+            centers(bbox_array(sa_bboxes)), np.array(target_centers)
+        )
+        # High cost if there's a divider between a subassembly and the step
+        crossings = divider_crossings(sa_bboxes, target_bboxes, divider_bboxes)
+        cost_matrix[crossings] = high_cost
+        return assign_within(cost_matrix, max_distance)
+
+    cost_matrix, row_indices, col_indices = memoized(
+        memoize,
+        (
+            "step.assign_subassemblies",
+            sa_bboxes,
+            target_bboxes,
+            target_centers,
+            tuple(divider_bboxes),
+            max_distance,
+        ),
+        compute,
     )
-
-    # Run Hungarian algorithm
-    row_indices, col_indices = linear_sum_assignment(cost_matrix_thresholded)
+    log.debug("[step]   Subassembly to step costs:\n%s", cost_matrix)
 
     # Assign subassemblies to steps based on the matching
     # Note: Unlike diagrams, multiple subassemblies can be assigned to one step
@@ -1302,15 +1309,11 @@ def assign_subassemblies_to_steps(
         if i in assigned_subassemblies:
             continue
 
-        # Find the step with lowest cost for this subassembly
-        best_step_idx = None
-        best_cost = high_cost
-        for j in range(len(steps)):
-            if cost_matrix[i, j] < best_cost:
-                best_cost = cost_matrix[i, j]
-                best_step_idx = j
+        # Find the (first) step with lowest cost for this subassembly
+        best_step_idx = int(np.argmin(cost_matrix[i]))
+        best_cost = cost_matrix[i, best_step_idx]
 
-        if best_step_idx is not None and best_cost <= max_distance:
+        if best_cost < high_cost and best_cost <= max_distance:
             step = steps[best_step_idx]
             new_subassemblies = list(step.subassemblies) + [sa]
             object.__setattr__(step, "subassemblies", new_subassemblies)
@@ -1326,6 +1329,8 @@ def assign_rotation_symbols_to_steps(
     steps: Sequence[Step],
     rotation_symbols: list[RotationSymbol],
     max_distance: float = 300.0,
+    *,
+    memoize: Memoize | None = None,
 ) -> None:
     """Assign rotation symbols to steps using Hungarian algorithm.
 
@@ -1341,6 +1346,8 @@ def assign_rotation_symbols_to_steps(
         rotation_symbols: List of RotationSymbol objects to assign
         max_distance: Maximum distance for a valid assignment. Pairs with distance
             greater than this will not be matched.
+        memoize: Per-page cache (e.g. `ClassificationResult.memoize`) to reuse
+            the matching when the same steps and symbols are assigned again
     """
     if not steps or not rotation_symbols:
         log.debug(
@@ -1351,53 +1358,28 @@ def assign_rotation_symbols_to_steps(
         )
         return
 
-    n_steps = len(steps)
-    n_symbols = len(rotation_symbols)
-
     log.debug(
         "[step] Running Hungarian matching: %d steps, %d rotation symbols",
-        n_steps,
-        n_symbols,
+        len(steps),
+        len(rotation_symbols),
     )
 
-    # Build cost matrix: rows = rotation symbols, cols = steps
+    # Rows = rotation symbols, cols = steps
     # Cost = distance from rotation symbol center to step's diagram center
     # (or step bbox center if no diagram)
-    cost_matrix = np.zeros((n_symbols, n_steps))
-
-    for i, rs in enumerate(rotation_symbols):
-        rs_center = rs.bbox.center
-        for j, step in enumerate(steps):
-            # Use diagram center if available, otherwise step bbox center
-            if step.diagram:
-                target_center = step.diagram.bbox.center
-            else:
-                target_center = step.bbox.center
-
-            # Euclidean distance
-            distance = (
-                (rs_center[0] - target_center[0]) ** 2
-                + (rs_center[1] - target_center[1]) ** 2
-            ) ** 0.5
-
-            cost_matrix[i, j] = distance
-            log.debug(
-                "[step]   Distance from rotation_symbol[%d] at %s to step[%d]: %.1f",
-                i,
-                rs.bbox,
-                step.step_number.value,
-                distance,
-            )
-
-    # Apply max_distance threshold by setting costs above threshold to a high value
-    # This prevents assignments that are too far apart
-    high_cost = max_distance * 10  # Arbitrary large value
-    cost_matrix_thresholded = np.where(
-        cost_matrix > max_distance, high_cost, cost_matrix
+    rs_bboxes = tuple(rs.bbox for rs in rotation_symbols)
+    target_centers = tuple(
+        step.diagram.bbox.center if step.diagram else step.bbox.center for step in steps
     )
-
-    # Run Hungarian algorithm
-    row_indices, col_indices = linear_sum_assignment(cost_matrix_thresholded)
+    cost_matrix, row_indices, col_indices = memoized(
+        memoize,
+        ("step.assign_rotation_symbols", rs_bboxes, target_centers, max_distance),
+        lambda: assign_within(
+            distance_matrix(centers(bbox_array(rs_bboxes)), np.array(target_centers)),
+            max_distance,
+        ),
+    )
+    log.debug("[step]   Rotation symbol to step distances:\n%s", cost_matrix)
 
     # Assign rotation symbols to steps based on the matching
     for row_idx, col_idx in zip(row_indices, col_indices, strict=True):
@@ -183,7 +183,7 @@ class SubStepClassifier(LabelClassifier):
 
         # Find optimal pairings using shared logic
         pairings = find_optimal_pairings(
-            step_bboxes, diagram_bboxes, config, divider_bboxes
+            step_bboxes, diagram_bboxes, config, divider_bboxes, memoize=result.memoize
         )
 
         # Create candidates from pairings
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from collections import Counter
+from collections.abc import Sequence
 
 from pydantic import BaseModel
 
@@ -11,7 +12,7 @@ from build_a_long.pdf_extract.classifier.constants import (
     CATALOG_ELEMENT_ID_THRESHOLD,
 )
 from build_a_long.pdf_extract.classifier.text.text_histogram import TextHistogram
-from build_a_long.pdf_extract.extractor import PageData
+from build_a_long.pdf_extract.extractor import PageData, PageText
 
 logger = logging.getLogger(__name__)
 
@@ -72,7 +73,7 @@ class FontSizeHints(BaseModel):
     # TODO add a default() method that returns a hint with reasonable values.
 
     @classmethod
-    def from_pages(cls, pages: list[PageData]) -> FontSizeHints:
+    def from_pages(cls, pages: Sequence[PageData | PageText]) -> FontSizeHints:
         """Extract font size hints from multiple pages.
 
         This method analyzes pages to distinguish between instruction pages and
@@ -90,7 +91,8 @@ class FontSizeHints(BaseModel):
         6. Requires minimum sample counts for confidence
 
         Args:
-            pages: List of PageData objects to analyze.
+            pages: PageData objects, or the PageText columns of pages, to
+                analyze.
 
         Returns:
             FontSizeHints with identified sizes and remaining histogram.
@@ -5,11 +5,10 @@ import json
 import pytest
 
 from build_a_long.pdf_extract.classifier.text import FontSizeHints
-from build_a_long.pdf_extract.cli.io import load_json
-from build_a_long.pdf_extract.extractor import ExtractionResult, PageData
+from build_a_long.pdf_extract.extractor import PageData
 from build_a_long.pdf_extract.extractor.bbox import BBox
 from build_a_long.pdf_extract.extractor.page_blocks import Text
-from build_a_long.pdf_extract.fixtures import FIXTURES_DIR
+from build_a_long.pdf_extract.fixtures import FIXTURES_DIR, load_raw_fixture
 
 
 def test_from_pages_with_all_sizes() -> None:
@@ -313,17 +312,12 @@ class TestFontSizeHintsGolden:
                 src/build_a_long/pdf_extract/classifier/ \\
                 tools:generate-font-hints-golden
         """
-        fixture_path = FIXTURES_DIR / fixture_file
-
         # Determine golden file path
         golden_file = fixture_file.replace("_raw.json.bz2", "_font_hints_expected.json")
         golden_path = FIXTURES_DIR / golden_file
 
         # Load the input fixture
-        json_data = load_json(fixture_path)
-        extraction: ExtractionResult = ExtractionResult.model_validate_json(
-            json.dumps(json_data)
-        )  # type: ignore[assignment]
+        extraction = load_raw_fixture(fixture_file)
 
         # Run FontSizeHints.from_pages
         hints = FontSizeHints.from_pages(extraction.pages)
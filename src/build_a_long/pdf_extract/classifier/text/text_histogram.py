@@ -4,12 +4,17 @@ from __future__ import annotations
 
 import re
 from collections import Counter
+from collections.abc import Iterable, Sequence
 
 from pydantic import BaseModel, ConfigDict
 
-from build_a_long.pdf_extract.extractor import PageData
+from build_a_long.pdf_extract.extractor import PageData, PageText
 from build_a_long.pdf_extract.extractor.page_blocks import Text
 
+# TODO Ensure this matches the part count classifier (used elsewhere)
+# Pattern for part counts like "2x", "3x", etc.
+_PART_COUNT_PATTERN = re.compile(r"^\d+x$", re.IGNORECASE)
+
 
 class TextHistogram(BaseModel):
     """Global statistics about numeric text elements across all pages.
@@ -62,47 +67,59 @@ class TextHistogram(BaseModel):
         self.remaining_font_sizes.update(other.remaining_font_sizes)
 
     @classmethod
-    def from_pages(cls, pages: list[PageData]) -> TextHistogram:
+    def from_pages(cls, pages: Sequence[PageData | PageText]) -> TextHistogram:
         """Build a histogram from all text elements across all pages.
 
         Args:
-            pages: List of PageData objects to analyze.
+            pages: PageData objects, or the PageText columns of pages, to
+                analyze.
 
         Returns:
             A TextHistogram containing font size and name distributions.
         """
         histogram = TextHistogram.empty()
 
-        # TODO Ensure this matches the part count classifier (used elsewhere)
-        # Pattern for part counts like "2x", "3x", etc.
-        part_count_pattern = re.compile(r"^\d+x$", re.IGNORECASE)
-
         for page in pages:
-            for block in page.blocks:
-                if not isinstance(block, Text):
-                    continue
-
-                if block.font_name is not None:
-                    histogram.font_name_counts[block.font_name] += 1
-
-                if block.font_size is not None:
-                    text_stripped = block.text.strip()
-
-                    # Check if text matches part count pattern (\dx)
-                    if part_count_pattern.match(text_stripped):
-                        histogram.part_count_font_sizes[block.font_size] += 1
-
-                    elif text_stripped.isdigit():
-                        text_num = int(text_stripped)
-                        num_digits = len(text_stripped)
-
-                        # Check if text matches Element ID (6-7 digit number)
-                        if 6 <= num_digits <= 7:
-                            histogram.element_id_font_sizes[block.font_size] += 1
-                        # Check if text matches page number (±1 from current)
-                        elif abs(text_num - page.page_number) <= 1:
-                            histogram.page_number_font_sizes[block.font_size] += 1
-                        else:
-                            histogram.remaining_font_sizes[block.font_size] += 1
+            if isinstance(page, PageText):
+                spans: Iterable[tuple[str, str | None, float | None]] = zip(
+                    page.texts, page.font_names, page.font_sizes, strict=True
+                )
+            else:
+                spans = (
+                    (block.text, block.font_name, block.font_size)
+                    for block in page.blocks
+                    if isinstance(block, Text)
+                )
+            histogram._add_spans(spans, page.page_number)
 
         return histogram
+
+    def _add_spans(
+        self,
+        spans: Iterable[tuple[str, str | None, float | None]],
+        page_number: int,
+    ) -> None:
+        """Count the (text, font name, font size) spans of one page."""
+        for text, font_name, font_size in spans:
+            if font_name is not None:
+                self.font_name_counts[font_name] += 1
+
+            if font_size is not None:
+                text_stripped = text.strip()
+
+                # Check if text matches part count pattern (\dx)
+                if _PART_COUNT_PATTERN.match(text_stripped):
+                    self.part_count_font_sizes[font_size] += 1
+
+                elif text_stripped.isdigit():
+                    text_num = int(text_stripped)
+                    num_digits = len(text_stripped)
+
+                    # Check if text matches Element ID (6-7 digit number)
+                    if 6 <= num_digits <= 7:
+                        self.element_id_font_sizes[font_size] += 1
+                    # Check if text matches page number (±1 from current)
+                    elif abs(text_num - page_number) <= 1:
+                        self.page_number_font_sizes[font_size] += 1
+                    else:
+                        self.remaining_font_sizes[font_size] += 1
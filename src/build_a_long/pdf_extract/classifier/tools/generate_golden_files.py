@@ -5,23 +5,42 @@ This script runs the classifier on all fixtures and generates golden output file
 It uses hint fixtures (font_hints and page_hints) when available for consistent
 classification.
 
+Fixtures are classified in parallel. A fixture is only classified again when
+its raw file, its hints or the classifier source changed since the last run
+(use --force to classify everything), and golden files are only rewritten
+when their content changes.
+
 Usage:
     pants run src/build_a_long/pdf_extract/classifier/tools/generate_golden_files.py
 """
 
+import argparse
+import contextlib
 import logging
+import os
 import re
 import sys
+from collections.abc import Sequence
 from pathlib import Path
 
 from build_a_long.pdf_extract.classifier.classifier import classify_elements
 from build_a_long.pdf_extract.classifier.classifier_config import ClassifierConfig
-from build_a_long.pdf_extract.extractor import ExtractionResult, PageData
+from build_a_long.pdf_extract.classifier.tools.regeneration import (
+    Job,
+    Manifest,
+    inputs_hash,
+    regenerate,
+)
+from build_a_long.pdf_extract.cli.io import load_extraction
+from build_a_long.pdf_extract.extractor import PageData
 from build_a_long.pdf_extract.fixtures import load_classifier_config
 
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 
+# Inputs of each golden file as of the last run, to skip unchanged fixtures
+MANIFEST_PATH = Path(".cache/golden_files_manifest.json")
+
 
 def extract_element_id(filename: str) -> str | None:
     """Extract element ID from a fixture filename.
@@ -38,8 +57,74 @@ def extract_element_id(filename: str) -> str | None:
     return match.group(1) if match else None
 
 
-def main() -> None:
-    """Generate golden files for all fixtures."""
+def _hint_files(fixtures_dir: Path, element_id: str | None) -> list[Path]:
+    if element_id is None:
+        return []
+    return [
+        fixtures_dir / f"{element_id}_font_hints_expected.json",
+        fixtures_dir / f"{element_id}_page_hints_expected.json",
+    ]
+
+
+def generate_golden(fixture_path: Path) -> dict[str, bytes]:
+    """Classify the first page of a raw fixture into its golden file.
+
+    Returns:
+        The golden file's content, keyed by its name. Empty if the fixture
+        has no pages.
+    """
+    extraction = load_extraction(fixture_path)
+
+    # Get the first (and usually only) page
+    if not extraction.pages:
+        log.warning(f"  Skipping {fixture_path.name} - no pages found")
+        return {}
+
+    page: PageData = extraction.pages[0]
+
+    # Use the hints for this element ID, if there are any
+    element_id = extract_element_id(fixture_path.name)
+    config: ClassifierConfig | None = None
+    if element_id:
+        with contextlib.suppress(FileNotFoundError):
+            config = load_classifier_config(element_id)
+
+    # Run classification
+    result = classify_elements(page, config)
+
+    # Build the Page from classification results
+    page_element = result.page
+
+    # Serialize with by_alias=True to use __tag__ instead of tag
+    # Use Pydantic's JSON encoder for consistent serialization
+    assert page_element is not None, "Page element should not be None"
+    golden_json = page_element.to_json(indent=2) + "\n"
+
+    golden_name = fixture_path.name.replace("_raw.json", "_expected.json")
+    return {golden_name: golden_json.encode()}
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Generate golden files for all fixtures whose inputs changed."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to classify the fixtures (default: all CPUs).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate every golden file, even if its inputs are unchanged.",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=MANIFEST_PATH,
+        help="Where to record the inputs of each golden file (default: %(default)s).",
+    )
+    args = parser.parse_args(argv)
 
     # TODO maybe be explict with the full path of the directory
     fixtures_dir = Path("src/build_a_long/pdf_extract/fixtures")
@@ -48,7 +133,7 @@ def main() -> None:
         log.error(f"Fixtures directory not found: {fixtures_dir}")
         sys.exit(1)
 
-    raw_fixtures = list(fixtures_dir.glob("*_raw.json"))
+    raw_fixtures = sorted(fixtures_dir.glob("*_raw.json"))
 
     if not raw_fixtures:
         log.error(f"No *_raw.json fixtures found in {fixtures_dir}")
@@ -60,53 +145,31 @@ def main() -> None:
     # Track which instruction IDs are missing hints
     missing_hints: list[str] = []
 
-    for fixture_path in sorted(raw_fixtures):
-        golden_path = fixture_path.with_name(
-            fixture_path.name.replace("_raw.json", "_expected.json")
-        )
-
-        log.info(f"Processing {fixture_path.name}...")
-
-        # Load the input fixture (which is an ExtractionResult with pages)
-        extraction_result: ExtractionResult = ExtractionResult.model_validate_json(
-            fixture_path.read_text()
-        )  # type: ignore[assignment]
-
-        # Get the first (and usually only) page
-        if not extraction_result.pages:
-            log.warning(f"  Skipping {fixture_path.name} - no pages found")
-            continue
-
-        page: PageData = extraction_result.pages[0]
-
-        # Try to load hints for this element ID
+    jobs: list[Job[Path]] = []
+    for fixture_path in raw_fixtures:
         element_id = extract_element_id(fixture_path.name)
-        config: ClassifierConfig | None = None
-
-        if element_id:
-            try:
-                config = load_classifier_config(element_id)
-                log.info(f"  Using hints for {element_id}")
-            except FileNotFoundError:
-                log.warning(f"  No hints found for {element_id}")
-                missing_hints.append(element_id)
-
-        # Run classification
-        result = classify_elements(page, config)
-
-        # Build the Page from classification results
-        page_element = result.page
-
-        # Serialize with by_alias=True to use __tag__ instead of tag
-        # Use Pydantic's JSON encoder for consistent serialization
-        assert page_element is not None, "Page element should not be None"
-        golden_json = page_element.to_json(indent=2) + "\n"
-
-        # Write golden file
-        golden_path.write_text(golden_json)
-        log.info(f"  Wrote {golden_path.absolute()}")
+        hint_files = _hint_files(fixtures_dir, element_id)
+        if element_id and not all(path.exists() for path in hint_files):
+            missing_hints.append(element_id)
+        jobs.append(
+            Job(
+                fixture_path.name,
+                inputs_hash(fixture_path, *hint_files),
+                fixture_path,
+            )
+        )
 
-    log.info(f"✓ Generated {len(raw_fixtures)} golden files")
+    summary = regenerate(
+        jobs,
+        generate_golden,
+        fixtures_dir,
+        manifest=Manifest(args.manifest),
+        workers=args.workers,
+        force=args.force,
+    )
+    summary.log(log)
+    if not summary.failed:
+        log.info(f"✓ Golden files up to date for {len(raw_fixtures)} fixtures")
 
     if missing_hints:
         unique_missing = sorted(set(missing_hints))
@@ -123,6 +186,9 @@ def main() -> None:
         )
         log.warning("=" * 70)
 
+    if summary.failed:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
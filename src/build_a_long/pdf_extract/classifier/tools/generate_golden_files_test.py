@@ -4,6 +4,7 @@ These tests ensure that the golden file generation process remains functional.
 """
 
 import json
+from pathlib import Path
 
 from build_a_long.pdf_extract.classifier.classifier import classify_elements
 from build_a_long.pdf_extract.classifier.tools.generate_golden_files import main
@@ -57,7 +58,7 @@ def test_page_serialization() -> None:
     assert parsed["__tag__"] == "Page"
 
 
-def test_generate_golden_files_main() -> None:
+def test_generate_golden_files_main(tmp_path: Path) -> None:
     """Test that the generate_golden_files.main() function works end-to-end.
 
     This is a regression test to ensure the script doesn't break due to
@@ -71,7 +72,7 @@ def test_generate_golden_files_main() -> None:
         return
 
     # Run the main function - this should not raise any errors
-    main()
+    main(["--workers", "1", "--force", "--manifest", str(tmp_path / "manifest.json")])
 
     # Verify that golden files were generated for each raw fixture
     for raw_fixture in expected_files:
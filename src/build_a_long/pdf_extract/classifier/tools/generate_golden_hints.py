@@ -9,8 +9,10 @@ Usage:
     pants run src/build_a_long/pdf_extract/classifier/tools/generate_golden_hints.py
 """
 
+import argparse
 import json
 import logging
+import os
 import re
 import sys
 from pathlib import Path
@@ -19,7 +21,7 @@ import pymupdf
 
 from build_a_long.pdf_extract.classifier.pages import PageHintCollection
 from build_a_long.pdf_extract.classifier.text import FontSizeHints
-from build_a_long.pdf_extract.cli.io import load_json
+from build_a_long.pdf_extract.cli.io import load_extraction, load_extractions
 from build_a_long.pdf_extract.extractor import ExtractionResult, extract_page_data
 
 logging.basicConfig(level=logging.INFO)
@@ -140,6 +142,24 @@ def write_hints(
     log.info(f"    Wrote {page_hints_path.name}")
 
 
+def generate_hints_from_extraction(
+    fixtures_dir: Path, element_id: str, extraction: ExtractionResult
+) -> None:
+    """Generate hints from the pages of a loaded *_raw.json.bz2 fixture.
+
+    Args:
+        fixtures_dir: Path to fixtures directory
+        element_id: The element ID
+        extraction: The loaded fixture
+    """
+    # Generate hints
+    font_hints = FontSizeHints.from_pages(extraction.pages)
+    page_hints = PageHintCollection.from_pages(extraction.pages)
+
+    # Write hints
+    write_hints(fixtures_dir, element_id, font_hints, page_hints)
+
+
 def generate_hints_from_bz2(fixtures_dir: Path, bz2_path: Path) -> bool:
     """Generate hints from a *_raw.json.bz2 fixture.
 
@@ -155,19 +175,7 @@ def generate_hints_from_bz2(fixtures_dir: Path, bz2_path: Path) -> bool:
         return False
 
     log.info(f"  {bz2_path.name} (from bz2)...")
-
-    # Load the input fixture
-    json_data = load_json(bz2_path)
-    extraction: ExtractionResult = ExtractionResult.model_validate_json(
-        json.dumps(json_data)
-    )  # type: ignore[assignment]
-
-    # Generate hints
-    font_hints = FontSizeHints.from_pages(extraction.pages)
-    page_hints = PageHintCollection.from_pages(extraction.pages)
-
-    # Write hints
-    write_hints(fixtures_dir, element_id, font_hints, page_hints)
+    generate_hints_from_extraction(fixtures_dir, element_id, load_extraction(bz2_path))
     return True
 
 
@@ -202,6 +210,14 @@ def generate_hints_from_pdf(
 
 def main() -> None:
     """Generate golden files for FontSizeHints and PageHintCollection."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to load the bz2 fixtures (default: all CPUs).",
+    )
+    args = parser.parse_args()
 
     fixtures_dir = Path("src/build_a_long/pdf_extract/fixtures")
     data_dir = Path("data")
@@ -224,14 +240,17 @@ def main() -> None:
     success_count = 0
     missing_sources: list[str] = []
 
-    for element_id in sorted(required_ids):
-        # Prefer bz2 fixture if available
-        if element_id in bz2_fixtures and generate_hints_from_bz2(
-            fixtures_dir, bz2_fixtures[element_id]
-        ):
-            success_count += 1
-            continue
+    # Prefer bz2 fixtures where available, loading them all in parallel
+    bz2_ids = sorted(required_ids & bz2_fixtures.keys())
+    extractions = load_extractions(
+        [bz2_fixtures[element_id] for element_id in bz2_ids], workers=args.workers
+    )
+    for element_id, extraction in zip(bz2_ids, extractions, strict=True):
+        log.info(f"  {bz2_fixtures[element_id].name} (from bz2)...")
+        generate_hints_from_extraction(fixtures_dir, element_id, extraction)
+        success_count += 1
 
+    for element_id in sorted(required_ids - bz2_fixtures.keys()):
         # Fall back to PDF
         pdf_path = find_pdf_for_element(element_id, data_dir)
         if pdf_path and generate_hints_from_pdf(fixtures_dir, element_id, pdf_path):
@@ -7,15 +7,29 @@ extraction logic.
 
 Fixtures are defined in index.json5 (JSON5 format to allow comments).
 
+PDFs are extracted in parallel. A fixture is only extracted again when its
+PDF, its definition or the extractor source changed since the last run (use
+--force to extract everything), and fixture files are only rewritten when
+their content changes.
+
 Usage:
     pants run src/build_a_long/pdf_extract/classifier/tools/regenerate_fixtures.py
 """
 
+import argparse
 import bz2
 import logging
+import os
 import sys
+from collections.abc import Sequence
 from pathlib import Path
 
+from build_a_long.pdf_extract.classifier.tools.regeneration import (
+    Job,
+    Manifest,
+    inputs_hash,
+    regenerate,
+)
 from build_a_long.pdf_extract.extractor import ExtractionResult
 from build_a_long.pdf_extract.extractor.extractor import PageData
 from build_a_long.pdf_extract.tests.fixture_utils import (
@@ -30,48 +44,76 @@ log = logging.getLogger(__name__)
 # Output directory for fixtures (relative to repo root when running outside sandbox)
 FIXTURES_DIR = Path("src/build_a_long/pdf_extract/fixtures")
 
+# Inputs of each fixture as of the last run, to skip unchanged fixtures
+MANIFEST_PATH = Path(".cache/raw_fixtures_manifest.json")
+
 
-def save_fixture(
+def fixture_outputs(
     fixture_def: FixtureDefinition,
     extracted_pages: dict[int, PageData],
-    output_dir: Path,
-) -> None:
-    """Save extracted pages as fixture files.
+) -> dict[str, bytes]:
+    """Serialize extracted pages into fixture files.
 
     Args:
         fixture_def: The fixture definition
         extracted_pages: Dict mapping page number to PageData
-        output_dir: Directory to save fixtures
+
+    Returns:
+        Each fixture file's content, keyed by its name
     """
+    outputs: dict[str, bytes] = {}
     if fixture_def.is_per_page:
         # Save each page as a separate file
         for page_num, page_data in sorted(extracted_pages.items()):
             extraction = ExtractionResult(pages=[page_data])
-            json_str = extraction.to_json()
-
             filename = fixture_def.get_fixture_filename(page_num)
-            output_path = output_dir / filename
-            output_path.write_text(json_str)
-            log.info(f"  Wrote {output_path}")
+            outputs[filename] = extraction.to_json().encode("utf-8")
     else:
         # Save all pages in a single file
         pages = [extracted_pages[pn] for pn in sorted(extracted_pages.keys())]
         extraction = ExtractionResult(pages=pages)
-        json_str = extraction.to_json()
+        json_bytes = extraction.to_json().encode("utf-8")
 
         filename = fixture_def.get_fixture_filename()
-        output_path = output_dir / filename
+        outputs[filename] = (
+            bz2.compress(json_bytes) if fixture_def.compress else json_bytes
+        )
 
-        if fixture_def.compress:
-            output_path.write_bytes(bz2.compress(json_str.encode("utf-8")))
-        else:
-            output_path.write_text(json_str)
+    return outputs
 
-        log.info(f"  Wrote {output_path}")
+
+def extract_fixture(fixture_def: FixtureDefinition) -> dict[str, bytes]:
+    """Extract a fixture definition's pages from its PDF into fixture files."""
+    # Extract all needed pages in one pass (also resolves page ranges)
+    extraction = extract_pages_from_pdf(fixture_def.pdf_path, fixture_def.pages)
+    log.info(
+        f"  Extracted {len(extraction.pages)} page(s) for {fixture_def.description}"
+    )
+    return fixture_outputs(fixture_def, extraction.pages)
 
 
-def main() -> int:
-    """Regenerate all fixture files."""
+def main(argv: Sequence[str] | None = None) -> int:
+    """Regenerate the fixture files whose inputs changed."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to extract the fixtures (default: all CPUs).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate every fixture, even if its inputs are unchanged.",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=MANIFEST_PATH,
+        help="Where to record the inputs of each fixture (default: %(default)s).",
+    )
+    args = parser.parse_args(argv)
+
     if not FIXTURES_DIR.exists():
         log.error(f"Fixtures directory not found: {FIXTURES_DIR}")
         return 1
@@ -86,36 +128,45 @@ def main() -> int:
     log.info(f"Loaded {len(fixtures)} fixture definitions from {index_path}")
     log.info("")
 
-    errors: list[str] = []
+    missing: dict[str, str] = {}
+    jobs: list[Job[FixtureDefinition]] = []
 
     for fixture_def in fixtures:
-        log.info(f"=== {fixture_def.description} ===")
-
+        name = f"{fixture_def.pdf} [pages {fixture_def.pages or 'all'}]"
         pdf_path = fixture_def.pdf_path
         if not pdf_path.exists():
             log.error(f"  PDF not found: {pdf_path}")
-            errors.append(str(pdf_path))
+            missing[name] = "PDF not found"
             continue
 
-        if fixture_def.pages:
-            log.info(f"  Extracting pages: {fixture_def.pages}")
-        else:
-            log.info("  Extracting all pages")
-
-        # Extract all needed pages in one pass (also resolves page ranges)
-        extraction = extract_pages_from_pdf(pdf_path, fixture_def.pages)
-        log.info(f"  Extracted {len(extraction.pages)} page(s)")
-
-        # Save fixture(s)
-        save_fixture(fixture_def, extraction.pages, FIXTURES_DIR)
-
-        log.info("")
+        jobs.append(
+            Job(
+                name,
+                inputs_hash(pdf_path, fixture_def.model_dump_json()),
+                fixture_def,
+            )
+        )
+
+    summary = regenerate(
+        jobs,
+        extract_fixture,
+        FIXTURES_DIR,
+        manifest=Manifest(args.manifest),
+        workers=args.workers,
+        force=args.force,
+    )
+    summary.failed.update(missing)
+    log.info("")
+    summary.log(log)
 
-    if errors:
-        log.error(f"✗ Failed to process {len(errors)} PDF(s)")
+    if summary.failed:
+        log.error(f"✗ Failed to process {len(summary.failed)} PDF(s)")
         return 1
 
-    log.info("✓ All raw fixtures regenerated successfully!")
+    log.info("✓ All raw fixtures up to date!")
+    if not summary.regenerated:
+        return 0
+
     log.info("")
     log.info("Next steps:")
     log.info(
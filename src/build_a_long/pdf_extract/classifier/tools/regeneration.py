@@ -0,0 +1,292 @@
+"""Parallel, incremental regeneration of generated fixture files.
+
+`generate_golden_files.py` and `regenerate_fixtures.py` both turn inputs
+(raw fixtures and hints, or source PDFs) into checked-in files. Each job
+here is one such unit of work, with a hash of everything its outputs
+depend on, including `source_version`. A manifest records the hash each
+job's outputs were last generated from, and a digest of each output, so
+jobs whose inputs are unchanged and whose outputs were not edited since
+are skipped.
+
+Changed jobs run across a process pool. Their outputs are written
+atomically, and only if their content differs, so files that come out the
+same keep their mtimes.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import pydantic
+from pydantic import BaseModel
+
+from build_a_long.common import atomic_write
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 2
+"""Bump whenever the manifest format changes, so old manifests are ignored."""
+
+_PACKAGE_DIR = Path(__file__).resolve().parents[2]
+
+
+@functools.cache
+def source_version() -> str:
+    """Hash the pdf_extract sources (excluding tests) that generate fixtures.
+
+    Any code change therefore regenerates everything, which is safe; the
+    content check in `write_if_changed` keeps unaffected outputs untouched.
+    """
+    h = hashlib.sha256()
+    for path in sorted(_PACKAGE_DIR.rglob("*.py")):
+        if path.name.endswith("_test.py"):
+            continue
+        h.update(path.relative_to(_PACKAGE_DIR).as_posix().encode())
+        h.update(hashlib.sha256(path.read_bytes()).digest())
+    return h.hexdigest()
+
+
+def inputs_hash(*inputs: Path | str) -> str:
+    """Hash a job's inputs along with `source_version`.
+
+    Args:
+        inputs: Files (hashed by name and content; a missing file hashes
+            differently from any content) and strings (e.g. options).
+    """
+    h = hashlib.sha256(source_version().encode())
+    for item in inputs:
+        if isinstance(item, Path):
+            h.update(b"\0file\0" + item.name.encode())
+            try:
+                h.update(hashlib.sha256(item.read_bytes()).digest())
+            except FileNotFoundError:
+                h.update(b"\0missing")
+        else:
+            h.update(b"\0str\0" + item.encode())
+    return h.hexdigest()
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Atomically write a file, unless it already has this content.
+
+    Returns:
+        True if the file was written.
+    """
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    atomic_write(path, data)
+    return True
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_digest(path: Path) -> str | None:
+    """The digest of a file's content, or None if it does not exist."""
+    try:
+        return _digest(path.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+class _ManifestEntry(BaseModel):
+    inputs: str
+    outputs: dict[str, str]
+    """Digest of each output file's content, by file name."""
+
+
+class _ManifestFile(BaseModel):
+    version: int
+    entries: dict[str, _ManifestEntry]
+
+
+class Manifest:
+    """The inputs hash and output digests of each job, as of the last run.
+
+    With a ``path`` the manifest is loaded from it (if it exists and is
+    readable) and `save` writes it back.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self._entries: dict[str, _ManifestEntry] = {}
+        if path is not None and path.exists():
+            try:
+                manifest = _ManifestFile.model_validate_json(path.read_bytes())
+            except (OSError, pydantic.ValidationError) as e:
+                logger.warning("Ignoring unreadable manifest %s: %s", path, e)
+            else:
+                if manifest.version == MANIFEST_VERSION:
+                    self._entries = manifest.entries
+
+    def is_current(self, name: str, inputs: str, output_dir: Path) -> bool:
+        """Whether a job's outputs are as it generated them from ``inputs``.
+
+        Outputs that were deleted, edited or reverted since are not current.
+        """
+        entry = self._entries.get(name)
+        return (
+            entry is not None
+            and entry.inputs == inputs
+            and all(
+                _file_digest(output_dir / output) == digest
+                for output, digest in entry.outputs.items()
+            )
+        )
+
+    def record(self, name: str, inputs: str, outputs: Mapping[str, bytes]) -> None:
+        """Record the outputs a job generated from ``inputs``.
+
+        Args:
+            name: The job's name.
+            inputs: The job's inputs hash.
+            outputs: The content of each output, by file name.
+        """
+        self._entries[name] = _ManifestEntry(
+            inputs=inputs,
+            outputs={output: _digest(data) for output, data in sorted(outputs.items())},
+        )
+
+    def save(self) -> None:
+        """Write the manifest to ``path``, if set."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        manifest = _ManifestFile(version=MANIFEST_VERSION, entries=self._entries)
+        write_if_changed(self.path, manifest.model_dump_json(indent=2).encode())
+
+
+class Job[T](NamedTuple):
+    """One unit of regeneration.
+
+    Attributes:
+        name: Identifies the job in the manifest and in logs
+        inputs: Hash of everything the outputs depend on (see `inputs_hash`)
+        arg: Passed to the generate function; must be picklable
+    """
+
+    name: str
+    inputs: str
+    arg: T
+
+
+class Summary(NamedTuple):
+    """What a regeneration run did, with each job's time in seconds."""
+
+    regenerated: dict[str, float]
+    unchanged: dict[str, float]
+    """Jobs skipped because their inputs were unchanged (0 seconds), or
+    whose outputs came out the same."""
+    failed: dict[str, str]
+    """Error message by job."""
+    seconds: float
+
+    def log(self, log: logging.Logger, slowest: int = 5) -> None:
+        """Log the counts, total time and slowest jobs."""
+        log.info(
+            "Regenerated %d, unchanged %d, failed %d in %.1fs",
+            len(self.regenerated),
+            len(self.unchanged),
+            len(self.failed),
+            self.seconds,
+        )
+        timed = sorted(
+            {**self.regenerated, **self.unchanged}.items(),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        for name, seconds in timed[:slowest]:
+            if seconds > 0:
+                log.info("  %6.2fs  %s", seconds, name)
+        for name, error in self.failed.items():
+            log.error("  Failed %s: %s", name, error)
+
+
+def _timed[T](
+    generate: Callable[[T], Mapping[str, bytes]], arg: T
+) -> tuple[Mapping[str, bytes], float]:
+    start = time.perf_counter()
+    outputs = generate(arg)
+    return outputs, time.perf_counter() - start
+
+
+def regenerate[T](
+    jobs: Iterable[Job[T]],
+    generate: Callable[[T], Mapping[str, bytes]],
+    output_dir: Path,
+    *,
+    manifest: Manifest,
+    workers: int = 1,
+    force: bool = False,
+) -> Summary:
+    """Run the jobs whose inputs changed, and write their changed outputs.
+
+    Args:
+        jobs: The jobs, in the order to log them.
+        generate: Called with a job's ``arg``, returns its outputs' content by
+            file name (relative to ``output_dir``). Must be a module-level
+            function, to run in worker processes.
+        output_dir: Where outputs are written.
+        manifest: Skips jobs whose inputs are unchanged, and records the
+            others. Saved at the end of the run.
+        workers: Number of processes. 1 runs the jobs serially in-process.
+        force: Run every job, even if its inputs are unchanged.
+    """
+    start = time.perf_counter()
+    regenerated: dict[str, float] = {}
+    unchanged: dict[str, float] = {}
+    failed: dict[str, str] = {}
+
+    pending: list[Job[T]] = []
+    for job in jobs:
+        if not force and manifest.is_current(job.name, job.inputs, output_dir):
+            unchanged[job.name] = 0.0
+        else:
+            pending.append(job)
+
+    executor: ProcessPoolExecutor | None = None
+    futures: list[Future[tuple[Mapping[str, bytes], float]]] = []
+    if workers > 1 and len(pending) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(pending)))
+        futures = [executor.submit(_timed, generate, job.arg) for job in pending]
+
+    try:
+        for i, job in enumerate(pending):
+            try:
+                if executor is not None:
+                    outputs, seconds = futures[i].result()
+                else:
+                    outputs, seconds = _timed(generate, job.arg)
+            except Exception as e:
+                logger.debug("Job %s failed", job.name, exc_info=True)
+                failed[job.name] = f"{type(e).__name__}: {e}"
+                continue
+
+            written = [
+                name
+                for name, data in outputs.items()
+                if write_if_changed(output_dir / name, data)
+            ]
+            manifest.record(job.name, job.inputs, outputs)
+            if written:
+                regenerated[job.name] = seconds
+                logger.info("Regenerated %s (%.2fs)", ", ".join(written), seconds)
+            else:
+                unchanged[job.name] = seconds
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        manifest.save()
+
+    return Summary(regenerated, unchanged, failed, time.perf_counter() - start)
@@ -0,0 +1,166 @@
+"""Tests for incremental fixture regeneration."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from build_a_long.pdf_extract.classifier.tools.regeneration import (
+    Job,
+    Manifest,
+    inputs_hash,
+    regenerate,
+    write_if_changed,
+)
+
+# Arguments `_generate` was called with, in this process
+_calls: list[str] = []
+
+
+def _generate(arg: str) -> dict[str, bytes]:
+    _calls.append(arg)
+    if arg == "boom":
+        raise ValueError("cannot generate")
+    return {f"{arg}.out": arg.upper().encode()}
+
+
+@pytest.fixture(autouse=True)
+def _reset_calls() -> None:
+    _calls.clear()
+
+
+def _jobs(*args: str, salt: str = "") -> list[Job[str]]:
+    return [Job(arg, inputs_hash(arg, salt), arg) for arg in args]
+
+
+def test_write_if_changed(tmp_path: Path) -> None:
+    path = tmp_path / "out.json"
+
+    assert write_if_changed(path, b"a")
+    os.utime(path, (0, 0))
+    assert not write_if_changed(path, b"a")
+    assert path.stat().st_mtime == 0
+    assert write_if_changed(path, b"b")
+    assert path.read_bytes() == b"b"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+
+
+def test_inputs_hash(tmp_path: Path) -> None:
+    path = tmp_path / "in.json"
+    missing = inputs_hash(path)
+    path.write_text("1")
+    one = inputs_hash(path)
+    path.write_text("2")
+
+    assert len({missing, one, inputs_hash(path), inputs_hash("in.json")}) == 4
+    assert inputs_hash(path) == inputs_hash(path)
+
+
+def test_skips_unchanged_inputs(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "manifest.json"
+    out = tmp_path / "out"
+    out.mkdir()
+
+    first = regenerate(
+        _jobs("a", "b"), _generate, out, manifest=Manifest(manifest_path)
+    )
+    assert sorted(first.regenerated) == ["a", "b"]
+    assert (out / "a.out").read_bytes() == b"A"
+
+    second = regenerate(
+        _jobs("a", "b"), _generate, out, manifest=Manifest(manifest_path)
+    )
+    assert sorted(second.unchanged) == ["a", "b"]
+    assert _calls == ["a", "b"]
+
+    # A deleted output is regenerated even though its inputs are unchanged
+    (out / "b.out").unlink()
+    third = regenerate(
+        _jobs("a", "b"), _generate, out, manifest=Manifest(manifest_path)
+    )
+    assert list(third.regenerated) == ["b"]
+
+
+def test_edited_output_is_regenerated(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "manifest.json"
+    out = tmp_path / "out"
+    out.mkdir()
+    regenerate(_jobs("a", "b"), _generate, out, manifest=Manifest(manifest_path))
+
+    (out / "a.out").write_bytes(b"edited by hand")
+    summary = regenerate(
+        _jobs("a", "b"), _generate, out, manifest=Manifest(manifest_path)
+    )
+
+    assert list(summary.regenerated) == ["a"]
+    assert list(summary.unchanged) == ["b"]
+    assert (out / "a.out").read_bytes() == b"A"
+
+
+def test_changed_inputs_with_same_output_are_unchanged(tmp_path: Path) -> None:
+    manifest = Manifest(tmp_path / "manifest.json")
+    regenerate(_jobs("a"), _generate, tmp_path, manifest=manifest)
+    os.utime(tmp_path / "a.out", (0, 0))
+
+    summary = regenerate(_jobs("a", salt="new"), _generate, tmp_path, manifest=manifest)
+
+    assert list(summary.unchanged) == ["a"]
+    assert _calls == ["a", "a"]
+    assert (tmp_path / "a.out").stat().st_mtime == 0
+
+
+def test_force(tmp_path: Path) -> None:
+    manifest = Manifest(tmp_path / "manifest.json")
+    regenerate(_jobs("a"), _generate, tmp_path, manifest=manifest)
+    regenerate(_jobs("a"), _generate, tmp_path, manifest=manifest, force=True)
+
+    assert _calls == ["a", "a"]
+
+
+def test_failed_job_is_reported_and_retried(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "manifest.json"
+
+    summary = regenerate(
+        _jobs("a", "boom", "c"), _generate, tmp_path, manifest=Manifest(manifest_path)
+    )
+
+    assert sorted(summary.regenerated) == ["a", "c"]
+    assert summary.failed == {"boom": "ValueError: cannot generate"}
+
+    regenerate(
+        _jobs("a", "boom", "c"), _generate, tmp_path, manifest=Manifest(manifest_path)
+    )
+    assert _calls == ["a", "boom", "c", "boom"]
+
+
+def test_workers(tmp_path: Path) -> None:
+    serial = tmp_path / "serial"
+    parallel = tmp_path / "parallel"
+    serial.mkdir()
+    parallel.mkdir()
+
+    regenerate(_jobs("a", "b", "c"), _generate, serial, manifest=Manifest())
+    summary = regenerate(
+        _jobs("a", "b", "boom", "c"),
+        _generate,
+        parallel,
+        manifest=Manifest(),
+        workers=2,
+    )
+
+    assert list(summary.regenerated) == ["a", "b", "c"]
+    assert list(summary.failed) == ["boom"]
+    for path in serial.iterdir():
+        assert (parallel / path.name).read_bytes() == path.read_bytes()
+
+
+def test_unreadable_manifest_is_ignored(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text("not json")
+
+    summary = regenerate(
+        _jobs("a"), _generate, tmp_path, manifest=Manifest(manifest_path)
+    )
+
+    assert list(summary.regenerated) == ["a"]
+    assert Manifest(manifest_path).is_current("a", _jobs("a")[0].inputs, tmp_path)
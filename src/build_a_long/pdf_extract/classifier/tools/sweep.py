@@ -0,0 +1,330 @@
+"""Sweep classifier config settings over golden fixtures.
+
+Tuning a threshold means classifying the fixture corpus once per candidate
+value. Most config fields only affect a few classifiers, so re-running the
+whole pipeline per setting repeats work that cannot change. A sweep instead:
+
+1. Scores each fixture page once with its base config, recording which
+   top-level `ClassifierConfig` fields each classifier read while scoring
+   that page, and checkpoints the scored candidates.
+2. For each setting, re-scores only the classifiers that read a changed
+   field, and everything downstream of them (in `topological_sort` order),
+   reusing every other classifier's candidates. The page is then built from
+   scratch with the setting's config, exactly as `Classifier.classify` would.
+3. Compares each built page with its golden file and reports precision and
+   recall per setting.
+
+A classifier that did not read a field while scoring a page cannot score
+that page differently when the field changes, so the reuse is exact: the
+pages built are the same as classifying from scratch.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, NamedTuple
+
+from pydantic import BaseModel, TypeAdapter
+
+from build_a_long.pdf_extract.classifier.classification_result import (
+    ClassificationResult,
+    ScoreCheckpoint,
+)
+from build_a_long.pdf_extract.classifier.classifier import Classifier
+from build_a_long.pdf_extract.classifier.classifier_config import ClassifierConfig
+from build_a_long.pdf_extract.classifier.tracing import PageTrace
+from build_a_long.pdf_extract.extractor import PageData
+from build_a_long.pdf_extract.extractor.bbox import BBox
+from build_a_long.pdf_extract.extractor.lego_page_elements import Page
+
+logger = logging.getLogger(__name__)
+
+_CONFIG_FIELDS = frozenset(ClassifierConfig.model_fields)
+
+# Top-level config fields read by the classifier currently scoring, if any
+_config_reads: ContextVar[set[str] | None] = ContextVar("_config_reads", default=None)
+
+
+@contextmanager
+def _recording_reads() -> Iterator[set[str]]:
+    """Collect the `_RecordingConfig` fields read within the block."""
+    reads: set[str] = set()
+    token = _config_reads.set(reads)
+    try:
+        yield reads
+    finally:
+        _config_reads.reset(token)
+
+
+class _RecordingConfig(ClassifierConfig):
+    """A config that records which of its fields are read (see `_config_reads`)."""
+
+    def __getattribute__(self, name: str) -> Any:
+        if name in _CONFIG_FIELDS:
+            reads = _config_reads.get()
+            if reads is not None:
+                reads.add(name)
+        return super().__getattribute__(name)
+
+
+def apply_overrides(
+    config: ClassifierConfig, overrides: Mapping[str, Any]
+) -> ClassifierConfig:
+    """Return a copy of a config with some fields replaced.
+
+    Args:
+        config: The config to start from. It is not modified.
+        overrides: Values keyed by field path, e.g.
+            ``{"progress_bar.indicator_search_margin": 5}``. Values are
+            validated (and converted, e.g. from strings) against the field's
+            type.
+
+    Raises:
+        ValueError: If a path does not name a config field, or a value is
+            not valid for it.
+    """
+    config = config.model_copy()
+    for path, value in overrides.items():
+        *parents, name = path.split(".")
+        models: list[BaseModel] = [config]
+        for parent in parents:
+            child = getattr(models[-1], parent, None)
+            if not isinstance(child, BaseModel):
+                raise ValueError(f"Unknown config field: {path}")
+            models.append(child.model_copy())
+        field = type(models[-1]).model_fields.get(name)
+        if field is None:
+            raise ValueError(f"Unknown config field: {path}")
+        setattr(models[-1], name, TypeAdapter(field.annotation).validate_python(value))
+        # Attach the copied sections to their (copied) parents
+        for parent, child, attr in zip(models[:-1], models[1:], parents, strict=True):
+            setattr(parent, attr, child)
+    return config
+
+
+def changed_fields(base: ClassifierConfig, config: ClassifierConfig) -> set[str]:
+    """Top-level config fields whose values differ between two configs."""
+    return {
+        name
+        for name in _CONFIG_FIELDS
+        if getattr(base, name) is not getattr(config, name)
+        and getattr(base, name) != getattr(config, name)
+    }
+
+
+class Setting(NamedTuple):
+    """A named set of config overrides (see `apply_overrides`)."""
+
+    name: str
+    overrides: dict[str, Any]
+
+
+def grid(axes: Mapping[str, Sequence[Any]]) -> list[Setting]:
+    """Every combination of values for some config fields.
+
+    Args:
+        axes: Candidate values keyed by field path.
+    """
+    settings = []
+    for values in itertools.product(*axes.values()):
+        overrides = dict(zip(axes, values, strict=True))
+        name = " ".join(f"{path}={value}" for path, value in overrides.items())
+        settings.append(Setting(name or "base", overrides))
+    return settings
+
+
+class ElementCounts(NamedTuple):
+    """How many elements of one kind matched a golden page."""
+
+    matched: int
+    predicted: int
+    expected: int
+
+    def __add__(self, other: object) -> ElementCounts:
+        if not isinstance(other, ElementCounts):
+            return NotImplemented
+        return ElementCounts(
+            self.matched + other.matched,
+            self.predicted + other.predicted,
+            self.expected + other.expected,
+        )
+
+    @property
+    def precision(self) -> float:
+        return self.matched / self.predicted if self.predicted else 1.0
+
+    @property
+    def recall(self) -> float:
+        return self.matched / self.expected if self.expected else 1.0
+
+
+def _element_keys(page: Page | None) -> Counter[tuple[str, BBox]]:
+    if page is None:
+        return Counter()
+    return Counter(
+        (type(element).__name__, element.bbox)
+        for element in page.iter_elements()
+        if element is not page
+    )
+
+
+def compare_pages(page: Page | None, golden: Page) -> dict[str, ElementCounts]:
+    """Match a page's elements against a golden page, by type and bbox.
+
+    Args:
+        page: The classified page, or None if classification failed.
+        golden: The expected page, as loaded from a golden file.
+
+    Returns:
+        Counts keyed by element type name.
+    """
+    if page is not None:
+        # Round-trip through JSON to round floats as the golden files do
+        page = Page.model_validate_json(page.to_json())
+    predicted = _element_keys(page)
+    expected = _element_keys(golden)
+    matched = predicted & expected
+    kinds = {kind for kind, _ in predicted.keys() | expected.keys()}
+    return {
+        kind: ElementCounts(
+            sum(n for (k, _), n in matched.items() if k == kind),
+            sum(n for (k, _), n in predicted.items() if k == kind),
+            sum(n for (k, _), n in expected.items() if k == kind),
+        )
+        for kind in sorted(kinds)
+    }
+
+
+class ScoredPage:
+    """A page scored once with its base config, ready to be built per setting.
+
+    Attributes:
+        name: Name of the page, e.g. its fixture file
+        config: The base config the page was scored with
+        golden: The expected page
+        reads: Top-level config fields each classifier (by output label)
+            read while scoring this page
+        build_reads: Top-level config fields read while building this page
+            with the base config
+    """
+
+    def __init__(
+        self, name: str, page_data: PageData, config: ClassifierConfig, golden: Page
+    ) -> None:
+        self.name = name
+        self.config = config
+        self.golden = golden
+
+        recording = _RecordingConfig.model_construct(
+            **{field: getattr(config, field) for field in _CONFIG_FIELDS}
+        )
+        classifier = Classifier(recording)
+        self._classifiers = classifier.classifiers
+        self._result = ClassificationResult(
+            page_data=page_data,
+            trace=PageTrace.for_page(page_data.page_number),
+        )
+        self.reads: dict[str, frozenset[str]] = {}
+        for label_classifier in self._classifiers:
+            with _recording_reads() as reads:
+                label_classifier.score(self._result)
+            self.reads[label_classifier.output] = frozenset(reads)
+        self._checkpoint: ScoreCheckpoint = self._result.checkpoint_scores()
+
+        # Build once with the base config too: settings that change nothing
+        # this page's scoring or building read get the same page
+        with _recording_reads() as reads:
+            self._base_page = self._reclassify(classifier, set())
+        self.build_reads = frozenset(reads)
+        self._base_counts = compare_pages(self._base_page, golden)
+
+    def labels_to_rescore(self, changed: Iterable[str]) -> set[str]:
+        """Labels whose candidates may differ when some config fields change.
+
+        A label is re-scored if its classifier read a changed field while
+        scoring this page, or if it depends on a label that is re-scored.
+        """
+        changed = set(changed)
+        labels: set[str] = set()
+        for classifier in self._classifiers:
+            if self.reads[classifier.output] & changed or classifier.requires & labels:
+                labels.add(classifier.output)
+        return labels
+
+    def classify(self, classifier: Classifier) -> Page | None:
+        """Build this page with a classifier's config.
+
+        Only the labels affected by how that config differs from the base
+        config are scored again (see `labels_to_rescore`). If none are, and
+        building the page did not read a changed field either, the page
+        built with the base config is returned as is.
+
+        Returns:
+            The page, or None if classification failed.
+        """
+        changed = changed_fields(self.config, classifier.config)
+        rescore = self.labels_to_rescore(changed)
+        if not rescore and not self.build_reads & changed:
+            return self._base_page
+        return self._reclassify(classifier, rescore)
+
+    def compare(self, page: Page | None) -> dict[str, ElementCounts]:
+        """Match a page built by `classify` against the golden page."""
+        if page is self._base_page:
+            return self._base_counts
+        return compare_pages(page, self.golden)
+
+    def _reclassify(self, classifier: Classifier, rescore: set[str]) -> Page | None:
+        try:
+            return classifier.reclassify(self._result, self._checkpoint, rescore).page
+        except Exception as e:
+            logger.debug("Classifying %s failed: %s", self.name, e)
+            return None
+
+
+class SettingReport(NamedTuple):
+    """How well one setting's pages matched their golden files."""
+
+    setting: Setting
+    counts: dict[str, ElementCounts]
+    """Counts keyed by element type name, over all pages."""
+    failed_pages: list[str]
+
+    @property
+    def total(self) -> ElementCounts:
+        return sum(self.counts.values(), ElementCounts(0, 0, 0))
+
+
+def sweep(
+    pages: Sequence[ScoredPage], settings: Iterable[Setting]
+) -> Iterator[SettingReport]:
+    """Classify the pages with each setting and compare them with their goldens.
+
+    Args:
+        pages: Pages scored with their base configs.
+        settings: Overrides to apply to each page's base config.
+
+    Yields:
+        A report per setting, in order.
+    """
+    for setting in settings:
+        totals: dict[str, ElementCounts] = {}
+        failed: list[str] = []
+        classifiers: dict[int, Classifier] = {}
+        for page in pages:
+            # Pages of the same manual share a base config, so share a classifier
+            classifier = classifiers.get(id(page.config))
+            if classifier is None:
+                classifier = Classifier(apply_overrides(page.config, setting.overrides))
+                classifiers[id(page.config)] = classifier
+            built = page.classify(classifier)
+            if built is None:
+                failed.append(page.name)
+            for kind, page_counts in page.compare(built).items():
+                totals[kind] = totals.get(kind, ElementCounts(0, 0, 0)) + page_counts
+        yield SettingReport(setting, dict(sorted(totals.items())), failed)
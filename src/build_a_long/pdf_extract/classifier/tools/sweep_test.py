@@ -0,0 +1,153 @@
+"""Tests for the config sweep engine."""
+
+import pytest
+
+from build_a_long.pdf_extract.classifier.classifier import Classifier
+from build_a_long.pdf_extract.classifier.classifier_config import ClassifierConfig
+from build_a_long.pdf_extract.classifier.tools.sweep import (
+    ElementCounts,
+    ScoredPage,
+    Setting,
+    apply_overrides,
+    changed_fields,
+    compare_pages,
+    grid,
+    sweep,
+)
+from build_a_long.pdf_extract.extractor.lego_page_elements import Page
+from build_a_long.pdf_extract.fixtures import (
+    FIXTURES_DIR,
+    load_classifier_config,
+    load_raw_fixture,
+)
+
+FIXTURE = "6509377_page_010_raw.json"
+
+
+def _golden(fixture_file: str) -> Page:
+    golden_path = FIXTURES_DIR / fixture_file.replace("_raw.json", "_expected.json")
+    return Page.model_validate_json(golden_path.read_text())
+
+
+@pytest.fixture(scope="module")
+def scored_page() -> ScoredPage:
+    return ScoredPage(
+        FIXTURE,
+        load_raw_fixture(FIXTURE).pages[0],
+        load_classifier_config("6509377"),
+        _golden(FIXTURE),
+    )
+
+
+class TestApplyOverrides:
+    def test_replaces_nested_field_without_modifying_base(self) -> None:
+        base = ClassifierConfig()
+        config = apply_overrides(
+            base,
+            {
+                "progress_bar.indicator_search_margin": "2.5",
+                "min_confidence_threshold": 0.3,
+            },
+        )
+
+        assert config.progress_bar.indicator_search_margin == 2.5
+        assert config.min_confidence_threshold == 0.3
+        assert base.progress_bar.indicator_search_margin != 2.5
+        assert base.min_confidence_threshold == 0.6
+        # Untouched sections are shared, not copied
+        assert config.page_number is base.page_number
+        assert changed_fields(base, config) == {
+            "progress_bar",
+            "min_confidence_threshold",
+        }
+
+    @pytest.mark.parametrize(
+        "path", ["no_such_field", "progress_bar.no_such_field", "page_hints.x.y"]
+    )
+    def test_unknown_field(self, path: str) -> None:
+        with pytest.raises(ValueError, match="Unknown config field"):
+            apply_overrides(ClassifierConfig(), {path: 1})
+
+    def test_invalid_value(self) -> None:
+        with pytest.raises(ValueError):
+            apply_overrides(
+                ClassifierConfig(), {"progress_bar.indicator_search_margin": "wide"}
+            )
+
+
+def test_grid() -> None:
+    settings = grid({"a.x": [1, 2], "b": ["y"]})
+
+    assert settings == [
+        Setting("a.x=1 b=y", {"a.x": 1, "b": "y"}),
+        Setting("a.x=2 b=y", {"a.x": 2, "b": "y"}),
+    ]
+    assert grid({}) == [Setting("base", {})]
+
+
+def test_compare_pages() -> None:
+    golden = _golden(FIXTURE)
+    missing_page_number = golden.model_copy(update={"page_number": None})
+
+    counts = compare_pages(missing_page_number, golden)
+
+    assert counts["PageNumber"] == ElementCounts(matched=0, predicted=0, expected=1)
+    assert counts["PageNumber"].recall == 0.0
+    assert counts["PageNumber"].precision == 1.0
+    assert all(
+        c.matched == c.predicted == c.expected
+        for kind, c in counts.items()
+        if kind != "PageNumber"
+    )
+    assert compare_pages(None, golden)["PageNumber"].predicted == 0
+
+
+class TestScoredPage:
+    def test_records_config_reads(self, scored_page: ScoredPage) -> None:
+        assert "progress_bar" in scored_page.reads["progress_bar_indicator"]
+        assert "progress_bar" not in scored_page.reads["step_number"]
+
+    def test_rescores_dependents(self, scored_page: ScoredPage) -> None:
+        labels = scored_page.labels_to_rescore({"progress_bar"})
+
+        assert {"progress_bar_indicator", "progress_bar", "page"} <= labels
+        assert "step_number" not in labels
+        assert scored_page.labels_to_rescore(set()) == set()
+
+    def test_unchanged_config_reuses_page(self, scored_page: ScoredPage) -> None:
+        config = apply_overrides(scored_page.config, {})
+
+        assert scored_page.classify(Classifier(config)) is scored_page.classify(
+            Classifier(scored_page.config)
+        )
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {},
+            {"progress_bar.indicator_search_margin": 0.5},
+            {"page_number.min_score": 0.99},
+            {"step_number.min_score": 0.1, "part_count.min_score": 0.9},
+        ],
+    )
+    def test_matches_classify(
+        self, scored_page: ScoredPage, overrides: dict[str, float]
+    ) -> None:
+        config = apply_overrides(scored_page.config, overrides)
+        page_data = load_raw_fixture(FIXTURE).pages[0]
+
+        expected = Classifier(config).classify(page_data).page
+
+        assert scored_page.classify(Classifier(config)) == expected
+
+
+def test_sweep(scored_page: ScoredPage) -> None:
+    reports = list(sweep([scored_page], grid({"page_number.min_score": [0.5, 0.99]})))
+
+    assert [r.setting.name for r in reports] == [
+        "page_number.min_score=0.5",
+        "page_number.min_score=0.99",
+    ]
+    assert reports[0].total.precision == reports[0].total.recall == 1.0
+    assert reports[1].counts["PageNumber"].recall == 0.0
+    assert not reports[0].failed_pages
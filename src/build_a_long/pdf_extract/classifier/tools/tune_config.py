@@ -4,15 +4,22 @@ Script to analyze sample PDFs and tune configuration parameters.
 
 Run with:
     pants run src/build_a_long/pdf_extract/classifier/tools/tune_config.py
+
+Sweep config values against the golden fixtures with:
+    pants run src/build_a_long/pdf_extract/classifier/tools/tune_config.py -- \
+        --sweep progress_bar.indicator_search_margin=5,10,15
 """
 
-import glob
-import json
+import argparse
+import itertools
 import logging
 import math
+import os
 import sys
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel
@@ -20,70 +27,71 @@ from pydantic import BaseModel
 # Ensure src is in path for imports if running directly
 sys.path.insert(0, "src")
 
-from build_a_long.pdf_extract.classifier.candidate import Candidate
-from build_a_long.pdf_extract.classifier.classification_result import (
-    ClassificationResult,
-)
-from build_a_long.pdf_extract.classifier.classifier import Classifier
 from build_a_long.pdf_extract.classifier.classifier_config import ClassifierConfig
 from build_a_long.pdf_extract.classifier.config import (
     ProgressBarConfig,
 )
-from build_a_long.pdf_extract.extractor.extractor import PageData
+from build_a_long.pdf_extract.classifier.tools.sweep import (
+    ScoredPage,
+    SettingReport,
+    apply_overrides,
+    grid,
+    sweep,
+)
+from build_a_long.pdf_extract.classifier.tools.tuning import (
+    CandidateRow,
+    TuningCache,
+    iter_candidate_rows,
+)
+from build_a_long.pdf_extract.extractor.lego_page_elements import Page
+from build_a_long.pdf_extract.fixtures import (
+    FIXTURES_DIR,
+    RAW_FIXTURE_FILES,
+    extract_element_id,
+    load_classifier_config,
+    load_raw_fixture,
+)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 log = logging.getLogger(__name__)
 
 
+def tuning_config() -> ClassifierConfig:
+    """A permissive config, to capture all potential candidates."""
+    config = ClassifierConfig()
+
+    # Relax ProgressBarIndicator config to capture outliers
+    config.progress_bar.indicator_min_size = 0.1
+    config.progress_bar.indicator_max_size = 1000.0
+    config.progress_bar.indicator_max_bottom_margin_ratio = 0.5
+    return config
+
+
+def iter_pages(
+    rows: Iterable[CandidateRow],
+) -> Iterator[dict[str, list[CandidateRow]]]:
+    """Group a stream of candidate rows by page, then by label."""
+    for _, page_rows in itertools.groupby(
+        rows, key=lambda row: (row.source, row.page_number)
+    ):
+        by_label: dict[str, list[CandidateRow]] = defaultdict(list)
+        for row in page_rows:
+            by_label[row.label].append(row)
+        yield by_label
+
+
 class Tuner(ABC):
     """Abstract base class for configuration tuners."""
 
-    def __init__(self, data_files: list[str]):
-        self.data_files = data_files
-        self._results_cache: list[tuple[PageData, ClassificationResult]] | None = None
-
     @abstractmethod
-    def tune(self, results: list[tuple[PageData, ClassificationResult]]) -> None:
-        """Run the tuning analysis and print recommendations."""
-        pass
+    def tune(self, rows: Iterable[CandidateRow]) -> None:
+        """Run the tuning analysis over candidate rows and print recommendations.
 
-    def load_results(self) -> list[tuple[PageData, ClassificationResult]]:
-        """Load pages and run classification with loose config."""
-        if self._results_cache is not None:
-            return self._results_cache
-
-        # Create a permissive config to capture all potential candidates
-        config = ClassifierConfig()
-
-        # Relax ProgressBarIndicator config to capture outliers
-        config.progress_bar.indicator_min_size = 0.1
-        config.progress_bar.indicator_max_size = 1000.0
-        config.progress_bar.indicator_max_bottom_margin_ratio = 0.5
-
-        classifier = Classifier(config)
-        results = []
-
-        print(f"Loading and classifying {len(self.data_files)} files...")
-        for file_path in self.data_files:
-            try:
-                with open(file_path) as f:
-                    data = json.load(f)
-
-                pages = data.get("pages", [])
-                for page_dict in pages:
-                    try:
-                        page_data = PageData.model_validate(page_dict)
-                        if page_data.bbox:
-                            result = classifier.classify(page_data)
-                            results.append((page_data, result))
-                    except Exception:
-                        pass
-            except Exception as e:
-                log.error(f"Error reading {file_path}: {e}")
-
-        self._results_cache = results
-        return results
+        Args:
+            rows: Candidate rows, page by page (see `iter_candidate_rows`).
+        """
+        pass
 
     def _print_recommendation(
         self,
@@ -114,8 +122,8 @@ class Tuner(ABC):
         print(msg)
 
     def _find_best_indicator(
-        self, bar_cand: Candidate, indicators: Sequence[Candidate]
-    ) -> Candidate | None:
+        self, bar_cand: CandidateRow, indicators: Sequence[CandidateRow]
+    ) -> CandidateRow | None:
         """Find the best matching indicator for a progress bar."""
         bar_bbox = bar_cand.bbox
         best_ind_cand = None
@@ -157,7 +165,7 @@ class Tuner(ABC):
 class ProgressBarTuner(Tuner):
     """Tuner for ProgressBarConfig parameters."""
 
-    def tune(self, results: list[tuple[PageData, ClassificationResult]]) -> None:
+    def tune(self, rows: Iterable[CandidateRow]) -> None:
         print(f"--- Tuning {ProgressBarConfig.__name__} ---")
 
         horizontal_excesses: list[float] = []
@@ -165,9 +173,9 @@ class ProgressBarTuner(Tuner):
 
         bar_count = 0
 
-        for _, result in results:
-            bars = result.get_candidates("progress_bar")
-            indicators = result.get_candidates("progress_bar_indicator")
+        for page in iter_pages(rows):
+            bars = page["progress_bar"]
+            indicators = page["progress_bar_indicator"]
 
             if not bars:
                 continue
@@ -224,7 +232,7 @@ class ProgressBarTuner(Tuner):
 class ProgressBarIndicatorTuner(Tuner):
     """Tuner for ProgressBarConfig indicator parameters."""
 
-    def tune(self, results: list[tuple[PageData, ClassificationResult]]) -> None:
+    def tune(self, rows: Iterable[CandidateRow]) -> None:
         print(f"--- Tuning {ProgressBarConfig.__name__} (indicator settings) ---")
 
         indicator_min_dims: list[float] = []
@@ -232,9 +240,9 @@ class ProgressBarIndicatorTuner(Tuner):
 
         matched_indicators_count = 0
 
-        for _, result in results:
-            bars = result.get_candidates("progress_bar")
-            indicators = result.get_candidates("progress_bar_indicator")
+        for page in iter_pages(rows):
+            bars = page["progress_bar"]
+            indicators = page["progress_bar_indicator"]
 
             if not bars:
                 continue
@@ -274,34 +282,147 @@ class ProgressBarIndicatorTuner(Tuner):
         print("")
 
 
+def score_golden_fixtures(raw_files: Iterable[str]) -> list[ScoredPage]:
+    """Score the first page of each raw fixture that has a golden file."""
+    configs: dict[str, ClassifierConfig] = {}
+    pages: list[ScoredPage] = []
+    for fixture_file in raw_files:
+        golden_path = FIXTURES_DIR / fixture_file.replace("_raw.json", "_expected.json")
+        if not golden_path.exists():
+            continue
+        extraction = load_raw_fixture(fixture_file)
+        if not extraction.pages:
+            continue
+        # Fixtures of the same manual share hints, so share their config
+        element_id = extract_element_id(fixture_file)
+        if element_id not in configs:
+            configs[element_id] = load_classifier_config(element_id)
+        pages.append(
+            ScoredPage(
+                fixture_file,
+                extraction.pages[0],
+                configs[element_id],
+                Page.model_validate_json(golden_path.read_text()),
+            )
+        )
+    return pages
+
+
+def print_sweep(reports: Iterable[SettingReport]) -> None:
+    """Print precision and recall per setting, then the best setting per type."""
+    print(f"{'precision':>9}  {'recall':>6}  {'failed':>6}  setting")
+    best: SettingReport | None = None
+    for report in reports:
+        total = report.total
+        print(
+            f"{total.precision:9.4f}  {total.recall:6.4f}  "
+            f"{len(report.failed_pages):6d}  {report.setting.name}"
+        )
+        if best is None or (total.recall, total.precision) > (
+            best.total.recall,
+            best.total.precision,
+        ):
+            best = report
+    if best is None:
+        return
+
+    print(f"\nBest: {best.setting.name}")
+    for kind, counts in best.counts.items():
+        print(
+            f"  {kind:24s} precision {counts.precision:.4f}  recall {counts.recall:.4f}"
+        )
+    for name in best.failed_pages:
+        print(f"  failed: {name}")
+
+
+def _sweep_axis(value: str) -> tuple[str, list[str]]:
+    path, sep, values = value.partition("=")
+    if not sep or not values:
+        raise argparse.ArgumentTypeError(f"expected FIELD=VALUE[,VALUE...]: {value}")
+    return path, values.split(",")
+
+
 def main():
-    files = glob.glob("debug/*_raw.json")
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "files",
+        type=Path,
+        nargs="*",
+        help="Raw extraction JSON files to tune on (default: debug/*_raw.json).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to classify the files (default: all CPUs).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=Path("debug/tune_cache"),
+        help=(
+            "Cache candidate rows here, keyed by file and config hash, so "
+            "re-runs only classify files that changed (default: %(default)s)."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Neither read nor write the cache."
+    )
+    parser.add_argument(
+        "--sweep",
+        metavar="FIELD=VALUE[,VALUE...]",
+        type=_sweep_axis,
+        action="append",
+        help=(
+            "Instead of tuning, report precision/recall against the golden "
+            "fixtures for every combination of these config values, e.g. "
+            "--sweep progress_bar.indicator_search_margin=5,10,15. Repeatable."
+        ),
+    )
+    args = parser.parse_args()
+
+    if args.sweep:
+        settings = grid(dict(args.sweep))
+        try:
+            for setting in settings:
+                apply_overrides(ClassifierConfig(), setting.overrides)
+        except ValueError as e:
+            parser.error(str(e))
+        # Sweep the raw fixtures given, or all of them
+        raw_files = [f.name for f in args.files] or RAW_FIXTURE_FILES
+        pages = score_golden_fixtures(raw_files)
+        print(f"Sweeping {len(settings)} settings over {len(pages)} golden fixtures")
+        print_sweep(sweep(pages, settings))
+        return
+
+    files: list[Path] = args.files or sorted(Path("debug").glob("*_raw.json"))
     if not files:
         log.error(
             "No debug/*_raw.json files found. Run extraction with debug output first."
         )
         sys.exit(1)
 
-    # Use first tuner to load results shared by all
-    # Actually, Tuner class is abstract.
-    # Let's instantiate tuners and manage data loading cleanly.
-
-    tuners = [
-        ProgressBarTuner(files),
-        ProgressBarIndicatorTuner(files),
+    config = tuning_config()
+    cache = None if args.no_cache else TuningCache(args.cache_dir)
+    tuners: list[Tuner] = [
+        ProgressBarTuner(),
+        ProgressBarIndicatorTuner(),
     ]
 
-    # Load results once
-    # Since Tuner stores cache, and they share the same file list...
-    # Actually they are separate instances.
-    # Let's just load it once here.
-
-    print("Initializing analysis...")
-    # Just use the first tuner to load results for now, effectively sharing logic
-    results = tuners[0].load_results()
+    print(f"Classifying {len(files)} files...")
+    if cache is None:
+        # Without a cache, classify once and share the rows across tuners
+        rows = list(iter_candidate_rows(files, config, workers=args.workers))
+        for tuner in tuners:
+            tuner.tune(rows)
+        return
 
     for tuner in tuners:
-        tuner.tune(results)
+        # Each tuner streams the rows; after the first, they come from the cache
+        tuner.tune(
+            iter_candidate_rows(files, config, cache=cache, workers=args.workers)
+        )
+    print(f"Tuning cache: {cache.hits} hits, {cache.misses} misses")
 
 
 if __name__ == "__main__":
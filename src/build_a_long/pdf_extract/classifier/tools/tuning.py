@@ -0,0 +1,258 @@
+"""Classification results for config tuning, as cached candidate rows.
+
+Tuning a config means classifying every page of many raw extraction files
+with a permissive config, then looking at where the candidates fall. The
+tuners only need a few numbers per candidate, so each file's results are
+reduced to compact `CandidateRow`s.
+
+Files are classified across a process pool, and each file's rows are
+cached on disk keyed by the file's content hash, the config's hash and
+the classifier sources' hash (`regeneration.source_version`), so later
+runs (and other tuners) only classify files, configs or code that changed.
+Cache files are written atomically.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import pydantic
+from pydantic import BaseModel
+
+from build_a_long.common import atomic_write
+from build_a_long.pdf_extract.classifier.classification_result import (
+    ClassificationResult,
+)
+from build_a_long.pdf_extract.classifier.classifier import Classifier
+from build_a_long.pdf_extract.classifier.classifier_config import ClassifierConfig
+from build_a_long.pdf_extract.classifier.tools.regeneration import source_version
+from build_a_long.pdf_extract.cli.io import load_extraction
+from build_a_long.pdf_extract.extractor.bbox import BBox
+
+logger = logging.getLogger(__name__)
+
+
+class CandidateRow(NamedTuple):
+    """One candidate considered while classifying a page.
+
+    Attributes:
+        source: Name of the raw extraction file the page came from
+        page_number: PDF page number (1-indexed)
+        label: The label the candidate was scored for
+        x0, y0, x1, y1: The candidate's bounding box
+        score: The candidate's score
+        constructed: Whether the candidate was built into an element
+    """
+
+    source: str
+    page_number: int
+    label: str
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    score: float
+    constructed: bool
+
+    @property
+    def bbox(self) -> BBox:
+        return BBox(self.x0, self.y0, self.x1, self.y1)
+
+
+class _CacheFile(BaseModel):
+    rows: list[CandidateRow]
+
+
+def candidate_rows(source: str, result: ClassificationResult) -> list[CandidateRow]:
+    """Reduce a page's classification result to its candidate rows."""
+    page_number = result.page_data.page_number
+    return [
+        CandidateRow(
+            source,
+            page_number,
+            label,
+            c.bbox.x0,
+            c.bbox.y0,
+            c.bbox.x1,
+            c.bbox.y1,
+            c.score,
+            c.constructed is not None,
+        )
+        for label, candidates in result.candidates.items()
+        for c in candidates
+    ]
+
+
+def classify_file(path: Path, classifier: Classifier) -> list[CandidateRow]:
+    """Classify every page of a raw extraction file into candidate rows.
+
+    Pages without a bbox, or whose classification fails, are skipped.
+    """
+    rows: list[CandidateRow] = []
+    for page_data in load_extraction(path).pages:
+        if not page_data.bbox:
+            continue
+        try:
+            result = classifier.classify(page_data)
+        except Exception as e:
+            logger.debug("Skipping %s page %d: %s", path.name, page_data.page_number, e)
+            continue
+        rows.extend(candidate_rows(path.name, result))
+    return rows
+
+
+def config_hash(config: ClassifierConfig) -> str:
+    """Hash a config, including its hints."""
+    return hashlib.sha256(config.model_dump_json().encode()).hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    """Hash a file's bytes."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class TuningCache:
+    """Candidate rows on disk, one file per (raw file hash, config hash).
+
+    Rows are also keyed by `source_version`, so any change to the
+    classifiers (or to `CandidateRow`) misses the cache instead of reusing
+    stale rows.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.source_version = source_version()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, source_hash: str, config_key: str) -> Path:
+        name = f"{source_hash[:32]}-{config_key[:32]}-{self.source_version[:16]}"
+        return self.directory / f"{name}.json"
+
+    def contains(self, source_hash: str, config_key: str) -> bool:
+        """Whether rows are stored for a raw file and config."""
+        return self._path(source_hash, config_key).exists()
+
+    def get(self, source_hash: str, config_key: str) -> list[CandidateRow] | None:
+        """Return the cached rows, or None on a miss."""
+        path = self._path(source_hash, config_key)
+        try:
+            cached = _CacheFile.model_validate_json(path.read_bytes())
+        except FileNotFoundError:
+            cached = None
+        except (OSError, pydantic.ValidationError) as e:
+            logger.warning("Ignoring unreadable tuning cache %s: %s", path, e)
+            cached = None
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return cached.rows
+
+    def put(self, source_hash: str, config_key: str, rows: list[CandidateRow]) -> None:
+        """Store the rows for a raw file and config."""
+        path = self._path(source_hash, config_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, _CacheFile(rows=rows).model_dump_json())
+
+
+# Per-process classifier for pool workers, set up once by `_init_worker`.
+_worker_classifier: Classifier | None = None
+
+
+def _init_worker(config: ClassifierConfig) -> None:
+    global _worker_classifier
+    _worker_classifier = Classifier(config)
+
+
+def _classify_in_worker(path: Path) -> list[CandidateRow]:
+    assert _worker_classifier is not None, "tuning worker was not initialized"
+    return classify_file(path, _worker_classifier)
+
+
+def iter_candidate_rows(
+    paths: Sequence[Path],
+    config: ClassifierConfig,
+    *,
+    cache: TuningCache | None = None,
+    workers: int = 1,
+) -> Iterator[CandidateRow]:
+    """Classify raw extraction files with a config, yielding candidate rows.
+
+    Rows are yielded file by file, in the order of ``paths``, and page by
+    page within a file, so only one file's rows are held at a time. Files
+    with cached rows are not classified again; the others are classified
+    across ``workers`` processes (submitted up front) and yielded and
+    cached as their turn comes. Files that cannot be read are logged and
+    skipped.
+
+    Args:
+        paths: Raw extraction files (ExtractionResult JSON, compressed or not)
+        config: Config to classify with
+        cache: Cache to read rows from and write new rows to
+        workers: Number of classifier processes. 1 classifies serially
+            in-process.
+    """
+    config_key = config_hash(config)
+    source_hashes: dict[Path, str] = {}
+    if cache is not None:
+        for path in paths:
+            try:
+                source_hashes[path] = file_hash(path)
+            except OSError as e:
+                logger.error("Error reading %s: %s", path, e)
+
+    if cache is None:
+        misses = list(paths)
+    else:
+        misses = [
+            path
+            for path, source_hash in source_hashes.items()
+            if not cache.contains(source_hash, config_key)
+        ]
+    executor: ProcessPoolExecutor | None = None
+    futures: dict[Path, Future[list[CandidateRow]]] = {}
+    if workers > 1 and len(misses) > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=min(workers, len(misses)),
+            initializer=_init_worker,
+            initargs=(config,),
+        )
+        futures = {path: executor.submit(_classify_in_worker, path) for path in misses}
+    classifier: Classifier | None = None
+
+    pending = set(misses)
+    try:
+        for path in paths:
+            if cache is not None:
+                if path not in source_hashes:
+                    continue
+                if path in pending:
+                    cache.misses += 1
+                else:
+                    rows = cache.get(source_hashes[path], config_key)
+                    if rows is not None:
+                        yield from rows
+                        continue
+            try:
+                if path in futures:
+                    rows = futures.pop(path).result()
+                else:
+                    if classifier is None:
+                        classifier = Classifier(config)
+                    rows = classify_file(path, classifier)
+            except Exception as e:
+                logger.error("Error reading %s: %s", path, e)
+                continue
+            if cache is not None:
+                cache.put(source_hashes[path], config_key, rows)
+            yield from rows
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,118 @@
+"""Tests for the tuning candidate rows and their cache."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from build_a_long.pdf_extract.classifier.classifier_config import ClassifierConfig
+from build_a_long.pdf_extract.classifier.tools import tuning
+from build_a_long.pdf_extract.classifier.tools.tuning import (
+    TuningCache,
+    iter_candidate_rows,
+)
+from build_a_long.pdf_extract.fixtures import FIXTURES_DIR
+
+SMALL_FIXTURES = ["6433200_page_031_raw.json", "6433200_page_005_raw.json"]
+
+
+@pytest.fixture
+def raw_files(tmp_path: Path) -> list[Path]:
+    paths = []
+    for name in SMALL_FIXTURES:
+        path = tmp_path / name
+        shutil.copy(FIXTURES_DIR / name, path)
+        paths.append(path)
+    return paths
+
+
+def test_rows_cover_every_file_in_order(raw_files: list[Path]) -> None:
+    rows = list(iter_candidate_rows(raw_files, ClassifierConfig()))
+
+    assert rows
+    sources = [row.source for row in rows]
+    assert sources == sorted(sources, key=SMALL_FIXTURES.index)
+    assert set(sources) == set(SMALL_FIXTURES)
+    assert any(row.constructed for row in rows)
+    for row in rows:
+        assert row.bbox.x0 == row.x0 and row.bbox.y1 == row.y1
+
+
+def test_cache_hit_skips_classification(
+    raw_files: list[Path], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = TuningCache(tmp_path / "cache")
+    config = ClassifierConfig()
+    first = list(iter_candidate_rows(raw_files, config, cache=cache))
+    assert (cache.hits, cache.misses) == (0, len(raw_files))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("classified a cached file")
+
+    monkeypatch.setattr(tuning, "classify_file", fail)
+    second = list(iter_candidate_rows(raw_files, config, cache=cache))
+
+    assert second == first
+    assert cache.hits == len(raw_files)
+
+
+def test_config_change_misses_cache(raw_files: list[Path], tmp_path: Path) -> None:
+    cache = TuningCache(tmp_path / "cache")
+    list(iter_candidate_rows(raw_files, ClassifierConfig(), cache=cache))
+
+    changed = ClassifierConfig()
+    changed.progress_bar.indicator_min_size = 0.1
+    list(iter_candidate_rows(raw_files, changed, cache=cache))
+
+    assert cache.hits == 0
+    assert len(list(cache.directory.glob("*.json"))) == 2 * len(raw_files)
+
+
+def test_source_change_misses_cache(
+    raw_files: list[Path], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = TuningCache(tmp_path / "cache")
+    list(iter_candidate_rows(raw_files, ClassifierConfig(), cache=cache))
+
+    monkeypatch.setattr(tuning, "source_version", lambda: "changed sources")
+    cache = TuningCache(cache.directory)
+    list(iter_candidate_rows(raw_files, ClassifierConfig(), cache=cache))
+
+    assert (cache.hits, cache.misses) == (0, len(raw_files))
+    assert len(list(cache.directory.glob("*.json"))) == 2 * len(raw_files)
+
+
+def test_corrupt_cache_entry_is_recomputed(
+    raw_files: list[Path], tmp_path: Path
+) -> None:
+    cache = TuningCache(tmp_path / "cache")
+    expected = list(iter_candidate_rows(raw_files, ClassifierConfig(), cache=cache))
+    for path in cache.directory.glob("*.json"):
+        path.write_text("not json")
+
+    cache = TuningCache(cache.directory)
+    rows = list(iter_candidate_rows(raw_files, ClassifierConfig(), cache=cache))
+
+    assert rows == expected
+    assert (cache.hits, cache.misses) == (0, len(raw_files))
+
+
+def test_workers_match_serial(raw_files: list[Path]) -> None:
+    config = ClassifierConfig()
+    serial = list(iter_candidate_rows(raw_files, config))
+    parallel = list(iter_candidate_rows(raw_files, config, workers=2))
+
+    assert parallel == serial
+
+
+def test_unreadable_file_is_skipped(raw_files: list[Path], tmp_path: Path) -> None:
+    missing = tmp_path / "missing_raw.json"
+    paths = [raw_files[0], missing, raw_files[1]]
+
+    rows = list(iter_candidate_rows(paths, ClassifierConfig()))
+    cached_rows = list(
+        iter_candidate_rows(paths, ClassifierConfig(), cache=TuningCache(tmp_path))
+    )
+
+    assert rows == cached_rows
+    assert {row.source for row in rows} == set(SMALL_FIXTURES)
@@ -0,0 +1,82 @@
+"""Structured, lazily evaluated decision tracing for the classifier.
+
+Classifiers make thousands of build and clustering decisions per page. Logging
+each one with eagerly computed arguments (block id lists, sorted sets) costs
+time even when DEBUG logging is off, because Python evaluates the arguments
+before ``logger.debug`` decides to drop the message.
+
+Instead, `Classifier.classify` decides once per page whether to trace, and
+stores the result on `ClassificationResult.trace`. Hot paths guard payload
+construction behind that check:
+
+.. code-block:: python
+
+    if result.trace is not None:
+        result.trace.record(
+            "diagram.expand", seed=seed.id, consumed=sorted(result._consumed_blocks)
+        )
+
+A page is traced when a decision trace was requested (``--debug-classification``
+writes one file per page) or when DEBUG logging is enabled for the classifier,
+in which case every record is also logged.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+log = logging.getLogger(__name__)
+
+
+class TraceRecord(BaseModel):
+    """A single classifier decision."""
+
+    event: str
+    """Dotted event name, e.g. ``build.start`` or ``diagram.expand``."""
+
+    data: dict[str, Any] = Field(default_factory=dict)
+
+
+class PageTrace(BaseModel):
+    """Decision trace for one page."""
+
+    page_number: int
+
+    keep: bool = True
+    """Whether records are stored (for a decision trace file)."""
+
+    log_records: bool = False
+    """Whether records are also logged at DEBUG level."""
+
+    records: list[TraceRecord] = Field(default_factory=list)
+
+    @classmethod
+    def for_page(cls, page_number: int, *, keep: bool = False) -> PageTrace | None:
+        """Return a trace for a page, or None if nothing would consume it.
+
+        Args:
+            page_number: The page being classified.
+            keep: Store the records, e.g. to write a decision trace file.
+
+        Returns:
+            A trace if `keep` is set or DEBUG logging is enabled, else None.
+        """
+        log_records = log.isEnabledFor(logging.DEBUG)
+        if not keep and not log_records:
+            return None
+        return cls(page_number=page_number, keep=keep, log_records=log_records)
+
+    def record(self, event: str, **data: Any) -> None:
+        """Record a decision.
+
+        Args:
+            event: Dotted event name.
+            **data: JSON-serializable details (block ids, bboxes, reasons).
+        """
+        if self.keep:
+            self.records.append(TraceRecord(event=event, data=data))
+        if self.log_records:
+            log.debug("[%s] page=%s %s", event, self.page_number, data)
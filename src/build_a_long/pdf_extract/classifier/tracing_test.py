@@ -0,0 +1,30 @@
+"""Tests for classifier decision tracing."""
+
+import logging
+
+import pytest
+
+from build_a_long.pdf_extract.classifier.tracing import PageTrace
+
+
+def test_no_trace_unless_requested_or_debug_logging() -> None:
+    assert PageTrace.for_page(1) is None
+
+    trace = PageTrace.for_page(1, keep=True)
+    assert trace is not None
+    trace.record("build.start", label="step", blocks=[1, 2])
+    assert [(r.event, r.data) for r in trace.records] == [
+        ("build.start", {"label": "step", "blocks": [1, 2]})
+    ]
+
+
+def test_debug_logging_enables_trace_without_keeping_records(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    with caplog.at_level(logging.DEBUG, logger="build_a_long.pdf_extract"):
+        trace = PageTrace.for_page(7)
+        assert trace is not None
+        trace.record("diagram.expand", seed=3)
+
+    assert trace.records == []
+    assert "[diagram.expand] page=7 {'seed': 3}" in caplog.text
@@ -10,16 +10,21 @@ from build_a_long.pdf_extract.validation import (
 
 from .config import ProcessingConfig, parse_arguments
 from .io import (
+    ManualJsonWriter,
     load_json,
     open_compressed,
     render_annotated_images,
+    save_classification_stats,
     save_debug_json,
+    save_decision_traces,
     save_manual_json,
     save_raw_json,
 )
 from .output_models import DebugOutput
+from .profiling import StageProfiler
 from .reporting import (
     print_classification_debug,
+    print_classification_stats,
     print_font_hints,
     print_histogram,
     print_page_hierarchy,
@@ -34,17 +39,22 @@ from .unconsumed_diagnostics import (
 __all__ = [
     "ProcessingConfig",
     "parse_arguments",
+    "ManualJsonWriter",
     "load_json",
     "open_compressed",
     "render_annotated_images",
+    "save_classification_stats",
     "save_debug_json",
+    "save_decision_traces",
     "save_manual_json",
     "save_raw_json",
     "DebugOutput",
+    "StageProfiler",
     "ValidationIssue",
     "ValidationResult",
     "ValidationSeverity",
     "print_classification_debug",
+    "print_classification_stats",
     "print_font_hints",
     "print_histogram",
     "print_page_hierarchy",
@@ -30,6 +30,9 @@ class ProcessingConfig(BaseModel):
     draw_deleted: bool = False
     draw_drawings: bool = False
     draw_unconsumed: bool = False
+    render_workers: int = 1
+    raster_cache_dir: Path | None = None
+    validation_cache_dir: Path | None = None
 
     # Debug flags
     debug_classification: bool = False
@@ -38,6 +41,35 @@ class ProcessingConfig(BaseModel):
     debug_unconsumed: bool = False
     print_histogram: bool = False
     print_font_hints: bool = False
+    classifier_stats: bool = False
+    classifier_stats_format: str | None = None
+    profile: str | None = None
+    profile_pages: str | None = None
+    profile_top: int = 20
+
+    @property
+    def instrument(self) -> bool:
+        """Whether classification should record timings and counters."""
+        return self.classifier_stats or self.classifier_stats_format is not None
+
+    @property
+    def compact_results(self) -> bool:
+        """Whether per-page results can be compacted once classified.
+
+        Compacting drops every candidate, so it is only done when no debug
+        output or annotated image needs them.
+        """
+        return not (
+            self.save_debug_json
+            or self.debug_classification
+            or self.debug_candidates
+            or self.debug_unconsumed
+            or self.draw_blocks
+            or self.draw_elements
+            or self.draw_deleted
+            or self.draw_drawings
+            or self.draw_unconsumed
+        )
 
     @classmethod
     def from_args(cls, args: argparse.Namespace) -> ProcessingConfig:
@@ -68,12 +100,24 @@ class ProcessingConfig(BaseModel):
             draw_deleted=args.draw_deleted,
             draw_drawings=args.draw_drawings,
             draw_unconsumed=args.draw_unconsumed,
+            render_workers=args.render_workers,
+            raster_cache_dir=args.raster_cache_dir,
+            validation_cache_dir=args.validation_cache_dir,
             debug_classification=args.debug_classification,
             debug_candidates=args.debug_candidates,
             debug_candidates_label=args.debug_candidates_label,
             debug_unconsumed=args.debug_unconsumed,
             print_histogram=args.print_histogram,
             print_font_hints=args.print_font_hints,
+            classifier_stats=args.classifier_stats,
+            classifier_stats_format=args.classifier_stats_format,
+            profile=(
+                args.profile
+                if args.profile is not None or args.profile_pages is None
+                else "prof"
+            ),
+            profile_pages=args.profile_pages,
+            profile_top=args.profile_top,
         )
 
 
@@ -201,6 +245,33 @@ def parse_arguments() -> argparse.Namespace:
             "(unconsumed blocks)."
         ),
     )
+    output_group.add_argument(
+        "--render-workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of processes used to render annotated images "
+            "(default: 1, render serially)."
+        ),
+    )
+    output_group.add_argument(
+        "--raster-cache-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Cache rendered page rasters in this directory, keyed by PDF hash, "
+            "page and DPI, so re-renders only redraw the annotations."
+        ),
+    )
+    output_group.add_argument(
+        "--validation-cache-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Cache per-page validation results in this directory, keyed by "
+            "page content, so re-runs only re-validate pages that changed."
+        ),
+    )
 
     # Debug options group
     debug_group = parser.add_argument_group("debug options")
@@ -220,7 +291,10 @@ def parse_arguments() -> argparse.Namespace:
     debug_group.add_argument(
         "--debug-classification",
         action="store_true",
-        help="Print detailed classification debugging information for each page.",
+        help=(
+            "Print detailed classification debugging information for each page, "
+            "and save each page's build decisions (*_page_NNN_decisions.json)."
+        ),
     )
     debug_group.add_argument(
         "--debug-candidates",
@@ -257,6 +331,49 @@ def parse_arguments() -> argparse.Namespace:
         action="store_true",
         help="Print font size hints derived from text analysis.",
     )
+    debug_group.add_argument(
+        "--classifier-stats",
+        action="store_true",
+        help=(
+            "Instrument classification and print time, candidate counts, "
+            "builds, failures and rollbacks per label."
+        ),
+    )
+    debug_group.add_argument(
+        "--classifier-stats-format",
+        choices=["json", "trace"],
+        help=(
+            "Instrument classification and save the stats as JSON "
+            "(*_stats.json) or as a Chrome trace (*_trace.json, open in "
+            "ui.perfetto.dev)."
+        ),
+    )
+    debug_group.add_argument(
+        "--profile",
+        nargs="?",
+        const="prof",
+        choices=["prof", "collapsed"],
+        help=(
+            "Profile extraction, classification, validation and output "
+            "separately and print the slowest functions. Saves cProfile "
+            "*_profile_<stage>.prof files (default), or with 'collapsed', "
+            "sampled *_profile_<stage>.collapsed flamegraph stacks."
+        ),
+    )
+    debug_group.add_argument(
+        "--profile-pages",
+        type=str,
+        help=(
+            "Only profile the classification of these pages (same syntax as "
+            "--pages), one profile per page. Implies --profile."
+        ),
+    )
+    debug_group.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        help="Number of functions listed per profile (default: 20).",
+    )
     debug_group.add_argument(
         "--log-level",
         type=str,
@@ -1,20 +1,33 @@
 """Input/Output operations for PDF extraction."""
 
 import bz2
+import functools
 import gzip
+import hashlib
 import json
 import logging
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any
+from typing import Any, Self, TextIO
 
 import pymupdf
 
-from build_a_long.pdf_extract.classifier import ClassificationResult
+from build_a_long.pdf_extract.classifier import (
+    ClassificationResult,
+    ClassificationStats,
+)
 from build_a_long.pdf_extract.cli.output_models import DebugOutput
-from build_a_long.pdf_extract.drawing import draw_and_save_bboxes
+from build_a_long.pdf_extract.drawing import (
+    PageOverlay,
+    RasterCache,
+    build_page_overlay,
+    draw_and_save_bboxes,
+    render_page_overlay,
+)
 from build_a_long.pdf_extract.extractor import ExtractionResult, PageData
-from build_a_long.pdf_extract.extractor.lego_page_elements import Manual
-from build_a_long.pdf_extract.utils import transform_for_json
+from build_a_long.pdf_extract.extractor.lego_page_elements import Manual, Page
+from build_a_long.pdf_extract.utils import remove_empty_lists, transform_for_json
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +84,68 @@ def load_json(path: Path) -> dict[str, Any]:
         ) from e
 
 
+def load_extraction(path: Path) -> ExtractionResult:
+    """Load a raw extraction JSON file, automatically detecting compression.
+
+    The file is decompressed as a stream into bytes and validated once with
+    `model_validate_json`, without building an intermediate Python dict.
+
+    Args:
+        path: Path to an ExtractionResult JSON file (compressed or not)
+
+    Returns:
+        The validated ExtractionResult
+
+    Raises:
+        pydantic.ValidationError: If the file is not a valid ExtractionResult
+    """
+    with open_compressed(path, "rb") as f:
+        return ExtractionResult.model_validate_json(f.read())
+
+
+def load_extractions(
+    paths: Sequence[Path], *, workers: int = 1
+) -> list[ExtractionResult]:
+    """Load several raw extraction files, in parallel across processes.
+
+    Args:
+        paths: Paths to ExtractionResult JSON files (compressed or not)
+        workers: Number of loader processes. 1 loads serially in-process.
+
+    Returns:
+        The ExtractionResults, in the order of `paths`
+    """
+    if workers <= 1 or len(paths) <= 1:
+        return [load_extraction(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        return list(executor.map(load_extraction, paths))
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_extraction(path: Path, mtime_ns: int, size: int) -> ExtractionResult:
+    # mtime_ns and size are unused, but part of the cache key
+    return load_extraction(path)
+
+
+def cached_extraction(path: Path) -> ExtractionResult:
+    """Load a raw extraction file, reusing earlier loads in this process.
+
+    Keeps the most recently used results in a per-process LRU cache, keyed
+    by path, modification time and size so an edited file is reloaded.
+    The same ExtractionResult is returned to every caller, so it must be
+    treated as read-only.
+
+    Args:
+        path: Path to an ExtractionResult JSON file (compressed or not)
+
+    Returns:
+        The (shared) ExtractionResult
+    """
+    path = path.resolve()
+    stat = path.stat()
+    return _cached_extraction(path, stat.st_mtime_ns, stat.st_size)
+
+
 def save_debug_json(
     results: list[ClassificationResult],
     output_dir: Path,
@@ -101,6 +176,76 @@ def save_debug_json(
     logger.info("Saved debug JSON to %s", output_json_path)
 
 
+def save_classification_stats(
+    stats: ClassificationStats,
+    output_dir: Path,
+    pdf_path: Path,
+    *,
+    trace: bool = False,
+) -> Path:
+    """Save classifier instrumentation as JSON.
+
+    Args:
+        stats: Stats collected by `classify_pages(..., instrument=True)`
+        output_dir: Directory where JSON should be saved
+        pdf_path: Original PDF path (used for naming the JSON file)
+        trace: If True, write Chrome trace-event format (*_trace.json) instead
+            of the stats model (*_stats.json)
+
+    Returns:
+        Path to the saved file
+    """
+    suffix = "_trace.json" if trace else "_stats.json"
+    output_path = output_dir / (pdf_path.stem + suffix)
+    if output_dir == Path("/dev/null"):
+        return output_path
+
+    with open(output_path, "w") as f:
+        if trace:
+            json.dump(stats.to_chrome_trace(), f)
+        else:
+            f.write(stats.model_dump_json(indent=2))
+    logger.info("Saved classifier stats to %s", output_path)
+    return output_path
+
+
+def save_decision_traces(
+    results: list[ClassificationResult],
+    output_dir: Path,
+    pdf_path: Path,
+) -> list[Path]:
+    """Save each page's classifier decision trace as JSON.
+
+    Pages classified without tracing are skipped.
+
+    Args:
+        results: Classification results from `classify_pages(..., trace=True)`
+        output_dir: Directory where JSON should be saved
+        pdf_path: Original PDF path (used for naming the JSON files)
+
+    Returns:
+        Paths of the saved files, one per traced page
+    """
+    if output_dir == Path("/dev/null"):
+        return []
+
+    paths = []
+    for result in results:
+        if result.trace is None:
+            continue
+        page_num = result.page_data.page_number
+        output_path = output_dir / f"{pdf_path.stem}_page_{page_num:03d}_decisions.json"
+        with open(output_path, "w") as f:
+            f.write(
+                result.trace.model_dump_json(
+                    indent=2, include={"page_number", "records"}
+                )
+            )
+        paths.append(output_path)
+    logger.info("Saved %d decision traces to %s", len(paths), output_dir)
+    return paths
+
+
 def save_manual_json(
     manual: Manual,
     output_dir: Path,
@@ -128,6 +273,107 @@ def save_manual_json(
     return output_json_path
 
 
+class ManualJsonWriter:
+    """Write a Manual's JSON file incrementally, one page at a time.
+
+    Pages are appended as they are classified, so memory stays bounded by a
+    single page and the file fills in while the PDF is processed. Once
+    closed, the file is byte-for-byte what `save_manual_json` writes for the
+    same manual.
+
+    Use as a context manager. If the block raises, the incomplete file is
+    removed, as `save_manual_json` would not have written one.
+
+    Example:
+        with ManualJsonWriter(Manual(source_pdf=...), output_dir, pdf_path) as w:
+            for page in pages:
+                w.write_page(page)
+        print(w.path)
+    """
+
+    _PAGES_PLACEHOLDER = "\0pages\0"
+
+    def __init__(self, manual: Manual, output_dir: Path, pdf_path: Path) -> None:
+        """Prepare to write.
+
+        Args:
+            manual: Manual metadata (source, set number, ...). Its pages are
+                ignored; pass them to `write_page` instead.
+            output_dir: Directory where JSON should be saved
+            pdf_path: Original PDF path (used for naming the JSON file)
+        """
+        self.path = output_dir / (pdf_path.stem + ".json")
+        self._discard = output_dir == Path("/dev/null")
+        self._manual = manual.model_copy(update={"pages": []})
+        self._file: TextIO | None = None
+        self._suffix = ""
+        self._last_page_number: int | None = None
+        self._closed = False
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        self._closed = True
+        if self._file is not None:
+            self._file.close()
+            self.path.unlink(missing_ok=True)
+
+    def _dumps(self, data: Any) -> str:
+        # Same cleaning and formatting as Manual.to_json(indent=2)
+        return json.dumps(remove_empty_lists(data), indent=2, separators=(",", ": "))
+
+    def write_page(self, page: Page) -> None:
+        """Append a page. Pages must arrive in PDF page order.
+
+        Raises:
+            ValueError: If the page comes before the previously written one.
+        """
+        if self._closed:
+            raise ValueError("write_page() called after close()")
+        if (
+            self._last_page_number is not None
+            and page.pdf_page_number < self._last_page_number
+        ):
+            raise ValueError(
+                f"Page {page.pdf_page_number} written after page "
+                f"{self._last_page_number}; pages must be in PDF page order"
+            )
+        self._last_page_number = page.pdf_page_number
+        if self._discard:
+            return
+
+        # Nested two levels deep in the document: {"pages": [<page>]}
+        page_json = self._dumps(page.to_dict()).replace("\n", "\n    ")
+        if self._file is None:
+            data = self._manual.to_dict()
+            data["pages"] = self._PAGES_PLACEHOLDER
+            prefix, self._suffix = self._dumps(data).split(
+                json.dumps(self._PAGES_PLACEHOLDER)
+            )
+            self._file = open(self.path, "w")  # noqa: SIM115
+            self._file.write(f"{prefix}[\n    {page_json}")
+        else:
+            self._file.write(f",\n    {page_json}")
+
+    def close(self) -> None:
+        """Finish the document. Writes the whole file if no pages were added."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._discard:
+            return
+        if self._file is None:
+            with open(self.path, "w") as f:
+                f.write(self._manual.to_json(indent=2))
+            return
+        self._file.write(f"\n  ]{self._suffix}")
+        self._file.close()
+
+
 def save_raw_json(
     pages: list[PageData],
     output_dir: Path,
@@ -201,6 +447,32 @@ def save_raw_json(
         _save_json_file(json_data, output_path, f"{len(pages)} pages")
 
 
+# Per-process state for render workers, set up once by `_init_render_worker`.
+_worker_doc: pymupdf.Document | None = None
+_worker_raster_cache: RasterCache | None = None
+
+
+def _init_render_worker(pdf_path: Path, raster_cache_dir: Path | None) -> None:
+    """Open the PDF once per worker process."""
+    global _worker_doc, _worker_raster_cache
+    _worker_doc = pymupdf.open(str(pdf_path))
+    _worker_raster_cache = RasterCache(raster_cache_dir) if raster_cache_dir else None
+
+
+def _render_overlay_in_worker(
+    overlay: PageOverlay, output_path: Path, pdf_hash: str | None
+) -> None:
+    """Render one prepared overlay using the worker's open document."""
+    assert _worker_doc is not None, "render worker was not initialized"
+    render_page_overlay(
+        _worker_doc[overlay.page_number - 1],
+        overlay,
+        output_path,
+        raster_cache=_worker_raster_cache,
+        pdf_hash=pdf_hash,
+    )
+
+
 def render_annotated_images(
     doc: pymupdf.Document,
     results: list[ClassificationResult],
@@ -213,9 +485,16 @@ def render_annotated_images(
     draw_drawings: bool = False,
     draw_unconsumed: bool = False,
     debug_candidates_label: str | None = None,
+    workers: int = 1,
+    raster_cache_dir: Path | None = None,
+    pdf_hash: str | None = None,
 ) -> None:
     """Render PDF pages with annotated bounding boxes as PNG images.
 
+    With ``workers > 1`` the overlays are prepared in this process and the
+    page rasterization, drawing and PNG encoding happen in a process pool
+    where each worker holds its own open copy of the PDF.
+
     Args:
         doc: The open PyMuPDF Document
         results: List of ClassificationResult with labels and elements
@@ -227,22 +506,64 @@ def render_annotated_images(
         draw_drawings: If True, render the actual drawing paths.
         draw_unassigned: If True, render blocks with no candidates.
         debug_candidates_label: If provided, only render candidates with this label.
+        workers: Number of render processes. 1 renders serially in-process.
+        raster_cache_dir: If provided, cache base page rasters here keyed by
+            (pdf hash, page, dpi) so re-renders only redraw the overlays.
+        pdf_hash: SHA256 of the PDF, used as the raster cache key. Computed
+            from ``pdf_path`` when a cache is requested and this is None.
     """
     if output_dir == Path("/dev/null"):
         return
 
-    for result in results:
-        page_num = result.page_data.page_number  # 1-indexed
-        page = doc[page_num - 1]  # 0-indexed
-        output_path = output_dir / f"{pdf_path.stem}_page_{page_num:03d}.png"
-        draw_and_save_bboxes(
-            page,
-            result,
-            output_path,
-            draw_blocks=draw_blocks,
-            draw_elements=draw_elements,
-            draw_deleted=draw_deleted,
-            draw_drawings=draw_drawings,
-            draw_unconsumed=draw_unconsumed,
-            debug_candidates_label=debug_candidates_label,
-        )
+    if raster_cache_dir is not None and pdf_hash is None:
+        with open(pdf_path, "rb") as f:
+            pdf_hash = hashlib.file_digest(f, "sha256").hexdigest()
+
+    def _output_path(page_num: int) -> Path:
+        return output_dir / f"{pdf_path.stem}_page_{page_num:03d}.png"
+
+    if workers <= 1 or len(results) <= 1:
+        raster_cache = RasterCache(raster_cache_dir) if raster_cache_dir else None
+        for result in results:
+            page_num = result.page_data.page_number  # 1-indexed
+            page = doc[page_num - 1]  # 0-indexed
+            draw_and_save_bboxes(
+                page,
+                result,
+                _output_path(page_num),
+                draw_blocks=draw_blocks,
+                draw_elements=draw_elements,
+                draw_deleted=draw_deleted,
+                draw_drawings=draw_drawings,
+                draw_unconsumed=draw_unconsumed,
+                debug_candidates_label=debug_candidates_label,
+                raster_cache=raster_cache,
+                pdf_hash=pdf_hash,
+            )
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(results)),
+        initializer=_init_render_worker,
+        initargs=(pdf_path, raster_cache_dir),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _render_overlay_in_worker,
+                build_page_overlay(
+                    result,
+                    draw_blocks=draw_blocks,
+                    draw_elements=draw_elements,
+                    draw_deleted=draw_deleted,
+                    draw_drawings=draw_drawings,
+                    draw_unconsumed=draw_unconsumed,
+                    debug_candidates_label=debug_candidates_label,
+                ),
+                _output_path(result.page_data.page_number),
+                pdf_hash,
+            )
+            for result in results
+        ]
+        for future in as_completed(futures):
+            # Surface any worker exception in the main process
+            future.result()
@@ -6,9 +6,35 @@ import json
 import tempfile
 from pathlib import Path
 
+import pymupdf
 import pytest
 
-from build_a_long.pdf_extract.cli.io import load_json, open_compressed
+from build_a_long.pdf_extract.classifier import (
+    ClassificationResult,
+    ClassificationStats,
+    PageStats,
+    PageTrace,
+)
+from build_a_long.pdf_extract.cli.io import (
+    ManualJsonWriter,
+    cached_extraction,
+    load_extraction,
+    load_extractions,
+    load_json,
+    open_compressed,
+    render_annotated_images,
+    save_classification_stats,
+    save_decision_traces,
+    save_manual_json,
+)
+from build_a_long.pdf_extract.extractor import ExtractionResult, PageData
+from build_a_long.pdf_extract.extractor.bbox import BBox
+from build_a_long.pdf_extract.extractor.lego_page_elements import (
+    Manual,
+    Page,
+    PageNumber,
+)
+from build_a_long.pdf_extract.extractor.page_blocks import Text
 
 
 def test_open_compressed_with_uncompressed() -> None:
@@ -225,3 +251,185 @@ def test_load_json_with_corrupted_gz() -> None:
         assert "Failed to parse JSON" in str(exc_info.value)
     finally:
         temp_path.unlink()
+
+
+def test_render_annotated_images_parallel_matches_serial(tmp_path: Path) -> None:
+    """Test that the process pool renders the same images as the serial path."""
+    pdf_path = tmp_path / "doc.pdf"
+    with pymupdf.open() as doc:
+        for i in range(3):
+            page = doc.new_page(width=200, height=200)
+            page.insert_text((20, 40), f"Page {i + 1}")
+        doc.save(pdf_path)
+
+    results = [
+        ClassificationResult(
+            page_data=PageData(
+                page_number=n,
+                bbox=BBox(0, 0, 200, 200),
+                blocks=[Text(id=0, bbox=BBox(18, 28, 80, 44), text=f"Page {n}")],
+            )
+        )
+        for n in (1, 2, 3)
+    ]
+
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    serial_dir.mkdir()
+    parallel_dir.mkdir()
+    with pymupdf.open(pdf_path) as doc:
+        render_annotated_images(doc, results, serial_dir, pdf_path, draw_blocks=True)
+        render_annotated_images(
+            doc,
+            results,
+            parallel_dir,
+            pdf_path,
+            draw_blocks=True,
+            workers=2,
+            raster_cache_dir=tmp_path / "cache",
+        )
+
+    for n in (1, 2, 3):
+        name = f"doc_page_{n:03d}.png"
+        assert (serial_dir / name).read_bytes() == (parallel_dir / name).read_bytes()
+    assert len(list((tmp_path / "cache").glob("*/*.png"))) == 3
+
+
+def test_save_classification_stats(tmp_path: Path) -> None:
+    page = PageStats(page_number=3, seconds=0.1)
+    with page.build("step"):
+        pass
+    stats = ClassificationStats(pages=[page])
+    pdf_path = Path("manual.pdf")
+
+    stats_path = save_classification_stats(stats, tmp_path, pdf_path)
+    assert stats_path == tmp_path / "manual_stats.json"
+    assert ClassificationStats.model_validate_json(stats_path.read_text()) == stats
+
+    trace_path = save_classification_stats(stats, tmp_path, pdf_path, trace=True)
+    assert trace_path == tmp_path / "manual_trace.json"
+    trace = json.loads(trace_path.read_text())
+    assert [e["name"] for e in trace["traceEvents"] if e["ph"] == "X"] == ["step"]
+
+
+def test_save_decision_traces(tmp_path: Path) -> None:
+    traced = ClassificationResult(
+        page_data=PageData(page_number=4, bbox=BBox(0, 0, 10, 10), blocks=[]),
+        trace=PageTrace(page_number=4),
+    )
+    traced.trace.record("build.start", label="page")
+    untraced = ClassificationResult(
+        page_data=PageData(page_number=5, bbox=BBox(0, 0, 10, 10), blocks=[])
+    )
+
+    paths = save_decision_traces([traced, untraced], tmp_path, Path("manual.pdf"))
+
+    assert paths == [tmp_path / "manual_page_004_decisions.json"]
+    assert json.loads(paths[0].read_text()) == {
+        "page_number": 4,
+        "records": [{"event": "build.start", "data": {"label": "page"}}],
+    }
+
+
+def _manual(page_count: int) -> Manual:
+    return Manual(
+        source_pdf="manual.pdf",
+        source_size=1234,
+        pages=[
+            Page(
+                bbox=BBox(0, 0, 100, 100),
+                pdf_page_number=i,
+                page_number=PageNumber(bbox=BBox(0, 90, 10, 100), value=i),
+            )
+            for i in range(1, page_count + 1)
+        ],
+    )
+
+
+@pytest.mark.parametrize("page_count", [0, 1, 3])
+def test_manual_json_writer_matches_save_manual_json(
+    tmp_path: Path, page_count: int
+) -> None:
+    manual = _manual(page_count)
+    (tmp_path / "full").mkdir()
+    expected = save_manual_json(manual, tmp_path / "full", Path("manual.pdf"))
+
+    (tmp_path / "streamed").mkdir()
+    with ManualJsonWriter(manual, tmp_path / "streamed", Path("manual.pdf")) as w:
+        for page in manual.pages:
+            w.write_page(page)
+
+    assert w.path == tmp_path / "streamed" / "manual.json"
+    assert w.path.read_bytes() == expected.read_bytes()
+
+
+def test_manual_json_writer_rejects_out_of_order_pages(tmp_path: Path) -> None:
+    manual = _manual(2)
+    writer = ManualJsonWriter(manual, tmp_path, Path("manual.pdf"))
+    writer.write_page(manual.pages[1])
+    with pytest.raises(ValueError, match="PDF page order"):
+        writer.write_page(manual.pages[0])
+    writer.close()
+    with pytest.raises(ValueError, match="after close"):
+        writer.write_page(manual.pages[1])
+
+
+def test_manual_json_writer_removes_partial_file_on_error(tmp_path: Path) -> None:
+    manual = _manual(1)
+    with (
+        pytest.raises(RuntimeError),
+        ManualJsonWriter(manual, tmp_path, Path("manual.pdf")) as writer,
+    ):
+        writer.write_page(manual.pages[0])
+        assert writer.path.exists()
+        raise RuntimeError("classification failed")
+    assert not writer.path.exists()
+
+
+def _extraction(page_number: int) -> ExtractionResult:
+    return ExtractionResult(
+        pages=[
+            PageData(
+                page_number=page_number,
+                bbox=BBox(0, 0, 100, 100),
+                blocks=[Text(id=0, bbox=BBox(10, 10, 20, 20), text=str(page_number))],
+            )
+        ]
+    )
+
+
+def test_load_extraction_compressed_and_uncompressed(tmp_path: Path) -> None:
+    extraction = _extraction(1)
+    data = extraction.model_dump_json(by_alias=True)
+    plain = tmp_path / "plain_raw.json"
+    plain.write_text(data)
+    compressed = tmp_path / "doc_raw.json.bz2"
+    with bz2.open(compressed, "wt", encoding="utf-8") as f:
+        f.write(data)
+
+    assert load_extraction(plain) == extraction
+    assert load_extraction(compressed) == extraction
+
+
+def test_load_extractions_keeps_order(tmp_path: Path) -> None:
+    paths = []
+    for page_number in (3, 1, 2):
+        path = tmp_path / f"{page_number}_raw.json"
+        path.write_text(_extraction(page_number).model_dump_json(by_alias=True))
+        paths.append(path)
+
+    expected = [_extraction(n) for n in (3, 1, 2)]
+    assert load_extractions(paths) == expected
+    assert load_extractions(paths, workers=2) == expected
+
+
+def test_cached_extraction_reloads_changed_file(tmp_path: Path) -> None:
+    path = tmp_path / "doc_raw.json"
+    path.write_text(_extraction(1).model_dump_json(by_alias=True))
+
+    first = cached_extraction(path)
+    assert cached_extraction(path) is first
+    assert cached_extraction(tmp_path / "." / "doc_raw.json") is first
+
+    path.write_text(_extraction(22).model_dump_json(by_alias=True))
+    assert cached_extraction(path) == _extraction(22)
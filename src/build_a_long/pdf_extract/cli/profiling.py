@@ -0,0 +1,255 @@
+"""Per-stage and per-page profiling for the CLI (``--profile``).
+
+`StageProfiler` profiles each stage of processing one PDF (extraction,
+classification, validation, output) separately, or, with a page filter,
+only the classification of the selected pages, so a single pathological
+page can be profiled inside a full-document run without the hint phase or
+the other pages diluting the picture.
+
+Two formats are supported:
+
+- ``prof``: deterministic `cProfile` profiles, saved as
+  ``<stem>_profile_<stage>.prof`` (open with ``snakeviz`` or `pstats`).
+- ``collapsed``: a sampling profiler that records the main thread's stack
+  about every millisecond, saved as ``<stem>_profile_<stage>.collapsed`` in
+  the "collapsed stack" format ``flamegraph.pl`` and speedscope read, with
+  microseconds as the sample values. Sampling barely slows the run down, so
+  timings stay realistic.
+
+Stages may nest: entering a stage pauses the enclosing one, so time spent
+validating a page inside the classification loop is only counted once.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import FrameType
+from typing import Literal, Self
+
+logger = logging.getLogger(__name__)
+
+type ProfileFormat = Literal["prof", "collapsed"]
+
+SAMPLE_INTERVAL = 0.001
+"""Seconds between stack samples in the ``collapsed`` format."""
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+class _Sampler(threading.Thread):
+    """Samples one thread's stack into a Counter per label.
+
+    The sampler only runs when it gets the GIL, which can be much less often
+    than ``interval``, so each sample is weighted by the microseconds since
+    the previous one.
+    """
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.label: str | None = None
+        self.samples: dict[str, Counter[str]] = {}
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            label = self.label
+            if label is None:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            names: list[str] = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            names.reverse()
+            stacks = self.samples.setdefault(label, Counter())
+            stacks[";".join(names)] += round(elapsed * 1_000_000)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class StageProfiler:
+    """Profiles the stages of processing one PDF.
+
+    A profiler created with ``fmt=None`` is disabled: `stage` and `page`
+    are no-ops, so callers can wrap their stages unconditionally. Used as a
+    context manager, `finish` is called on exit.
+
+    Example:
+        with StageProfiler("prof", output_dir, pdf_path) as profiler:
+            with profiler.stage("extraction"):
+                ...
+    """
+
+    def __init__(
+        self,
+        fmt: ProfileFormat | None,
+        output_dir: Path,
+        pdf_path: Path,
+        *,
+        pages: set[int] | None = None,
+        top: int = 20,
+    ) -> None:
+        """Create a profiler.
+
+        Args:
+            fmt: Output format, or None to disable profiling.
+            output_dir: Directory where profiles are saved.
+            pdf_path: Original PDF path (used for naming the files).
+            pages: If given, only profile the classification of these pages
+                (see `page`) and ignore stages.
+            top: How many functions `finish` lists.
+        """
+        self.fmt = fmt
+        self.output_dir = output_dir
+        self.pdf_path = pdf_path
+        self.pages = pages
+        self.top = top
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._active: list[str] = []
+        self._labels: dict[str, None] = {}  # Ordered set of profiled labels
+        self._sampler: _Sampler | None = None
+        self._finished = False
+        self._paths: list[Path] = []
+        if fmt == "collapsed":
+            self._sampler = _Sampler(threading.get_ident(), SAMPLE_INTERVAL)
+            self._sampler.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.finish()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether anything is being profiled."""
+        return self.fmt is not None and not self._finished
+
+    def _pause(self, label: str) -> None:
+        if self._sampler is not None:
+            self._sampler.label = None
+        else:
+            self._profiles[label].disable()
+
+    def _resume(self, label: str) -> None:
+        if self._sampler is not None:
+            self._sampler.label = label
+        else:
+            self._profiles.setdefault(label, cProfile.Profile()).enable()
+
+    @contextmanager
+    def _profiling(self, label: str) -> Iterator[None]:
+        if self._active:
+            self._pause(self._active[-1])
+        self._active.append(label)
+        self._labels[label] = None
+        self._resume(label)
+        try:
+            yield
+        finally:
+            self._pause(label)
+            self._active.pop()
+            if self._active:
+                self._resume(self._active[-1])
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile a stage. Repeated stages with the same name accumulate."""
+        if not self.enabled or self.pages is not None:
+            yield
+            return
+        with self._profiling(name):
+            yield
+
+    @contextmanager
+    def page(self, page_number: int) -> Iterator[None]:
+        """Profile the classification of one page, if it was selected."""
+        if not self.enabled or self.pages is None or page_number not in self.pages:
+            yield
+            return
+        with self._profiling(f"page_{page_number:03d}"):
+            yield
+
+    def _path(self, label: str) -> Path:
+        suffix = ".prof" if self.fmt == "prof" else ".collapsed"
+        return self.output_dir / f"{self.pdf_path.stem}_profile_{label}{suffix}"
+
+    def self_times(self, label: str) -> list[tuple[str, float]]:
+        """Return (function, self seconds) for a label, slowest first."""
+        if self._sampler is not None:
+            leaves: Counter[str] = Counter()
+            for stack, micros in self._sampler.samples.get(label, {}).items():
+                leaves[stack.rsplit(";", 1)[-1]] += micros
+            return [(name, micros / 1_000_000) for name, micros in leaves.most_common()]
+        profile = self._profiles.get(label)
+        if profile is None:
+            return []
+        stats = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+        times = [
+            # Built-ins have no source location ("~")
+            (func if file == "~" else f"{func} ({os.path.basename(file)}:{line})", tt)
+            for (file, line, func), (_, _, tt, _, _) in stats.items()
+        ]
+        return sorted(times, key=lambda item: item[1], reverse=True)
+
+    def finish(self) -> list[Path]:
+        """Stop profiling, save the profiles and print the top functions.
+
+        Calling it again just returns the same paths.
+
+        Returns:
+            Paths of the saved profiles.
+        """
+        if not self.enabled:
+            return self._paths
+        if self._sampler is not None:
+            self._sampler.stop()
+        self._finished = True
+
+        paths = self._paths
+        for label in self._labels:
+            path = self._path(label)
+            if self.output_dir != Path("/dev/null"):
+                if self._sampler is not None:
+                    with open(path, "w") as f:
+                        samples = self._sampler.samples.get(label, {})
+                        for stack, count in samples.items():
+                            f.write(f"{stack} {count}\n")
+                else:
+                    self._profiles[label].dump_stats(path)
+                logger.info("Saved %s profile to %s", label, path)
+            paths.append(path)
+
+            print(f"=== Profile: {label} (top {self.top} by self time) ===")
+            for name, seconds in self.self_times(label)[: self.top]:
+                print(f"  {seconds * 1000:9.1f}ms  {name}")
+            print()
+
+        if self.pages is not None:
+            missing = sorted(
+                p for p in self.pages if f"page_{p:03d}" not in self._labels
+            )
+            if missing:
+                logger.warning("Profiled pages were never classified: %s", missing)
+        return paths
@@ -0,0 +1,81 @@
+"""Tests for the CLI profiler."""
+
+import pstats
+import time
+from pathlib import Path
+
+import pytest
+
+from build_a_long.pdf_extract.classifier import classify_pages
+from build_a_long.pdf_extract.classifier.test_utils import PageBuilder
+from build_a_long.pdf_extract.cli.profiling import StageProfiler
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _function_names(path: Path) -> set[str]:
+    stats = pstats.Stats(str(path)).stats  # type: ignore[attr-defined]
+    return {func for (_, _, func) in stats}
+
+
+def test_disabled_profiler_is_a_no_op(tmp_path: Path) -> None:
+    profiler = StageProfiler(None, tmp_path, Path("manual.pdf"))
+    with profiler, profiler.stage("extraction"), profiler.page(1):
+        pass
+    assert profiler.finish() == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_nested_stages_are_profiled_separately(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    profiler = StageProfiler("prof", tmp_path, Path("manual.pdf"), top=3)
+    with profiler, profiler.stage("classification"):
+        _busy(0.01)
+        with profiler.stage("validation"):
+            _busy(0.01)
+
+    paths = profiler.finish()
+    assert paths == [
+        tmp_path / "manual_profile_classification.prof",
+        tmp_path / "manual_profile_validation.prof",
+    ]
+    assert "_busy" in _function_names(paths[0])
+    assert "_busy" in _function_names(paths[1])
+    out = capsys.readouterr().out
+    assert "=== Profile: classification (top 3 by self time) ===" in out
+
+
+def test_profile_pages_only_profiles_selected_pages(tmp_path: Path) -> None:
+    pages = [
+        PageBuilder(page_number=i, width=100, height=200)
+        .add_text(str(i), 5, 190, 10, 8, id=0)
+        .build()
+        for i in range(1, 4)
+    ]
+    profiler = StageProfiler("prof", tmp_path, Path("manual.pdf"), pages={2, 7})
+    # Stages are ignored when profiling pages
+    with profiler, profiler.stage("classification"):
+        classify_pages(pages, page_context=profiler.page)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "manual_profile_page_002.prof"
+    ]
+    assert "classify" in _function_names(tmp_path / "manual_profile_page_002.prof")
+
+
+def test_collapsed_stacks(tmp_path: Path) -> None:
+    profiler = StageProfiler("collapsed", tmp_path, Path("manual.pdf"))
+    with profiler, profiler.stage("extraction"):
+        _busy(0.05)
+
+    lines = (tmp_path / "manual_profile_extraction.collapsed").read_text().splitlines()
+    assert lines
+    stack, micros = lines[0].rsplit(" ", 1)
+    assert int(micros) > 0
+    assert any("_busy" in line for line in lines)
+    assert any("_busy" in name for name, _ in profiler.self_times("extraction"))
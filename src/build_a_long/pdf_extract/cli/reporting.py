@@ -9,6 +9,7 @@ from pydantic import BaseModel, ConfigDict, Field
 from build_a_long.pdf_extract.classifier import (
     Candidate,
     ClassificationResult,
+    ClassificationStats,
 )
 from build_a_long.pdf_extract.classifier.text import FontSizeHints, TextHistogram
 from build_a_long.pdf_extract.extractor import PageData
@@ -70,11 +71,12 @@ def print_summary(
         total_blocks += len(page.blocks)
         # Tally block types and labels
         has_page_number = False
+        block_labels = result.get_block_labels()
         for block in page.blocks:
             t = block.__class__.__name__.lower()
             blocks_by_type[t] = blocks_by_type.get(t, 0) + 1
 
-            label = result.get_label(block)
+            label = block_labels.get(block.id)
             if label:
                 labeled_counts[label] = labeled_counts.get(label, 0) + 1
                 if label == "page_number":
@@ -220,6 +222,49 @@ def print_histogram(histogram: TextHistogram) -> None:
     print()
 
 
+def print_classification_stats(
+    stats: ClassificationStats, slowest_pages: int = 5
+) -> None:
+    """Print per-label timings and counters from an instrumented classification.
+
+    Args:
+        stats: Stats collected by `classify_pages(..., instrument=True)`
+        slowest_pages: How many of the slowest pages to list
+    """
+    print("=== Classifier Stats ===")
+    print()
+    print(
+        f"{'Label':<24} | {'Score ms':>9} | {'Build ms':>9} | {'Cands':>6} | "
+        f"{'Builds':>6} | {'Failed':>6} | {'Rollbk':>6}"
+    )
+    print("-" * 84)
+    totals = stats.totals()
+    ordered = sorted(
+        totals.items(),
+        key=lambda item: item[1].score_seconds + item[1].build_seconds,
+        reverse=True,
+    )
+    for label, t in ordered:
+        print(
+            f"{label:<24} | {t.score_seconds * 1000:9.1f} | "
+            f"{t.build_seconds * 1000:9.1f} | {t.candidates:6d} | "
+            f"{t.builds_attempted:6d} | {t.builds_failed:6d} | {t.rollbacks:6d}"
+        )
+    print("-" * 84)
+    print(
+        "Build times include nested builds, so they overlap across labels."
+        f" Total: {stats.seconds * 1000:.1f}ms over {len(stats.pages)} pages"
+    )
+
+    slowest = sorted(stats.pages, key=lambda page: page.seconds, reverse=True)
+    if slowest:
+        print()
+        print("Slowest pages:")
+        for page in slowest[:slowest_pages]:
+            print(f"  page {page.page_number}: {page.seconds * 1000:.1f}ms")
+    print()
+
+
 def print_font_hints(hints: FontSizeHints) -> None:
     """Print font size hints extracted from the document.
 
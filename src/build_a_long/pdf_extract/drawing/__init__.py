@@ -1,3 +1,15 @@
-from .drawing import draw_and_save_bboxes
+from .drawing import (
+    PageOverlay,
+    RasterCache,
+    build_page_overlay,
+    draw_and_save_bboxes,
+    render_page_overlay,
+)
 
-__all__ = ["draw_and_save_bboxes"]
+__all__ = [
+    "PageOverlay",
+    "RasterCache",
+    "build_page_overlay",
+    "draw_and_save_bboxes",
+    "render_page_overlay",
+]
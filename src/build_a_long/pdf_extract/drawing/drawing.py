@@ -1,3 +1,4 @@
+import io
 import logging
 from pathlib import Path
 
@@ -5,6 +6,7 @@ import pymupdf
 from PIL import Image, ImageDraw
 from pydantic import BaseModel, ConfigDict
 
+from build_a_long.common import atomic_write
 from build_a_long.pdf_extract.classifier import ClassificationResult
 from build_a_long.pdf_extract.drawing.path_renderer import (
     draw_dashed_rectangle,
@@ -18,6 +20,9 @@ from build_a_long.pdf_extract.extractor.page_blocks import (
 
 logger = logging.getLogger(__name__)
 
+IMAGE_DPI = 150
+"""Resolution used when rendering annotated page images."""
+
 
 class DrawableItem(BaseModel):
     """A unified structure for things to draw on the page."""
@@ -42,8 +47,63 @@ class DrawableItem(BaseModel):
     is_unconsumed: bool = False
     """True if this block has no candidates."""
 
-    depth: int = 0
-    """Nesting depth for color selection (computed later)."""
+
+class PageOverlay(BaseModel):
+    """Everything needed to annotate a page, detached from the classification.
+
+    An overlay is small and picklable, so it can be built in the main process
+    and shipped to a render worker that owns its own open document.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    page_number: int
+    """1-indexed page number to render."""
+
+    items: list[DrawableItem]
+    """Boxes and labels to draw."""
+
+    depths: list[int]
+    """Nesting depth of each item in `items`, used for color selection."""
+
+    drawings: list[DrawingBlock] = []
+    """Drawing blocks whose paths should be rendered."""
+
+
+class RasterCache:
+    """On-disk cache of rendered base page images.
+
+    Rendering a page with MuPDF is usually the most expensive part of
+    producing an annotated image, and the base raster only depends on the PDF
+    content, the page and the resolution. Caching it lets debug re-renders
+    only redraw the overlays.
+
+    Entries are stored as ``<cache_dir>/<pdf_hash>/<page>@<dpi>.png``.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+
+    def _path(self, pdf_hash: str, page_number: int, dpi: int) -> Path:
+        return self.cache_dir / pdf_hash / f"{page_number:04d}@{dpi}.png"
+
+    def get(self, pdf_hash: str, page_number: int, dpi: int) -> Image.Image | None:
+        """Return the cached raster, or None on a miss."""
+        path = self._path(pdf_hash, page_number, dpi)
+        try:
+            with Image.open(path) as cached:
+                return cached.convert("RGB")
+        except OSError, ValueError:
+            return None
+
+    def put(self, pdf_hash: str, page_number: int, dpi: int, img: Image.Image) -> None:
+        """Store a raster atomically so concurrent workers never see partials."""
+        path = self._path(pdf_hash, page_number, dpi)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        png = io.BytesIO()
+        # Favor encode speed over size, this is a cache not an artifact.
+        img.save(png, format="PNG", compress_level=1)
+        atomic_write(path, png.getvalue())
 
 
 def _create_drawable_items(
@@ -214,9 +274,90 @@ def _create_drawable_items(
     return items
 
 
+def build_page_overlay(
+    result: ClassificationResult,
+    *,
+    draw_blocks: bool = False,
+    draw_elements: bool = False,
+    draw_deleted: bool = False,
+    draw_drawings: bool = False,
+    draw_unconsumed: bool = False,
+    debug_candidates_label: str | None = None,
+) -> PageOverlay:
+    """Collect the items to draw for a page and compute their nesting depth.
+
+    Args:
+        result: Classification result containing blocks and elements
+        draw_blocks: If True, include PDF blocks
+        draw_elements: If True, include LEGO page elements
+        draw_deleted: If True, include removed/non-winner items
+        draw_drawings: If True, include drawing blocks to render their paths
+        draw_unconsumed: If True, include blocks with no candidates
+        debug_candidates_label: If provided, only include candidates with this label
+
+    Returns:
+        A PageOverlay that can be rendered without the ClassificationResult.
+    """
+    items = _create_drawable_items(
+        result,
+        draw_blocks=draw_blocks,
+        draw_elements=draw_elements,
+        draw_deleted=draw_deleted,
+        draw_unconsumed=draw_unconsumed,
+        debug_candidates_label=debug_candidates_label,
+    )
+
+    # Build hierarchy for depth calculation directly from DrawableItems
+    hierarchy = build_hierarchy_from_blocks(items)
+    depths = [hierarchy.get_depth(item) for item in items]
+
+    drawings: list[DrawingBlock] = []
+    if draw_drawings:
+        drawings = [
+            block
+            for block in result.page_data.blocks
+            if isinstance(block, DrawingBlock) and block.items
+        ]
+
+    return PageOverlay(
+        page_number=result.page_data.page_number,
+        items=items,
+        depths=depths,
+        drawings=drawings,
+    )
+
+
+def _rasterize(page: pymupdf.Page, dpi: int) -> Image.Image:
+    """Render a page to a PIL RGB image."""
+    pix = page.get_pixmap(colorspace=pymupdf.csRGB, dpi=dpi)
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+
+def _render_base_image(
+    page: pymupdf.Page,
+    page_number: int,
+    dpi: int,
+    *,
+    raster_cache: RasterCache | None = None,
+    pdf_hash: str | None = None,
+) -> Image.Image:
+    """Render the page to an RGB image, consulting the raster cache if given."""
+    if raster_cache is None or pdf_hash is None:
+        return _rasterize(page, dpi)
+
+    cached = raster_cache.get(pdf_hash, page_number, dpi)
+    if cached is not None:
+        return cached
+
+    img = _rasterize(page, dpi)
+    raster_cache.put(pdf_hash, page_number, dpi, img)
+    return img
+
+
 def _draw_item(
     draw: ImageDraw.ImageDraw,
     item: DrawableItem,
+    depth: int,
     depth_colors: list[str],
     scale_x: float,
     scale_y: float,
@@ -228,6 +369,7 @@ def _draw_item(
     Args:
         draw: PIL ImageDraw object
         item: The item to draw
+        depth: Nesting depth of the item, used for color and label alignment
         depth_colors: List of colors to cycle through
         scale_x: X scaling factor
         scale_y: Y scaling factor
@@ -242,7 +384,7 @@ def _draw_item(
         bbox.y1 * scale_y,
     )
 
-    color = depth_colors[item.depth % len(depth_colors)]
+    color = depth_colors[depth % len(depth_colors)]
 
     # Determine drawing style
     if item.is_unconsumed:
@@ -270,7 +412,7 @@ def _draw_item(
 
     # Determine text position
     # Left aligned if depth is even, Right aligned if odd
-    text_x = scaled_bbox[0] if item.depth % 2 == 0 else scaled_bbox[2] - text_width
+    text_x = scaled_bbox[0] if depth % 2 == 0 else scaled_bbox[2] - text_width
 
     # Default to drawing below the box
     text_y = scaled_bbox[3] + 2
@@ -283,121 +425,129 @@ def _draw_item(
     draw.text((text_x, text_y), item.label, fill=color)
 
 
-def draw_and_save_bboxes(
+def render_page_overlay(
     page: pymupdf.Page,
-    result: ClassificationResult,
+    overlay: PageOverlay,
     output_path: Path,
     *,
-    draw_blocks: bool = False,
-    draw_elements: bool = False,
-    draw_deleted: bool = False,
-    draw_drawings: bool = False,
-    draw_unconsumed: bool = False,
-    debug_candidates_label: str | None = None,
+    dpi: int = IMAGE_DPI,
+    raster_cache: RasterCache | None = None,
+    pdf_hash: str | None = None,
 ) -> None:
-    """
-    Draws bounding boxes from blocks on the PDF page image and saves it.
-    Colors are based on nesting depth (calculated via bbox containment).
+    """Render a page, draw a prepared overlay on top and save it as PNG.
 
     Args:
         page: PyMuPDF page to render
-        result: ClassificationResult containing labels and blocks
+        overlay: The overlay built by `build_page_overlay`
         output_path: Where to save the output image
-        draw_blocks: If True, render classified PDF blocks.
-        draw_elements: If True, render classified LEGO page elements.
-        draw_deleted: If True, also render blocks marked as deleted.
-        draw_drawings: If True, render the actual drawing paths.
-        draw_unassigned: If True, render blocks with no candidates.
-        debug_candidates_label: If provided, only render candidates with this label.
+        dpi: Resolution of the rendered page
+        raster_cache: Optional cache of base page rasters
+        pdf_hash: Hash identifying the PDF, required to use the raster cache
     """
-    image_dpi = 150
-
-    # Render page to an image
-    pix = page.get_pixmap(colorspace=pymupdf.csRGB, dpi=image_dpi)
-    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    img = _render_base_image(
+        page,
+        overlay.page_number,
+        dpi,
+        raster_cache=raster_cache,
+        pdf_hash=pdf_hash,
+    )
     draw = ImageDraw.Draw(img)
 
     # Get page dimensions for scaling
     page_rect = page.rect
-    scale_x = pix.width / page_rect.width
-    scale_y = pix.height / page_rect.height
+    scale_x = img.width / page_rect.width
+    scale_y = img.height / page_rect.height
 
     # Colors for different nesting depths (cycles through this list)
     depth_colors = ["red", "green", "blue", "yellow", "purple", "orange"]
 
-    # Create unified list of items to draw
-    items = _create_drawable_items(
-        result,
-        draw_blocks=draw_blocks,
-        draw_elements=draw_elements,
-        draw_deleted=draw_deleted,
-        draw_unconsumed=draw_unconsumed,
-        debug_candidates_label=debug_candidates_label,
-    )
-
-    # Build hierarchy for depth calculation directly from DrawableItems
-    hierarchy = build_hierarchy_from_blocks(items)
-
-    # Compute depth and create new items with depth set (since items are frozen)
-    items_with_depth = []
-    for item in items:
-        depth = hierarchy.get_depth(item)
-        # Create new item with depth
-        items_with_depth.append(
-            DrawableItem(
-                bbox=item.bbox,
-                label=item.label,
-                is_element=item.is_element,
-                is_winner=item.is_winner,
-                is_removed=item.is_removed,
-                is_unconsumed=item.is_unconsumed,
-                depth=depth,
-            )
-        )
-
     # Draw all items
-    for item in items_with_depth:
+    for item, depth in zip(overlay.items, overlay.depths, strict=True):
         _draw_item(
             draw,
             item,
+            depth,
             depth_colors,
             scale_x,
             scale_y,
-            image_width=pix.width,
-            image_height=pix.height,
+            image_width=img.width,
+            image_height=img.height,
         )
 
     # Draw actual drawing paths if requested
-    if draw_drawings:
-        drawings_rendered = 0
+    if overlay.drawings:
         clipped_count = 0
-        for block in result.page_data.blocks:
-            if isinstance(block, DrawingBlock) and block.items:
-                # Use different colors for clipped vs non-clipped drawings
-                is_clipped = block.is_clipped
-                color = "magenta" if is_clipped else "cyan"
-                draw_path_items(draw, block.items, scale_x, scale_y, color=color)
-
-                # Draw visible bbox (which is now just bbox) in yellow
-                vbox = [
-                    block.bbox.x0 * scale_x,
-                    block.bbox.y0 * scale_y,
-                    block.bbox.x1 * scale_x,
-                    block.bbox.y1 * scale_y,
-                ]
-                draw.rectangle(vbox, outline="yellow", width=1)
-
-                drawings_rendered += 1
-                if is_clipped:
-                    clipped_count += 1
+        for block in overlay.drawings:
+            assert block.items is not None
+            # Use different colors for clipped vs non-clipped drawings
+            is_clipped = block.is_clipped
+            color = "magenta" if is_clipped else "cyan"
+            draw_path_items(draw, block.items, scale_x, scale_y, color=color)
+
+            # Draw visible bbox (which is now just bbox) in yellow
+            vbox = [
+                block.bbox.x0 * scale_x,
+                block.bbox.y0 * scale_y,
+                block.bbox.x1 * scale_x,
+                block.bbox.y1 * scale_y,
+            ]
+            draw.rectangle(vbox, outline="yellow", width=1)
+
+            if is_clipped:
+                clipped_count += 1
 
         logger.debug(
             "Rendered %d drawing paths on page %d (%d clipped, %d unclipped)",
-            drawings_rendered,
-            result.page_data.page_number,
+            len(overlay.drawings),
+            overlay.page_number,
             clipped_count,
-            drawings_rendered - clipped_count,
+            len(overlay.drawings) - clipped_count,
         )
 
     img.save(output_path)
     logger.info("Saved image with bboxes to %s", output_path)
+
+
+def draw_and_save_bboxes(
+    page: pymupdf.Page,
+    result: ClassificationResult,
+    output_path: Path,
+    *,
+    draw_blocks: bool = False,
+    draw_elements: bool = False,
+    draw_deleted: bool = False,
+    draw_drawings: bool = False,
+    draw_unconsumed: bool = False,
+    debug_candidates_label: str | None = None,
+    raster_cache: RasterCache | None = None,
+    pdf_hash: str | None = None,
+) -> None:
+    """
+    Draws bounding boxes from blocks on the PDF page image and saves it.
+    Colors are based on nesting depth (calculated via bbox containment).
+
+    Args:
+        page: PyMuPDF page to render
+        result: ClassificationResult containing labels and blocks
+        output_path: Where to save the output image
+        draw_blocks: If True, render classified PDF blocks.
+        draw_elements: If True, render classified LEGO page elements.
+        draw_deleted: If True, also render blocks marked as deleted.
+        draw_drawings: If True, render the actual drawing paths.
+        draw_unassigned: If True, render blocks with no candidates.
+        debug_candidates_label: If provided, only render candidates with this label.
+        raster_cache: Optional cache of base page rasters.
+        pdf_hash: Hash identifying the PDF, required to use the raster cache.
+    """
+    overlay = build_page_overlay(
+        result,
+        draw_blocks=draw_blocks,
+        draw_elements=draw_elements,
+        draw_deleted=draw_deleted,
+        draw_drawings=draw_drawings,
+        draw_unconsumed=draw_unconsumed,
+        debug_candidates_label=debug_candidates_label,
+    )
+    render_page_overlay(
+        page, overlay, output_path, raster_cache=raster_cache, pdf_hash=pdf_hash
+    )
@@ -4,6 +4,7 @@ from pathlib import Path
 from tempfile import TemporaryDirectory
 
 import pymupdf
+import pytest
 
 from build_a_long.pdf_extract.classifier import (
     Candidate,
@@ -11,9 +12,12 @@ from build_a_long.pdf_extract.classifier import (
     RemovalReason,
 )
 from build_a_long.pdf_extract.classifier.test_utils import TestScore
+from build_a_long.pdf_extract.drawing import drawing
 from build_a_long.pdf_extract.drawing.drawing import (
     DrawableItem,
+    RasterCache,
     _create_drawable_items,
+    build_page_overlay,
     draw_and_save_bboxes,
 )
 from build_a_long.pdf_extract.extractor.bbox import BBox
@@ -491,3 +495,64 @@ def test_draw_and_save_bboxes_clipped_text():
         assert output_path.stat().st_size > 0
 
     doc.close()
+
+
+def test_build_page_overlay_depths():
+    """Test that overlay depths follow bbox containment."""
+    parent = Drawing(id=1, bbox=BBox(10, 10, 100, 100))
+    child = Text(id=2, bbox=BBox(20, 20, 50, 50), text="Nested")
+    result = ClassificationResult(
+        page_data=PageData(
+            page_number=3, bbox=BBox(0, 0, 200, 200), blocks=[parent, child]
+        )
+    )
+
+    overlay = build_page_overlay(result, draw_blocks=True)
+
+    assert overlay.page_number == 3
+    depths = {
+        item.bbox: depth
+        for item, depth in zip(overlay.items, overlay.depths, strict=True)
+    }
+    assert depths[parent.bbox] == 0
+    assert depths[child.bbox] == 1
+    assert overlay.drawings == []
+
+
+def test_draw_and_save_bboxes_uses_raster_cache(tmp_path, monkeypatch):
+    """Test that a second render is served from the raster cache."""
+    doc = pymupdf.open()
+    page = doc.new_page(width=200, height=200)
+    block = Text(id=1, bbox=BBox(10, 10, 50, 30), text="Hello")
+    result = ClassificationResult(
+        page_data=PageData(page_number=1, bbox=BBox(0, 0, 200, 200), blocks=[block])
+    )
+    cache = RasterCache(tmp_path / "cache")
+
+    draw_and_save_bboxes(
+        page,
+        result,
+        tmp_path / "first.png",
+        draw_blocks=True,
+        raster_cache=cache,
+        pdf_hash="abc",
+    )
+    assert cache.get("abc", 1, drawing.IMAGE_DPI) is not None
+
+    def _fail(*args, **kwargs):
+        pytest.fail("page should not be re-rasterized on a cache hit")
+
+    monkeypatch.setattr(drawing, "_rasterize", _fail)
+    draw_and_save_bboxes(
+        page,
+        result,
+        tmp_path / "second.png",
+        draw_blocks=True,
+        raster_cache=cache,
+        pdf_hash="abc",
+    )
+
+    assert (tmp_path / "second.png").read_bytes() == (
+        tmp_path / "first.png"
+    ).read_bytes()
+    doc.close()
@@ -1,6 +1,7 @@
 """Rendering of vector drawing paths from PyMuPDF."""
 
 import logging
+from collections.abc import Sequence
 
 from PIL import ImageDraw
 
@@ -40,7 +41,7 @@ def draw_dashed_rectangle(
 
 def draw_path_items(
     draw: ImageDraw.ImageDraw,
-    items: tuple[tuple, ...],
+    items: Sequence[tuple],
     scale_x: float,
     scale_y: float,
     color: str = "cyan",
@@ -52,7 +53,7 @@ def draw_path_items(
 
     Args:
         draw: PIL ImageDraw object
-        items: Drawing path items (PyMuPDF get_drawings), converted to tuples
+        items: Drawing path items (PyMuPDF get_drawings), e.g. `Drawing.items`
         scale_x: X scaling factor
         scale_y: Y scaling factor
         color: Color for the path lines (default: cyan)
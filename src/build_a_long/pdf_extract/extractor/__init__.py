@@ -4,12 +4,14 @@ from .bbox import BBox
 from .extractor import (
     ExtractionResult,
     PageData,
+    PageText,
     extract_page_data,
 )
 
 __all__ = [
     "extract_page_data",
     "PageData",
+    "PageText",
     "ExtractionResult",
     "PageRange",
     "BBox",
@@ -7,6 +7,7 @@ from annotated_types import Ge
 from pydantic import BaseModel, ConfigDict
 
 from build_a_long.pdf_extract.extractor.pymupdf_types import RectLike
+from build_a_long.pdf_extract.extractor.spatial_index import OverlapGraph
 
 # Type alias for non-negative floats
 NonNegativeFloat = Annotated[float, Ge(0)]
@@ -474,7 +475,10 @@ def build_connected_cluster[T: HasBBox](
     """Build a connected cluster of items based on bbox overlap.
 
     Starts with a seed item and recursively adds candidates that overlap
-    with any item already in the cluster.
+    with any item already in the cluster. Overlaps are found through a
+    spatial grid, so this is roughly linear in the number of candidates. When
+    querying the same candidates repeatedly, build an `OverlapGraph` once
+    instead.
 
     Args:
         seed_item: Initial item to start the cluster
@@ -492,42 +496,13 @@ def build_connected_cluster[T: HasBBox](
         >>> # Include adjacent blocks that are touching
         >>> cluster = build_connected_cluster(bag_image, images, tolerance=0.1)
     """
-    # Build index mapping for quick lookup
-    candidate_set = set(range(len(candidate_items)))
-    cluster_indices: set[int] = set()
-    to_process: list[int] = []
-
-    # Add seed item to cluster
-    for idx, candidate in enumerate(candidate_items):
+    # The first candidate that is (or has the same bbox as) the seed starts
+    # the cluster. If there is none the seed is not a candidate.
+    for candidate in candidate_items:
         if candidate is seed_item or candidate.bbox.equals(seed_item.bbox):
-            if idx in candidate_set:
-                cluster_indices.add(idx)
-                to_process.append(idx)
-                candidate_set.discard(idx)
-            break
-
-    # Expand cluster by finding overlapping items
-    processed: set[int] = set()
-    while to_process:
-        current_idx = to_process.pop()
-        if current_idx in processed:
-            continue
-        processed.add(current_idx)
-
-        current_item = candidate_items[current_idx]
-        # Expand the current item's bbox by tolerance for overlap check.
-        current_bbox = current_item.bbox.expand(tolerance)
-
-        # Find candidates that overlap with current item (expanded by tolerance)
-        for idx in list(candidate_set):
-            candidate = candidate_items[idx]
-            if candidate.bbox.overlaps(current_bbox):
-                cluster_indices.add(idx)
-                to_process.append(idx)
-                candidate_set.discard(idx)
-
-    # Return clustered items in original order
-    return [candidate_items[idx] for idx in sorted(cluster_indices)]
+            graph = OverlapGraph(candidate_items, tolerance=tolerance)
+            return graph.cluster(candidate)
+    return []
 
 
 def build_all_connected_clusters[T: HasBBox](
@@ -538,7 +513,8 @@ def build_all_connected_clusters[T: HasBBox](
     """Build all connected clusters from a list of items based on bbox overlap.
 
     Groups all items into clusters where items in each cluster are
-    transitively connected through overlapping bounding boxes.
+    transitively connected through overlapping bounding boxes. Clusters are
+    ordered by their first item and keep the input order within a cluster.
 
     Args:
         items: List of items with bbox property
@@ -555,33 +531,7 @@ def build_all_connected_clusters[T: HasBBox](
         >>> for cluster in clusters:
         ...     print(f"Cluster of {len(cluster)} images")
     """
-    if not items:
-        return []
-
-    # Track which items have been assigned to clusters
-    remaining_indices = set(range(len(items)))
-    clusters: list[list[T]] = []
-
-    while remaining_indices:
-        # Pick an arbitrary seed from remaining items
-        seed_idx = min(remaining_indices)
-        seed_item = items[seed_idx]
-        remaining_indices.remove(seed_idx)
-
-        # Build a cluster starting from this seed
-        cluster = build_connected_cluster(seed_item, items, tolerance=tolerance)
-
-        # Remove clustered items from remaining set
-        for item in cluster:
-            try:
-                idx = items.index(item)
-                remaining_indices.discard(idx)
-            except ValueError:
-                pass
-
-        clusters.append(cluster)
-
-    return clusters
+    return OverlapGraph(items, tolerance=tolerance).components()
 
 
 def filter_contained[T: HasBBox](items: Sequence[T], container: BBox) -> list[T]:
@@ -8,16 +8,78 @@ In PyMuPDF's drawing hierarchy (with extended=True):
 
 The ClipStackTracker maintains the clip stack as we iterate forward through
 drawings, avoiding the O(n²) cost of walking backwards for each drawing.
+Each stack frame also keeps the running intersection of every clip up to it,
+so a drawing is clipped with one intersection however deep the nesting is.
 """
 
+from __future__ import annotations
+
 import logging
-from collections.abc import Iterator
+import math
+from collections.abc import Iterator, Sequence
+from typing import NamedTuple
+
+import numpy as np
 
 from build_a_long.pdf_extract.extractor.bbox import BBox
 from build_a_long.pdf_extract.extractor.pymupdf_types import DrawingDict
 
 logger = logging.getLogger(__name__)
 
+type Rect = tuple[float, float, float, float]
+
+_NO_CLIP: Rect = (-math.inf, -math.inf, math.inf, math.inf)
+
+
+class _ClipFrame(NamedTuple):
+    """One clip on the stack, linked to the frame below it.
+
+    Frames are immutable, so the stack at any point can be kept by holding
+    on to its top frame.
+    """
+
+    level: int
+    clip: Rect
+    # Raw max/min of every clip up to and including this one. It may be
+    # inverted (x0 > x1) if the clips don't overlap; see `_clip_rect`.
+    cumulative: Rect
+    parent: _ClipFrame | None
+
+
+def _clip_rect(rect: Rect, top: _ClipFrame | None) -> Rect:
+    """Intersect a rect with every clip in a stack, bottom to top.
+
+    Equivalent to chaining `BBox.intersect` over the stack. Intersections
+    are associative as long as none is empty, so the rect only needs to be
+    intersected with the cumulative clip. Only when the result is empty,
+    where `BBox.intersect` collapses each empty step to its midpoint, are
+    the clips applied one by one.
+    """
+    if top is None:
+        return rect
+    c = top.cumulative
+    x0, y0 = max(rect[0], c[0]), max(rect[1], c[1])
+    x1, y1 = min(rect[2], c[2]), min(rect[3], c[3])
+    if x0 <= x1 and y0 <= y1:
+        return (x0, y0, x1, y1)
+    return _clip_rect_stepwise(rect, top)
+
+
+def _clip_rect_stepwise(rect: Rect, top: _ClipFrame) -> Rect:
+    clips: list[Rect] = []
+    frame: _ClipFrame | None = top
+    while frame is not None:
+        clips.append(frame.clip)
+        frame = frame.parent
+    x0, y0, x1, y1 = rect
+    for cx0, cy0, cx1, cy1 in reversed(clips):
+        x0, y0, x1, y1 = max(x0, cx0), max(y0, cy0), min(x1, cx1), min(y1, cy1)
+        if x0 > x1:
+            x0 = x1 = (x0 + x1) / 2
+        if y0 > y1:
+            y0 = y1 = (y0 + y1) / 2
+    return (x0, y0, x1, y1)
+
 
 class ClipStackTracker:
     """Tracks active clip paths while iterating through drawings.
@@ -34,8 +96,8 @@ class ClipStackTracker:
 
     def __init__(self) -> None:
         """Initialize the clip stack tracker."""
-        # Stack of (level, clip_bbox) tuples, sorted by level ascending
-        self._clip_stack: list[tuple[int, BBox]] = []
+        # Top of the stack of clips, sorted by level ascending
+        self._top: _ClipFrame | None = None
 
     def update(self, drawing: DrawingDict) -> None:
         """Update clip stack based on the current drawing.
@@ -44,42 +106,127 @@ class ClipStackTracker:
         visible bbox for non-clip drawings.
         """
         level = drawing.get("level", 0)
-        drawing_type = drawing.get("type")
 
         # Pop any clips at level >= current drawing's level
         # (their scope has ended)
-        while self._clip_stack and self._clip_stack[-1][0] >= level:
-            popped = self._clip_stack.pop()
-            logger.debug("  Popped clip at level %d", popped[0])
+        while self._top is not None and self._top.level >= level:
+            logger.debug("  Popped clip at level %d", self._top.level)
+            self._top = self._top.parent
 
         # If this is a clip, add it to the stack
-        if drawing_type == "clip":
+        if drawing.get("type") == "clip":
             scissor = drawing.get("scissor")
-            if scissor:
+            clip = (
+                (scissor.x0, scissor.y0, scissor.x1, scissor.y1)
+                if scissor is not None
+                else None
+            )
+            if clip is not None and any(clip):
                 # Skip inverted/invalid clip rectangles
-                if scissor.x0 > scissor.x1 or scissor.y0 > scissor.y1:
+                if clip[0] > clip[2] or clip[1] > clip[3]:
                     logger.debug(
                         "  Skipping inverted clip at level %d: %s",
                         level,
                         scissor,
                     )
                     return
-                clip_bbox = BBox.from_tuple(
-                    (scissor.x0, scissor.y0, scissor.x1, scissor.y1)
+                c = self._top.cumulative if self._top is not None else _NO_CLIP
+                cumulative = (
+                    max(c[0], clip[0]),
+                    max(c[1], clip[1]),
+                    min(c[2], clip[2]),
+                    min(c[3], clip[3]),
                 )
-                self._clip_stack.append((level, clip_bbox))
-                logger.debug("  Added clip at level %d: %s", level, clip_bbox)
+                self._top = _ClipFrame(level, clip, cumulative, self._top)
+                logger.debug("  Added clip at level %d: %s", level, clip)
 
     def apply_clips(self, bbox: BBox) -> BBox:
         """Apply all active clips to get the visible bbox."""
-        visible = bbox
-        for _, clip_bbox in self._clip_stack:
-            visible = visible.intersect(clip_bbox)
-        return visible
+        if self._top is None:
+            return bbox
+        return BBox.from_tuple(
+            _clip_rect((bbox.x0, bbox.y0, bbox.x1, bbox.y1), self._top)
+        )
+
+
+def visible_rects(
+    drawings: Sequence[DrawingDict],
+) -> list[tuple[Rect, Rect] | None]:
+    """Compute the rect and visible (clipped) rect of every drawing.
+
+    The clip stack is tracked in one forward pass, then all drawings are
+    intersected with their cumulative clip at once with NumPy.
+
+    Args:
+        drawings: List of drawings from page.get_drawings(extended=True)
+
+    Returns:
+        For each drawing, its (rect, visible rect), or None for clips and
+        drawings without a rect.
+    """
+    tracker = ClipStackTracker()
+    indices: list[int] = []
+    rects: list[Rect] = []
+    tops: list[_ClipFrame | None] = []
+    for idx, drawing in enumerate(drawings):
+        tracker.update(drawing)
+        if drawing.get("type") == "clip":
+            continue
+        drect = drawing.get("rect")
+        if drect is None:
+            continue
+        rect = (drect.x0, drect.y0, drect.x1, drect.y1)
+        # Same as `not drect` for an all-zero Rect, without its slow __bool__
+        if not any(rect):
+            continue
+        indices.append(idx)
+        rects.append(rect)
+        tops.append(tracker._top)
+
+    result: list[tuple[Rect, Rect] | None] = [None] * len(drawings)
+    if not rects:
+        return result
+
+    rect_array = np.array(rects, dtype=np.float64).reshape(-1, 4)
+    clip_array = np.array(
+        [top.cumulative if top is not None else _NO_CLIP for top in tops],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+    # Like max()/min() in `BBox.intersect`, keep the drawing's coordinate on
+    # ties (so the sign of zero matches too)
+    lo, hi = slice(0, 2), slice(2, 4)
+    visible = np.concatenate(
+        (
+            np.where(
+                clip_array[:, lo] > rect_array[:, lo],
+                clip_array[:, lo],
+                rect_array[:, lo],
+            ),
+            np.where(
+                clip_array[:, hi] < rect_array[:, hi],
+                clip_array[:, hi],
+                rect_array[:, hi],
+            ),
+        ),
+        axis=1,
+    )
+    empty = (visible[:, 0] > visible[:, 2]) | (visible[:, 1] > visible[:, 3])
+
+    for i, (idx, rect, row, is_empty) in enumerate(
+        zip(indices, rects, visible.tolist(), empty.tolist(), strict=True)
+    ):
+        top = tops[i]
+        if is_empty and top is not None:
+            result[idx] = (rect, _clip_rect_stepwise(rect, top))
+        elif top is None:
+            result[idx] = (rect, rect)
+        else:
+            result[idx] = (rect, tuple(row))  # type: ignore[assignment]
+    return result
 
 
 def iterate_drawings_with_clips(
-    drawings: list[DrawingDict],
+    drawings: Sequence[DrawingDict],
 ) -> Iterator[tuple[int, DrawingDict, BBox | None]]:
     """Iterate through drawings, yielding visible bbox for each non-clip.
 
@@ -92,21 +239,13 @@ def iterate_drawings_with_clips(
         Tuples of (index, drawing, visible_bbox) for non-clip drawings.
         visible_bbox is None if the drawing has no rect.
     """
-    tracker = ClipStackTracker()
-
-    for idx, drawing in enumerate(drawings):
-        tracker.update(drawing)
-
+    for idx, (drawing, rects) in enumerate(
+        zip(drawings, visible_rects(drawings), strict=True)
+    ):
         # Skip clip paths - they're not visible drawings
         if drawing.get("type") == "clip":
             continue
-
-        drect = drawing.get("rect")
-        if not drect:
+        if rects is None:
             yield idx, drawing, None
             continue
-
-        bbox = BBox.from_rect(drect)
-        visible_bbox = tracker.apply_clips(bbox)
-
-        yield idx, drawing, visible_bbox
+        yield idx, drawing, BBox.from_tuple(rects[1])
@@ -0,0 +1,92 @@
+import pymupdf
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from build_a_long.pdf_extract.extractor.bbox import BBox
+from build_a_long.pdf_extract.extractor.clip import (
+    ClipStackTracker,
+    iterate_drawings_with_clips,
+    visible_rects,
+)
+
+# Small integer coordinates so clips often touch, nest or don't overlap
+coord = st.integers(-5, 30).map(float)
+rect = st.tuples(coord, coord, coord, coord).map(
+    lambda r: pymupdf.Rect(
+        min(r[0], r[2]), min(r[1], r[3]), max(r[0], r[2]), max(r[1], r[3])
+    )
+)
+drawing = st.one_of(
+    st.builds(
+        lambda level, scissor: {"type": "clip", "level": level, "scissor": scissor},
+        st.integers(0, 6),
+        rect,
+    ),
+    st.builds(
+        lambda level, r: {"type": "f", "level": level, "rect": r},
+        st.integers(0, 6),
+        rect,
+    ),
+)
+
+
+def _reference_visible_bboxes(drawings: list[dict]) -> list[BBox | None]:
+    """Intersect each drawing with every active clip, one at a time."""
+    stack: list[tuple[int, BBox]] = []
+    result: list[BBox | None] = []
+    for d in drawings:
+        while stack and stack[-1][0] >= d["level"]:
+            stack.pop()
+        if d["type"] == "clip":
+            # Empty (falsy) scissors are ignored, as are empty rects
+            if d["scissor"]:
+                stack.append((d["level"], BBox.from_rect(d["scissor"])))
+            result.append(None)
+            continue
+        if not d["rect"]:
+            result.append(None)
+            continue
+        visible = BBox.from_rect(d["rect"])
+        for _, clip in stack:
+            visible = visible.intersect(clip)
+        result.append(visible)
+    return result
+
+
+@settings(max_examples=300)
+@given(st.lists(drawing, max_size=40))
+def test_visible_bboxes_match_clipping_one_clip_at_a_time(drawings: list[dict]):
+    expected = _reference_visible_bboxes(drawings)
+
+    rects = visible_rects(drawings)  # type: ignore[arg-type]
+    assert [BBox.from_tuple(r[1]) if r else None for r in rects] == expected
+
+    tracker = ClipStackTracker()
+    for d, want in zip(drawings, expected, strict=True):
+        tracker.update(d)  # type: ignore[arg-type]
+        if d["type"] != "clip" and d["rect"]:
+            assert tracker.apply_clips(BBox.from_rect(d["rect"])) == want
+
+
+def test_iterate_drawings_with_clips():
+    drawings = [
+        {"type": "clip", "level": 0, "scissor": pymupdf.Rect(0, 0, 10, 10)},
+        {"type": "f", "level": 1, "rect": pymupdf.Rect(5, 5, 20, 20)},
+        {"type": "clip", "level": 1, "scissor": pymupdf.Rect(20, 20, 30, 30)},
+        # Disjoint clips collapse the visible bbox to a point
+        {"type": "f", "level": 2, "rect": pymupdf.Rect(0, 0, 30, 30)},
+        # Ends both clips
+        {"type": "f", "level": 0, "rect": pymupdf.Rect(5, 5, 20, 20)},
+        # Inverted clips are ignored
+        {"type": "clip", "level": 0, "scissor": pymupdf.Rect(10, 10, 0, 0)},
+        {"type": "f", "level": 1, "rect": pymupdf.Rect(1, 2, 3, 4)},
+        {"type": "f", "level": 1},
+    ]
+
+    assert list(iterate_drawings_with_clips(drawings)) == [  # type: ignore[arg-type]
+        (1, drawings[1], BBox(5, 5, 10, 10)),
+        (3, drawings[3], BBox(15, 15, 15, 15)),
+        (4, drawings[4], BBox(5, 5, 20, 20)),
+        (6, drawings[6], BBox(1, 2, 3, 4)),
+        (7, drawings[7], None),
+    ]
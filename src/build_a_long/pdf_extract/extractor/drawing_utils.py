@@ -1,60 +1,327 @@
 """Utilities for processing PyMuPDF drawing data.
 
-This module contains functions for converting PyMuPDF drawing items
-to JSON-serializable tuples.
+This module contains `PathItems`, the compact representation of a drawing's
+path commands stored on `Drawing.items`, and `convert_drawing_items`, which
+builds it from PyMuPDF drawing items.
 
 For clip path computation, use the clip module.
 """
 
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, overload
+
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
 from build_a_long.pdf_extract.extractor.pymupdf_types import DrawingDict  # noqa: F401
 
+# Path commands, their opcodes and how many coordinates each one stores
+_LINE, _CURVE, _RECT, _QUAD = range(4)
+_COMMANDS = ("l", "c", "re", "qu")
+_OPCODES = {name: code for code, name in enumerate(_COMMANDS)}
+_SIZES = (4, 8, 4, 8)
+
+_NEGATIVE_ZERO = array("d", [-0.0]).tobytes()
+
+
+def _to_tuple(value: object) -> object:
+    if isinstance(value, list | tuple):
+        return tuple(_to_tuple(x) for x in value)
+    return value
+
+
+def _to_list(value: object) -> object:
+    if isinstance(value, list | tuple):
+        return [_to_list(x) for x in value]
+    return value
+
+
+def _unsigned_zeros(coords: bytes) -> bytes:
+    """Packed coordinates with -0.0 as 0.0, for hashing.
+
+    The check is cheap, and may also match bytes spanning two coordinates.
+    """
+    if _NEGATIVE_ZERO not in coords:
+        return coords
+    # -0.0 + 0.0 is 0.0
+    return array("d", [c + 0.0 for c in memoryview(coords).cast("d")]).tobytes()
+
+
+def _decode_item(code: int, c: list[float], orientation: int, seq: type) -> Any:
+    """Build one item from its opcode, coordinates and orientation.
+
+    ``seq`` is `tuple`, or `list` for JSON.
+    """
+    if code == _LINE:
+        return seq(("l", seq(c[0:2]), seq(c[2:4])))
+    if code == _CURVE:
+        return seq(("c", seq(c[0:2]), seq(c[2:4]), seq(c[4:6]), seq(c[6:8])))
+    if code == _RECT:
+        return seq(("re", seq(c), orientation))
+    quad = seq((seq(c[0:2]), seq(c[2:4]), seq(c[4:6]), seq(c[6:8])))
+    return seq(("qu", quad))
+
+
+class PathItems(Sequence[tuple]):
+    """The path commands of a drawing, packed into bytes.
+
+    PyMuPDF describes a path as a list of items such as
+    ``("l", p1, p2)``, ``("c", p1, p2, p3, p4)``, ``("re", rect, orientation)``
+    and ``("qu", quad)``. Stored as nested tuples, a page with thousands of
+    vector paths holds millions of small float and tuple objects, and every
+    hash or comparison of a `Drawing` (e.g. as a dict key) walks them all.
+
+    Instead, the commands are stored as one opcode byte per item, all
+    coordinates as one packed float64 buffer and the rectangle orientations
+    as a packed int buffer. The hash is computed once, and equality compares
+    the buffers. Coordinates are kept at full precision, so the JSON output
+    is identical to that of the nested tuples. Like the tuples, items that
+    differ only in the sign of a zero coordinate are equal and hash alike.
+
+    For compatibility, a `PathItems` is also a sequence of the original
+    tuples, built on access (points are ``(x, y)`` tuples, rectangles
+    ``(x0, y0, x1, y1)``). Indexing decodes only the requested item, using
+    a table of item offsets built on first use. Hot paths should prefer
+    `count_command` and `command`, which don't build tuples.
+
+    Items that don't match one of the four known shapes can't be packed;
+    then the items are kept as nested tuples instead.
+    """
+
+    __slots__ = ("_ops", "_coords", "_orientations", "_raw", "_hash", "_offsets")
+
+    def __init__(
+        self,
+        ops: bytes,
+        coords: bytes,
+        orientations: bytes,
+        raw: tuple[tuple, ...] | None = None,
+    ) -> None:
+        """Wrap already packed buffers. Use `from_items` to build one."""
+        self._ops = ops
+        self._coords = coords
+        self._orientations = orientations
+        self._raw = raw
+        self._hash = (
+            hash(raw)
+            if raw is not None
+            else hash((ops, _unsigned_zeros(coords), orientations))
+        )
+        self._offsets: array | None = None
 
-def convert_drawing_items(items: list[tuple] | None) -> tuple[tuple, ...] | None:
-    """Convert PyMuPDF objects in drawing items to JSON-serializable tuples.
+    @classmethod
+    def from_items(cls, items: Iterable[Any]) -> PathItems:
+        """Pack path items.
 
-    Drawing items can contain Rect, Point, and Quad objects which need
-    to be converted to tuples for JSON serialization.
+        Args:
+            items: PyMuPDF drawing items (with Point/Rect/Quad objects), or
+                the same items as nested tuples or lists (e.g. from JSON).
+
+        Returns:
+            The packed items.
+        """
+        if isinstance(items, PathItems):
+            return items
+        items = list(items)
+        ops = bytearray()
+        coords = array("d")
+        orientations = array("i")
+        try:
+            for item in items:
+                code = _OPCODES[item[0]]
+                start = len(coords)
+                if code == _LINE:
+                    _, p1, p2 = item
+                    coords.extend(p1)
+                    coords.extend(p2)
+                elif code == _CURVE:
+                    _, p1, p2, p3, p4 = item
+                    coords.extend(p1)
+                    coords.extend(p2)
+                    coords.extend(p3)
+                    coords.extend(p4)
+                elif code == _RECT:
+                    _, rect, orientation = item
+                    coords.extend(rect)
+                    orientations.append(orientation)
+                else:
+                    (_, quad) = item
+                    for point in quad:
+                        coords.extend(point)
+                if len(coords) - start != _SIZES[code]:
+                    raise ValueError(f"Unexpected path item shape: {item!r}")
+                ops.append(code)
+        except KeyError, IndexError, TypeError, ValueError, OverflowError:
+            return cls(b"", b"", b"", raw=_to_tuple(items))  # type: ignore[arg-type]
+        return cls(bytes(ops), coords.tobytes(), orientations.tobytes())
+
+    @classmethod
+    def _validate(cls, value: Any) -> PathItems:
+        if isinstance(value, str | bytes) or not isinstance(value, Iterable):
+            raise ValueError("Path items must be a sequence of path commands")
+        return cls.from_items(value)
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        """Validate with `from_items`, and serialize as nested tuples.
+
+        Pydantic models can therefore store `PathItems` directly: they are
+        packed from PyMuPDF items, tuples or JSON lists, serialized as the
+        nested items (arrays in JSON), and described in JSON schemas as
+        arrays of arrays.
+        """
+        items_schema = handler.generate_schema(tuple[tuple, ...])
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            json_schema_input_schema=items_schema,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls.as_tuples, return_schema=items_schema
+            ),
+        )
+
+    @property
+    def is_packed(self) -> bool:
+        """Whether the items are packed (False if kept as nested tuples)."""
+        return self._raw is None
+
+    def __len__(self) -> int:
+        return len(self._raw) if self._raw is not None else len(self._ops)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, PathItems):
+            return NotImplemented
+        return (
+            self._hash == other._hash
+            and self._raw == other._raw
+            and self._ops == other._ops
+            and self._orientations == other._orientations
+            and (
+                self._coords == other._coords
+                # Equal hashes but different bytes: compare the values, so
+                # that -0.0 equals 0.0
+                or memoryview(self._coords).cast("d")
+                == memoryview(other._coords).cast("d")
+            )
+        )
+
+    def __repr__(self) -> str:
+        return f"PathItems({self.as_tuples()!r})"
+
+    def __reduce__(self) -> tuple:
+        return (
+            PathItems,
+            (self._ops, self._coords, self._orientations, self._raw),
+        )
+
+    def command(self, index: int) -> str:
+        """Return the command (``"l"``, ``"c"``, ``"re"`` or ``"qu"``) of an item."""
+        if self._raw is not None:
+            return self._raw[index][0]
+        return _COMMANDS[self._ops[index]]
+
+    def count_command(self, command: str) -> int:
+        """Return how many items use a command, e.g. ``"c"`` for curves."""
+        if self._raw is not None:
+            return sum(1 for item in self._raw if item and item[0] == command)
+        code = _OPCODES.get(command)
+        return 0 if code is None else self._ops.count(code)
+
+    def _iter_tuples(self, json: bool = False) -> Iterator[Any]:
+        seq = list if json else tuple
+        values = memoryview(self._coords).cast("d").tolist()
+        orientations = iter(memoryview(self._orientations).cast("i").tolist())
+        i = 0
+        for code in self._ops:
+            c = values[i : i + _SIZES[code]]
+            i += _SIZES[code]
+            orientation = next(orientations) if code == _RECT else 0
+            yield _decode_item(code, c, orientation, seq)
+
+    def _item_offsets(self) -> array:
+        """Where each item's coordinates and orientation start, built once.
+
+        Item ``i`` starts at coordinate ``offsets[2 * i]`` and, if it is a
+        rectangle, its orientation is ``orientations[offsets[2 * i + 1]]``.
+        """
+        if self._offsets is None:
+            offsets = array("q")
+            coord = orientation = 0
+            for code in self._ops:
+                offsets.append(coord)
+                offsets.append(orientation)
+                coord += _SIZES[code]
+                orientation += code == _RECT
+            self._offsets = offsets
+        return self._offsets
+
+    def _item(self, index: int) -> tuple:
+        """Decode one packed item."""
+        if index < 0:
+            index += len(self._ops)
+        if not 0 <= index < len(self._ops):
+            raise IndexError("PathItems index out of range")
+        code = self._ops[index]
+        offsets = self._item_offsets()
+        start = offsets[2 * index]
+        c = memoryview(self._coords).cast("d")[start : start + _SIZES[code]].tolist()
+        orientation = (
+            memoryview(self._orientations).cast("i")[offsets[2 * index + 1]]
+            if code == _RECT
+            else 0
+        )
+        return _decode_item(code, c, orientation, tuple)
+
+    def __iter__(self) -> Iterator[tuple]:
+        if self._raw is not None:
+            return iter(self._raw)
+        return self._iter_tuples()
+
+    @overload
+    def __getitem__(self, index: int) -> tuple: ...
+    @overload
+    def __getitem__(self, index: slice) -> tuple[tuple, ...]: ...
+    def __getitem__(self, index: int | slice) -> tuple | tuple[tuple, ...]:
+        if self._raw is not None:
+            return self._raw[index]
+        if isinstance(index, slice):
+            return tuple(self._item(i) for i in range(*index.indices(len(self))))
+        return self._item(index)
+
+    def as_tuples(self) -> tuple[tuple, ...]:
+        """Return the items as nested tuples (built on each call)."""
+        if self._raw is not None:
+            return self._raw
+        return tuple(self._iter_tuples())
+
+    def to_json(self) -> list[list]:
+        """Return the items as nested lists, as JSON stores them."""
+        if self._raw is not None:
+            return _to_list(self._raw)  # type: ignore[return-value]
+        return list(self._iter_tuples(json=True))
+
+
+def convert_drawing_items(items: Iterable[Any] | None) -> PathItems | None:
+    """Pack PyMuPDF drawing items into `PathItems`.
+
+    Drawing items can contain Rect, Point, and Quad objects; their
+    coordinates are copied into the packed buffers.
 
     Args:
         items: List of drawing command tuples from PyMuPDF
 
     Returns:
-        Tuple of tuples with PyMuPDF objects converted to tuples, or None
+        The packed items, or None
     """
     if items is None:
         return None
-
-    converted_items: list[tuple] = []
-    for item in items:
-        if not isinstance(item, tuple) or len(item) == 0:
-            converted_items.append(item)
-            continue
-
-        # Convert tuple elements that are PyMuPDF objects
-        converted_elements: list = [item[0]]  # Keep the command string
-        for element in item[1:]:
-            # Check if element has x0, y0, x1, y1 (Rect-like)
-            if hasattr(element, "x0"):
-                converted_elements.append(
-                    (element.x0, element.y0, element.x1, element.y1)
-                )
-            # Check if element has x, y (Point-like)
-            elif hasattr(element, "x") and hasattr(element, "y"):
-                converted_elements.append((element.x, element.y))
-            # Check if it's a Quad (has ul, ur, ll, lr)
-            elif hasattr(element, "ul"):
-                converted_elements.append(
-                    (
-                        (element.ul.x, element.ul.y),
-                        (element.ur.x, element.ur.y),
-                        (element.ll.x, element.ll.y),
-                        (element.lr.x, element.lr.y),
-                    )
-                )
-            else:
-                # Keep as-is if not a recognized PyMuPDF object
-                converted_elements.append(element)
-
-        converted_items.append(tuple(converted_elements))
-
-    return tuple(converted_items)
+    return PathItems.from_items(items)
@@ -0,0 +1,124 @@
+import json
+import pickle
+from collections.abc import Callable
+
+import pymupdf
+import pytest
+from hypothesis import example, given
+from hypothesis import strategies as st
+
+from build_a_long.pdf_extract.extractor.drawing_utils import (
+    PathItems,
+    convert_drawing_items,
+)
+
+coord = st.floats(allow_nan=False, allow_infinity=False)
+point = st.tuples(coord, coord)
+path_item = st.one_of(
+    st.tuples(st.just("l"), point, point),
+    st.tuples(st.just("c"), point, point, point, point),
+    st.tuples(
+        st.just("re"),
+        st.tuples(coord, coord, coord, coord),
+        st.sampled_from([-1, 0, 1]),
+    ),
+    st.tuples(st.just("qu"), st.tuples(point, point, point, point)),
+)
+
+
+def _map_coords(value: object, f: Callable[[float], float]) -> object:
+    """Apply ``f`` to every coordinate of (nested) path items."""
+    if isinstance(value, tuple):
+        return tuple(_map_coords(x, f) for x in value)
+    if isinstance(value, float):
+        return f(value)
+    return value
+
+
+@given(st.lists(path_item, max_size=20))
+def test_path_items_round_trip(items: list[tuple]) -> None:
+    packed = PathItems.from_items(items)
+
+    assert packed.is_packed
+    assert packed.as_tuples() == tuple(items)
+    assert list(packed) == items
+    assert len(packed) == len(items)
+    # Indexing decodes single items
+    assert [packed[i] for i in range(len(items))] == items
+    assert [packed[-i] for i in range(1, len(items) + 1)] == items[::-1]
+    assert packed[1:-1:2] == tuple(items[1:-1:2])
+    # JSON output matches the nested tuples it replaces
+    assert json.dumps(packed.to_json()) == json.dumps(items)
+    # Equal to (and hashes like) the same items loaded back from JSON
+    loaded = PathItems.from_items(json.loads(json.dumps(items)))
+    assert loaded == packed
+    assert hash(loaded) == hash(packed)
+    assert pickle.loads(pickle.dumps(packed)) == packed
+
+
+@given(st.lists(path_item, max_size=20))
+@example([("l", (-0.0, 0.0), (0.0, -0.0)), ("re", (-0.0, 0.0, 1.0, 1.0), 1)])
+def test_signed_zeros_are_equal(items: list[tuple]) -> None:
+    """Items differing only in the sign of zeros are equal and hash alike."""
+    flipped = [_map_coords(item, lambda c: -c if c == 0 else c) for item in items]
+    packed = PathItems.from_items(items)
+    packed_flipped = PathItems.from_items(flipped)
+
+    assert packed == packed_flipped
+    assert hash(packed) == hash(packed_flipped)
+    # The stored bytes keep the sign
+    assert json.dumps(packed_flipped.to_json()) == json.dumps(flipped)
+
+
+def test_convert_pymupdf_objects() -> None:
+    rect = pymupdf.Rect(0, 0, 10, 20)
+    items = convert_drawing_items(
+        [
+            ("l", pymupdf.Point(1, 2), pymupdf.Point(3, 4)),
+            ("re", rect, 1),
+            ("qu", rect.quad),
+            ("c", *(pymupdf.Point(i, i) for i in range(4))),
+        ]
+    )
+
+    assert items is not None
+    assert items.as_tuples() == (
+        ("l", (1.0, 2.0), (3.0, 4.0)),
+        ("re", (0.0, 0.0, 10.0, 20.0), 1),
+        ("qu", ((0.0, 0.0), (10.0, 0.0), (0.0, 20.0), (10.0, 20.0))),
+        ("c", (0.0, 0.0), (1.0, 1.0), (2.0, 2.0), (3.0, 3.0)),
+    )
+    assert items.command(1) == "re"
+    assert items.count_command("c") == 1
+    assert items.count_command("x") == 0
+    assert convert_drawing_items(None) is None
+
+
+def test_differing_items_are_not_equal() -> None:
+    a = PathItems.from_items([("l", (0.0, 0.0), (1.0, 1.0))])
+    b = PathItems.from_items([("l", (0.0, 0.0), (1.0, 2.0))])
+    c = PathItems.from_items([("re", (0.0, 0.0, 1.0, 1.0), -1)])
+    d = PathItems.from_items([("re", (0.0, 0.0, 1.0, 1.0), 1)])
+
+    assert a != b
+    assert c != d
+    assert a != (("l", (0.0, 0.0), (1.0, 1.0)),)
+
+
+def test_unknown_items_are_kept_as_tuples() -> None:
+    items = PathItems.from_items([["l", [0.0, 0.0]], ["v", 1]])
+
+    assert not items.is_packed
+    assert items.as_tuples() == (("l", (0.0, 0.0)), ("v", 1))
+    assert items.to_json() == [["l", [0.0, 0.0]], ["v", 1]]
+    assert items.count_command("v") == 1
+    assert items == PathItems.from_items((("l", (0.0, 0.0)), ("v", 1)))
+
+
+def test_index_out_of_range() -> None:
+    items = PathItems.from_items([("l", (0.0, 0.0), (1.0, 1.0))])
+
+    with pytest.raises(IndexError):
+        items[1]
+    with pytest.raises(IndexError):
+        items[-2]
@@ -1,12 +1,14 @@
+from __future__ import annotations
+
 import logging
 from collections.abc import Sequence
 
 import pymupdf
 from PIL import Image as PILImage
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from build_a_long.pdf_extract.extractor.bbox import BBox
-from build_a_long.pdf_extract.extractor.clip import iterate_drawings_with_clips
+from build_a_long.pdf_extract.extractor.clip import visible_rects
 from build_a_long.pdf_extract.extractor.ocr import OCR
 
 # Note: We intentionally do not build hierarchy here to avoid syncing issues
@@ -15,6 +17,8 @@ from build_a_long.pdf_extract.extractor.page_blocks import (
     Drawing,
     Image,
     Text,
+    span_dict_text,
+    texttrace_span_text,
 )
 from build_a_long.pdf_extract.extractor.pymupdf_types import (
     ImageInfoDict,
@@ -92,6 +96,59 @@ class PageData(BaseModel):
     blocks: list[Blocks]
 
 
+class PageText(BaseModel):
+    """Text spans of a single PDF page, stored as parallel columns.
+
+    A lightweight alternative to `PageData` for passes that only need each
+    span's text, font and position (such as building font size and page
+    hints over every page of a manual), without a `Text` block per span.
+
+    Attributes:
+        page_number: The page number (1-indexed) from the PDF metadata.
+        bbox: The bounding box of the entire page (page coordinate space).
+        texts: The text of each span.
+        font_names: The font name of each span.
+        font_sizes: The font size of each span.
+        bboxes: The (x0, y0, x1, y1) bounding box of each span.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    page_number: int
+    bbox: BBox
+    texts: list[str]
+    font_names: list[str | None]
+    font_sizes: list[float | None]
+    bboxes: list[RectLikeTuple]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @classmethod
+    def from_page_data(cls, page: PageData) -> PageText:
+        """Collect the Text blocks of a page, in order, into columns."""
+        texts = [block for block in page.blocks if isinstance(block, Text)]
+        return cls(
+            page_number=page.page_number,
+            bbox=page.bbox,
+            texts=[t.text for t in texts],
+            font_names=[t.font_name for t in texts],
+            font_sizes=[t.font_size for t in texts],
+            bboxes=[(t.bbox.x0, t.bbox.y0, t.bbox.x1, t.bbox.y1) for t in texts],
+        )
+
+    def take(self, indices: Sequence[int]) -> PageText:
+        """Return a PageText with only the spans at `indices`, in that order."""
+        return PageText.model_construct(
+            page_number=self.page_number,
+            bbox=self.bbox,
+            texts=[self.texts[i] for i in indices],
+            font_names=[self.font_names[i] for i in indices],
+            font_sizes=[self.font_sizes[i] for i in indices],
+            bboxes=[self.bboxes[i] for i in indices],
+        )
+
+
 class ExtractionResult(SerializationMixin, BaseModel):
     """Top-level container for extracted PDF data."""
 
@@ -416,26 +473,31 @@ class Extractor:
 
         drawing_blocks: list[Drawing] = []
 
-        # Use efficient O(n) iteration with clip tracking
-        for idx, d, visible_bbox in iterate_drawings_with_clips(drawings):
-            if visible_bbox is None:
+        # Clip every drawing in one O(n) pass over the clip stack
+        for idx, (d, rects) in enumerate(
+            zip(drawings, visible_rects(drawings), strict=True)
+        ):
+            # Skip clip paths - they're not visible drawings
+            if d.get("type") == "clip":
+                continue
+            if rects is None:
                 logger.warning(
                     "Drawing at index %d has no 'rect' field, skipping: %s", idx, d
                 )
                 continue
 
-            level = d.get("level", 0)
-            drect = d.get("rect")
-            nbbox = BBox.from_rect(drect)
+            rect, visible = rects
             logger.debug(
-                "Drawing %d at level %d: bbox=%s, visible_bbox=%s",
+                "Drawing %d at level %d: rect=%s, visible=%s",
                 idx,
-                level,
-                nbbox,
-                visible_bbox,
+                d.get("level", 0),
+                rect,
+                visible,
             )
 
             try:
+                # Unclipped drawings only need the bbox of their rect
+                visible_bbox = None if visible == rect else BBox.from_tuple(visible)
                 drawing_block = Drawing.from_drawing_dict(
                     d,  # type: ignore[arg-type]
                     block_id=self._get_next_id(),
@@ -491,6 +553,61 @@ class Extractor:
         texttrace: list[TexttraceSpanDict] = self._page.get_texttrace()  # type: ignore[assignment]
         return self._extract_text_blocks_from_texttrace(texttrace)
 
+    def extract_page_text(self) -> PageText:
+        """Extract only the text, font and bbox of each span, as columns.
+
+        A fast path for passes that only need text statistics (e.g. font
+        size and page hints for every page of a document). It reads the
+        same spans as `extract_text_blocks`, in the same order, but builds
+        no `Text` blocks and assigns no IDs.
+
+        Returns:
+            PageText with one entry per span
+        """
+        texts: list[str] = []
+        font_names: list[str | None] = []
+        font_sizes: list[float | None] = []
+        bboxes: list[RectLikeTuple] = []
+
+        if self._use_rawdict:
+            # Same flags as extract_text_blocks; see the comment there
+            rawdict: RawDict = self._page.get_text("dict", flags=0)  # type: ignore[assignment]
+            for block in rawdict.get("blocks", []):
+                if block.get("type") != 0:
+                    continue
+                text_block_dict: TextBlockDict = block  # type: ignore[assignment]
+                for line in text_block_dict.get("lines", []):
+                    for span in line.get("spans", []):
+                        bbox = span.get("bbox")
+                        if not bbox:
+                            continue
+                        texts.append(span_dict_text(span))
+                        font_names.append(span.get("font"))
+                        font_sizes.append(span.get("size"))
+                        bboxes.append(tuple(bbox))  # type: ignore[arg-type]
+        else:
+            texttrace: list[TexttraceSpanDict] = self._page.get_texttrace()  # type: ignore[assignment]
+            for tspan in texttrace:
+                bbox = tspan.get("bbox")
+                if not bbox:
+                    continue
+                texts.append(texttrace_span_text(tspan))
+                font_names.append(tspan.get("font"))
+                font_sizes.append(tspan.get("size"))
+                bboxes.append(tuple(bbox))  # type: ignore[arg-type]
+
+        page_rect = self._page.rect
+        return PageText(
+            page_number=self._page_num,
+            bbox=BBox.from_tuple(
+                (page_rect.x0, page_rect.y0, page_rect.x1, page_rect.y1)
+            ),
+            texts=texts,
+            font_names=font_names,
+            font_sizes=font_sizes,
+            bboxes=bboxes,
+        )
+
     def extract_page_data(
         self,
         include_types: set[str] | None = None,
@@ -2,6 +2,7 @@ from unittest.mock import MagicMock
 
 from build_a_long.pdf_extract.extractor.extractor import (
     Extractor,
+    PageText,
     extract_page_data,
 )
 from build_a_long.pdf_extract.extractor.page_blocks import (
@@ -263,6 +264,42 @@ class TestExtractorMethods:
         assert result[1].id == 1
         assert result[1].draw_order == 1
 
+    def test_extract_page_text_matches_text_blocks(self):
+        """Test Extractor.extract_page_text reads the same spans as
+        extract_text_blocks, with both text APIs."""
+        page = (
+            PageBuilder()
+            .add_text("1", (10.0, 20.0, 30.0, 40.0), size=24.0)
+            .add_text("2x", (50.0, 60.0, 70.0, 80.0), font="Helvetica")
+            .add_image(
+                bbox=(100.0, 200.0, 150.0, 250.0),
+                xref=10,
+                number=2,
+                image_id="Im1",
+            )
+            .build_mock_page()
+        )
+
+        for use_rawdict in (True, False):
+            extractor = Extractor(page=page, page_num=3, use_rawdict=use_rawdict)
+            page_text = extractor.extract_page_text()
+
+            assert page_text.texts == ["1", "2x"]
+            assert page_text.font_names == ["Arial", "Helvetica"]
+            assert page_text.font_sizes == [24.0, 12.0]
+            assert page_text.bboxes == [
+                (10.0, 20.0, 30.0, 40.0),
+                (50.0, 60.0, 70.0, 80.0),
+            ]
+            assert page_text == PageText.from_page_data(
+                extractor.extract_page_data(include_types={"text"})
+            )
+
+        # No block IDs are used up
+        extractor = Extractor(page=page, page_num=3)
+        extractor.extract_page_text()
+        assert extractor.extract_text_blocks()[0].id == 0
+
     def test_extract_image_blocks(self):
         """Test Extractor.extract_image_blocks extracts images from page."""
         page = (
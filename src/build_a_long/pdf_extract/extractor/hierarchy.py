@@ -8,7 +8,9 @@ ancestor for each child.
 
 from __future__ import annotations
 
+import bisect
 import logging
+import math
 from collections.abc import Sequence
 from typing import Protocol, runtime_checkable
 
@@ -109,48 +111,134 @@ class BlockTree[T: HasBBox](BaseModel):
         return id(obj) not in self.parent_map or self.parent_map[id(obj)] is None
 
 
-def build_hierarchy_from_blocks[T: HasBBox](
-    blocks: Sequence[T],
-) -> BlockTree[T]:
-    """Build a containment-based hierarchy from objects with bbox attributes.
+_BRUTE_FORCE_THRESHOLD = 32
+"""Below this many objects the quadratic scan beats building a spatial index."""
 
-    Strategy:
-    - Sort objects by area ascending (smallest first) so children attach before parents.
-    - For each object, find the smallest containing ancestor and attach as a child.
+_MAX_GRID_CELLS = 32
+"""Upper bound on grid cells per axis for the containment index."""
 
-    Args:
-        blocks: Sequence of objects that have a bbox attribute
+type _Rect = tuple[float, float, float, float]
 
-    Returns:
-        BlockTree containing the hierarchy with roots and parent/children mappings.
-    """
-    converted: list[T] = list(blocks)
 
-    # Sort indices by area ascending to assign children first
-    idxs = sorted(range(len(converted)), key=lambda i: converted[i].bbox.area)
+def _find_parents_brute_force(rects: Sequence[_Rect]) -> list[int | None]:
+    """Reference O(n²) parent search.
 
-    # Prepare parent mapping: each index maps to parent index or None
-    parent: list[int | None] = [None] * len(converted)
+    For each rect, the parent is the smallest-area other rect that contains it,
+    skipping rects identical to it. Ties on area go to the lowest index.
+    """
+    areas = [(r[2] - r[0]) * (r[3] - r[1]) for r in rects]
+    idxs = sorted(range(len(rects)), key=lambda i: areas[i])
 
+    parent: list[int | None] = [None] * len(rects)
     for i in idxs:  # small to large
-        bbox_i = converted[i].bbox
+        ix0, iy0, ix1, iy1 = rects[i]
         best_parent: int | None = None
         best_parent_area: float = float("inf")
-        for j, candidate in enumerate(converted):
+        for j, (jx0, jy0, jx1, jy1) in enumerate(rects):
             if i == j:
                 continue
-            bbox_j = candidate.bbox
             # Skip if bboxes are identical (duplicate blocks at same position)
-            # This check uses `contains` which, like `fully_inside`, considers
-            # identical boxes to "contain" each other.
-            if bbox_i == bbox_j:
+            # as identical boxes would otherwise "contain" each other.
+            if rects[i] == rects[j]:
                 continue
-            if bbox_j.contains(bbox_i):
-                area = bbox_j.area
+            if ix0 >= jx0 and iy0 >= jy0 and ix1 <= jx1 and iy1 <= jy1:
+                area = areas[j]
                 if area < best_parent_area:
                     best_parent = j
                     best_parent_area = area
         parent[i] = best_parent
+    return parent
+
+
+def _find_parents_indexed(rects: Sequence[_Rect]) -> list[int | None]:
+    """Grid-indexed parent search with the same results as the brute force scan.
+
+    Any container of a rect must also cover that rect's top-left corner, so
+    each rect is registered in every grid cell it overlaps and a query only
+    looks at the cell holding the corner. Cells keep their rects sorted by
+    (area, index), so the first containing, non-identical rect found at or
+    above the query's own area is the smallest container, with ties broken by
+    index exactly as the brute force scan does.
+
+    Building the index is O(n log n) plus the cells covered by each rect, and
+    each query usually stops after a handful of candidates.
+    """
+    n = len(rects)
+    areas = [(r[2] - r[0]) * (r[3] - r[1]) for r in rects]
+
+    min_x = min(r[0] for r in rects)
+    min_y = min(r[1] for r in rects)
+    max_x = max(r[2] for r in rects)
+    max_y = max(r[3] for r in rects)
+    cells = max(1, min(_MAX_GRID_CELLS, math.isqrt(n)))
+    cell_w = (max_x - min_x) / cells or 1.0
+    cell_h = (max_y - min_y) / cells or 1.0
+
+    def _col(x: float) -> int:
+        return min(cells - 1, int((x - min_x) / cell_w))
+
+    def _row(y: float) -> int:
+        return min(cells - 1, int((y - min_y) / cell_h))
+
+    # Insert in (area, index) order so every cell list ends up sorted.
+    order = sorted(range(n), key=lambda i: (areas[i], i))
+    grid: list[list[int]] = [[] for _ in range(cells * cells)]
+    for i in order:
+        x0, y0, x1, y1 = rects[i]
+        for row in range(_row(y0), _row(y1) + 1):
+            base = row * cells
+            for col in range(_col(x0), _col(x1) + 1):
+                grid[base + col].append(i)
+
+    # Parallel area lists so each query can bisect past smaller rects.
+    grid_areas = [[areas[i] for i in cell] for cell in grid]
+
+    parent: list[int | None] = [None] * n
+    for i in range(n):
+        rect_i = rects[i]
+        ix0, iy0, ix1, iy1 = rect_i
+        cell_index = _row(iy0) * cells + _col(ix0)
+        cell = grid[cell_index]
+        start = bisect.bisect_left(grid_areas[cell_index], areas[i])
+        for k in range(start, len(cell)):
+            j = cell[k]
+            if j == i:
+                continue
+            jx0, jy0, jx1, jy1 = rect_j = rects[j]
+            if rect_j == rect_i:
+                continue
+            if ix0 >= jx0 and iy0 >= jy0 and ix1 <= jx1 and iy1 <= jy1:
+                parent[i] = j
+                break
+    return parent
+
+
+def build_hierarchy_from_blocks[T: HasBBox](
+    blocks: Sequence[T],
+) -> BlockTree[T]:
+    """Build a containment-based hierarchy from objects with bbox attributes.
+
+    Strategy:
+    - Each object's parent is the smallest other object whose bbox contains it.
+    - Objects with identical bboxes never become each other's parent.
+    - Ties between equally sized containers go to the earliest object.
+
+    Small inputs use a direct scan, larger ones a grid index over the bboxes
+    (see `_find_parents_indexed`); both give identical results.
+
+    Args:
+        blocks: Sequence of objects that have a bbox attribute
+
+    Returns:
+        BlockTree containing the hierarchy with roots and parent/children mappings.
+    """
+    converted: list[T] = list(blocks)
+    rects = [(b.bbox.x0, b.bbox.y0, b.bbox.x1, b.bbox.y1) for b in converted]
+
+    if len(rects) < _BRUTE_FORCE_THRESHOLD:
+        parent = _find_parents_brute_force(rects)
+    else:
+        parent = _find_parents_indexed(rects)
 
     # Build children arrays
     children_lists: list[list[int]] = [[] for _ in converted]
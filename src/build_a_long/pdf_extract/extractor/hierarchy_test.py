@@ -1,5 +1,10 @@
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
 from build_a_long.pdf_extract.extractor.bbox import BBox
 from build_a_long.pdf_extract.extractor.hierarchy import (
+    _find_parents_brute_force,
+    _find_parents_indexed,
     build_hierarchy_from_blocks,
 )
 from build_a_long.pdf_extract.extractor.lego_page_elements import (
@@ -159,3 +164,51 @@ def test_build_hierarchy_nested_same_area():
 
     collect_all(outer)
     assert len(all_descendants) == 3
+
+
+# Coordinates on a coarse grid so that nesting, shared edges, duplicates and
+# zero-area boxes are all common.
+_coords = st.integers(min_value=0, max_value=12).map(float)
+
+
+@st.composite
+def _rects(draw) -> tuple[float, float, float, float]:
+    x0, x1 = sorted((draw(_coords), draw(_coords)))
+    y0, y1 = sorted((draw(_coords), draw(_coords)))
+    return (x0, y0, x1, y1)
+
+
+@settings(max_examples=300)
+@given(st.lists(_rects(), min_size=1, max_size=80))
+def test_indexed_parents_match_brute_force(rects):
+    """The grid-indexed search must pick exactly the same parents."""
+    assert _find_parents_indexed(rects) == _find_parents_brute_force(rects)
+
+
+def test_build_hierarchy_large_page_matches_brute_force():
+    """Test a page large enough to use the indexed builder."""
+    blocks = [Drawing(bbox=BBox(0, 0, 1000, 1000), id=0)]
+    for i in range(10):
+        for j in range(10):
+            x, y = i * 100, j * 100
+            blocks.append(Drawing(bbox=BBox(x, y, x + 90, y + 90), id=len(blocks)))
+            blocks.append(
+                Text(bbox=BBox(x + 5, y + 5, x + 20, y + 20), text="1", id=len(blocks))
+            )
+            # Duplicate of the text, to exercise the identical-bbox rule
+            blocks.append(
+                Text(bbox=BBox(x + 5, y + 5, x + 20, y + 20), text="1", id=len(blocks))
+            )
+
+    tree = build_hierarchy_from_blocks(blocks)
+
+    rects = [(b.bbox.x0, b.bbox.y0, b.bbox.x1, b.bbox.y1) for b in blocks]
+    expected = _find_parents_brute_force(rects)
+    for block, parent_idx in zip(blocks, expected, strict=True):
+        expected_parent = blocks[parent_idx] if parent_idx is not None else None
+        assert tree.get_parent(block) is expected_parent
+
+    assert tree.roots == [blocks[0]]
+    assert tree.get_depth(blocks[1]) == 1
+    assert tree.get_depth(blocks[2]) == 2
+    assert tree.get_depth(blocks[3]) == 2
@@ -26,7 +26,10 @@ from pydantic import (
 )
 
 from build_a_long.pdf_extract.extractor.bbox import BBox
-from build_a_long.pdf_extract.extractor.drawing_utils import convert_drawing_items
+from build_a_long.pdf_extract.extractor.drawing_utils import (
+    PathItems,
+    convert_drawing_items,
+)
 from build_a_long.pdf_extract.extractor.pymupdf_types import (
     DrawingDict,
     ImageInfoDict,
@@ -53,9 +56,15 @@ class Block(SerializationMixin, BaseModel, ABC):
     - Every block must have a unique ID assigned by the Extractor.
     - Subclasses are small data holders.
 
-    Blocks are frozen (immutable) and hashable based on field values,
-    allowing use as dict keys. Two blocks with identical field values
-    are considered equal.
+    Blocks are frozen (immutable) and hashable, allowing use as dict keys.
+    Two blocks with identical field values are considered equal.
+
+    Blocks are used as dict keys and set members throughout classification,
+    so hashing and comparing them is kept cheap: since ids are unique per
+    page, the hash only covers the id and bbox (both part of equality, so
+    equal blocks still hash alike), and blocks with different ids are
+    unequal without comparing their other fields (such as large drawing
+    paths).
     """
 
     model_config = ConfigDict(
@@ -75,6 +84,17 @@ class Block(SerializationMixin, BaseModel, ABC):
     in bboxlog).
     """
 
+    def __hash__(self) -> int:
+        bbox = self.bbox
+        return hash((self.id, bbox.x0, bbox.y0, bbox.x1, bbox.y1))
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, Block) and self.id != other.id:
+            return False
+        return super().__eq__(other)
+
 
 class Drawing(Block):
     """A vector drawing block on the page.
@@ -93,7 +113,7 @@ class Drawing(Block):
     path_type: str | None = None  # path type: "f", "s", "fs", "clip", "group"
     dashes: str | None = None  # dashed line specification
     even_odd: bool | None = None  # fill behavior for overlaps
-    items: tuple[tuple, ...] | None = None  # list of draw commands
+    items: PathItems | None = None  # draw commands (see PathItems)
     original_bbox: BBox | None = None  # original bbox before clipping (only if clipped)
 
     model_config = ConfigDict(frozen=True, populate_by_name=True)
@@ -140,11 +160,12 @@ class Drawing(Block):
             ValueError: If the drawing has no 'rect' field
         """
         drect = d.get("rect")
-        if not drect:
+        # An all-zero rect is falsy; checked on the bbox since pymupdf's
+        # Rect.__bool__ is slow
+        nbbox = BBox.from_rect(drect) if drect is not None else None
+        if nbbox is None or not (nbbox.x0 or nbbox.y0 or nbbox.x1 or nbbox.y1):
             raise ValueError("Drawing has no 'rect' field")
 
-        nbbox = BBox.from_rect(drect)
-
         # Extract additional metadata if requested
         fill_color: tuple[float, ...] | None = None
         stroke_color: tuple[float, ...] | None = None
@@ -154,7 +175,7 @@ class Drawing(Block):
         path_type: str | None = None
         dashes: str | None = None
         even_odd: bool | None = None
-        items: tuple[tuple, ...] | None = None
+        items: PathItems | None = None
 
         if include_metadata:
             fill_color = d.get("fill")
@@ -165,7 +186,7 @@ class Drawing(Block):
             path_type = d.get("type")
             dashes = d.get("dashes")
             even_odd = d.get("even_odd")
-            # Convert PyMuPDF objects to tuples for JSON serialization
+            # Pack PyMuPDF objects into compact path items
             items = convert_drawing_items(d.get("items"))
 
         # Get draw order directly from seqno (corresponds to bboxlog index)
@@ -196,6 +217,26 @@ class Drawing(Block):
         return f"Drawing(bbox={str(self.bbox)})"
 
 
+def texttrace_span_text(span: TexttraceSpanDict) -> str:
+    """Assemble the text of a PyMuPDF texttrace span from its chars.
+
+    Each char is a (unicode, glyph_id, origin, bbox) tuple.
+    """
+    return "".join(chr(c[0]) for c in span.get("chars", []))
+
+
+def span_dict_text(span: SpanDict) -> str:
+    """Return the text of a PyMuPDF dict or rawdict span.
+
+    'dict' spans have a 'text' field with the string directly, while
+    'rawdict' spans have a 'chars' list of character dicts, each with the
+    character in 'c'.
+    """
+    if "text" in span:
+        return span.get("text", "")
+    return "".join(c.get("c", "") for c in span.get("chars", []))
+
+
 class Text(Block):
     """A text block on the page.
 
@@ -240,10 +281,7 @@ class Text(Block):
 
         nbbox = BBox.from_tuple(bbox)
 
-        # Assemble text from chars array
-        # Each char is (unicode, glyph_id, origin, bbox)
-        chars = span.get("chars", [])
-        text = "".join(chr(c[0]) for c in chars)
+        text = texttrace_span_text(span)
 
         font_size: float | None = span.get("size")
         font_name: str | None = span.get("font")
@@ -269,6 +307,7 @@ class Text(Block):
             ascender = span.get("ascender")
             descender = span.get("descender")
             # Get origin from first char if available
+            chars = span.get("chars", [])
             if chars:
                 origin = chars[0][2]  # origin is 3rd element of char tuple
 
@@ -319,15 +358,7 @@ class Text(Block):
 
         nbbox = BBox.from_tuple(bbox)
 
-        # Handle both dict (has 'text') and rawdict (has 'chars') formats
-        if "text" in span:
-            # dict format: text is directly available
-            text = span.get("text", "")
-        else:
-            # rawdict format: assemble text from chars array
-            # Each char dict has 'c' for the character, 'origin', and 'bbox'
-            chars = span.get("chars", [])
-            text = "".join(c.get("c", "") for c in chars)
+        text = span_dict_text(span)
 
         font_size: float | None = span.get("size")
         font_name: str | None = span.get("font")
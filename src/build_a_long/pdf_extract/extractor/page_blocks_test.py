@@ -9,6 +9,9 @@ from build_a_long.pdf_extract.extractor.lego_page_elements import (
 )
 from build_a_long.pdf_extract.extractor.page_blocks import (
     Drawing,
+    Text,
+    span_dict_text,
+    texttrace_span_text,
 )
 
 
@@ -68,3 +71,65 @@ def test_drawing_is_clipped_property():
     # Verify the bboxes are indeed different
     assert clipped.bbox != clipped.original_bbox
     assert unclipped.bbox == unclipped.original_bbox
+
+
+def test_drawing_items_from_json_are_hashable():
+    """Drawings loaded from JSON equal (and hash like) freshly extracted ones."""
+    drawing = Drawing(
+        bbox=BBox(0, 0, 10, 10),
+        id=1,
+        items=(("re", (0.0, 0.0, 10.0, 10.0), 1), ("l", (0.0, 0.0), (10.0, 10.0))),
+    )
+    loaded = Drawing.model_validate_json(drawing.model_dump_json(by_alias=True))
+
+    assert loaded == drawing
+    assert hash(loaded) == hash(drawing)
+
+
+def test_drawing_json_schema():
+    """Drawing items are described as the nested arrays stored in JSON."""
+    items_schema = {"type": "array", "items": {"type": "array", "items": {}}}
+    for mode in ("validation", "serialization"):
+        schema = Drawing.model_json_schema(mode=mode)
+        assert items_schema in schema["properties"]["items"]["anyOf"]
+
+
+def test_block_equality_and_hash():
+    """Blocks hash by id and bbox but still compare every field."""
+    items = (("l", (0.0, 0.0), (10.0, 10.0)),)
+    drawing = Drawing(bbox=BBox(0, 0, 10, 10), id=1, items=items)
+    copy = drawing.model_copy()
+    recolored = drawing.model_copy(update={"fill_color": (1.0, 0.0, 0.0)})
+    renumbered = drawing.model_copy(update={"id": 2})
+
+    assert copy == drawing
+    assert hash(copy) == hash(drawing)
+    assert recolored != drawing
+    assert renumbered != drawing
+    assert drawing in {copy}
+    assert recolored not in {drawing: None}
+
+
+def test_span_text_from_dict_and_rawdict():
+    """dict spans carry their text; rawdict spans spell it out in chars."""
+    bbox = (0.0, 0.0, 10.0, 10.0)
+    dict_span = {"bbox": bbox, "text": "12x"}
+    rawdict_span = {"bbox": bbox, "chars": [{"c": "1"}, {"c": "2"}, {"c": "x"}]}
+
+    assert span_dict_text(dict_span) == "12x"  # type: ignore[arg-type]
+    assert span_dict_text(rawdict_span) == "12x"  # type: ignore[arg-type]
+    assert span_dict_text({"bbox": bbox}) == ""  # type: ignore[arg-type]
+    assert Text.from_span_dict(rawdict_span, 1).text == "12x"  # type: ignore[arg-type]
+
+
+def test_span_text_from_texttrace():
+    """texttrace chars are (unicode, glyph, origin, bbox) tuples."""
+    origin = (0.0, 10.0)
+    char_bbox = (0.0, 0.0, 5.0, 10.0)
+    span = {
+        "bbox": (0.0, 0.0, 10.0, 10.0),
+        "chars": [(ord("4"), 1, origin, char_bbox), (ord("x"), 2, origin, char_bbox)],
+    }
+
+    assert texttrace_span_text(span) == "4x"  # type: ignore[arg-type]
+    assert Text.from_texttrace_span(span, 1).text == "4x"  # type: ignore[arg-type]
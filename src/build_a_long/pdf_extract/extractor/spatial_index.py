@@ -0,0 +1,384 @@
+"""Spatial indexing helpers for bbox-heavy page computations.
+
+Most per-page geometry questions ("which blocks overlap this one?", "which
+blocks are connected through overlaps?") are naively answered by comparing
+every pair of blocks. On dense pages with thousands of blocks that quickly
+dominates classification time. The helpers here bucket bboxes into a uniform
+grid so each query only compares against nearby blocks, or sweep across the
+page so only boxes that share an x range are compared.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from build_a_long.pdf_extract.extractor.bbox import BBox, HasBBox
+
+_MAX_GRID_CELLS = 32
+"""Upper bound on grid cells per axis."""
+
+_SLACK = 1e-6
+"""Padding for candidate lookups, so rounding never drops a true match."""
+
+_LINEAR_QUERIES = 8
+"""Queries answered by scanning every item before the grid is built."""
+
+
+class SpatialGrid[T: HasBBox]:
+    """A uniform grid over a fixed set of items, for rectangle queries.
+
+    Each item is registered in every cell its bbox overlaps. A query visits
+    only the cells covered by the query rectangle, so the cost depends on the
+    number of nearby items rather than the total.
+
+    Building the grid costs several times more than one linear scan, so the
+    first few queries just scan every item and the grid is built on demand
+    once the queries add up. Pages that only ask one or two questions never
+    pay for it.
+
+    The item list is fixed at construction; items are referred to by their
+    index in `items`.
+    """
+
+    def __init__(self, items: Sequence[T], cells_per_axis: int | None = None) -> None:
+        """Index the items.
+
+        Args:
+            items: Items with a bbox attribute.
+            cells_per_axis: Grid resolution. Defaults to roughly sqrt(n),
+                capped to keep registration of large items cheap.
+        """
+        self.items: list[T] = list(items)
+        self.rects: list[tuple[float, float, float, float]] = [
+            (i.bbox.x0, i.bbox.y0, i.bbox.x1, i.bbox.y1) for i in self.items
+        ]
+        n = len(self.rects)
+        if cells_per_axis is None:
+            cells_per_axis = max(1, min(_MAX_GRID_CELLS, math.isqrt(n)))
+        self._cells = cells_per_axis
+        self._grid: list[list[int]] | None = None
+        self._linear_queries = 0
+
+    def _build_grid(self) -> list[list[int]]:
+        rects = self.rects
+        if rects:
+            self._min_x = min(r[0] for r in rects)
+            self._min_y = min(r[1] for r in rects)
+            max_x = max(r[2] for r in rects)
+            max_y = max(r[3] for r in rects)
+        else:
+            self._min_x = self._min_y = max_x = max_y = 0.0
+        self._cell_w = (max_x - self._min_x) / self._cells or 1.0
+        self._cell_h = (max_y - self._min_y) / self._cells or 1.0
+
+        # Registration is inlined since it runs once per item. Every rect
+        # lies inside the grid bounds, so only the upper clamp is needed.
+        cells, last = self._cells, self._cells - 1
+        min_x, min_y = self._min_x, self._min_y
+        cell_w, cell_h = self._cell_w, self._cell_h
+        grid: list[list[int]] = [[] for _ in range(cells * cells)]
+        for idx, (x0, y0, x1, y1) in enumerate(rects):
+            c0 = min(last, int((x0 - min_x) / cell_w))
+            c1 = min(last, int((x1 - min_x) / cell_w))
+            for row in range(
+                min(last, int((y0 - min_y) / cell_h)),
+                min(last, int((y1 - min_y) / cell_h)) + 1,
+            ):
+                base = row * cells
+                for col in range(c0, c1 + 1):
+                    grid[base + col].append(idx)
+        self._grid = grid
+        return grid
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _col(self, x: float) -> int:
+        return max(0, min(self._cells - 1, int((x - self._min_x) / self._cell_w)))
+
+    def _row(self, y: float) -> int:
+        return max(0, min(self._cells - 1, int((y - self._min_y) / self._cell_h)))
+
+    def _cells_for(self, x0: float, y0: float, x1: float, y1: float) -> list[int]:
+        c0, c1 = self._col(x0), self._col(x1)
+        return [
+            row * self._cells + col
+            for row in range(self._row(y0), self._row(y1) + 1)
+            for col in range(c0, c1 + 1)
+        ]
+
+    def candidates(self, x0: float, y0: float, x1: float, y1: float) -> set[int]:
+        """Return indices of items that may overlap the given rectangle.
+
+        This is a superset of the overlapping items; callers must still test
+        each candidate exactly.
+        """
+        grid = self._grid
+        if grid is None:
+            if self._linear_queries < _LINEAR_QUERIES:
+                self._linear_queries += 1
+                return set(range(len(self.rects)))
+            grid = self._build_grid()
+        found: set[int] = set()
+        for cell in self._cells_for(x0, y0, x1, y1):
+            found.update(grid[cell])
+        return found
+
+    def overlapping(self, bbox: BBox, margin: float = 0.0) -> list[int]:
+        """Return indices of items overlapping ``bbox`` grown by ``margin``.
+
+        Uses the same touching-counts semantics as `BBox.overlaps`. Indices are
+        returned in ascending order.
+
+        Args:
+            bbox: The query box.
+            margin: Amount to grow the query box on every side.
+        """
+        qx0, qy0 = bbox.x0 - margin, bbox.y0 - margin
+        qx1, qy1 = bbox.x1 + margin, bbox.y1 + margin
+        rects = self.rects
+        return sorted(
+            idx
+            for idx in self.candidates(qx0, qy0, qx1, qy1)
+            if max(qx0, rects[idx][0]) <= min(qx1, rects[idx][2])
+            and max(qy0, rects[idx][1]) <= min(qy1, rects[idx][3])
+        )
+
+    def neighbours(self, bbox: BBox, margin: float) -> list[int]:
+        """Return indices of items within ``margin`` of ``bbox``, both expanded.
+
+        An item is a neighbour when ``bbox.expand(margin)`` overlaps
+        ``item.bbox.expand(margin)``, i.e. the gap between them is at most
+        twice the margin. This is the usual "are these close together?" test;
+        the arithmetic matches `BBox.expand` and `BBox.overlaps` exactly, so
+        it can replace that pairwise test without changing any result.
+        Indices are returned in ascending order.
+
+        Args:
+            bbox: The query box.
+            margin: Non-negative amount both boxes are grown by.
+        """
+        qx0, qy0 = bbox.x0 - margin, bbox.y0 - margin
+        qx1, qy1 = bbox.x1 + margin, bbox.y1 + margin
+        pad = margin + _SLACK
+        rects = self.rects
+        found = []
+        for idx in self.candidates(qx0 - pad, qy0 - pad, qx1 + pad, qy1 + pad):
+            x0, y0, x1, y1 = rects[idx]
+            if max(qx0, x0 - margin) <= min(qx1, x1 + margin) and max(
+                qy0, y0 - margin
+            ) <= min(qy1, y1 + margin):
+                found.append(idx)
+        found.sort()
+        return found
+
+
+def proximity_groups[T: HasBBox](items: Sequence[T], margin: float) -> list[list[T]]:
+    """Group items that are connected through `SpatialGrid.neighbours`.
+
+    Two items belong to the same group when a chain of items links them, each
+    within ``margin`` of the next (both boxes expanded by ``margin``).
+
+    Args:
+        items: Items with a bbox attribute.
+        margin: Non-negative amount both boxes are grown by.
+
+    Returns:
+        The groups, ordered by their first item, with items in input order.
+    """
+    grid = SpatialGrid(items)
+    group_of: list[int | None] = [None] * len(grid)
+    groups: list[list[int]] = []
+    for start in range(len(grid)):
+        if group_of[start] is not None:
+            continue
+        group_of[start] = len(groups)
+        members = [start]
+        stack = [start]
+        while stack:
+            for j in grid.neighbours(grid.items[stack.pop()].bbox, margin):
+                if group_of[j] is None:
+                    group_of[j] = len(groups)
+                    members.append(j)
+                    stack.append(j)
+        groups.append(sorted(members))
+    return [[grid.items[i] for i in group] for group in groups]
+
+
+def overlapping_pairs[T: HasBBox](
+    items: Sequence[T], others: Sequence[T] | None = None
+) -> list[tuple[int, int]]:
+    """Find the pairs of items whose bboxes overlap, with a sweep line.
+
+    Boxes are visited in order of their left edge while an "active" list
+    holds those whose right edge has not been passed yet, so each box is
+    only compared with boxes that overlap it horizontally. Overlap is
+    `BBox.overlaps`: touching edges count.
+
+    Args:
+        items: Items with a bbox attribute.
+        others: If given, pair ``items`` with ``others`` instead of with
+            each other.
+
+    Returns:
+        Sorted index pairs: ``(i, j)`` with ``i < j`` into ``items``, or
+        ``(i, j)`` into ``items`` and ``others``. That is the order a nested
+        loop over the inputs would find them in.
+    """
+    # Tag each box with the input it came from: 0 for items, 1 for others
+    boxes = [(item.bbox, 0, i) for i, item in enumerate(items)]
+    if others is not None:
+        boxes.extend((item.bbox, 1, j) for j, item in enumerate(others))
+    boxes.sort(key=lambda box: box[0].x0)
+
+    pairs: list[tuple[int, int]] = []
+    active: list[tuple[BBox, int, int]] = []
+    for box in boxes:
+        bbox, side, index = box
+        active = [a for a in active if a[0].x1 >= bbox.x0]
+        for a_bbox, a_side, a_index in active:
+            if others is not None and a_side == side:
+                continue
+            if max(bbox.y0, a_bbox.y0) <= min(bbox.y1, a_bbox.y1):
+                if others is not None:
+                    pairs.append((index, a_index) if side == 0 else (a_index, index))
+                else:
+                    pairs.append(
+                        (index, a_index) if index < a_index else (a_index, index)
+                    )
+        active.append(box)
+    pairs.sort()
+    return pairs
+
+
+class OverlapGraph[T: HasBBox]:
+    """Connectivity of items whose tolerance-expanded bboxes overlap.
+
+    Two items are adjacent when one's bbox overlaps the other's bbox expanded
+    by `tolerance` (the relation `build_connected_cluster` uses). The items
+    are indexed once in a `SpatialGrid`; connected sets are then found by
+    flood fill over the grid, where each step only tests nearby items that
+    have not been reached yet. That keeps both sparse pages (many small
+    clusters) and dense ones (one big blob of overlapping images) close to
+    linear.
+
+    - `components()` returns every component; it is computed on first use
+      and cached.
+    - `cluster()` answers "which items are connected to this seed, using only
+      items that are still available (e.g. unconsumed, inside a constraint
+      bbox)?".
+
+    Because availability is a predicate evaluated at query time, queries stay
+    correct as blocks are consumed or released (for example on build
+    rollback) without rebuilding the index.
+    """
+
+    def __init__(self, items: Sequence[T], *, tolerance: float = 1e-6) -> None:
+        """Index the items.
+
+        Args:
+            items: Items with a bbox attribute.
+            tolerance: Amount to expand bboxes before checking overlap.
+        """
+        self.tolerance = tolerance
+        self._grid = SpatialGrid(items)
+        self.items: list[T] = self._grid.items
+        self._index_of: dict[int, int] = {
+            id(item): i for i, item in enumerate(self.items)
+        }
+        self._components: list[list[int]] | None = None
+
+    def _walk(
+        self, start: int, visited: set[int], ok: Callable[[int], bool] | None
+    ) -> list[int]:
+        """Flood fill from ``start``, adding reached indices to ``visited``."""
+        rects = self._grid.rects
+        t = self.tolerance
+        rejected: set[int] = set()
+        reached = [start]
+        visited.add(start)
+        stack = [start]
+        n = len(rects)
+        # Stop as soon as every item is decided, which is common on pages
+        # where a page-sized image overlaps everything.
+        while stack and len(visited) + len(rejected) < n:
+            ax0, ay0, ax1, ay1 = rects[stack.pop()]
+            ex0, ey0, ex1, ey1 = ax0 - t, ay0 - t, ax1 + t, ay1 + t
+            nearby = self._grid.candidates(ex0, ey0, ex1, ey1)
+            nearby -= visited
+            nearby -= rejected
+            for j in nearby:
+                bx0, by0, bx1, by1 = rects[j]
+                # Test both directions so the relation is symmetric even when
+                # floating point rounding of the expansion differs.
+                if not (
+                    (max(bx0, ex0) <= min(bx1, ex1) and max(by0, ey0) <= min(by1, ey1))
+                    or (
+                        max(ax0, bx0 - t) <= min(ax1, bx1 + t)
+                        and max(ay0, by0 - t) <= min(ay1, by1 + t)
+                    )
+                ):
+                    continue
+                if ok is not None and not ok(j):
+                    rejected.add(j)
+                    continue
+                visited.add(j)
+                reached.append(j)
+                stack.append(j)
+        return sorted(reached)
+
+    def index_of(self, item: T) -> int | None:
+        """Return the index of ``item`` (by identity), or None if not indexed."""
+        return self._index_of.get(id(item))
+
+    def components(self) -> list[list[T]]:
+        """Return all connected components.
+
+        Components are ordered by their first item, and items within a
+        component keep their input order.
+        """
+        if self._components is None:
+            visited: set[int] = set()
+            self._components = [
+                self._walk(i, visited, None)
+                for i in range(len(self.items))
+                if i not in visited
+            ]
+        return [[self.items[i] for i in c] for c in self._components]
+
+    def cluster(
+        self,
+        seed: T,
+        *,
+        available: Callable[[T], bool] | None = None,
+        within: BBox | None = None,
+    ) -> list[T]:
+        """Return items connected to ``seed`` through available items only.
+
+        Args:
+            seed: The item to start from. Must be one of the indexed items.
+            available: Optional predicate; items for which it returns False
+                are treated as absent (neither included nor traversed).
+            within: Optional constraint; only items whose bbox is fully
+                contained in it are included or traversed.
+
+        Returns:
+            The connected items (including the seed) in input order, or an
+            empty list if the seed itself is unavailable.
+        """
+        ok: Callable[[int], bool] | None = None
+        if available is not None or within is not None:
+
+            def ok(i: int) -> bool:
+                item = self.items[i]
+                if within is not None and not within.contains(item.bbox):
+                    return False
+                return available is None or available(item)
+
+        start = self._index_of[id(seed)]
+        if ok is not None and not ok(start):
+            return []
+        return [self.items[i] for i in self._walk(start, set(), ok)]
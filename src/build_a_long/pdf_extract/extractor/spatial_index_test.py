@@ -0,0 +1,192 @@
+from dataclasses import dataclass
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from build_a_long.pdf_extract.extractor.bbox import BBox
+from build_a_long.pdf_extract.extractor.spatial_index import (
+    OverlapGraph,
+    SpatialGrid,
+    overlapping_pairs,
+    proximity_groups,
+)
+
+
+@dataclass(eq=False)
+class _Item:
+    bbox: BBox
+
+
+def _reference_cluster(
+    seed: int, items: list[_Item], available: set[int], tolerance: float
+) -> list[int]:
+    """The original quadratic flood fill, over indices."""
+    if seed not in available:
+        return []
+    remaining = set(available) - {seed}
+    cluster = {seed}
+    to_process = [seed]
+    while to_process:
+        current = items[to_process.pop()].bbox.expand(tolerance)
+        for idx in list(remaining):
+            if items[idx].bbox.overlaps(current):
+                cluster.add(idx)
+                to_process.append(idx)
+                remaining.discard(idx)
+    return sorted(cluster)
+
+
+# Coordinates on a coarse grid so that touching edges, duplicates and
+# zero-area boxes are all common.
+_coords = st.integers(min_value=0, max_value=20).map(float)
+
+
+@st.composite
+def _items(draw) -> _Item:
+    x0, x1 = sorted((draw(_coords), draw(_coords)))
+    y0, y1 = sorted((draw(_coords), draw(_coords)))
+    return _Item(BBox(x0, y0, x1, y1))
+
+
+def test_grid_overlapping_matches_bbox_overlaps():
+    items = [_Item(BBox(i * 10, 0, i * 10 + 5, 5)) for i in range(20)]
+    grid = SpatialGrid(items)
+    query = BBox(12, 1, 31, 2)
+    assert grid.overlapping(query) == [
+        i for i, item in enumerate(items) if item.bbox.overlaps(query)
+    ]
+    assert grid.overlapping(query, margin=5) == [
+        i for i, item in enumerate(items) if item.bbox.overlaps(query.expand(5))
+    ]
+
+
+def test_grid_empty():
+    grid = SpatialGrid([])
+    assert len(grid) == 0
+    assert grid.overlapping(BBox(0, 0, 10, 10)) == []
+
+
+@settings(max_examples=200)
+@given(st.lists(_items(), min_size=1, max_size=60))
+def test_components_match_reference(items):
+    graph = OverlapGraph(items)
+    all_indices = set(range(len(items)))
+    expected: list[list[int]] = []
+    seen: set[int] = set()
+    for i in range(len(items)):
+        if i not in seen:
+            component = _reference_cluster(i, items, all_indices, 1e-6)
+            seen.update(component)
+            expected.append(component)
+
+    assert graph.components() == [[items[i] for i in c] for c in expected]
+
+
+@settings(max_examples=200)
+@given(
+    st.lists(_items(), min_size=1, max_size=60),
+    st.data(),
+)
+def test_cluster_with_availability_matches_reference(items, data):
+    """Restricting the walk to available items must match filtering first."""
+    graph = OverlapGraph(items, tolerance=0.5)
+    consumed = data.draw(st.sets(st.integers(0, len(items) - 1)))
+    within = data.draw(st.none() | _items().map(lambda item: item.bbox))
+    seed = data.draw(st.integers(0, len(items) - 1))
+
+    available = {
+        i
+        for i in range(len(items))
+        if i not in consumed and (within is None or within.contains(items[i].bbox))
+    }
+    expected = _reference_cluster(seed, items, available, 0.5)
+
+    cluster = graph.cluster(
+        items[seed],
+        available=lambda item: items.index(item) not in consumed,
+        within=within,
+    )
+    assert cluster == [items[i] for i in expected]
+
+
+def test_cluster_reflects_changes_in_availability():
+    """The same graph answers correctly as items are consumed and released."""
+    items = [_Item(BBox(i * 10, 0, i * 10 + 10, 10)) for i in range(5)]
+    graph = OverlapGraph(items)
+    consumed: set[int] = set()
+
+    def available(item: _Item) -> bool:
+        return items.index(item) not in consumed
+
+    assert graph.cluster(items[0], available=available) == items
+
+    consumed.add(2)
+    assert graph.cluster(items[0], available=available) == items[:2]
+    assert graph.cluster(items[4], available=available) == items[3:]
+    assert graph.cluster(items[2], available=available) == []
+
+    consumed.clear()
+    assert graph.cluster(items[4], available=available) == items
+
+
+@settings(max_examples=200)
+@given(
+    st.lists(_items(), max_size=60),
+    _items(),
+    st.sampled_from([0.0, 0.5, 1.0, 3.0]),
+)
+def test_neighbours_match_expanded_overlap(items, query, margin):
+    grid = SpatialGrid(items)
+    expanded = query.bbox.expand(margin)
+    assert grid.neighbours(query.bbox, margin) == [
+        i for i, item in enumerate(items) if item.bbox.expand(margin).overlaps(expanded)
+    ]
+
+
+def _reference_groups(items: list[_Item], margin: float) -> list[list[int]]:
+    """Pairwise union-find grouping, as TriviaTextClassifier used to do."""
+    parent = list(range(len(items)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            x = parent[x]
+        return x
+
+    for i in range(len(items)):
+        for j in range(i + 1, len(items)):
+            if items[i].bbox.expand(margin).overlaps(items[j].bbox.expand(margin)):
+                parent[find(i)] = find(j)
+    groups: dict[int, list[int]] = {}
+    for i in range(len(items)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+@settings(max_examples=200)
+@given(st.lists(_items(), max_size=60), st.sampled_from([0.0, 0.5, 2.0]))
+def test_proximity_groups_match_reference(items, margin):
+    assert proximity_groups(items, margin) == [
+        [items[i] for i in group] for group in _reference_groups(items, margin)
+    ]
+
+
+@settings(max_examples=200, deadline=None)
+@given(st.lists(_items(), max_size=60))
+def test_overlapping_pairs_match_nested_loop(items):
+    assert overlapping_pairs(items) == [
+        (i, j)
+        for i in range(len(items))
+        for j in range(i + 1, len(items))
+        if items[i].bbox.overlaps(items[j].bbox)
+    ]
+
+
+@settings(max_examples=200, deadline=None)
+@given(st.lists(_items(), max_size=30), st.lists(_items(), max_size=30))
+def test_overlapping_pairs_between_two_lists(items, others):
+    assert overlapping_pairs(items, others) == [
+        (i, j)
+        for i in range(len(items))
+        for j in range(len(others))
+        if items[i].bbox.overlaps(others[j].bbox)
+    ]
@@ -11,6 +11,8 @@ from pathlib import Path
 from build_a_long.pdf_extract.classifier.classifier_config import ClassifierConfig
 from build_a_long.pdf_extract.classifier.pages import PageHintCollection
 from build_a_long.pdf_extract.classifier.text import FontSizeHints
+from build_a_long.pdf_extract.cli.io import cached_extraction
+from build_a_long.pdf_extract.extractor import ExtractionResult
 
 # Base directory containing all fixture files
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
@@ -56,6 +58,21 @@ def extract_element_id(fixture_file: str) -> str:
     return match.group(1)
 
 
+def load_raw_fixture(fixture_file: str) -> ExtractionResult:
+    """Load a raw fixture (e.g. '6509377_page_013_raw.json' or a .json.bz2).
+
+    Loads are cached per process (see `cached_extraction`), so tests that
+    load the same fixture share one parse. The result must not be modified.
+
+    Args:
+        fixture_file: Name of the fixture file in FIXTURES_DIR.
+
+    Returns:
+        The fixture's ExtractionResult.
+    """
+    return cached_extraction(FIXTURES_DIR / fixture_file)
+
+
 def load_font_hints(element_id: str) -> FontSizeHints:
     """Load font size hints from a fixture file.
 
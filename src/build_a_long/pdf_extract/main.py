@@ -4,26 +4,32 @@ import hashlib
 import logging
 import os
 import time
+from contextlib import ExitStack, nullcontext
 from pathlib import Path
 
 import pymupdf
 
 from build_a_long.pdf_extract.classifier import (
+    ClassificationResult,
     FontSizeHints,
     classify_elements,
     classify_pages,
 )
 from build_a_long.pdf_extract.cli import (
+    ManualJsonWriter,
     ProcessingConfig,
     parse_arguments,
     print_classification_debug,
+    print_classification_stats,
     print_font_hints,
     print_histogram,
     render_annotated_images,
+    save_classification_stats,
     save_debug_json,
-    save_manual_json,
+    save_decision_traces,
     save_raw_json,
 )
+from build_a_long.pdf_extract.cli.profiling import StageProfiler
 from build_a_long.pdf_extract.cli.reporting import (
     build_and_print_page_hierarchy,
     print_summary,
@@ -35,12 +41,15 @@ from build_a_long.pdf_extract.extractor.extractor import (
     ExtractionResult,
     Extractor,
     PageData,
+    PageText,
 )
+from build_a_long.pdf_extract.extractor.lego_page_elements import Manual
 from build_a_long.pdf_extract.extractor.page_blocks import Image
 from build_a_long.pdf_extract.parser import parse_page_ranges
 from build_a_long.pdf_extract.parser.page_ranges import PageRanges
+from build_a_long.pdf_extract.validation.page_cache import PageValidationCache
 from build_a_long.pdf_extract.validation.printer import print_validation
-from build_a_long.pdf_extract.validation.runner import validate_results
+from build_a_long.pdf_extract.validation.runner import DocumentValidator
 
 logger = logging.getLogger(__name__)
 
@@ -92,12 +101,15 @@ def _load_json_pages(json_path: Path) -> list:
     return extraction.pages
 
 
-def _parse_page_selection(pages_arg: str | None, doc_length: int) -> PageRanges | None:
+def _parse_page_selection(
+    pages_arg: str | None, doc_length: int, flag: str = "--pages"
+) -> PageRanges | None:
     """Parse page ranges from arguments.
 
     Args:
         pages_arg: Page range string from command line (e.g., "5-10,15")
         doc_length: Total number of pages in the document
+        flag: The option the ranges came from, for error messages
 
     Returns:
         PageRanges object or None if parsing failed
@@ -108,7 +120,7 @@ def _parse_page_selection(pages_arg: str | None, doc_length: int) -> PageRanges
     try:
         return parse_page_ranges(pages_arg)
     except ValueError as e:
-        logger.error("Invalid --pages: %s", e)
+        logger.error("Invalid %s: %s", flag, e)
         return None
 
 
@@ -170,49 +182,65 @@ def _process_pdf(config: ProcessingConfig, pdf_path: Path, output_dir: Path) ->
         source_hash = hashlib.file_digest(f, "sha256").hexdigest()
 
     # Extract and classify
-    with pymupdf.open(str(pdf_path)) as doc:
+    with ExitStack() as stack:
+        doc = stack.enter_context(pymupdf.open(str(pdf_path)))
         page_ranges = _parse_page_selection(config.page_ranges, len(doc))
         if page_ranges is None:
             return 2
 
+        profile_pages = None
+        if config.profile_pages is not None:
+            profile_ranges = _parse_page_selection(
+                config.profile_pages, len(doc), "--profile-pages"
+            )
+            if profile_ranges is None:
+                return 2
+            profile_pages = set(profile_ranges.page_numbers(len(doc)))
+        profiler = stack.enter_context(
+            StageProfiler(
+                config.profile,  # type: ignore[arg-type]
+                output_dir,
+                pdf_path,
+                pages=profile_pages,
+                top=config.profile_top,
+            )
+        )
+
         # Log which PDF and pages we're processing in a single line
         print(f"Processing: {pdf_path} (pages: {page_ranges})")
 
         page_numbers = list(page_ranges.page_numbers(len(doc)))
 
         # Extract data from all pages in a single pass
-        # - For hint pages (all pages): extract text only
+        # - For hint pages (all pages): extract span text, font and bbox only
         # - For requested pages: extract all types with metadata
-        # This approach reuses the TextPage cache within each Extractor
         logger.debug("Extracting page data...")
 
-        full_document_text_pages: list[PageData] = []
+        full_document_text_pages: list[PageText] = []
         requested_pages_with_all_blocks: list[PageData] = []
         requested_pages_set = set(page_numbers)
 
-        for page_index in range(len(doc)):
-            page_num = page_index + 1  # 1-indexed
-            page = doc[page_index]
+        with profiler.stage("extraction"):
+            for page_index in range(len(doc)):
+                page_num = page_index + 1  # 1-indexed
+                page = doc[page_index]
 
-            # Create Extractor for this page (caches TextPage internally)
-            extractor = Extractor(
-                page=page,
-                page_num=page_num,
-                include_metadata=(page_num in requested_pages_set),
-            )
+                extractor = Extractor(
+                    page=page,
+                    page_num=page_num,
+                    include_metadata=(page_num in requested_pages_set),
+                )
 
-            # Always extract text for hints (all pages need this)
-            text_page_data = extractor.extract_page_data(include_types={"text"})
-            full_document_text_pages.append(text_page_data)
+                # Always extract text for hints (all pages need this). This
+                # builds no blocks, so block IDs still start at 0 below.
+                full_document_text_pages.append(extractor.extract_page_text())
 
-            # For requested pages, also extract full data
-            # The TextPage is already cached, so text extraction is reused
-            if page_num in requested_pages_set:
-                extractor.reset_ids()  # Reset IDs for fresh extraction
-                full_page_data = extractor.extract_page_data(
-                    include_types=config.include_types
-                )
-                requested_pages_with_all_blocks.append(full_page_data)
+                # For requested pages, also extract full data
+                if page_num in requested_pages_set:
+                    full_page_data = extractor.extract_page_data(
+                        include_types=config.include_types
+                    )
+                    requested_pages_with_all_blocks.append(full_page_data)
 
         logger.debug("Finished extracting page data.")
 
@@ -225,13 +253,14 @@ def _process_pdf(config: ProcessingConfig, pdf_path: Path, output_dir: Path) ->
             # When specific pages are requested, save one file per page
             # Otherwise save all pages in a single file
             per_page = config.page_ranges is not None and config.page_ranges != "all"
-            save_raw_json(
-                pages,
-                output_dir,
-                pdf_path,
-                compress=config.compress_json,
-                per_page=per_page,
-            )
+            with profiler.stage("output"):
+                save_raw_json(
+                    pages,
+                    output_dir,
+                    pdf_path,
+                    compress=config.compress_json,
+                    per_page=per_page,
+                )
 
         # Check if we need classification at all
         needs_classification = (
@@ -245,6 +274,7 @@ def _process_pdf(config: ProcessingConfig, pdf_path: Path, output_dir: Path) ->
             or config.debug_candidates
             or config.print_histogram
             or config.print_font_hints
+            or config.instrument
         )
 
         if not needs_classification:
@@ -272,20 +302,73 @@ def _process_pdf(config: ProcessingConfig, pdf_path: Path, output_dir: Path) ->
             )  # Use text-only pages for hints
             print_font_hints(font_hints)
 
+        # Validate and write the Manual JSON page by page as pages are
+        # classified, so neither needs every page held at once.
+        validation_cache = (
+            PageValidationCache(config.validation_cache_dir / f"{source_hash}.json")
+            if config.validation_cache_dir is not None
+            else None
+        )
+        validator = DocumentValidator(cache=validation_cache)
+        manual_writer = (
+            ManualJsonWriter(
+                Manual(
+                    source_pdf=pdf_path.name,
+                    source_size=source_size,
+                    source_hash=source_hash,
+                ),
+                output_dir,
+                pdf_path,
+            )
+            if config.save_json
+            else None
+        )
+
+        def on_result(result: ClassificationResult) -> None:
+            with profiler.stage("validation"):
+                validator.add(result)
+            if manual_writer is not None and result.page is not None:
+                with profiler.stage("output"):
+                    manual_writer.write_page(result.page)
+
         # Classify elements (use full_document_text_pages for hints, but only
         # classify selected pages)
-        batch_result = classify_pages(pages, pages_for_hints=full_document_text_pages)
+        with manual_writer or nullcontext(), profiler.stage("classification"):
+            batch_result = classify_pages(
+                pages,
+                pages_for_hints=full_document_text_pages,
+                instrument=config.instrument,
+                trace=config.debug_classification,
+                compact=config.compact_results,
+                on_result=on_result,
+                page_context=profiler.page,
+            )
+
+        if batch_result.stats is not None:
+            if config.classifier_stats:
+                print_classification_stats(batch_result.stats)
+            if config.classifier_stats_format is not None:
+                save_classification_stats(
+                    batch_result.stats,
+                    output_dir,
+                    pdf_path,
+                    trace=config.classifier_stats_format == "trace",
+                )
 
         # Extract page_data from results for compatibility
         classified_pages = [result.page_data for result in batch_result.results]
 
+        if config.debug_classification:
+            save_decision_traces(batch_result.results, output_dir, pdf_path)
+
         # Save debug classification JSON if requested
         if config.save_debug_json:
-            save_debug_json(
-                batch_result.results,
-                output_dir,
-                pdf_path,
-            )
+            with profiler.stage("output"):
+                save_debug_json(
+                    batch_result.results,
+                    output_dir,
+                    pdf_path,
+                )
 
         _print_debug_output(
             config,
@@ -302,20 +385,25 @@ def _process_pdf(config: ProcessingConfig, pdf_path: Path, output_dir: Path) ->
                 detailed=config.summary_detailed,
             )
 
-        # Run validation checks
-        validation = validate_results(batch_result)
+        # Report validation checks
+        with profiler.stage("validation"):
+            validation = validator.finish()
         print_validation(validation)
+        if validation_cache is not None:
+            validation_cache.save()
+            logger.info(
+                "Validation cache: %d pages reused, %d validated",
+                validation_cache.hits,
+                validation_cache.misses,
+            )
 
-        # Save classified Manual JSON
-        if config.save_json:
-            manual = batch_result.manual
-            manual.source_pdf = pdf_path.name
-            manual.source_size = source_size
-            manual.source_hash = source_hash
-
-            output_path = save_manual_json(manual, output_dir, pdf_path)
+        # The classified Manual JSON was written during classification
+        if manual_writer is not None:
             elapsed = time.monotonic() - start_time
-            print(f"Classification finished saved: {output_path} (took {elapsed:.1f}s)")
+            print(
+                f"Classification finished saved: {manual_writer.path} "
+                f"(took {elapsed:.1f}s)"
+            )
 
         if (
             config.draw_blocks
@@ -323,18 +411,22 @@ def _process_pdf(config: ProcessingConfig, pdf_path: Path, output_dir: Path) ->
             or config.draw_drawings
             or config.draw_unconsumed
         ):
-            render_annotated_images(
-                doc,
-                batch_result.results,
-                output_dir,
-                pdf_path,
-                draw_blocks=config.draw_blocks,
-                draw_elements=config.draw_elements,
-                draw_deleted=config.draw_deleted,
-                draw_drawings=config.draw_drawings,
-                draw_unconsumed=config.draw_unconsumed,
-                debug_candidates_label=config.debug_candidates_label,
-            )
+            with profiler.stage("output"):
+                render_annotated_images(
+                    doc,
+                    batch_result.results,
+                    output_dir,
+                    pdf_path,
+                    draw_blocks=config.draw_blocks,
+                    draw_elements=config.draw_elements,
+                    draw_deleted=config.draw_deleted,
+                    draw_drawings=config.draw_drawings,
+                    draw_unconsumed=config.draw_unconsumed,
+                    debug_candidates_label=config.debug_candidates_label,
+                    workers=config.render_workers,
+                    raster_cache_dir=config.raster_cache_dir,
+                    pdf_hash=source_hash,
+                )
 
     return 0
 
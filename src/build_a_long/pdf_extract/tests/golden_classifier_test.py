@@ -24,12 +24,12 @@ import logging
 import pytest
 
 from build_a_long.pdf_extract.classifier.classifier import classify_elements
-from build_a_long.pdf_extract.extractor import ExtractionResult
 from build_a_long.pdf_extract.fixtures import (
     FIXTURES_DIR,
     RAW_FIXTURE_FILES,
     extract_element_id,
     load_classifier_config,
+    load_raw_fixture,
 )
 from build_a_long.pdf_extract.tests.fixture_utils import compare_json
 
@@ -53,16 +53,12 @@ class TestGoldenClassifier:
             pants run \
                 src/build_a_long/pdf_extract/classifier/tools/generate_golden_files.py
         """
-        fixture_path = FIXTURES_DIR / fixture_file
-
         # Determine golden file path
         golden_file = fixture_file.replace("_raw.json", "_expected.json")
         golden_path = FIXTURES_DIR / golden_file
 
         # Load the input fixture
-        extraction: ExtractionResult = ExtractionResult.model_validate_json(
-            fixture_path.read_text()
-        )  # type: ignore[assignment]
+        extraction = load_raw_fixture(fixture_file)
 
         # Check that golden file exists
         if not golden_path.exists():
@@ -0,0 +1,112 @@
+"""Performance budget tests for the classifier golden fixtures.
+
+Each fixture page is classified and compared against its entry in
+``fixtures/performance_budget.json`` (see `benchmarks.budget`):
+
+- Candidate counts per label are always checked. They are deterministic,
+  and a label producing far more candidates than budgeted is the usual
+  precursor to a slowdown in `ClassificationResult.build`.
+- Classification time is only checked in performance budget mode, by
+  setting ``PERF_BUDGET=1``, because wall-clock timings are too noisy for
+  every CI run. ``PERF_BUDGET_FACTOR`` sets how many times its budget a page
+  may take (default 3).
+
+    PERF_BUDGET=1 pants test \\
+        src/build_a_long/pdf_extract/tests/performance_budget_test.py
+
+To update the budget after an intended change:
+    pants run src/build_a_long/pdf_extract/benchmarks/budget_benchmark.py -- \\
+        --update
+"""
+
+import os
+
+import pytest
+
+from build_a_long.pdf_extract.benchmarks.budget import (
+    DEFAULT_CANDIDATE_FACTOR,
+    DEFAULT_TIME_FACTOR,
+    FixtureBudget,
+    PerformanceBudget,
+    calibrate,
+    candidate_counts,
+    candidate_violations,
+    load_fixture,
+    measure_fixture,
+    time_violation,
+)
+from build_a_long.pdf_extract.fixtures import RAW_FIXTURE_FILES
+
+PERF_BUDGET = os.environ.get("PERF_BUDGET", "") not in ("", "0")
+TIME_FACTOR = float(os.environ.get("PERF_BUDGET_FACTOR", DEFAULT_TIME_FACTOR))
+
+UPDATE_HINT = (
+    "\n\nIf this is intended, update the budget: pants run "
+    "src/build_a_long/pdf_extract/benchmarks/budget_benchmark.py -- --update"
+)
+
+
+@pytest.fixture(scope="module")
+def budget() -> PerformanceBudget:
+    return PerformanceBudget.load()
+
+
+@pytest.fixture(scope="module")
+def calibration_seconds() -> float:
+    return calibrate()
+
+
+def test_every_fixture_has_a_budget(budget: PerformanceBudget) -> None:
+    assert sorted(budget.fixtures) == RAW_FIXTURE_FILES, UPDATE_HINT
+
+
+@pytest.mark.parametrize("fixture_file", RAW_FIXTURE_FILES)
+def test_candidate_counts_within_budget(
+    fixture_file: str, budget: PerformanceBudget
+) -> None:
+    fixture_budget = budget.fixtures.get(fixture_file)
+    if fixture_budget is None:
+        pytest.skip(f"No budget for {fixture_file}")
+
+    _, result = load_fixture(fixture_file)
+    violations = candidate_violations(
+        candidate_counts(result), fixture_budget, DEFAULT_CANDIDATE_FACTOR
+    )
+    if violations:
+        pytest.fail(
+            f"{fixture_file} candidate explosion:\n  "
+            + "\n  ".join(violations)
+            + UPDATE_HINT,
+            pytrace=False,
+        )
+
+
+@pytest.mark.skipif(not PERF_BUDGET, reason="set PERF_BUDGET=1 to check timings")
+@pytest.mark.parametrize("fixture_file", RAW_FIXTURE_FILES)
+def test_classification_time_within_budget(
+    fixture_file: str, budget: PerformanceBudget, calibration_seconds: float
+) -> None:
+    fixture_budget = budget.fixtures.get(fixture_file)
+    if fixture_budget is None:
+        pytest.skip(f"No budget for {fixture_file}")
+
+    measured = measure_fixture(fixture_file, calibration_seconds)
+    violation = time_violation(measured.units, fixture_budget, TIME_FACTOR)
+    if violation:
+        pytest.fail(f"{fixture_file} {violation}" + UPDATE_HINT, pytrace=False)
+
+
+def test_budget_limits() -> None:
+    """A 50x slowdown or a candidate explosion is caught; noise is not."""
+    fixture_budget = FixtureBudget(units=2.0, candidates={"step": 10})
+
+    assert time_violation(2.5, fixture_budget, DEFAULT_TIME_FACTOR) is None
+    assert time_violation(100.0, fixture_budget, DEFAULT_TIME_FACTOR) is not None
+    # Tiny budgets are raised to a floor
+    assert time_violation(0.5, FixtureBudget(units=0.01), 3.0) is None
+
+    assert candidate_violations({"step": 12}, fixture_budget, 1.5) == []
+    assert candidate_violations({"new_label": 3}, fixture_budget, 1.5) == []
+    assert candidate_violations({"step": 500}, fixture_budget, 1.5) == [
+        "step: 500 candidates, budget is 10 (limit 20)"
+    ]
@@ -4,6 +4,7 @@ This module provides validation rules to check for common issues that indicate
 the extraction may not be working correctly for a particular instruction book.
 """
 
+from .page_cache import PageValidation, PageValidationCache, page_content_hash
 from .printer import print_validation
 from .rules import (
     format_ranges,
@@ -20,7 +21,12 @@ from .rules import (
     validate_steps_have_parts,
     validate_steps_no_significant_overlap,
 )
-from .runner import validate_page, validate_results
+from .runner import (
+    DocumentValidator,
+    validate_page,
+    validate_page_result,
+    validate_results,
+)
 from .types import ValidationIssue, ValidationResult, ValidationSeverity
 
 __all__ = [
@@ -29,8 +35,14 @@ __all__ = [
     "ValidationResult",
     "ValidationSeverity",
     # Main runners
+    "DocumentValidator",
     "validate_results",
     "validate_page",
+    "validate_page_result",
+    # Per-page result cache
+    "PageValidation",
+    "PageValidationCache",
+    "page_content_hash",
     # Printer
     "print_validation",
     # Sequence validation rules (cross-page)
@@ -0,0 +1,142 @@
+"""Per-page validation results, cached by page content.
+
+Validation splits into per-page rules, which only look at one page result,
+and cross-page rules, which only need a few values from each page (see
+`PageValidation`). The per-page part can therefore be cached: when a manual
+is re-processed and most pages classify exactly as before, only the pages
+whose content changed are validated again.
+
+Cache files hold the entries used by the last run, keyed by
+`page_content_hash`, and are written atomically.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from pathlib import Path
+
+import pydantic
+from pydantic import BaseModel, ConfigDict, Field
+
+from build_a_long.common import atomic_write
+from build_a_long.pdf_extract.classifier import ClassificationResult
+
+from .rules import PartIdentifier
+from .types import ValidationIssue
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+"""Bump whenever a per-page rule changes, so stale entries are not reused."""
+
+
+class PageValidation(BaseModel):
+    """Everything validation needs from one page result.
+
+    Attributes:
+        pdf_page: PDF page number (1-indexed)
+        issues: Issues found by the per-page rules
+        skipped_reason: Why classification skipped the page, if it did
+        has_page: Whether classification produced a Page
+        lego_page_number: The detected LEGO page number
+        progress: The progress bar value
+        steps: (step number, has parts) for each step, in order
+        is_catalog: Whether the page is a catalog page
+        catalog_xrefs: Image xrefs of the catalog parts
+        catalog_digests: Image digests of the catalog parts
+        instruction_parts: Identifiers of the instruction parts' diagrams
+    """
+
+    model_config = ConfigDict(
+        frozen=True, ser_json_bytes="base64", val_json_bytes="base64"
+    )
+
+    pdf_page: int
+    issues: list[ValidationIssue] = Field(default_factory=list)
+    skipped_reason: str | None = None
+    has_page: bool = True
+    lego_page_number: int | None = None
+    progress: float | None = None
+    steps: list[tuple[int, bool]] = Field(default_factory=list)
+    is_catalog: bool = False
+    catalog_xrefs: list[int] = Field(default_factory=list)
+    catalog_digests: list[bytes] = Field(default_factory=list)
+    instruction_parts: list[PartIdentifier] = Field(default_factory=list)
+
+
+class _CacheFile(BaseModel):
+    version: int
+    entries: dict[str, PageValidation]
+
+
+def page_content_hash(result: ClassificationResult, *options: object) -> str:
+    """Hash everything the per-page rules look at.
+
+    That is the classified Page, the page bounds, the skip reason and the
+    unclaimed blocks. ``options`` are rule settings that also affect the
+    outcome (they are hashed by ``repr``).
+    """
+    page_data = result.page_data
+    h = hashlib.sha256()
+    h.update(repr((CACHE_VERSION, options)).encode())
+    h.update(repr((page_data.page_number, page_data.bbox)).encode())
+    h.update(repr(result.skipped_reason).encode())
+    if result.page is not None:
+        h.update(result.page.model_dump_json().encode())
+    if not result.skipped_reason:
+        h.update(
+            repr(
+                [(b.id, type(b).__name__) for b in result.get_unclaimed_blocks()]
+            ).encode()
+        )
+    return h.hexdigest()
+
+
+class PageValidationCache:
+    """`PageValidation` entries keyed by `page_content_hash`.
+
+    With a ``path`` the cache is loaded from it (if it exists and is
+    readable) and `save` writes back the entries looked up or added since,
+    dropping those for pages that no longer exist.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, PageValidation] = {}
+        self._used: dict[str, PageValidation] = {}
+        if path is not None and path.exists():
+            try:
+                cached = _CacheFile.model_validate_json(path.read_bytes())
+            except (OSError, pydantic.ValidationError) as e:
+                logger.warning("Ignoring unreadable validation cache %s: %s", path, e)
+            else:
+                if cached.version == CACHE_VERSION:
+                    self._entries = cached.entries
+
+    def get(self, key: str) -> PageValidation | None:
+        """Return the entry for ``key``, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used[key] = entry
+        return entry
+
+    def put(self, key: str, entry: PageValidation) -> None:
+        """Store an entry."""
+        self._entries[key] = entry
+        self._used[key] = entry
+
+    def save(self) -> None:
+        """Write the entries used in this run to ``path``, if set."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(
+            self.path,
+            _CacheFile(version=CACHE_VERSION, entries=self._used).model_dump_json(),
+        )
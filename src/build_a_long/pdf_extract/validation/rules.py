@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import statistics
+from collections import Counter
 
 from build_a_long.pdf_extract.classifier import ClassificationResult
 from build_a_long.pdf_extract.extractor import PageData
@@ -14,11 +15,11 @@ from build_a_long.pdf_extract.extractor.lego_page_elements import (
     LegoPageElement,
     Manual,
     Page,
-    Part,
     ProgressBar,
     ProgressBarBar,
     ProgressBarIndicator,
 )
+from build_a_long.pdf_extract.extractor.spatial_index import overlapping_pairs
 
 from .types import ValidationIssue, ValidationResult, ValidationSeverity
 
@@ -343,9 +344,10 @@ def validate_step_sequence(
     step_values = [s[1] for s in sorted_steps]
 
     # Check for duplicates
+    step_counts = Counter(step_values)
     duplicates: dict[int, list[int]] = {}
     for pdf_page, step_num in step_numbers_seen:
-        if step_values.count(step_num) > 1:
+        if step_counts[step_num] > 1:
             if step_num not in duplicates:
                 duplicates[step_num] = []
             duplicates[step_num].append(pdf_page)
@@ -660,6 +662,48 @@ def validate_progress_bar_sequence(
                 pass  # Ignore calculation errors for edge cases
 
 
+type PartIdentifier = tuple[int, int | None, bytes | None]
+"""(pdf_page, xref, digest) of an instruction part's diagram."""
+
+
+def collect_instruction_part_ids(page: Page) -> list[PartIdentifier]:
+    """Return the diagram identifiers of the parts used on an instruction page.
+
+    Args:
+        page: A classified page; non-instruction pages yield nothing.
+
+    Returns:
+        (pdf_page, xref, digest) for each part with a diagram, in step order.
+    """
+    if not page.is_instruction or not page.instruction:
+        return []
+    return [
+        (page.pdf_page_number, part.diagram.xref, part.diagram.digest)
+        for step in page.instruction.steps
+        if step.parts_list
+        for part in step.parts_list.parts
+        if part.diagram  # Ensure there's a diagram
+    ]
+
+
+def collect_catalog_ids(page: Page) -> set[int | bytes]:
+    """Return the unique image identifiers (xref or digest) of a catalog page.
+
+    Args:
+        page: A classified page; non-catalog pages yield nothing.
+    """
+    identifiers: set[int | bytes] = set()
+    if not page.is_catalog or not page.catalog:
+        return identifiers
+    for part in page.catalog.parts:
+        if part.diagram:
+            if part.diagram.xref is not None:
+                identifiers.add(part.diagram.xref)
+            if part.diagram.digest is not None:
+                identifiers.add(part.diagram.digest)
+    return identifiers
+
+
 def validate_catalog_coverage(
     validation: ValidationResult,
     manual: Manual,
@@ -676,62 +720,71 @@ def validate_catalog_coverage(
         manual: The complete Manual object containing all pages
         experimental: Whether to treat this rule as experimental (INFO severity only)
     """
-    if not manual.catalog_pages:
-        return  # No catalog to check against
+    catalog_identifiers: set[int | bytes] = set()
+    instruction_parts: list[PartIdentifier] = []
+    for page in manual.pages:
+        catalog_identifiers |= collect_catalog_ids(page)
+        instruction_parts.extend(collect_instruction_part_ids(page))
+    report_catalog_coverage(
+        validation,
+        has_catalog=bool(manual.catalog_pages),
+        instruction_parts=instruction_parts,
+        catalog_identifiers=catalog_identifiers,
+        experimental=experimental,
+    )
 
-    # 1. Collect all parts from instruction pages
-    instruction_parts: list[tuple[int, Part]] = []  # (page_num, Part)
-    for page in manual.instruction_pages:
-        if page.instruction:
-            for step in page.instruction.steps:
-                if step.parts_list:
-                    for part in step.parts_list.parts:
-                        if part.diagram:  # Ensure there's a diagram
-                            instruction_parts.append((page.pdf_page_number, part))
+
+def report_catalog_coverage(
+    validation: ValidationResult,
+    *,
+    has_catalog: bool,
+    instruction_parts: list[PartIdentifier],
+    catalog_identifiers: set[int | bytes],
+    experimental: bool = True,
+) -> None:
+    """Report catalog coverage from identifiers collected page by page.
+
+    See `validate_catalog_coverage`. The identifiers come from
+    `collect_instruction_part_ids` and `collect_catalog_ids`, so a streaming
+    validator doesn't need to keep the pages.
+
+    Args:
+        validation: ValidationResult to add issues to
+        has_catalog: Whether the manual has any catalog pages
+        instruction_parts: Identifiers of every instruction part, in page order
+        catalog_identifiers: Union of the catalog pages' identifiers
+        experimental: Whether to treat this rule as experimental (INFO severity only)
+    """
+    if not has_catalog:
+        return  # No catalog to check against
 
     if not instruction_parts:
         return
 
-    # 2. Collect all unique identifiers from catalog parts (xref or digest)
-    catalog_identifiers: set[int | bytes] = set()
-    for part in manual.catalog_parts:
-        if part.diagram:
-            if part.diagram.xref is not None:
-                catalog_identifiers.add(part.diagram.xref)
-            if part.diagram.digest is not None:
-                catalog_identifiers.add(part.diagram.digest)
-
     if not catalog_identifiers:
         return
 
-    # 3. Check coverage
+    # Check coverage
     matched_count = 0
     unmatched_parts: list[
         tuple[int, str]
     ] = []  # (page_num, identifier_type + id_value)
 
-    for page_num, part in instruction_parts:
-        is_matched = False
-        if part.diagram and (
-            (part.diagram.xref is not None and part.diagram.xref in catalog_identifiers)
-            or (
-                part.diagram.digest is not None
-                and part.diagram.digest in catalog_identifiers
-            )
+    for page_num, xref, digest in instruction_parts:
+        if (xref is not None and xref in catalog_identifiers) or (
+            digest is not None and digest in catalog_identifiers
         ):
             matched_count += 1
-            is_matched = True
-
-        if not is_matched:
-            # Prepare identifier for unmatched parts
-            identifier = ""
-            if part.diagram and part.diagram.xref is not None:
-                identifier = f"xref:{part.diagram.xref}"
-            elif part.diagram and part.diagram.digest is not None:
-                identifier = f"digest:{part.diagram.digest.hex()}"
-            else:
-                identifier = "unknown_id"
-            unmatched_parts.append((page_num, identifier))
+            continue
+
+        # Prepare identifier for unmatched parts
+        if xref is not None:
+            identifier = f"xref:{xref}"
+        elif digest is not None:
+            identifier = f"digest:{digest.hex()}"
+        else:
+            identifier = "unknown_id"
+        unmatched_parts.append((page_num, identifier))
 
     # Report stats
     coverage_pct = matched_count / len(instruction_parts) * 100
@@ -870,20 +923,18 @@ def validate_parts_lists_no_overlap(
         step.parts_list for step in page.instruction.steps if step.parts_list
     ]
 
-    for i, pl1 in enumerate(parts_lists):
-        for pl2 in parts_lists[i + 1 :]:
-            overlap = pl1.bbox.overlaps(pl2.bbox)
-            if overlap > 0.0:
-                validation.add(
-                    ValidationIssue(
-                        severity=ValidationSeverity.ERROR,
-                        rule="overlapping_parts_lists",
-                        message="PartsList regions overlap",
-                        pages=[page_data.page_number],
-                        details=f"{pl1.bbox} and {pl2.bbox} overlap "
-                        f"(IOU: {pl1.bbox.iou(pl2.bbox):.3f})",
-                    )
-                )
+    for i, j in overlapping_pairs(parts_lists):
+        pl1, pl2 = parts_lists[i], parts_lists[j]
+        validation.add(
+            ValidationIssue(
+                severity=ValidationSeverity.ERROR,
+                rule="overlapping_parts_lists",
+                message="PartsList regions overlap",
+                pages=[page_data.page_number],
+                details=f"{pl1.bbox} and {pl2.bbox} overlap "
+                f"(IOU: {pl1.bbox.iou(pl2.bbox):.3f})",
+            )
+        )
 
 
 def validate_steps_no_significant_overlap(
@@ -911,20 +962,21 @@ def validate_steps_no_significant_overlap(
     if len(steps) < 2:
         return
 
-    for i, step1 in enumerate(steps):
-        for step2 in steps[i + 1 :]:
-            iou = step1.bbox.iou(step2.bbox)
-            if iou > overlap_threshold:
-                validation.add(
-                    ValidationIssue(
-                        severity=ValidationSeverity.WARNING,
-                        rule="overlapping_steps",
-                        message=f"Steps {step1.step_number.value} and "
-                        f"{step2.step_number.value} overlap significantly",
-                        pages=[page_data.page_number],
-                        details=f"IOU: {iou:.3f} (threshold: {overlap_threshold})",
-                    )
+    # Only steps whose boxes overlap can have a non-zero IOU
+    for i, j in overlapping_pairs(steps):
+        step1, step2 = steps[i], steps[j]
+        iou = step1.bbox.iou(step2.bbox)
+        if iou > overlap_threshold:
+            validation.add(
+                ValidationIssue(
+                    severity=ValidationSeverity.WARNING,
+                    rule="overlapping_steps",
+                    message=f"Steps {step1.step_number.value} and "
+                    f"{step2.step_number.value} overlap significantly",
+                    pages=[page_data.page_number],
+                    details=f"IOU: {iou:.3f} (threshold: {overlap_threshold})",
                 )
+            )
 
 
 def validate_part_contains_children(
@@ -1039,7 +1091,7 @@ def validate_content_no_metadata_overlap(
         page_data: The raw PageData for context
     """
     # Define metadata elements
-    metadata_elements: list[tuple[str, object]] = []
+    metadata_elements: list[tuple[str, LegoPageElement]] = []
     if page.page_number:
         metadata_elements.append(("PageNumber", page.page_number))
     if page.progress_bar:
@@ -1052,7 +1104,7 @@ def validate_content_no_metadata_overlap(
     # For steps, check structural components (step_number, parts_list) but not
     # diagrams or subassemblies, as those are large visual elements that may
     # legitimately extend into the metadata area
-    content_elements: list[tuple[str, object]] = []
+    content_elements: list[tuple[str, LegoPageElement]] = []
     if page.instruction:
         for step in page.instruction.steps:
             # Check step_number (should never overlap metadata)
@@ -1071,21 +1123,24 @@ def validate_content_no_metadata_overlap(
         for part in page.catalog.parts:
             content_elements.append(("CatalogPart", part))
 
-    # Check for overlaps
-    for meta_name, meta_elem in metadata_elements:
-        for content_name, content_elem in content_elements:
-            # Use intersection area to detect overlap
-            intersection = meta_elem.bbox.intersect(content_elem.bbox)  # type: ignore[union-attr]
-            if intersection.area > 0:
-                validation.add(
-                    ValidationIssue(
-                        severity=ValidationSeverity.WARNING,
-                        rule="content_metadata_overlap",
-                        message=f"{content_name} overlaps with {meta_name}",
-                        pages=[page_data.page_number],
-                        details=f"{content_elem.bbox} intersects {meta_elem.bbox}",  # type: ignore[union-attr]
-                    )
+    # Check for overlaps. A positive intersection area needs overlapping boxes.
+    for i, j in overlapping_pairs(
+        [elem for _, elem in metadata_elements],
+        [elem for _, elem in content_elements],
+    ):
+        meta_name, meta_elem = metadata_elements[i]
+        content_name, content_elem = content_elements[j]
+        intersection = meta_elem.bbox.intersect(content_elem.bbox)
+        if intersection.area > 0:
+            validation.add(
+                ValidationIssue(
+                    severity=ValidationSeverity.WARNING,
+                    rule="content_metadata_overlap",
+                    message=f"{content_name} overlaps with {meta_name}",
+                    pages=[page_data.page_number],
+                    details=f"{content_elem.bbox} intersects {meta_elem.bbox}",
                 )
+            )
 
 
 def validate_unconsumed_blocks(
@@ -1101,19 +1156,8 @@ def validate_unconsumed_blocks(
     if result.skipped_reason:
         return
 
-    unconsumed_blocks = []
-    for block in result.page_data.blocks:
-        # Check if block is consumed by a constructed candidate
-        best_candidate = result.get_best_candidate(block)
-        if best_candidate:
-            continue
-
-        # Check if block was explicitly removed
-        if result.is_removed(block):
-            continue
-
-        # Block is unconsumed and not removed
-        unconsumed_blocks.append(block)
+    # Blocks with no constructed candidate that were not explicitly removed
+    unconsumed_blocks = result.get_unclaimed_blocks()
 
     if unconsumed_blocks:
         block_details = ", ".join(
@@ -1163,19 +1207,20 @@ def validate_no_divider_intersection(
         Divider,
     )
 
-    for element in page.iter_elements():
-        if isinstance(element, excluded_types):
-            continue
-
-        for divider in page.dividers:
-            if element.bbox.overlaps(divider.bbox):
-                validation.add(
-                    ValidationIssue(
-                        severity=ValidationSeverity.WARNING,
-                        rule="divider_intersection",
-                        message=f"{type(element).__name__} intersects with divider",
-                        pages=[page_data.page_number],
-                        details=f"{type(element).__name__} {element.bbox} intersects "
-                        f"Divider {divider.bbox}",
-                    )
-                )
+    elements = [
+        element
+        for element in page.iter_elements()
+        if not isinstance(element, excluded_types)
+    ]
+    for i, j in overlapping_pairs(elements, page.dividers):
+        element, divider = elements[i], page.dividers[j]
+        validation.add(
+            ValidationIssue(
+                severity=ValidationSeverity.WARNING,
+                rule="divider_intersection",
+                message=f"{type(element).__name__} intersects with divider",
+                pages=[page_data.page_number],
+                details=f"{type(element).__name__} {element.bbox} intersects "
+                f"Divider {divider.bbox}",
+            )
+        )
@@ -1,11 +1,18 @@
 """Main validation runner that orchestrates all validation rules."""
 
-from build_a_long.pdf_extract.classifier import BatchClassificationResult
+from build_a_long.pdf_extract.classifier import (
+    BatchClassificationResult,
+    ClassificationResult,
+)
 from build_a_long.pdf_extract.extractor import PageData
 from build_a_long.pdf_extract.extractor.lego_page_elements import Page
 
+from .page_cache import PageValidation, PageValidationCache, page_content_hash
 from .rules import (
-    validate_catalog_coverage,
+    PartIdentifier,
+    collect_catalog_ids,
+    collect_instruction_part_ids,
+    report_catalog_coverage,
     validate_content_no_metadata_overlap,
     validate_elements_within_page,
     validate_first_page_number,
@@ -26,109 +33,229 @@ from .rules import (
 from .types import ValidationResult
 
 
-def validate_results(
-    batch_result: BatchClassificationResult,
-) -> ValidationResult:
-    """Run all validation rules on classification results.
-
-    This function checks for common issues that indicate the extraction
-    may not be working correctly for a particular instruction book.
-
-    Validation rules:
-    - Each page should have a page number detected
-    - Step numbers should form a continuous sequence without gaps
-    - Step numbers should not have duplicates
-    - Pages with steps should have parts lists
-    - The first page number found should be reasonable (typically 1-4)
+def validate_page_result(
+    result: ClassificationResult,
+    *,
+    domain_rules: bool = False,
+    step_overlap_threshold: float = 0.05,
+) -> PageValidation:
+    """Run the per-page rules on one result and collect its cross-page values.
 
     Args:
-        batch_result: The complete batch classification result.
+        result: A page's classification result.
+        domain_rules: Also run the `validate_page` domain invariant rules.
+        step_overlap_threshold: Passed to `validate_page`.
 
     Returns:
-        ValidationResult containing all found issues
+        The page's issues and the values `DocumentValidator` aggregates.
     """
+    page = result.page
+    pdf_page = result.page_data.page_number
+
+    # Skipped pages contribute nothing else
+    if result.skipped_reason:
+        return PageValidation(pdf_page=pdf_page, skipped_reason=result.skipped_reason)
+
+    # Check for unconsumed blocks
     validation = ValidationResult()
+    validate_unconsumed_blocks(validation, result)
+
+    # Invalid pages (no Page object but also not skipped)
+    if page is None:
+        return PageValidation(
+            pdf_page=pdf_page, issues=validation.issues, has_page=False
+        )
+
+    if domain_rules:
+        validate_page(
+            page,
+            result.page_data,
+            validation,
+            step_overlap_threshold=step_overlap_threshold,
+        )
+
+    catalog_ids = collect_catalog_ids(page)
+    return PageValidation(
+        pdf_page=pdf_page,
+        issues=validation.issues,
+        lego_page_number=page.page_number.value if page.page_number else None,
+        progress=page.progress_bar.progress if page.progress_bar else None,
+        steps=[
+            (
+                step.step_number.value,
+                step.parts_list is not None and len(step.parts_list.parts) > 0,
+            )
+            for step in (page.instruction.steps if page.instruction else [])
+        ],
+        is_catalog=page.is_catalog,
+        catalog_xrefs=sorted(i for i in catalog_ids if isinstance(i, int)),
+        catalog_digests=sorted(i for i in catalog_ids if isinstance(i, bytes)),
+        instruction_parts=collect_instruction_part_ids(page),
+    )
 
-    # Collect data for validation
-    missing_page_numbers: list[int] = []
-    step_numbers_seen: list[tuple[int, int]] = []  # (pdf_page, step_number)
-    steps_without_parts: list[tuple[int, int]] = []  # (pdf_page, step_number)
-    lego_page_numbers: list[int] = []  # Detected LEGO page numbers
-    skipped_pages: list[tuple[int, str]] = []  # (pdf_page, reason)
-    invalid_pages: list[int] = []  # Pages where classification produced no Page
-    progress_bars: list[tuple[int, float]] = []  # (pdf_page, progress_value)
 
-    for result in batch_result.results:
-        page = result.page
-        page_data = result.page_data
-        pdf_page = page_data.page_number
-
-        # Check for skipped pages
-        if result.skipped_reason:
-            skipped_pages.append((pdf_page, result.skipped_reason))
-            continue  # Don't collect other data for skipped pages
-
-        # Check for unconsumed blocks
-        validate_unconsumed_blocks(validation, result)
-
-        # Check for invalid pages (no Page object but also not skipped)
-        if page is None:
-            invalid_pages.append(pdf_page)
-            continue
-
-        # Check for page number
-        if page.page_number:
-            lego_page_numbers.append(page.page_number.value)
+class DocumentValidator:
+    """Validates a document one page result at a time.
+
+    Validation has two parts:
+
+    - per-page rules, run by `validate_page_result` as each result arrives
+      (before it is compacted or dropped), and
+    - cross-page rules, run by `finish` over the few values each page
+      contributed (its LEGO page number, step numbers, progress value and
+      part image identifiers), so the pages themselves are not kept.
+
+    With a `PageValidationCache`, per-page results are looked up by
+    `page_content_hash` first, so re-validating a manual where only a few
+    pages changed only re-runs the rules on those pages.
+
+    Feeding every result of a batch in order and calling `finish` gives the
+    same issues, in the same order, as `validate_results`.
+    """
+
+    def __init__(
+        self,
+        *,
+        cache: PageValidationCache | None = None,
+        domain_rules: bool = False,
+    ) -> None:
+        """Create a validator.
+
+        Args:
+            cache: Optional cache of per-page results.
+            domain_rules: Also run the `validate_page` domain invariant rules
+                on every page.
+        """
+        self.cache = cache
+        self.domain_rules = domain_rules
+        self.validation = ValidationResult()
+        self.page_count = 0
+        self.missing_page_numbers: list[int] = []
+        self.step_numbers_seen: list[tuple[int, int]] = []  # (pdf_page, step)
+        self.steps_without_parts: list[tuple[int, int]] = []  # (pdf_page, step)
+        self.lego_page_numbers: list[int] = []
+        self.skipped_pages: list[tuple[int, str]] = []  # (pdf_page, reason)
+        self.invalid_pages: list[int] = []  # No Page object but not skipped
+        self.progress_bars: list[tuple[int, float]] = []  # (pdf_page, progress)
+        self.has_catalog = False
+        self.catalog_identifiers: set[int | bytes] = set()
+        self.instruction_parts: list[PartIdentifier] = []
+
+    def add(self, result: ClassificationResult) -> None:
+        """Check one page's result and record what the cross-page rules need."""
+        if self.cache is None:
+            self.add_page(validate_page_result(result, domain_rules=self.domain_rules))
+            return
+
+        key = page_content_hash(result, self.domain_rules)
+        entry = self.cache.get(key)
+        if entry is None:
+            entry = validate_page_result(result, domain_rules=self.domain_rules)
+            self.cache.put(key, entry)
+        self.add_page(entry)
+
+    def add_page(self, entry: PageValidation) -> None:
+        """Record an already validated page."""
+        self.page_count += 1
+        pdf_page = entry.pdf_page
+        self.validation.issues.extend(entry.issues)
+
+        if entry.skipped_reason:
+            self.skipped_pages.append((pdf_page, entry.skipped_reason))
+            return
+        if not entry.has_page:
+            self.invalid_pages.append(pdf_page)
+            return
+
+        if entry.lego_page_number is not None:
+            self.lego_page_numbers.append(entry.lego_page_number)
         else:
-            missing_page_numbers.append(pdf_page)
+            self.missing_page_numbers.append(pdf_page)
 
-        # Collect progress bar value
-        if page.progress_bar and page.progress_bar.progress is not None:
-            progress_bars.append((pdf_page, page.progress_bar.progress))
+        if entry.progress is not None:
+            self.progress_bars.append((pdf_page, entry.progress))
 
-        # Collect step numbers
-        if page and page.instruction:
-            for step in page.instruction.steps:
-                step_numbers_seen.append((pdf_page, step.step_number.value))
+        for step_number, has_parts in entry.steps:
+            self.step_numbers_seen.append((pdf_page, step_number))
+            if not has_parts:
+                self.steps_without_parts.append((pdf_page, step_number))
 
-                # Check for steps without parts lists
-                if step.parts_list is None or len(step.parts_list.parts) == 0:
-                    steps_without_parts.append((pdf_page, step.step_number.value))
+        if entry.is_catalog:
+            self.has_catalog = True
+            self.catalog_identifiers.update(entry.catalog_xrefs)
+            self.catalog_identifiers.update(entry.catalog_digests)
+        self.instruction_parts.extend(entry.instruction_parts)
 
-    # --- Validation Rules ---
+    def finish(self) -> ValidationResult:
+        """Run the cross-page rules and return every issue found."""
+        validation = self.validation
 
-    # Rule 0: Skipped pages
-    validate_skipped_pages(validation, skipped_pages)
+        # Rule 0: Skipped pages
+        validate_skipped_pages(validation, self.skipped_pages)
 
-    # Rule 0b: Invalid pages (classification failed to produce a Page)
-    validate_invalid_pages(validation, invalid_pages)
+        # Rule 0b: Invalid pages (classification failed to produce a Page)
+        validate_invalid_pages(validation, self.invalid_pages)
 
-    # Rule 1: Missing page numbers
-    validate_missing_page_numbers(
-        validation, missing_page_numbers, len(batch_result.results)
-    )
+        # Rule 1: Missing page numbers
+        validate_missing_page_numbers(
+            validation, self.missing_page_numbers, self.page_count
+        )
 
-    # Rule 2 & 3: Step number sequence validation
-    validate_step_sequence(validation, step_numbers_seen)
+        # Rule 2 & 3: Step number sequence validation
+        validate_step_sequence(validation, self.step_numbers_seen)
 
-    # Rule 4: Steps without parts lists
-    validate_steps_have_parts(validation, steps_without_parts)
+        # Rule 4: Steps without parts lists
+        validate_steps_have_parts(validation, self.steps_without_parts)
 
-    # Rule 5: First page number validation
-    validate_first_page_number(validation, lego_page_numbers)
+        # Rule 5: First page number validation
+        validate_first_page_number(validation, self.lego_page_numbers)
 
-    # Rule 6: Page number sequence validation
-    validate_page_number_sequence(validation, lego_page_numbers)
+        # Rule 6: Page number sequence validation
+        validate_page_number_sequence(validation, self.lego_page_numbers)
 
-    # Rule 7: Progress bar sequence validation
-    validate_progress_bar_sequence(validation, progress_bars)
+        # Rule 7: Progress bar sequence validation
+        validate_progress_bar_sequence(validation, self.progress_bars)
 
-    # Rule 8: Catalog coverage
-    validate_catalog_coverage(validation, batch_result.manual, experimental=True)
+        # Rule 8: Catalog coverage
+        report_catalog_coverage(
+            validation,
+            has_catalog=self.has_catalog,
+            instruction_parts=self.instruction_parts,
+            catalog_identifiers=self.catalog_identifiers,
+            experimental=True,
+        )
 
-    return validation
+        return validation
 
-    return validation
+
+def validate_results(
+    batch_result: BatchClassificationResult,
+) -> ValidationResult:
+    """Run all validation rules on classification results.
+
+    This function checks for common issues that indicate the extraction
+    may not be working correctly for a particular instruction book.
+
+    Validation rules:
+    - Each page should have a page number detected
+    - Step numbers should form a continuous sequence without gaps
+    - Step numbers should not have duplicates
+    - Pages with steps should have parts lists
+    - The first page number found should be reasonable (typically 1-4)
+
+    Use `DocumentValidator` directly to validate pages as they are
+    classified.
+
+    Args:
+        batch_result: The complete batch classification result.
+
+    Returns:
+        ValidationResult containing all found issues
+    """
+    validator = DocumentValidator()
+    for result in batch_result.results:
+        validator.add(result)
+    return validator.finish()
 
 
 def validate_page(
@@ -31,6 +31,7 @@ from build_a_long.pdf_extract.extractor.lego_page_elements import (
     StepNumber,
 )
 
+from .page_cache import PageValidation, PageValidationCache
 from .printer import print_validation
 from .rules import (
     format_ranges,
@@ -47,7 +48,7 @@ from .rules import (
     validate_steps_have_parts,
     validate_steps_no_significant_overlap,
 )
-from .runner import validate_results
+from .runner import DocumentValidator, validate_results
 from .types import ValidationIssue, ValidationResult, ValidationSeverity
 
 
@@ -696,6 +697,114 @@ class TestValidateResults:
         validation = validate_results(batch_result)
         assert any(i.rule == "step_gaps" for i in validation.issues)
 
+    def test_document_validator_matches_validate_results(self) -> None:
+        """Streaming pages through DocumentValidator gives the same issues."""
+        pages = [_make_page_data(i) for i in range(1, 5)]
+        results = [
+            _make_classification_result(pages[0], page_number_val=1, step_numbers=[1]),
+            _make_classification_result(
+                pages[1], page_number_val=None, step_numbers=[3, 3]
+            ),
+            _make_classification_result(
+                pages[2], page_number_val=5, step_numbers=[4], include_parts=False
+            ),
+            ClassificationResult(page_data=pages[3], skipped_reason="too many blocks"),
+        ]
+        batch_result = BatchClassificationResult(
+            results=results, histogram=TextHistogram.empty()
+        )
+        expected = validate_results(batch_result)
+        assert expected.issues
+
+        validator = DocumentValidator()
+        for result in results:
+            validator.add(result)
+            # Only the compact summary is needed after a page is added
+            result.compact()
+        assert validator.finish().issues == expected.issues
+
+
+class TestDocumentValidatorCache:
+    """Tests for per-page result caching in DocumentValidator."""
+
+    def _results(self, second_page_steps: list[int]) -> list[ClassificationResult]:
+        pages = [_make_page_data(i) for i in range(1, 4)]
+        return [
+            _make_classification_result(pages[0], page_number_val=1, step_numbers=[1]),
+            _make_classification_result(
+                pages[1], page_number_val=2, step_numbers=second_page_steps
+            ),
+            _make_classification_result(
+                pages[2], page_number_val=None, step_numbers=[4], include_parts=False
+            ),
+        ]
+
+    def _validate(
+        self, results: list[ClassificationResult], cache: PageValidationCache
+    ) -> ValidationResult:
+        validator = DocumentValidator(cache=cache)
+        for result in results:
+            validator.add(result)
+        return validator.finish()
+
+    def test_unchanged_pages_are_reused(self, tmp_path) -> None:
+        path = tmp_path / "cache.json"
+        results = self._results([2])
+        first = self._validate(results, PageValidationCache(path))
+        assert (
+            first.issues
+            == validate_results(
+                BatchClassificationResult(
+                    results=results, histogram=TextHistogram.empty()
+                )
+            ).issues
+        )
+
+        # Save and reload: every page is a hit and the issues are the same
+        cache = PageValidationCache(path)
+        self._validate(results, cache)
+        cache.save()
+        cache = PageValidationCache(path)
+        assert self._validate(results, cache).issues == first.issues
+        assert (cache.hits, cache.misses) == (3, 0)
+
+        # Only the changed page is validated again
+        changed = self._results([3])
+        cache = PageValidationCache(path)
+        validation = self._validate(changed, cache)
+        assert (cache.hits, cache.misses) == (2, 1)
+        assert any(i.rule == "step_gaps" for i in validation.issues)
+
+    def test_unreadable_cache_is_ignored(self, tmp_path) -> None:
+        path = tmp_path / "cache.json"
+        path.write_text("not json")
+        cache = PageValidationCache(path)
+        self._validate(self._results([2]), cache)
+        assert (cache.hits, cache.misses) == (0, 3)
+
+    def test_page_validation_round_trips_digests(self) -> None:
+        entry = PageValidation(
+            pdf_page=3,
+            is_catalog=True,
+            catalog_xrefs=[12],
+            catalog_digests=[b"\xff\x00digest"],
+            instruction_parts=[(3, None, b"\x80")],
+        )
+        assert PageValidation.model_validate_json(entry.model_dump_json()) == entry
+
+    def test_domain_rules(self) -> None:
+        result = _make_classification_result(
+            _make_page_data(1), page_number_val=1, step_numbers=[1, 2]
+        )
+        validator = DocumentValidator(domain_rules=True)
+        validator.add(result)
+        # Both steps share the same bbox
+        assert any(i.rule == "overlapping_steps" for i in validator.finish().issues)
+
+        validator = DocumentValidator()
+        validator.add(result)
+        assert not any(i.rule == "overlapping_steps" for i in validator.finish().issues)
+
 
 class TestPrintValidation:
     """Tests for print_validation function."""